@@ -1,9 +1,16 @@
 const { exec } = require('child_process');
 const path = require('path');
 const fs = require('fs');
+const os = require('os');
+const crypto = require('crypto');
 const multer = require('multer');
 const util = require('util');
 const execPromise = util.promisify(exec);
+const { submitReportJob, getReportJob, setReportJobResult, claimReportJob, releaseReportJob, isWorkerUnavailable } = require('../utils/reportWorkerClient');
+
+// Report jobs live in the worker this instance talks to - job ids carry the host name so a poll
+// routed to another host can be told apart from an unknown / expired job
+const REPORT_JOB_HOST_TAG = os.hostname().toLowerCase().replace(/[^a-z0-9]+/g, '-');
 
 // Configure multer for Excel file uploads
 const storage = multer.diskStorage({
@@ -48,6 +55,55 @@ const REPORT_UTILS_DIR = path.join(__dirname, '../utils/report-generation');
 const TEMPLATE_PPT_PATH = path.join(REPORT_UTILS_DIR, 'template.pptx');
 const TEMPLATE_EXCEL_PATH = path.join(REPORT_UTILS_DIR, 'template.xlsx');
 
+// Structured audit records (JSON Lines) written by the report generator in the same run
+// (same data and calculations as the deck). Keyed by uploaded Excel file name and reference date
+// so the audit endpoint can append the deck calculations to the full audit (or render only them)
+const getAuditRecordsPath = (outputDir, excelFileName, referenceDate) => {
+  const excelBase = path.parse(path.basename(excelFileName)).name;
+  const dateSuffix = referenceDate ? `_${String(referenceDate).replace(/[^0-9A-Za-z-]/g, '')}` : '';
+  return path.join(outputDir, `audit_records_${excelBase}${dateSuffix}.jsonl`);
+};
+
+// Upload a generated report to S3 if configured
+// Returns the download URL (S3 signed URL, or local download path) and the S3 key (null if not uploaded)
+const publishReport = async (outputPath, excelFileName) => {
+  const { uploadToS3, isS3Configured, generateReportKey, getSignedUrl } = require('../utils/cloudStorage');
+  let reportUrl = `/api/reports/download/${path.basename(outputPath)}`;
+  let reportKey = null;
+
+  if (isS3Configured()) {
+    try {
+      // Generate S3 key for report
+      const s3Key = generateReportKey('survey-reports', path.basename(outputPath));
+      
+      // Upload to S3
+      const uploadResult = await uploadToS3(outputPath, s3Key, {
+        contentType: 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+        metadata: {
+          reportType: 'survey-report',
+          generatedAt: new Date().toISOString(),
+          excelSource: excelFileName
+        }
+      });
+      
+      reportKey = uploadResult.key;
+      
+      // Generate signed URL for immediate download
+      reportUrl = await getSignedUrl(reportKey, 3600); // 1 hour expiry
+      
+      console.log('✅ Report uploaded to S3:', reportKey);
+      
+      // Optionally delete local file after upload (or keep as backup)
+      // fs.unlinkSync(outputPath);
+    } catch (s3Error) {
+      console.error('❌ S3 upload failed for report, using local storage:', s3Error.message);
+      // Continue with local file path
+    }
+  }
+
+  return { reportUrl, reportKey };
+};
+
 // @desc    Upload Excel file and generate report
 // @route   POST /api/reports/generate
 // @access  Private (Company Admin only)
@@ -77,6 +133,7 @@ const generateReport = async (req, res) => {
 
     const timestamp = Date.now();
     const outputPath = path.join(outputDir, `report_${timestamp}.pptx`);
+    const auditRecordsPath = getAuditRecordsPath(outputDir, excelFileName, referenceDate);
 
     // Check if template PPT exists
     if (!fs.existsSync(TEMPLATE_PPT_PATH)) {
@@ -86,9 +143,42 @@ const generateReport = async (req, res) => {
       });
     }
 
+    // Queue the job on the resident report worker and return immediately - the client polls
+    // GET /api/reports/jobs/:jobId for progress. Falls back to running the generator below
+    // (blocking this request) if the worker is not running
+    try {
+      const job = await submitReportJob({
+        jobId: `${REPORT_JOB_HOST_TAG}-${crypto.randomUUID()}`,
+        excelPath,
+        outputPath,
+        referenceDate,
+        auditOutput: auditRecordsPath,
+        metadata: {
+          excelFileName,
+          originalName: req.file.originalname
+        }
+      });
+
+      console.log(`📋 Report job queued on worker: ${job.job_id} (${req.file.originalname})`);
+
+      return res.status(202).json({
+        success: true,
+        message: 'Report generation started',
+        jobId: job.job_id,
+        status: job.state,
+        statusUrl: `/api/reports/jobs/${job.job_id}`,
+        excelPath: excelFileName // Return the uploaded Excel filename for audit trail
+      });
+    } catch (workerError) {
+      if (!isWorkerUnavailable(workerError)) {
+        throw workerError;
+      }
+      console.warn(`⚠️  Report worker unavailable (${workerError.code}), generating report in this request`);
+    }
+
     // Build Python command
     const pythonScript = path.join(REPORT_UTILS_DIR, 'generate_complete_report.py');
-    let command = `python3 "${pythonScript}" "${excelPath}" --template "${TEMPLATE_PPT_PATH}" --output "${outputPath}"`;
+    let command = `python3 "${pythonScript}" "${excelPath}" --template "${TEMPLATE_PPT_PATH}" --output "${outputPath}" --audit-output "${auditRecordsPath}"`;
     
     if (referenceDate) {
       command += ` --date "${referenceDate}"`;
@@ -124,39 +214,7 @@ const generateReport = async (req, res) => {
     }
 
     // Upload report to S3 if configured
-    const { uploadToS3, isS3Configured, generateReportKey, getSignedUrl } = require('../utils/cloudStorage');
-    let reportUrl = `/api/reports/download/${path.basename(outputPath)}`;
-    let reportKey = null;
-
-    if (isS3Configured()) {
-      try {
-        // Generate S3 key for report
-        const s3Key = generateReportKey('survey-reports', path.basename(outputPath));
-        
-        // Upload to S3
-        const uploadResult = await uploadToS3(outputPath, s3Key, {
-          contentType: 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
-          metadata: {
-            reportType: 'survey-report',
-            generatedAt: new Date().toISOString(),
-            excelSource: excelFileName
-          }
-        });
-        
-        reportKey = uploadResult.key;
-        
-        // Generate signed URL for immediate download
-        reportUrl = await getSignedUrl(reportKey, 3600); // 1 hour expiry
-        
-        console.log('✅ Report uploaded to S3:', reportKey);
-        
-        // Optionally delete local file after upload (or keep as backup)
-        // fs.unlinkSync(outputPath);
-      } catch (s3Error) {
-        console.error('❌ S3 upload failed for report, using local storage:', s3Error.message);
-        // Continue with local file path
-      }
-    }
+    const { reportUrl, reportKey } = await publishReport(outputPath, excelFileName);
 
     // Return success with file path
     res.json({
@@ -178,6 +236,138 @@ const generateReport = async (req, res) => {
   }
 };
 
+// @desc    Get report generation job status (progress while running, download details when completed)
+// @route   GET /api/reports/jobs/:jobId
+// @access  Private (Company Admin only)
+const getReportJobStatus = async (req, res) => {
+  try {
+    const { jobId } = req.params;
+
+    const job = await getReportJob(jobId);
+    if (!job && !jobId.startsWith(`${REPORT_JOB_HOST_TAG}-`)) {
+      // Submitted through another backend host - its worker holds the job
+      return res.status(421).json({
+        success: false,
+        message: 'Report job belongs to another server. Report job polls need sticky routing to the server that started the job.'
+      });
+    }
+    if (!job) {
+      return res.status(404).json({
+        success: false,
+        message: 'Report job not found'
+      });
+    }
+
+    const excelFileName = job.metadata && job.metadata.excelFileName;
+
+    if (job.state === 'failed') {
+      return res.json({
+        success: false,
+        status: job.state,
+        message: 'Error generating report',
+        error: job.error || 'Unknown error'
+      });
+    }
+
+    if (job.state !== 'completed') {
+      return res.json({
+        success: true,
+        status: job.state,
+        stage: job.stage,
+        queuePosition: job.queue_position || null,
+        progress: {
+          slide: job.slide,
+          totalSlides: job.total_slides
+        }
+      });
+    }
+
+    if (job.metadata && job.metadata.publishFailed) {
+      return res.json({
+        success: false,
+        status: 'failed',
+        message: 'Error generating report',
+        error: job.metadata.publishFailed
+      });
+    }
+
+    // Completed - the poll that claims the upload publishes and stores the result on the job;
+    // concurrent polls wait for it instead of uploading the report again
+    let published = job.metadata && job.metadata.published;
+    if (!published) {
+      const owner = `${os.hostname()}:${process.pid}:${crypto.randomUUID()}`;
+      const claimed = await claimReportJob(jobId, 'publish', owner);
+      if (claimed === null) {
+        // Job pruned from the worker since it was read above
+        return res.status(404).json({
+          success: false,
+          message: 'Report job not found'
+        });
+      }
+      if (claimed === false) {
+        return res.json({
+          success: true,
+          status: 'publishing',
+          stage: 'publishing',
+          progress: {
+            slide: job.slide,
+            totalSlides: job.total_slides
+          }
+        });
+      }
+
+      const outputPath = job.output_path;
+      if (!fs.existsSync(outputPath)) {
+        // Permanent - stored so every later poll reports it instead of waiting on the claim
+        const publishFailed = 'Report generation failed. Output file was not created.';
+        await setReportJobResult(jobId, { publishFailed });
+        return res.status(500).json({
+          success: false,
+          status: 'failed',
+          message: publishFailed
+        });
+      }
+
+      try {
+        const { reportUrl, reportKey } = await publishReport(outputPath, excelFileName);
+        published = {
+          filePath: reportUrl,
+          fileName: path.basename(outputPath),
+          s3Key: reportKey
+        };
+        await setReportJobResult(jobId, { published });
+      } catch (error) {
+        // Let the next poll retry the upload
+        await releaseReportJob(jobId, 'publish', owner).catch((releaseError) => {
+          console.error('Error releasing report publish claim:', releaseError.message);
+        });
+        throw error;
+      }
+
+      const executionTime = ((job.finished_at - job.started_at) / 60).toFixed(2);
+      console.log(`✅ Report job ${jobId} completed in ${executionTime} minutes`);
+    }
+
+    res.json({
+      success: true,
+      status: job.state,
+      message: 'Report generated successfully',
+      filePath: published.filePath, // S3 signed URL or local path
+      fileName: published.fileName,
+      excelPath: excelFileName, // Return the uploaded Excel filename for audit trail
+      s3Key: published.s3Key // Include S3 key if uploaded
+    });
+
+  } catch (error) {
+    console.error('Error getting report job status:', error);
+    res.status(500).json({
+      success: false,
+      message: 'Error getting report job status',
+      error: error.message
+    });
+  }
+};
+
 // @desc    Generate calculation audit trail
 // @route   POST /api/reports/audit
 // @access  Private (Company Admin only)
@@ -192,53 +382,38 @@ const generateAuditTrail = async (req, res) => {
       });
     }
 
-    // Validate that the file exists - check both uploads/reports and uploads/reports/output
-    let fullExcelPath = path.join(__dirname, '../../uploads/reports', excelPath);
-    if (!fs.existsSync(fullExcelPath)) {
-      // Try in the output directory
-      fullExcelPath = path.join(__dirname, '../../uploads/reports/output', excelPath);
-      if (!fs.existsSync(fullExcelPath)) {
-        // Try just the filename in uploads/reports
-        const justFilename = path.basename(excelPath);
-        fullExcelPath = path.join(__dirname, '../../uploads/reports', justFilename);
-        if (!fs.existsSync(fullExcelPath)) {
-          return res.status(404).json({
-            success: false,
-            message: 'Excel file not found'
-          });
-        }
-      }
-    }
-
     const outputDir = path.join(__dirname, '../../uploads/reports/output');
     if (!fs.existsSync(outputDir)) {
       fs.mkdirSync(outputDir, { recursive: true });
     }
 
+    // The audit is rendered from the calculations recorded while the report of this upload was
+    // generated (the deck's own numbers) - nothing is recomputed from the Excel file
+    const auditRecordsPath = getAuditRecordsPath(outputDir, excelPath, referenceDate);
+    if (!fs.existsSync(auditRecordsPath)) {
+      return res.status(404).json({
+        success: false,
+        message: 'No calculation records found for this file. Please generate the report first'
+      });
+    }
+
     const timestamp = Date.now();
     const outputPath = path.join(outputDir, `audit_trail_${timestamp}.txt`);
-
-    // Build Python command
     const pythonScript = path.join(REPORT_UTILS_DIR, 'calculation_audit_trail.py');
-    let command = `python3 "${pythonScript}" --excel "${fullExcelPath}" --output "${outputPath}"`;
-    
-    if (referenceDate) {
-      command += ` --date "${referenceDate}"`;
-    }
+    const command = `python3 "${pythonScript}" --render "${auditRecordsPath}" --output "${outputPath}"`;
 
     console.log(`Executing: ${command}`);
-    console.log(`⏱️  Starting audit trail generation for file: ${excelPath}`);
+    console.log(`⏱️  Rendering audit trail from records: ${path.basename(auditRecordsPath)}`);
 
-    // Execute Python script with increased buffer and timeout for very large files
     const startTime = Date.now();
     const { stdout, stderr } = await execPromise(command, {
       cwd: REPORT_UTILS_DIR,
-      maxBuffer: 500 * 1024 * 1024, // 500MB buffer for very large file processing
-      timeout: 7200000 // 2 hours timeout for very large files
+      maxBuffer: 50 * 1024 * 1024,
+      timeout: 600000 // 10 minutes - rendering only, no calculations
     });
     
-    const executionTime = ((Date.now() - startTime) / 1000 / 60).toFixed(2);
-    console.log(`✅ Audit trail generation completed in ${executionTime} minutes`);
+    const executionTime = ((Date.now() - startTime) / 1000).toFixed(1);
+    console.log(`✅ Audit trail rendered in ${executionTime} seconds`);
 
     if (stderr && !stderr.includes('Warning')) {
       console.error('Python script stderr:', stderr);
@@ -453,6 +628,7 @@ const downloadTemplate = async (req, res) => {
 
 module.exports = {
   generateReport,
+  getReportJobStatus,
   generateAuditTrail,
   downloadReport,
   downloadTemplate,
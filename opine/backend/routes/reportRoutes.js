@@ -2,6 +2,7 @@ const express = require('express');
 const router = express.Router();
 const {
   generateReport,
+  getReportJobStatus,
   generateAuditTrail,
   downloadReport,
   downloadTemplate,
@@ -16,6 +17,9 @@ router.use(authorize('company_admin'));
 // Upload Excel and generate report
 router.post('/generate', upload.single('excelFile'), generateReport);
 
+// Poll report generation job (progress / download details)
+router.get('/jobs/:jobId', getReportJobStatus);
+
 // Generate audit trail
 router.post('/audit', generateAuditTrail);
 
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Aggregate Store Module
+Persists per-day party totals (weighted sums and sample counts) on disk, keyed by
+survey / segment / weight columns, with a row hash per Survey Date. Daily exports are
+yesterday's file plus one more day of interviews, so a run only re-aggregates the
+Survey Dates whose rows are new or changed and reuses every other day from the store
+"""
+
+import pandas as pd
+import numpy as np
+import hashlib
+import shutil
+import os
+
+
+# Bump this whenever the aggregation rules change (party mapping, segment definitions,
+# stored arrays) so entries written by older code are ignored
+STORE_FORMAT_VERSION = 2
+
+# Keep only the most recently used surveys per store directory
+MAX_STORE_SURVEYS = 5
+
+# Environment override for the store location (defaults to <report-generation dir>/.aggregate_store)
+STORE_DIR_ENV = 'REPORT_AGGREGATE_STORE_DIR'
+
+# Total arrays stored per entry
+# Shaped (labels, days, parties)
+LABEL_TOTAL_KEYS = ('records', 'valid_votes')
+# Shaped (labels, weight columns, days, parties)
+WEIGHT_TOTAL_KEYS = ('weights', 'squared_weights', 'weighted_records', 'weighted_valid_votes')
+
+
+def get_store_dir(store_dir=None):
+    """
+    Resolve the aggregate store directory
+
+    Args:
+        store_dir: Explicit store directory (optional)
+
+    Returns:
+        Store directory path
+    """
+    if store_dir:
+        return store_dir
+    if os.environ.get(STORE_DIR_ENV):
+        return os.environ[STORE_DIR_ENV]
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), '.aggregate_store')
+
+
+def compute_survey_key(df):
+    """
+    Identify the survey by its export layout (column names), so successive daily
+    exports of the same survey share one store
+
+    Args:
+        df: Survey DataFrame
+
+    Returns:
+        Hex string key
+    """
+    columns = '\x1f'.join(str(col) for col in df.columns)
+    return hashlib.sha256(columns.encode('utf-8')).hexdigest()[:16]
+
+
+def _normalize_for_hash(df):
+    """
+    Cast every column to a fixed dtype before hashing, so the same values hash the same however
+    the frame was loaded (nullable Int8 vs float64 codes, categorical vs text names, ...)
+
+    Args:
+        df: Survey DataFrame
+
+    Returns:
+        DataFrame with float64 numbers, datetime64[ns] dates and str / None text
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            columns[col] = series.astype('datetime64[ns]')
+        elif pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_numeric_dtype(series.dtype):
+            # Nullable ints / booleans → float64 with NaN for missing values
+            columns[col] = series.astype(np.float64)
+        else:
+            text = series.astype(object)
+            columns[col] = text.where(text.notna(), None).map(str, na_action='ignore')
+    return pd.DataFrame(columns, index=df.index)
+
+
+def compute_day_hashes(df, day_codes, num_days):
+    """
+    Compute one content hash per Survey Date over all of that day's rows
+    (independent of row order, so a re-sorted export hashes the same, and of column dtypes,
+    so a cache hit and a fresh Excel parse of the same export hash the same)
+
+    Args:
+        df: Survey DataFrame
+        day_codes: Day index per row (-1 for rows without a valid date)
+        num_days: Number of unique dates
+
+    Returns:
+        Array of hex hash strings, one per day
+    """
+    row_hashes = pd.util.hash_pandas_object(_normalize_for_hash(df), index=False).to_numpy(dtype=np.uint64)
+    has_day = day_codes >= 0
+
+    # Wrapping uint64 sum of row hashes plus the row count per day
+    hash_sums = np.zeros(num_days, dtype=np.uint64)
+    np.add.at(hash_sums, day_codes[has_day], row_hashes[has_day])
+    row_counts = np.bincount(day_codes[has_day], minlength=num_days)
+
+    return np.array(
+        [f"{int(count):08x}{int(total):016x}" for count, total in zip(row_counts, hash_sums)],
+        dtype=str
+    )
+
+
+class AggregateStore:
+    """On-disk store of per-day party totals for one survey"""
+
+    def __init__(self, survey_key, store_dir=None):
+        """
+        Initialize store
+
+        Args:
+            survey_key: Survey identifier (see compute_survey_key)
+            store_dir: Store directory (default: <report-generation dir>/.aggregate_store
+                       or $REPORT_AGGREGATE_STORE_DIR)
+        """
+        self.store_dir = get_store_dir(store_dir)
+        self.survey_key = survey_key
+        self.survey_dir = os.path.join(self.store_dir, f"survey_v{STORE_FORMAT_VERSION}_{survey_key}")
+
+        # Days reused / re-aggregated across all entries in this run (for the summary line)
+        self.days_reused = 0
+        self.days_aggregated = 0
+
+    def get_entry_path(self, entry_key):
+        """
+        Get file path for an entry
+
+        Args:
+            entry_key: Hashable entry key (segment and weight columns)
+
+        Returns:
+            Path to .npz entry file
+        """
+        digest = hashlib.sha256(repr(entry_key).encode('utf-8')).hexdigest()[:24]
+        return os.path.join(self.survey_dir, f"entry_{digest}.npz")
+
+    def load_entry(self, entry_key):
+        """
+        Load a stored entry
+
+        Args:
+            entry_key: Hashable entry key
+
+        Returns:
+            Dictionary of arrays, or None if missing / unreadable
+        """
+        entry_path = self.get_entry_path(entry_key)
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            with np.load(entry_path, allow_pickle=False) as stored:
+                entry = {name: stored[name] for name in stored.files}
+            if str(entry['entry_key']) != repr(entry_key):
+                return None
+            return entry
+        except Exception as e:
+            print(f"Warning: Could not read aggregate store entry {entry_path}: {e}")
+            return None
+
+    def save_entry(self, entry_key, entry):
+        """
+        Save an entry (atomic rename)
+
+        Args:
+            entry_key: Hashable entry key
+            entry: Dictionary of arrays
+        """
+        entry_path = self.get_entry_path(entry_key)
+        try:
+            os.makedirs(self.survey_dir, exist_ok=True)
+            tmp_path = f"{entry_path}.{os.getpid()}.tmp.npz"
+            np.savez(tmp_path, entry_key=np.array(repr(entry_key)), **entry)
+            os.replace(tmp_path, entry_path)
+            os.utime(self.survey_dir, None)  # Mark survey as recently used for pruning
+        except OSError as e:
+            print(f"Warning: Could not write aggregate store entry: {e}")
+
+    def merge_day_totals(self, entry_key, dates, day_hashes, labels, weight_columns, aggregate_days):
+        """
+        Get per-(label, day) totals, reusing stored days whose row hash is unchanged
+        and aggregating only the new / changed days
+
+        Args:
+            entry_key: Hashable entry key
+            dates: Sorted unique Survey Dates (datetime64[ns] array)
+            day_hashes: Row hash per date (from compute_day_hashes)
+            labels: Segment labels (strings) - one for a plain segment, one per value for a group column
+            weight_columns: Weight columns totalled
+            aggregate_days: Function(day_mask) → dictionary of totals shaped as stored,
+                            aggregating only rows on days where day_mask is True
+
+        Returns:
+            Dictionary of totals: LABEL_TOTAL_KEYS shaped (labels, days, parties),
+            WEIGHT_TOTAL_KEYS shaped (labels, weight columns, days, parties)
+        """
+        num_days = len(dates)
+        date_values = dates.astype('datetime64[ns]').astype(np.int64)
+        labels = np.asarray(labels, dtype=str)
+
+        # Match current days against stored days by (date, row hash)
+        stored = self.load_entry(entry_key)
+        reused_days = np.zeros(num_days, dtype=bool)
+        stored_day_idx = np.full(num_days, -1, dtype=np.int64)
+        if stored is not None and list(stored['weight_columns']) == list(weight_columns):
+            stored_days = {
+                (int(date), str(day_hash)): idx
+                for idx, (date, day_hash) in enumerate(zip(stored['dates'], stored['day_hashes']))
+            }
+            for day_idx in range(num_days):
+                match = stored_days.get((int(date_values[day_idx]), str(day_hashes[day_idx])))
+                if match is not None:
+                    reused_days[day_idx] = True
+                    stored_day_idx[day_idx] = match
+
+        # Aggregate only the days that are new or changed
+        totals = aggregate_days(~reused_days)
+
+        if reused_days.any():
+            # Copy stored totals for unchanged days (labels matched by name)
+            stored_labels = {str(label): idx for idx, label in enumerate(stored['labels'])}
+            label_pairs = [(idx, stored_labels[label]) for idx, label in enumerate(labels) if label in stored_labels]
+            if label_pairs:
+                current_labels, source_labels = (np.array(idx) for idx in zip(*label_pairs))
+                current_days = np.flatnonzero(reused_days)
+                source_days = stored_day_idx[current_days]
+                for key in LABEL_TOTAL_KEYS:
+                    totals[key][np.ix_(current_labels, current_days)] = stored[key][np.ix_(source_labels, source_days)]
+                for key in WEIGHT_TOTAL_KEYS:
+                    for weight_idx in range(len(weight_columns)):
+                        totals[key][:, weight_idx][np.ix_(current_labels, current_days)] = \
+                            stored[key][:, weight_idx][np.ix_(source_labels, source_days)]
+
+        self.days_reused += int(reused_days.sum())
+        self.days_aggregated += int((~reused_days).sum())
+
+        entry = {
+            'dates': date_values,
+            'day_hashes': np.asarray(day_hashes, dtype=str),
+            'labels': labels,
+            'weight_columns': np.array(list(weight_columns), dtype=str),
+        }
+        entry.update({key: totals[key] for key in LABEL_TOTAL_KEYS + WEIGHT_TOTAL_KEYS})
+        self.save_entry(entry_key, entry)
+
+        return totals
+
+    def prune(self, keep=MAX_STORE_SURVEYS):
+        """Remove the least recently used surveys beyond the retention limit"""
+        try:
+            surveys = [
+                os.path.join(self.store_dir, name) for name in os.listdir(self.store_dir)
+                if name.startswith('survey_v') and os.path.isdir(os.path.join(self.store_dir, name))
+            ]
+            surveys.sort(key=os.path.getmtime, reverse=True)
+            for stale_dir in surveys[keep:]:
+                shutil.rmtree(stale_dir, ignore_errors=True)
+        except OSError:
+            pass
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Audit Records Module
+Structured audit trail output: one record per (calculation, party) with the slide, segment,
+date window, weight column, numerator (party weight), denominator (total weight) and value.
+Written as streaming JSON Lines or Parquet so two days' audits can be queried and diffed
+directly; the text audit is rendered from these records only on demand. Runs with share
+uncertainty enabled also carry the design effect, margin of error and confidence interval of
+each number (empty otherwise)
+"""
+
+import pandas as pd
+import json
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet is optional - JSON Lines always works
+    pa = None
+    pq = None
+
+
+# Columns of a structured audit record (one row per calculation and party). Calculations that
+# are not vote shares (gains / losses and transferability rows, top reasons / issues, opinion
+# questions) have one row per item instead: 'party' holds the item (party, reason, answer)
+AUDIT_RECORD_FIELDS = [
+    'seq', 'slide', 'metric', 'segment', 'group', 'window_start', 'window_end', 'source',
+    'weight_column', 'weighted_records_only', 'party', 'numerator', 'denominator', 'value',
+    'sample', 'rows', 'valid_votes', 'weighted_records',
+    'design_effect', 'effective_sample', 'moe', 'ci_low', 'ci_high',
+]
+
+# Per-calculation / per-party uncertainty columns (None unless the run computed them)
+UNCERTAINTY_FIELDS = ['design_effect', 'effective_sample']
+UNCERTAINTY_PARTY_FIELDS = ['moe', 'ci_low', 'ci_high']
+
+# Columns identifying the same number across two audits (see compare_audit_records)
+AUDIT_KEY_FIELDS = ['slide', 'metric', 'segment', 'group', 'window_start', 'window_end',
+                    'source', 'weight_column', 'party']
+
+# Rows per Parquet row group
+PARQUET_BATCH_ROWS = 50000
+
+
+def get_audit_format(output_path, output_format=None):
+    """
+    Get structured output format from explicit format or file extension
+
+    Args:
+        output_path: Output file path
+        output_format: 'jsonl' or 'parquet' (optional)
+
+    Returns:
+        'jsonl', 'parquet', or None for text output
+    """
+    if output_format:
+        return output_format.lower()
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    return None
+
+
+def iter_audit_rows(calculation_records):
+    """
+    Flatten calculation records (VoteShareCalculator.calculation_records) into audit rows
+
+    Args:
+        calculation_records: Iterable of calculation record dictionaries
+
+    Yields:
+        Dictionary per (calculation, party) with AUDIT_RECORD_FIELDS keys
+    """
+    for record in calculation_records:
+        base = {
+            'seq': record['seq'],
+            'slide': record.get('slide'),
+            'metric': record.get('metric'),
+            'segment': record.get('segment'),
+            'group': record.get('group'),
+            'window_start': record.get('window_start'),
+            'window_end': record.get('window_end'),
+            'source': record['source'],
+            'weight_column': record['weight_column'],
+            'weighted_records_only': record['weighted_records_only'],
+        }
+        uncertainty = record.get('uncertainty') or {}
+        for party, numerator in record['party_weights'].items():
+            row = dict(base)
+            row.update({
+                'party': party,
+                'numerator': numerator,
+                'denominator': record['total_weight'],
+                'value': record['vote_shares'][party],
+                'sample': record['sample'],
+                'rows': record['rows'],
+                'valid_votes': record['valid_votes'],
+                'weighted_records': record['weighted_records'],
+            })
+            for field in UNCERTAINTY_FIELDS:
+                row[field] = uncertainty.get(field)
+            for field in UNCERTAINTY_PARTY_FIELDS:
+                row[field] = uncertainty[field].get(party) if field in uncertainty else None
+            yield row
+
+
+def _parquet_schema():
+    """Arrow schema for Parquet audit records"""
+    return pa.schema([
+        ('seq', pa.int64()), ('slide', pa.int64()), ('metric', pa.string()), ('segment', pa.string()),
+        ('group', pa.string()), ('window_start', pa.string()), ('window_end', pa.string()),
+        ('source', pa.string()), ('weight_column', pa.string()), ('weighted_records_only', pa.bool_()),
+        ('party', pa.string()), ('numerator', pa.float64()), ('denominator', pa.float64()),
+        ('value', pa.float64()), ('sample', pa.int64()), ('rows', pa.int64()),
+        ('valid_votes', pa.int64()), ('weighted_records', pa.int64()),
+        ('design_effect', pa.float64()), ('effective_sample', pa.float64()), ('moe', pa.float64()),
+        ('ci_low', pa.float64()), ('ci_high', pa.float64()),
+    ])
+
+
+def write_audit_records(calculation_records, output_path, output_format=None):
+    """
+    Write structured audit records (streamed - rows are never all held as text)
+
+    Args:
+        calculation_records: Iterable of calculation record dictionaries
+        output_path: Output file path
+        output_format: 'jsonl' or 'parquet' (default: from file extension, else jsonl)
+
+    Returns:
+        Path written (extension switched to .jsonl if Parquet is unavailable)
+    """
+    output_format = get_audit_format(output_path, output_format) or 'jsonl'
+
+    if output_format == 'parquet' and pq is None:
+        output_path = os.path.splitext(output_path)[0] + '.jsonl'
+        print(f"Warning: pyarrow not available, writing JSON Lines audit records instead: {output_path}")
+        output_format = 'jsonl'
+
+    if output_format == 'parquet':
+        schema = _parquet_schema()
+        with pq.ParquetWriter(output_path, schema) as writer:
+            batch = []
+            for row in iter_audit_rows(calculation_records):
+                batch.append(row)
+                if len(batch) >= PARQUET_BATCH_ROWS:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    batch = []
+            if batch:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for row in iter_audit_rows(calculation_records):
+                f.write(json.dumps(row, ensure_ascii=False))
+                f.write('\n')
+
+    return output_path
+
+
+def read_audit_records(records_path):
+    """
+    Read structured audit records
+
+    Args:
+        records_path: Path to .jsonl or .parquet audit records
+
+    Returns:
+        DataFrame with AUDIT_RECORD_FIELDS columns
+    """
+    if get_audit_format(records_path) == 'parquet':
+        rows = pd.read_parquet(records_path)
+    else:
+        rows = pd.read_json(records_path, lines=True, dtype=False, precise_float=True)
+    return rows.reindex(columns=AUDIT_RECORD_FIELDS)
+
+
+def rows_to_calculation_records(rows):
+    """
+    Rebuild calculation records (one per calculation) from audit rows
+
+    Args:
+        rows: DataFrame from read_audit_records
+
+    Returns:
+        List of calculation record dictionaries (same shape as VoteShareCalculator.calculation_records)
+    """
+    records = []
+    for _, calculation_rows in rows.groupby('seq', sort=True):
+        first = calculation_rows.iloc[0]
+        record = {'seq': int(first['seq'])}
+        for key in ('slide', 'metric', 'segment', 'group', 'window_start', 'window_end'):
+            if pd.notna(first[key]):
+                record[key] = int(first[key]) if key == 'slide' else first[key]
+        record.update({
+            'source': first['source'],
+            'weight_column': first['weight_column'] if pd.notna(first['weight_column']) else None,
+            'weighted_records_only': bool(first['weighted_records_only']),
+            'rows': int(first['rows']),
+            'valid_votes': int(first['valid_votes']),
+            'weighted_records': int(first['weighted_records']),
+            'total_weight': float(first['denominator']),
+            'party_weights': dict(zip(calculation_rows['party'], calculation_rows['numerator'].astype(float))),
+            'sample': int(first['sample']),
+            'vote_shares': dict(zip(calculation_rows['party'], calculation_rows['value'].astype(float))),
+        })
+        if pd.notna(first['design_effect']):
+            record['uncertainty'] = {
+                'design_effect': float(first['design_effect']),
+                'effective_sample': float(first['effective_sample']),
+                **{field: dict(zip(calculation_rows['party'], calculation_rows[field].astype(float)))
+                   for field in UNCERTAINTY_PARTY_FIELDS},
+            }
+        records.append(record)
+    return records
+
+
+def compare_audit_records(old_path, new_path, tolerance=0.0):
+    """
+    Diff two structured audits (e.g. yesterday's and today's)
+    Numbers are matched on AUDIT_KEY_FIELDS (plus occurrence order for repeated calculations)
+
+    Args:
+        old_path: Path to older audit records
+        new_path: Path to newer audit records
+        tolerance: Ignore value changes up to this many percentage points
+
+    Returns:
+        DataFrame of added, removed and changed numbers with old/new value, sample and change
+    """
+    def keyed(records_path):
+        rows = read_audit_records(records_path)
+        rows[AUDIT_KEY_FIELDS] = rows[AUDIT_KEY_FIELDS].astype(object).where(rows[AUDIT_KEY_FIELDS].notna(), '')
+        rows['occurrence'] = rows.groupby(AUDIT_KEY_FIELDS, sort=False).cumcount()
+        return rows[AUDIT_KEY_FIELDS + ['occurrence', 'value', 'sample']]
+
+    merged = keyed(old_path).merge(
+        keyed(new_path), on=AUDIT_KEY_FIELDS + ['occurrence'], how='outer',
+        suffixes=('_old', '_new'), indicator=True
+    )
+    merged['change'] = merged['value_new'] - merged['value_old']
+    merged['status'] = merged['_merge'].map({'left_only': 'removed', 'right_only': 'added', 'both': 'changed'})
+
+    differs = (merged['_merge'] != 'both') | (merged['change'].abs() > tolerance) | \
+              (merged['sample_old'] != merged['sample_new'])
+    result = merged[differs].drop(columns=['_merge'])
+    return result.sort_values(['slide', 'segment', 'window_end', 'party'], key=lambda col: col.astype(str)).reset_index(drop=True)
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Report Benchmark
+Times generate_complete_report (and optionally generate_complete_audit) end to end and per stage
+on synthetic exports of configurable size (see synthetic_survey_data.py), with the bundled
+template.pptx, and appends the results to a history file keyed by git commit so regressions are
+caught before they reach the daily production run
+
+Each run is a separate generate_complete_report.py process with --profile, so the numbers
+include interpreter start-up and peak RSS is per run
+
+Usage:
+    python3 benchmark_report.py --sizes 10000 100000 1000000
+    python3 benchmark_report.py --sizes 10000 --audit --repeat 3 --fail-on-regression
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from synthetic_survey_data import write_synthetic_export, MAX_EXCEL_ROWS
+from run_profiler import get_profile_path
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TEMPLATE = os.path.join(SCRIPT_DIR, 'template.pptx')
+DEFAULT_WORK_DIR = os.path.join(SCRIPT_DIR, '.benchmark')
+HISTORY_FILE_NAME = 'benchmark_history.jsonl'
+
+# Default sample sizes (rows)
+DEFAULT_SIZES = [10000, 100000]
+
+# Slowdown (fraction) against the previous commit's result that counts as a regression
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+
+def get_git_revision():
+    """
+    Get the current git commit of the report code
+
+    Returns:
+        Tuple (short commit hash or None, True if the working tree has uncommitted changes)
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPT_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--', '.'], cwd=SCRIPT_DIR,
+                                capture_output=True, text=True, check=True).stdout
+        return commit, bool(status.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+
+def get_dataset_path(work_dir, num_rows, days, seed):
+    """Synthetic export path for one size / day count / seed (generated once, reused by later runs)"""
+    return os.path.join(work_dir, 'data', f"synthetic_{num_rows}_d{days}_s{seed}.xlsx")
+
+
+def ensure_dataset(work_dir, num_rows, days, end_date, seed):
+    """
+    Create the synthetic export for a benchmark size if it does not exist yet
+    (data cache filled too, so every cached run measures the same load path)
+
+    Returns:
+        Excel path
+    """
+    excel_path = get_dataset_path(work_dir, num_rows, days, seed)
+    if not os.path.exists(excel_path):
+        print(f"Generating synthetic export: {num_rows:,} rows, {days} days → {excel_path}")
+        started = time.time()
+        write_synthetic_export(excel_path, num_rows, days=days, end_date=end_date, seed=seed, cache_all=True)
+        print(f"  generated in {time.time() - started:.1f}s")
+    return excel_path
+
+
+def run_report(excel_path, template_path, output_path, reference_date, workers=1, audit=False,
+               use_data_cache=True, use_aggregate_store=False):
+    """
+    Run generate_complete_report.py once with profiling
+
+    Args:
+        excel_path: Synthetic export
+        template_path: Template PPT
+        output_path: Output deck
+        reference_date: Reference date ('YYYY-MM-DD')
+        workers: Slide worker processes
+        audit: If True, also generate the text audit trail (generate_complete_audit)
+        use_data_cache: If False, parse the Excel file (pass --no-cache)
+        use_aggregate_store: If False, aggregate every Survey Date from scratch
+
+    Returns:
+        Tuple (wall seconds of the process, profile dictionary or None, process return code)
+    """
+    command = [
+        sys.executable, os.path.join(SCRIPT_DIR, 'generate_complete_report.py'), excel_path,
+        '--template', template_path, '--output', output_path, '--date', reference_date,
+        '--workers', str(workers), '--profile',
+    ]
+    audit_path = os.path.splitext(output_path)[0] + '_audit.txt'
+    if audit:
+        command += ['--audit-output', audit_path]
+    if not use_data_cache:
+        command.append('--no-cache')
+    if not use_aggregate_store:
+        command.append('--no-aggregate-store')
+
+    log_path = os.path.splitext(output_path)[0] + '.log'
+    started = time.perf_counter()
+    with open(log_path, 'w') as log:
+        result = subprocess.run(command, stdout=log, stderr=subprocess.STDOUT, cwd=SCRIPT_DIR)
+    wall = time.perf_counter() - started
+
+    # With an audit, the profile next to the audit output holds the deck and audit stages
+    profile_path = get_profile_path(audit_path if audit else output_path)
+    profile = None
+    if os.path.exists(profile_path):
+        with open(profile_path) as f:
+            profile = json.load(f)
+    if result.returncode != 0 or profile is None:
+        print(f"Warning: Report run failed (exit code {result.returncode}) - see {log_path}")
+    return wall, profile, result.returncode
+
+
+def summarize_profile(profile, top=5):
+    """
+    Reduce a run profile to the benchmark numbers
+
+    Args:
+        profile: Profile dictionary written by RunProfiler
+        top: Number of slowest calculations kept
+
+    Returns:
+        Dictionary with stage, slide family and calculation timings (seconds), peak RSS and rows
+    """
+    stages = {}
+    for stage in profile['stages']:
+        if stage['depth'] == 0:
+            stages[stage['name']] = round(stages.get(stage['name'], 0.0) + stage['wall_s'], 4)
+    slides_total = sum(slide['wall_s'] for slide in profile['slides'])
+    return {
+        'rows': profile['run'].get('rows'),
+        'total_s': round(profile['total']['wall_s'], 4),
+        'cpu_s': round(profile['total']['cpu_s'], 4),
+        'peak_rss_mb': profile['total']['peak_rss_mb'],
+        'stages': stages,
+        'slides_s': round(slides_total, 4),
+        'slide_families': {family['family']: round(family['wall_s'], 4) for family in profile['slide_families']},
+        'top_calculations': {calculation['name']: round(calculation['wall_s'], 4)
+                             for calculation in profile['calculations'][:top]},
+    }
+
+
+def find_baseline(history, result):
+    """
+    Latest earlier result of the same benchmark configuration from another commit
+
+    Args:
+        history: Previous results (oldest first)
+        result: Current result
+
+    Returns:
+        Baseline result or None
+    """
+    config_keys = ('rows', 'days', 'workers', 'audit', 'data_cache')
+    for previous in reversed(history):
+        if previous.get('commit') == result['commit'] and previous.get('dirty') == result['dirty']:
+            continue
+        if all(previous.get(key) == result.get(key) for key in config_keys):
+            return previous
+    return None
+
+
+def read_history(history_path):
+    """Read benchmark results recorded so far (one JSON object per line)"""
+    if not os.path.exists(history_path):
+        return []
+    with open(history_path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run_benchmark(sizes, template_path=DEFAULT_TEMPLATE, work_dir=DEFAULT_WORK_DIR, days=45,
+                  end_date='2025-11-05', seed=0, workers=1, audit=False, repeat=1, use_data_cache=True,
+                  history_path=None, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """
+    Benchmark the report for each sample size and record the results
+
+    Args:
+        sizes: Sample sizes (rows)
+        template_path: Template PPT
+        work_dir: Directory for synthetic exports, decks, logs and the history file
+        days: Survey days in each export
+        end_date: Last survey date (the reference date is the day after)
+        seed: Random seed of the synthetic exports
+        workers: Slide worker processes per run
+        audit: If True, also time the text audit trail
+        repeat: Runs per size - the fastest is recorded
+        use_data_cache: If False, time the Excel parse too (only sizes written to Excel in full)
+        history_path: Results file (default: <work_dir>/benchmark_history.jsonl)
+        threshold: Slowdown fraction against the previous commit that counts as a regression
+
+    Returns:
+        Tuple (list of results, list of regression messages, list of sizes whose run failed)
+    """
+    history_path = history_path or os.path.join(work_dir, HISTORY_FILE_NAME)
+    history = read_history(history_path)
+    commit, dirty = get_git_revision()
+    reference_date = (pd.to_datetime(end_date) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+    os.makedirs(work_dir, exist_ok=True)
+
+    results = []
+    regressions = []
+    failed = []
+    for num_rows in sizes:
+        if not use_data_cache and num_rows > MAX_EXCEL_ROWS:
+            print(f"Warning: {num_rows:,} rows are only available through the data cache - skipping --no-cache run")
+            continue
+        excel_path = ensure_dataset(work_dir, num_rows, days, end_date, seed)
+        output_path = os.path.join(work_dir, f"report_{num_rows}.pptx")
+
+        best = None
+        for attempt in range(repeat):
+            wall, profile, returncode = run_report(excel_path, template_path, output_path, reference_date,
+                                                   workers=workers, audit=audit, use_data_cache=use_data_cache)
+            if returncode != 0 or profile is None:
+                break
+            if best is None or wall < best[0]:
+                best = (wall, profile)
+        if best is None:
+            failed.append(num_rows)
+            continue
+
+        result = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': commit,
+            'dirty': dirty,
+            'rows': num_rows,
+            'days': days,
+            'seed': seed,
+            'workers': workers,
+            'audit': audit,
+            'data_cache': use_data_cache,
+            'repeat': repeat,
+            'wall_s': round(best[0], 4),
+            **{key: value for key, value in summarize_profile(best[1]).items() if key != 'rows'},
+        }
+
+        baseline = find_baseline(history, result)
+        if baseline is not None:
+            result['baseline_commit'] = baseline.get('commit')
+            result['change'] = round(result['wall_s'] / baseline['wall_s'] - 1, 4)
+            if result['change'] > threshold:
+                regressions.append(f"{num_rows:,} rows: {baseline['wall_s']:.2f}s ({baseline.get('commit')}) → "
+                                   f"{result['wall_s']:.2f}s ({commit}{'+' if dirty else ''}), "
+                                   f"{result['change']:+.0%}")
+
+        results.append(result)
+        history.append(result)
+        with open(history_path, 'a') as f:
+            f.write(json.dumps(result) + '\n')
+
+    return results, regressions, failed
+
+
+def print_results(results):
+    """Print a table of benchmark results"""
+    print("\n" + "="*100)
+    print(f"{'Rows':>10} {'Wall':>8} {'Load':>8} {'Slides':>8} {'Save':>8} {'Audit':>8} {'Peak RSS':>10}  vs baseline")
+    print("="*100)
+    for result in results:
+        stages = result['stages']
+        change = f"{result['change']:+.1%} ({result['baseline_commit']})" if 'change' in result else '-'
+        audit = f"{stages['audit_trail']:>7.2f}s" if 'audit_trail' in stages else f"{'-':>8}"
+        print(f"{result['rows']:>10,} {result['wall_s']:>7.2f}s {stages.get('load_data', 0):>7.2f}s "
+              f"{result['slides_s']:>7.2f}s {stages.get('save', 0):>7.2f}s {audit} "
+              f"{(result['peak_rss_mb'] or 0):>8.0f}MB  {change}")
+    for result in results:
+        print(f"\n{result['rows']:,} rows - slowest slide families: " +
+              ", ".join(f"{family} {seconds:.2f}s" for family, seconds in list(result['slide_families'].items())[:5]))
+
+
+def main():
+    """Run the report benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark report generation on synthetic survey exports')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Sample sizes in rows (default: %(default)s)')
+    parser.add_argument('--days', type=int, default=45, help='Survey days in each export (default: %(default)s)')
+    parser.add_argument('--end', default='2025-11-05',
+                        help='Last survey date; the reference date is the day after (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the synthetic exports (default: %(default)s)')
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE, help='Template PPT (default: bundled template.pptx)')
+    parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR,
+                        help='Directory for exports, decks, logs and the results history (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=1, help='Slide worker processes per run (default: %(default)s)')
+    parser.add_argument('--audit', action='store_true', help='Also time the text audit trail (generate_complete_audit)')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per size, fastest recorded (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Include the Excel parse (exports up to {MAX_EXCEL_ROWS:,} rows only)')
+    parser.add_argument('--history', default=None,
+                        help=f'Results history file (default: <work dir>/{HISTORY_FILE_NAME})')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help='Slowdown against the previous commit reported as a regression (default: %(default)s)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Exit with status 1 if any size regressed')
+    args = parser.parse_args()
+
+    results, regressions, failed = run_benchmark(
+        args.sizes, template_path=args.template, work_dir=args.work_dir, days=args.days, end_date=args.end,
+        seed=args.seed, workers=args.workers, audit=args.audit, repeat=max(1, args.repeat),
+        use_data_cache=not args.no_cache, history_path=args.history, threshold=args.threshold
+    )
+    print_results(results)
+
+    if regressions:
+        print("\n⚠️  Regressions:")
+        for regression in regressions:
+            print(f"   {regression}")
+    if failed:
+        print(f"\n❌ Runs failed for: {', '.join(f'{num_rows:,} rows' for num_rows in failed)}")
+        return 1
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Chart Data Writer Module
+Fast replacement for python-pptx's chart.replace_data(): rewrites only the series name,
+category and value caches (c:tx / c:cat / c:val) in the chart XML, which is what PowerPoint
+draws. The chart's embedded Excel workbook (what "Edit Data" in PowerPoint opens and redraws
+the chart from) is rewritten once per chart, in bulk before the deck is saved. In cache-only
+mode the workbooks are not rewritten but removed instead - a stale workbook would bring the
+template's numbers back on "Edit Data" - so the charts are no longer editable in PowerPoint
+"""
+
+from lxml import etree
+from pptx.oxml.ns import qn
+from pptx.chart.xmlwriter import SeriesXmlRewriterFactory
+
+
+def _make_ref(tag, ref_tag, cache_tag, formula, values, format_code=None):
+    """
+    Build a <c:tx> / <c:cat> / <c:val> element holding a worksheet reference and its cached values
+
+    Args:
+        tag: Element tag ('c:tx', 'c:cat', 'c:val')
+        ref_tag: Reference tag ('c:strRef' or 'c:numRef')
+        cache_tag: Cache tag ('c:strCache' or 'c:numCache')
+        formula: Worksheet reference (e.g. 'Sheet1!$B$2:$B$17')
+        values: Cached values (None values are left out, as python-pptx does)
+        format_code: Number format of a c:numCache
+
+    Returns:
+        lxml element (same structure python-pptx writes in replace_data)
+    """
+    element = etree.Element(qn(tag))
+    ref = etree.SubElement(element, qn(ref_tag))
+    etree.SubElement(ref, qn('c:f')).text = formula
+    cache = etree.SubElement(ref, qn(cache_tag))
+    if format_code is not None:
+        etree.SubElement(cache, qn('c:formatCode')).text = format_code
+    etree.SubElement(cache, qn('c:ptCount')).set('val', str(len(values)))
+    for idx, value in enumerate(values):
+        if value is None:
+            continue
+        pt = etree.SubElement(cache, qn('c:pt'))
+        pt.set('idx', str(idx))
+        etree.SubElement(pt, qn('c:v')).text = str(value)
+    return element
+
+
+def _replace_child(ser, tag, new_element):
+    """
+    Replace the child element of a c:ser in place
+
+    Returns:
+        True if replaced, False if the series has no such child (caller falls back)
+    """
+    old_element = ser.find(qn(tag))
+    if old_element is None:
+        return False
+    ser.replace(old_element, new_element)
+    return True
+
+
+def write_series_caches(chart, chart_data):
+    """
+    Rewrite the series name / category / value caches of a chart from CategoryChartData
+
+    Only charts whose series already match the data (same series count, c:tx / c:cat / c:val
+    present, single-level text categories) are patched in place; anything else (series added or
+    removed, XY charts, ...) goes through python-pptx's series rewriter. Either way the chart XML
+    is the same as after chart.replace_data() - only the embedded workbook is not touched
+
+    Args:
+        chart: python-pptx Chart
+        chart_data: CategoryChartData with the new categories and series
+    """
+    chartSpace = chart._chartSpace
+    sers = chartSpace.plotArea.sers
+    categories = chart_data.categories
+
+    fast_path = (
+        len(sers) == len(chart_data)
+        and categories.depth == 1
+        and not categories.are_numeric
+        and all(ser.find(qn(tag)) is not None for ser in sers for tag in ('c:tx', 'c:cat', 'c:val'))
+    )
+    if not fast_path:
+        SeriesXmlRewriterFactory(chart.chart_type, chart_data).replace_series_data(chartSpace)
+        return
+
+    # Category labels and worksheet references are the same for every series
+    category_labels = [str(category.label) for category in categories]
+    for ser, series_data in zip(sers, chart_data):
+        _replace_child(ser, 'c:tx', _make_ref('c:tx', 'c:strRef', 'c:strCache',
+                                              series_data.name_ref, [series_data.name]))
+        _replace_child(ser, 'c:cat', _make_ref('c:cat', 'c:strRef', 'c:strCache',
+                                               series_data.categories_ref, category_labels))
+        _replace_child(ser, 'c:val', _make_ref('c:val', 'c:numRef', 'c:numCache',
+                                               series_data.values_ref, series_data.values,
+                                               format_code=series_data.number_format))
+
+
+def write_error_bars(chart, series_errors):
+    """
+    Write custom error bars (c:errBars with literal plus / minus lengths) on a chart's series,
+    e.g. confidence intervals of a trend chart. Series keep their data; existing error bars are replaced
+
+    Args:
+        chart: python-pptx Chart (series data already written)
+        series_errors: One (plus, minus) pair of length lists per series (chart order, aligned with
+                       the categories), or None to leave a series without error bars
+    """
+    for ser, errors in zip(chart._chartSpace.plotArea.sers, series_errors):
+        old_element = ser.find(qn('c:errBars'))
+        if old_element is not None:
+            ser.remove(old_element)
+        if errors is None:
+            continue
+
+        err_bars = etree.Element(qn('c:errBars'))
+        etree.SubElement(err_bars, qn('c:errBarType')).set('val', 'both')
+        etree.SubElement(err_bars, qn('c:errValType')).set('val', 'cust')
+        etree.SubElement(err_bars, qn('c:noEndCap')).set('val', '0')
+        for tag, values in zip(('c:plus', 'c:minus'), errors):
+            num_lit = etree.SubElement(etree.SubElement(err_bars, qn(tag)), qn('c:numLit'))
+            etree.SubElement(num_lit, qn('c:ptCount')).set('val', str(len(values)))
+            for idx, value in enumerate(values):
+                pt = etree.SubElement(num_lit, qn('c:pt'))
+                pt.set('idx', str(idx))
+                etree.SubElement(pt, qn('c:v')).text = str(value)
+
+        # Schema order: c:errBars comes right before the series' c:cat / c:val
+        anchor = ser.find(qn('c:cat'))
+        if anchor is None:
+            anchor = ser.find(qn('c:val'))
+        if anchor is not None:
+            anchor.addprevious(err_bars)
+        else:
+            ser.append(err_bars)
+
+
+def remove_workbook(chart):
+    """
+    Remove a chart's embedded Excel workbook (c:externalData and its relationship), so PowerPoint
+    can't redraw the chart from stale workbook data - the chart can no longer be edited there
+
+    Args:
+        chart: python-pptx Chart
+
+    Returns:
+        True if a workbook was removed
+    """
+    chartSpace = chart._chartSpace
+    rId = chartSpace.xlsx_part_rId
+    if rId is None:
+        return False
+    chartSpace._remove_externalData()
+    chart.part.drop_rel(rId)
+    return True
+
+
+class ChartDataWriter:
+    """Writes chart data into the deck's chart XML and the embedded workbooks of the updated charts"""
+
+    def __init__(self, editable_data=True):
+        """
+        Args:
+            editable_data: If True, rewrite each updated chart's embedded Excel workbook (before the
+                           deck is saved) so "Edit Data" in PowerPoint shows the new numbers.
+                           If False (cache-only, faster) the workbooks are removed instead
+        """
+        self.editable_data = editable_data
+        self._pending_workbooks = {}  # id(chartSpace) → (chart, chart_data) - last data written wins
+        self.charts_written = 0
+
+    def replace_data(self, chart, chart_data):
+        """
+        Replace a chart's data (drop-in for chart.replace_data)
+
+        Args:
+            chart: python-pptx Chart
+            chart_data: CategoryChartData
+        """
+        write_series_caches(chart, chart_data)
+        self.charts_written += 1
+        self._pending_workbooks[id(chart._chartSpace)] = (chart, chart_data)
+
+    def flush(self):
+        """
+        Write (editable data) or remove (cache-only) the embedded workbooks of every chart updated
+        since the last flush
+
+        Returns:
+            Number of workbooks written / removed
+        """
+        pending = list(self._pending_workbooks.values())
+        self._pending_workbooks = {}
+        if not self.editable_data:
+            return sum(remove_workbook(chart) for chart, _ in pending)
+        for chart, chart_data in pending:
+            chart._workbook.update_from_xlsx_blob(chart_data.xlsx_blob)
+        return len(pending)
+
+    def reset(self):
+        """Forget charts of a previous deck (start of a new deck)"""
+        self._pending_workbooks = {}
+        self.charts_written = 0
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Data Window Module
+Read-only subsets (date windows, segments, response filters) of the survey DataFrame held as
+sorted row positions over the one base frame, instead of a boolean-indexed .copy() per filter.
+Columns are read through the window, so a subset is only materialized (to_frame) where a
+calculation really needs a DataFrame of its own
+"""
+
+import hashlib
+import uuid
+
+import pandas as pd
+import numpy as np
+
+
+class DateIndex:
+    """Survey Date order of a DataFrame's rows with per-date row boundaries, for binary-search window lookups"""
+
+    def __init__(self, dates):
+        """
+        Args:
+            dates: Survey Date per row (datetime64 array aligned with the frame)
+        """
+        self.dates = np.asarray(dates, dtype='datetime64[ns]')
+        dated = ~np.isnat(self.dates)
+        # NaT sorts last - rows without a date are never inside a window
+        self.num_dated = int(dated.sum())
+
+        # Rows already in date order (VoteShareCalculator sorts its frame) need no permutation:
+        # every date window is then one contiguous range of rows
+        self.is_sorted = bool(dated[:self.num_dated].all() and
+                              (self.dates[1:self.num_dated] >= self.dates[:self.num_dated - 1]).all())
+        self.order = None if self.is_sorted else np.argsort(self.dates, kind='stable')
+        sorted_dates = self.dates if self.is_sorted else self.dates[self.order]
+
+        # Unique survey dates and the offset of each date's first row (plus the end offset),
+        # so a window is two binary searches over the dates instead of a scan over the rows
+        self.day_dates, first_rows = np.unique(sorted_dates[:self.num_dated], return_index=True)
+        self.day_offsets = np.append(first_rows, self.num_dated).astype(np.int64)
+        self._windows = {}
+
+    def get_bounds(self, start=None, end=None):
+        """
+        Get the date-sorted offsets [lo, hi) of the rows with start <= Survey Date <= end
+
+        Args:
+            start: First date included (None for no lower bound)
+            end: Last date included (None for no upper bound)
+
+        Returns:
+            Tuple (lo, hi) - row positions when is_sorted, positions in order otherwise
+        """
+        lo = 0 if start is None else int(self.day_offsets[np.searchsorted(
+            self.day_dates, np.datetime64(pd.Timestamp(start), 'ns'), side='left')])
+        hi = self.num_dated if end is None else int(self.day_offsets[np.searchsorted(
+            self.day_dates, np.datetime64(pd.Timestamp(end), 'ns'), side='right')])
+        return lo, max(lo, hi)
+
+    def get_rows(self, start=None, end=None):
+        """
+        Get row positions with start <= Survey Date <= end (memoized per bounds)
+
+        Args:
+            start: First date included (None for no lower bound)
+            end: Last date included (None for no upper bound)
+
+        Returns:
+            Sorted int64 array of row positions (frame order)
+        """
+        key = (start, end)
+        if key not in self._windows:
+            lo, hi = self.get_bounds(start, end)
+            if self.is_sorted:
+                self._windows[key] = np.arange(lo, hi, dtype=np.int64)
+            else:
+                self._windows[key] = np.sort(self.order[lo:hi])
+        return self._windows[key]
+
+
+class DataWindow:
+    """Read-only subset of a survey DataFrame: sorted row positions over the unchanged base frame"""
+
+    def __init__(self, base, rows=None, date_column='Survey Date', shared=None, token=None):
+        """
+        Args:
+            base: Base DataFrame (never copied or modified by the window)
+            rows: Sorted row positions in base, or a slice of them (None for all rows)
+            date_column: Survey date column
+            shared: State shared by every window over the same base (DateIndex, token) - internal
+            token: Stable identity of the base frame's data in rows_key (e.g. the survey file's
+                   content hash) - a new unique token if None. Ignored when shared is given
+        """
+        self.base = base
+        self.date_column = date_column
+        self._shared = shared if shared is not None else {'date_index': None, 'token': token or uuid.uuid4().hex}
+
+        # Contiguous positions are kept as a slice so column reads are views, not gathers
+        if isinstance(rows, slice):
+            rows = None if (rows.start, rows.stop) == (0, len(base)) else rows
+        elif rows is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+            if len(rows) == len(base) or (len(rows) > 0 and rows[-1] - rows[0] + 1 == len(rows)):
+                rows = slice(int(rows[0]), int(rows[-1]) + 1) if len(rows) < len(base) else None
+        self._positions = rows
+        self._rows_key = None
+
+    @property
+    def date_index(self):
+        """DateIndex over the base frame (shared by every window derived from it)"""
+        if self._shared['date_index'] is None:
+            self._shared['date_index'] = DateIndex(self.base[self.date_column].to_numpy(dtype='datetime64[ns]'))
+        return self._shared['date_index']
+
+    @property
+    def rows(self):
+        """Row positions in the base frame (int64 array)"""
+        if self._positions is None:
+            return np.arange(len(self.base), dtype=np.int64)
+        if isinstance(self._positions, slice):
+            return np.arange(self._positions.start, self._positions.stop, dtype=np.int64)
+        return self._positions
+
+    @property
+    def row_selector(self):
+        """Row positions in the base frame as a slice where contiguous (indexes aligned arrays without a gather)"""
+        if self._positions is None:
+            return slice(0, len(self.base))
+        return self._positions
+
+    @property
+    def rows_key(self):
+        """
+        Hashable identity of the rows over the base frame (equal for every window over the same
+        rows of the same dataset token - never for the rows of another frame)
+        """
+        if self._rows_key is None:
+            token = self._shared['token']
+            if self._positions is None:
+                self._rows_key = (token, 0, len(self.base))
+            elif isinstance(self._positions, slice):
+                self._rows_key = (token, self._positions.start, self._positions.stop)
+            else:
+                digest = hashlib.blake2b(self._positions.tobytes(), digest_size=16).hexdigest()
+                self._rows_key = (token, len(self._positions), digest)
+        return self._rows_key
+
+    @property
+    def columns(self):
+        return self.base.columns
+
+    @property
+    def index(self):
+        if self._positions is None:
+            return self.base.index
+        return self.base.index[self._positions]
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    def __len__(self):
+        if self._positions is None:
+            return len(self.base)
+        if isinstance(self._positions, slice):
+            return self._positions.stop - self._positions.start
+        return len(self._positions)
+
+    def __getitem__(self, key):
+        """
+        window['column'] → Series of the window's values (base index labels)
+        window[['a', 'b']] → DataFrame of those columns only
+        window[boolean mask] → DataWindow of the rows where mask is True
+        """
+        if isinstance(key, (pd.Series, np.ndarray, pd.api.extensions.ExtensionArray)):
+            return self.where(key)
+        if isinstance(key, list):
+            if self._positions is None:
+                return self.base[key]
+            return self.base[key].iloc[self._positions]
+        if self._positions is None:
+            return self.base[key]
+        return self.base[key].iloc[self._positions]
+
+    def take(self, rows):
+        """
+        Window over other rows of the same base (shares the date index and dataset token)
+
+        Args:
+            rows: Sorted row positions in the base frame, or a slice of them
+
+        Returns:
+            DataWindow
+        """
+        return DataWindow(self.base, rows, date_column=self.date_column, shared=self._shared)
+
+    def where(self, mask):
+        """
+        Narrow the window to the rows where mask is True
+
+        Args:
+            mask: Boolean Series / array aligned with this window (missing values count as False)
+
+        Returns:
+            DataWindow
+        """
+        if isinstance(mask, pd.Series):
+            mask = mask.fillna(False).to_numpy(dtype=bool)
+        else:
+            mask = np.asarray(mask, dtype=bool)
+        return DataWindow(self.base, self.rows[mask], date_column=self.date_column, shared=self._shared)
+
+    def notna(self, column):
+        """Narrow the window to rows with a non-empty value in column"""
+        return self.where(self[column].notna())
+
+    def between(self, start=None, end=None):
+        """
+        Narrow the window to start <= Survey Date <= end (binary search over the date index)
+
+        Args:
+            start: First date included (None for no lower bound)
+            end: Last date included (None for no upper bound)
+
+        Returns:
+            DataWindow
+        """
+        date_index = self.date_index
+        if date_index.is_sorted:
+            # Date-sorted base: the window is the row range [lo, hi) - intersect it with our rows
+            lo, hi = date_index.get_bounds(start, end)
+            if self._positions is None:
+                window_rows = slice(lo, hi)
+            elif isinstance(self._positions, slice):
+                lo, hi = max(lo, self._positions.start), min(hi, self._positions.stop)
+                window_rows = slice(lo, max(lo, hi))
+            else:
+                window_rows = self._positions[np.searchsorted(self._positions, lo):
+                                              np.searchsorted(self._positions, hi)]
+            return DataWindow(self.base, window_rows, date_column=self.date_column, shared=self._shared)
+
+        window_rows = date_index.get_rows(start, end)
+        if self._positions is not None:
+            window_rows = np.intersect1d(self.rows, window_rows, assume_unique=True)
+        return DataWindow(self.base, window_rows, date_column=self.date_column, shared=self._shared)
+
+    def to_frame(self):
+        """Materialize the window as its own DataFrame (a copy - use only where the rows must be modified)"""
+        if self._positions is None:
+            return self.base.copy()
+        return self.base.iloc[self._positions].copy()
@@ -5,25 +5,166 @@ Uses template PPT as base and updates only values
 """
 
 import pandas as pd
-from pptx import Presentation
-from pptx.util import Inches, Pt
+import numpy as np
+from pptx.util import Pt
 from pptx.enum.text import PP_ALIGN
-from pptx.dml.color import RGBColor
 from datetime import datetime, timedelta
 import os
 import sys
 import re
-from copy import deepcopy
+import multiprocessing
 
 # Import vote share calculator
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from vote_share_calculator import VoteShareCalculator
+from vote_share_calculator import VoteShareCalculator, DailyAggregateTable, PARTY_CATEGORIES
+from survey_data_cache import load_survey_data, compute_file_hash
+from aggregate_store import AggregateStore, compute_survey_key
+from segment_registry import SegmentRegistry, DEMOGRAPHIC_COLUMNS, DEMOGRAPHIC_SEGMENTS, match_segment_label
+from report_columns import is_report_column, REPORT_CATEGORY_COLUMNS
+from template_map import TemplateMap, update_base_text, get_slide_demographic
+from chart_data_writer import ChartDataWriter, write_error_bars
+from pptx_package import open_presentation, count_parsed_parts
+from run_profiler import RunProfiler
+from metric_graph import MetricGraph
+from weight_resolver import WeightResolver
+from multi_select import MultiSelectRegistry
+from share_uncertainty import ShareUncertainty
+
+
+# Overall DMA demographic charts (Slides 14-23): (slide number, demographic type, demographic value)
+OVERALL_DMA_DEMOGRAPHIC_SLIDES = [
+    (14, 'Gender', 'Male'),
+    (15, 'Gender', 'Female'),
+    (16, 'Location', 'Urban'),
+    (17, 'Location', 'Rural'),
+    (18, 'Religion', 'Hindu'),
+    (19, 'Religion', 'Muslim'),
+    (20, 'Social Category', 'General+OBC'),
+    (21, 'Social Category', 'SC'),
+    (22, 'Social Category', 'ST'),
+    (23, 'Age', '18-25'),
+]
+
+# 7 DMA demographic charts (Slides 24-39)
+DMA7_DEMOGRAPHIC_SLIDES = [
+    (24, 'Age', '26-34'),  # Note: Slide 24 is 26-34, not 18-25
+    (25, 'Age', '36-50'),
+    (26, 'Age', '50+'),
+    (27, 'Gender', 'Male'),
+    (28, 'Gender', 'Female'),
+    (29, 'Location', 'Urban'),
+    (30, 'Location', 'Rural'),
+    (31, 'Religion', 'Hindu'),
+    (32, 'Religion', 'Muslim'),
+    (33, 'Social Category', 'General+OBC'),
+    (34, 'Social Category', 'SC'),
+    (35, 'Social Category', 'ST'),
+    (36, 'Age', '18-25'),
+    (37, 'Age', '26-34'),
+    (38, 'Age', '36-50'),
+    (39, 'Age', '50+'),
+]
+
+# Gains and Losses - Demographics (Overall) tables (Slides 49-61)
+DEMOGRAPHIC_GAINS_LOSSES_SLIDES = [
+    (49, 'Location', 'Urban'),
+    (50, 'Location', 'Rural'),
+    (51, 'Gender', 'Male'),
+    (52, 'Gender', 'Female'),
+    (53, 'Age', '18-25'),
+    (54, 'Age', '26-34'),
+    (55, 'Age', '36-50'),
+    (56, 'Age', '50+'),
+    (57, 'Religion', 'Hindu'),
+    (58, 'Religion', 'Muslim'),
+    (59, 'Social Category', 'General+OBC'),
+    (60, 'Social Category', 'SC'),
+    (61, 'Social Category', 'ST'),
+]
+
+# Regional charts (Slides 75-84): each region has an Overall slide followed by a 7DMA slide
+REGION_ORDER = ['Jalpaiguri', 'Malda', 'Burdwan', 'Medinipur', 'Presidency']
+
+# Shape kind each slide metric is drawn into (see get_slide_compute_tasks) - a slide's metric is
+# only computed if the template binds a shape of that kind on the slide
+SLIDE_METRIC_SHAPES = {
+    'compute_demographic_chart': 'charts',
+    'compute_gains_losses_table': 'tables',
+    'compute_regional_chart': 'charts',
+    'compute_district_table': 'tables',
+    'compute_district_chart': 'charts',
+}
+
+# Slide families (first slide, last slide or None for all following slides, family name)
+# Slide update timings are summarized per family in the run profile
+SLIDE_FAMILIES = [
+    (1, 2, 'Title and introduction'),
+    (5, 7, 'State vote share'),
+    (9, 12, 'Demographic tables'),
+    (14, 23, 'Overall demographic charts'),
+    (24, 39, '7 DMA demographic charts'),
+    (41, 42, 'Caste tables'),
+    (44, 45, 'Top reasons'),
+    (47, 61, 'Gains and losses'),
+    (63, 64, 'Vote transferability'),
+    (66, 72, 'Opinion tables'),  # Preferred CM, state government rating, key issues, wisdom of crowds
+    (74, 84, 'Regions'),
+    (88, 93, 'District tables'),
+    (95, None, 'District graphs'),
+]
+
+
+def get_slide_family(slide_num):
+    """
+    Get the family of a slide (see SLIDE_FAMILIES)
+    
+    Args:
+        slide_num: Slide number
+    
+    Returns:
+        Family name, or None for slides outside every family
+    """
+    for first, last, family in SLIDE_FAMILIES:
+        if first <= slide_num and (last is None or slide_num <= last):
+            return family
+    return None
+
+# Generator shared with forked slide workers (set only while the worker pool is running)
+# Workers inherit it from the parent process, so the survey data is never pickled or copied
+_slide_worker_generator = None
+
+
+def _compute_slide_in_worker(task):
+    """
+    Worker process entry point: compute one slide's data with the inherited generator
+    
+    Args:
+        task: (slide_num, segment, compute method name, args) from get_slide_compute_tasks
+    
+    Returns:
+        (slide_num, result, calculation records, (aggregate store days reused, days aggregated),
+         period-weight decisions from WeightResolver.get_decisions)
+    """
+    generator = _slide_worker_generator
+    store = generator.aggregate_store
+    store_counts = (store.days_reused, store.days_aggregated) if store is not None else (0, 0)
+    generator.weights.reset_decisions()
+    
+    result, records = generator.compute_slide(task)
+    
+    if store is not None:
+        store_counts = (store.days_reused - store_counts[0], store.days_aggregated - store_counts[1])
+    return task[0], result, records, store_counts, generator.weights.get_decisions()
 
 
 class CompleteReportGenerator:
     """Generate complete report matching final PPT template exactly"""
     
-    def __init__(self, excel_path, template_ppt_path, reference_date=None):
+    def __init__(self, excel_path, template_ppt_path, reference_date=None, use_data_cache=True,
+                 use_aggregate_store=True, record_calculations=False, workers=1,
+                 template_prs=None, progress_callback=None, editable_chart_data=True,
+                 lazy_template_parts=True, profile=False, profile_dump=None, uncertainty=False,
+                 error_bars=False):
         """
         Initialize with Excel data and template PPT
         
@@ -32,35 +173,127 @@ class CompleteReportGenerator:
             template_ppt_path: Path to final PPT template to copy design from
             reference_date: Reference date for report generation (default: current date)
                            Can be datetime object or string in format 'YYYY-MM-DD'
+            use_data_cache: If True, reuse/create the columnar cache of the Excel data
+            use_aggregate_store: If True, reuse per-day totals from previous runs (only new or
+                                 changed Survey Dates are aggregated)
+            record_calculations: If True, record intermediate results of every vote share
+                                 calculation (for the audit trail, see generate_audit_trail)
+            workers: Number of worker processes computing the demographic, gains/losses, regional
+                     and district slides in parallel (1 = compute each slide as it is rendered)
+            template_prs: Already parsed template Presentation (e.g. kept warm by the report worker
+                          service) - used as the output deck and modified in place, so pass a private copy
+            progress_callback: Optional function(slide_num, total_slides) called as each slide is updated
+            editable_chart_data: If True, also rewrite the embedded Excel workbook of every updated chart
+                                 so "Edit Data" in PowerPoint shows the report's numbers. If False only
+                                 the chart XML PowerPoint draws from is rewritten (faster) and the
+                                 workbooks are removed - the charts can't be edited in PowerPoint
+            lazy_template_parts: If True, template slides / charts / layouts are parsed only when a
+                                 slide update uses them, and untouched parts are saved byte for byte
+                                 (see pptx_package.open_presentation)
+            profile: If True, time every stage, calculate_* call and slide update and write a JSON
+                     profile next to the deck (<output>_profile.json) and the audit trail
+            profile_dump: Also profile the whole run with 'cprofile' or 'pyinstrument' (dump written
+                          next to the deck)
+            uncertainty: If True, attach the design effect, margin of error and bootstrap confidence
+                         interval to every vote share (audit records and trend chart data)
+            error_bars: If True, draw the confidence intervals as error bars on the trend charts
+                        (implies uncertainty)
         """
         self.excel_path = excel_path
         self.template_ppt_path = template_ppt_path
+        self.use_data_cache = use_data_cache
+        self.use_aggregate_store = use_aggregate_store
+        self.record_calculations = record_calculations
+        self.workers = workers
+        self.lazy_template_parts = lazy_template_parts
+        self.uncertainty = uncertainty or error_bars
+        self.error_bars = error_bars
+        self.metrics = None  # Metric graph of the slide computations (values kept for one reference date)
+        self.slide_metric_tasks = {}  # slide_num → slide metric task (see get_slide_compute_tasks)
+        self.progress_callback = progress_callback
         self.df = None
-        self.template_prs = None
+        self.template_prs = template_prs
+        self.template_unmodified = False  # True while template_prs can be used as the output deck
+        self.template_map = None  # Compiled slide → shape bindings of the template (cached by file hash)
         self.output_prs = None
+        self.chart_writer = ChartDataWriter(editable_data=editable_chart_data)
         self.calculator = None
+        self.daily_aggregates = None  # Per-day party totals for time series charts
+        self.aggregate_store = None  # On-disk per-day totals from previous runs
+        self.segments = None  # Memoized demographic segment masks / windows / sample sizes
+        self.weights = None  # Weight columns per level × period and the sparse-weight decisions
+        self.multi_select = None  # Respondents × options matrices of the multi-select questions (Q10-Q13)
         self.ae2021_vote_shares = None  # Store 2021 AE vote shares from master sheet
         
+        # Per-stage timings (no-op unless profiling)
+        self.profiler = RunProfiler(enabled=profile, dump_format=profile_dump)
+        self.profiler.start_dump()
+        
         # Set reference date (current date or provided date)
-        if reference_date is None:
-            self.reference_date = datetime.now()
-        else:
-            if isinstance(reference_date, str):
-                self.reference_date = pd.to_datetime(reference_date)
-            elif isinstance(reference_date, datetime):
-                self.reference_date = reference_date
-            else:
-                self.reference_date = pd.to_datetime(reference_date)
+        self.reference_date = self.parse_reference_date(reference_date)
         
         # Load data
-        self.load_data()
+        with self.profiler.stage('load_data'):
+            self.load_data()
         
         # Load template PPT
+        with self.profiler.stage('load_template'):
+            self.load_template()
+        
+        # Every calculate_* call of the generator and its calculator is timed in the profile
+        self.profiler.instrument(self)
+        self.profiler.instrument(self.calculator)
+        self.profiler.info.update({'excel_path': excel_path, 'rows': len(self.df), 'workers': workers})
+    
+    @staticmethod
+    def parse_reference_date(reference_date):
+        """
+        Parse a reference date argument
+        
+        Args:
+            reference_date: datetime, string 'YYYY-MM-DD', or None for the current date
+        
+        Returns:
+            datetime / Timestamp
+        """
+        if reference_date is None:
+            return datetime.now()
+        if isinstance(reference_date, str):
+            return pd.to_datetime(reference_date)
+        if isinstance(reference_date, datetime):
+            return reference_date
+        return pd.to_datetime(reference_date)
+    
+    def set_reference_date(self, reference_date):
+        """
+        Switch to another reference date for the next deck, keeping the loaded data
+        (date index, per-day aggregates and segment rows are shared by every reference date)
+        
+        Args:
+            reference_date: datetime, string 'YYYY-MM-DD', or None for the current date
+        """
+        self.reference_date = self.parse_reference_date(reference_date)
+        self.metrics.reset()
+        self.output_prs = None
+        self.calculator.calculation_records = []
+        self.profiler.reset()
+    
+    def set_template(self, template_ppt_path):
+        """
+        Switch to another template PPT for the next deck, keeping the loaded data
+        
+        Args:
+            template_ppt_path: Path to template PPT
+        """
+        if template_ppt_path == self.template_ppt_path:
+            return
+        self.template_ppt_path = template_ppt_path
+        self.template_prs = None
         self.load_template()
     
     def get_weight_column(self, level='Region', period='Overall', fallback_to_exact=True):
         """
-        Get the correct weight column name from the dataframe
+        Get the correct weight column name from the dataframe (resolved once per dataset)
         
         Args:
             level: 'Region', 'District', or 'AC'
@@ -70,46 +303,41 @@ class CompleteReportGenerator:
         Returns:
             Column name if found, None otherwise
         """
-        # Try exact match first if fallback_to_exact
-        if fallback_to_exact:
-            exact_name = f'Weight - with Vote Share - AE 2021 - {level}'
-            if period != 'Overall':
-                exact_name += f' {period}'
-            if exact_name in self.df.columns:
-                return exact_name
-        
-        # Pattern match based on actual column names in Excel
-        # Pattern: "Weight Voteshare {period} {level} Level"
-        if period == 'Overall':
-            pattern = f'Weight Voteshare Overall {level} Level'
-        elif period == 'L7D':
-            pattern = f'Weight Voteshare L7D {level} Level'
-        elif period == 'L15D':
-            pattern = f'Weight Voteshare L15D {level} Level'
-        else:
-            pattern = None
-        
-        if pattern and pattern in self.df.columns:
-            return pattern
-        
-        # Try alternative patterns
-        alternatives = [
-            f'Weight Voteshare {period} {level} Level' if period != 'Overall' else f'Weight Voteshare Overall {level} Level',
-            f'Weight - with Vote Share - AE 2021 - {level}' + (f' {period}' if period != 'Overall' else ''),
-        ]
+        if self.weights is None:
+            self.weights = WeightResolver(self.df.columns)
+        return self.weights.get(level, period, fallback_to_exact)
+    
+    def use_period_weights(self, period, start=None, end=None, segment=None, mask=None, label=None):
+        """
+        Check whether an N-DMA window uses its period (L7D / L15D) Region weights: only when at
+        least half of the window's records have them. The counts come from the per-day weight
+        counts of the segment (O(1) per window), and the decision is counted for the run summary
         
-        for alt in alternatives:
-            if alt in self.df.columns:
-                return alt
+        Args:
+            period: 'L7D' or 'L15D'
+            start: First date of the window (None for no lower bound)
+            end: Last date of the window (None for no upper bound)
+            segment: Segment key of the per-day counts (None for all records)
+            mask: Boolean mask of the segment's records (first use of the segment only)
+            label: Window name for the summary (e.g. 'Gender=Male 7DMA')
         
-        return None
+        Returns:
+            Tuple (use period weights, records with a period weight, records)
+        """
+        period_col = self.get_weight_column('Region', period) or f'Weight Voteshare {period} Region Level'
+        counts = self.daily_aggregates.get_weight_counts(
+            [self.get_weight_column('Region', 'L7D'), self.get_weight_column('Region', 'L15D')],
+            segment=segment, mask=mask
+        )
+        available, total = counts.window_counts(period_col, start=start, end=end)
+        return self.weights.use_period_weights(period, available, total, label=label), available, total
     
     def get_sample_size(self, data, question_column=None):
         """
         Get sample size by counting only records with non-empty responses to a question
         
         Args:
-            data: DataFrame to count from
+            data: DataFrame or DataWindow to count from
             question_column: Column name for the question. If None, uses the main vote question.
                            If 'overall', counts records with at least one non-empty response to main question.
         
@@ -125,19 +353,74 @@ class CompleteReportGenerator:
         if question_column not in data.columns:
             return 0
         
-        # Count only records with non-empty (not null/NaN) responses
-        return len(data[data[question_column].notna()].copy())
+        # Count only records with non-empty (not null/NaN) responses (once per window rows and question)
+        result_cache = self.calculator.result_cache
+        cache_key = result_cache.make_key('sample_size', data, extra=(question_column,))
+        sample_size = result_cache.get(cache_key) if cache_key is not None else None
+        if sample_size is None:
+            sample_size = int(data[question_column].notna().sum())
+            if cache_key is not None:
+                result_cache.put(cache_key, sample_size)
+        return sample_size
+    
+    def get_named_window(self, name):
+        """
+        Get a named report window for the reference date (memoized by the calculator)
+        
+        Args:
+            name: 'Overall' (all records up to reference_date), 'L7D', 'L15D' or 'L30D'
+                  (N days ending one day before reference_date)
+        
+        Returns:
+            DataWindow
+        """
+        return self.calculator.get_named_window(name, self.reference_date)
     
     def load_data(self):
         """Load and preprocess Excel data"""
         print(f"Loading data from: {self.excel_path}")
         
-        self.df = pd.read_excel(self.excel_path)
-        self.df['Survey Date'] = pd.to_datetime(self.df['Survey Date'], errors='coerce')
-        self.df = self.df[self.df['Survey Date'].notna()].copy()
-        
-        # Initialize calculator
-        self.calculator = VoteShareCalculator(self.df)
+        # Survey Date parsed and rows without a valid date dropped (cached by file content hash)
+        # Only the columns in the report column manifest are loaded, names as categoricals
+        with self.profiler.stage('read_survey_data'):
+            content_hash = compute_file_hash(self.excel_path)
+            self.df = load_survey_data(
+                self.excel_path, use_cache=self.use_data_cache,
+                columns=is_report_column, category_columns=REPORT_CATEGORY_COLUMNS,
+                content_hash=content_hash
+            )
+            self.profiler.add_rows(len(self.df))
+        
+        # Initialize calculator (shares self.df, sorted by Survey Date if needed - precomputed party
+        # category columns for Q5/Q8/Q9/Q19 are added to it, so filtered frames carry them along)
+        # Cached calculation results are keyed on the file content hash
+        with self.profiler.stage('prepare_calculator', rows=len(self.df)):
+            self.calculator = VoteShareCalculator(self.df, dataset_token=content_hash)
+            self.df = self.calculator.df
+            self.calculator.record_calculations = self.record_calculations
+            if self.uncertainty:
+                self.calculator.uncertainty = ShareUncertainty()
+        
+        # Per-day aggregate table (cumulative / N-DMA chart windows come from prefix sums)
+        # With the aggregate store, days already aggregated by a previous run are reused
+        with self.profiler.stage('daily_aggregates', rows=len(self.df)):
+            if self.use_aggregate_store:
+                self.aggregate_store = AggregateStore(compute_survey_key(self.df))
+                self.aggregate_store.prune()
+            self.daily_aggregates = DailyAggregateTable(self.calculator, self.df, store=self.aggregate_store)
+        
+        # Weight column of every level × period (resolved once per dataset)
+        self.weights = WeightResolver(self.df.columns)
+        
+        # Demographic segments (masks, date windows and sample sizes memoized per dataset)
+        self.segments = SegmentRegistry(self.df, question_column=self.calculator.vote_question,
+                                        data_window=self.calculator.data_window)
+        
+        # Multi-select question blocks (each loaded into an option matrix on first use)
+        self.multi_select = MultiSelectRegistry(self.df)
+        
+        # Slide metrics and the windows / segments they depend on (computed on demand)
+        self.metrics = self.build_metric_graph()
         
         # Load 2021 AE vote shares from master sheet
         self.load_ae2021_vote_shares()
@@ -194,39 +477,66 @@ class CompleteReportGenerator:
             }
     
     def load_template(self):
-        """Load template PPT to extract design"""
-        print(f"Loading template from: {self.template_ppt_path}")
-        self.template_prs = Presentation(self.template_ppt_path)
+        """Load template PPT to extract design (skipped if a parsed template was passed in)"""
+        if self.template_prs is None:
+            print(f"Loading template from: {self.template_ppt_path}")
+            self.template_prs = open_presentation(self.template_ppt_path, lazy_parts=self.lazy_template_parts)
+        self.template_unmodified = True
         print(f"Template has {len(self.template_prs.slides)} slides")
+        
+        # Chart / table / Base text shapes per slide (compiled once per template version)
+        # Without a map every slide is searched shape by shape
+        try:
+            self.template_map = TemplateMap.load(self.template_ppt_path)
+        except Exception as e:
+            print(f"Warning: Could not load template map ({e}), searching slides for shapes")
+            self.template_map = None
+    
+    def get_slide_shapes(self, slide, slide_num, kind):
+        """
+        Get the shapes of a slide to search for charts or tables
+        
+        Args:
+            slide: Slide object
+            slide_num: Slide number
+            kind: 'charts' or 'tables'
+        
+        Returns:
+            The slide's bound chart / table shapes from the template map, or all its shapes
+        """
+        if self.template_map is not None:
+            shapes = self.template_map.get_shapes(slide, slide_num, kind)
+            if shapes is not None:
+                return shapes
+        return slide.shapes
     
     def get_overall_metrics(self):
         """Get overall metrics - filtered up to reference_date"""
-        # Filter data up to reference_date only
-        filtered_df = self.df[self.df['Survey Date'] <= self.reference_date].copy()
+        # Filter data up to reference_date only (window rows all have a valid Survey Date)
+        filtered_df = self.get_named_window('Overall')
         
         # Overall sample size: only count records with non-empty responses to main question
         sample_size = self.get_sample_size(filtered_df, 'overall')
         
         # For date calculations, use all records (even empty ones) for date range
-        valid_date_df = filtered_df[filtered_df['Survey Date'].notna()].copy()
-        start_date = valid_date_df['Survey Date'].min() if len(valid_date_df) > 0 else None
-        end_date = min(self.reference_date, valid_date_df['Survey Date'].max()) if len(valid_date_df) > 0 else None
+        survey_dates = filtered_df['Survey Date']
+        start_date = survey_dates.min() if len(filtered_df) > 0 else None
+        end_date = min(self.reference_date, survey_dates.max()) if len(filtered_df) > 0 else None
         duration_days = (end_date - start_date).days + 1 if start_date and end_date else 0
         
         # Calculate daily average sample (for "Total Sample conducted Daily")
         # Only count records with valid responses for daily averages
-        valid_response_df = filtered_df[filtered_df[self.calculator.vote_question].notna()].copy()
-        daily_samples = valid_response_df.groupby('Survey Date').size()
+        valid_response_df = filtered_df.notna(self.calculator.vote_question)
+        daily_samples = valid_response_df['Survey Date'].value_counts()
         avg_daily_sample = int(daily_samples.mean()) if len(daily_samples) > 0 else 0  # Round to nearest integer
         
         # Calculate gender breakdown - only count those with valid responses
-        valid_response_df = filtered_df[filtered_df[self.calculator.vote_question].notna()].copy()
-        male_sample = len(valid_response_df[valid_response_df['Gender'] == 1])
-        female_sample = len(valid_response_df[valid_response_df['Gender'] == 2])
+        male_sample = int((valid_response_df['Gender'] == 1).sum())
+        female_sample = int((valid_response_df['Gender'] == 2).sum())
         
         # Calculate F2F and CATI samples (Data Type: 1 = F2F, 2 = CATI) - only with valid responses
-        f2f_sample = len(valid_response_df[valid_response_df['Data Type'] == 1]) if 'Data Type' in valid_response_df.columns else 0
-        cati_sample = len(valid_response_df[valid_response_df['Data Type'] == 2]) if 'Data Type' in valid_response_df.columns else 0
+        f2f_sample = int((valid_response_df['Data Type'] == 1).sum()) if 'Data Type' in valid_response_df.columns else 0
+        cati_sample = int((valid_response_df['Data Type'] == 2).sum()) if 'Data Type' in valid_response_df.columns else 0
         
         # Calculate zones covered
         if 'Region Name' in filtered_df.columns:
@@ -257,22 +567,15 @@ class CompleteReportGenerator:
         """Update slide 5 (State Level Vote Share) table with calculated values"""
         # Calculate vote shares - filter data up to reference date only
         # Use data from start up to reference_date (when report is generated)
-        overall_data = self.calculator.df[
-            self.calculator.df['Survey Date'] <= self.reference_date
-        ].copy()
-        raw_vote_shares = self.calculator.calculate_vote_share(overall_data, use_weights=False)
+        overall_data = self.get_named_window('Overall')
+        with self.calculator.calculation_context(metric='Vote Share Raw'):
+            raw_vote_shares = self.calculator.calculate_vote_share(overall_data, use_weights=False)
         
         # For 7 DMA, calculate from reference date (when report is generated)
         # For 7DMA: end_date is one day before the reference date
         # So if reference_date is Oct 31, use Oct 24-30 (7 days ending on Oct 30, excluding Oct 31)
         # Window: (reference_date - 7 days) to (reference_date - 1 day) = 7 days total
-        end_date = self.reference_date - timedelta(days=1)  # One day before reference date
-        cutoff_date = end_date - timedelta(days=6)  # 6 days before end_date = 7 days total
-        dma7_data = self.df[
-            (self.df['Survey Date'] >= cutoff_date) & 
-            (self.df['Survey Date'] <= end_date) &
-            (self.df['Survey Date'] <= self.reference_date - timedelta(days=1))
-        ].copy()
+        dma7_data = self.get_named_window('L7D')
         
         # For 7DMA, use L7D weights when >=50% available, otherwise use regular weights
         # This matches the final PPT behavior where L7D weights are only used when sufficient
@@ -285,42 +588,44 @@ class CompleteReportGenerator:
         if regular_col not in dma7_data.columns:
             regular_col = None
         
-        l7d_available = dma7_data[l7d_col].notna().sum() if l7d_col else 0
-        total_records = len(dma7_data)
-        
         # For 7DMA: Use L7D weights if >=50% of records have L7D weights, otherwise use regular weights
         # This ensures we don't use sparse L7D weights which give incorrect results
-        if l7d_col and l7d_available > 0 and (l7d_available / total_records) >= 0.5:
+        use_l7d, l7d_available, total_records = self.use_period_weights(
+            'L7D', *self.calculator.get_window_bounds(7, self.reference_date), label='State 7DMA'
+        ) if l7d_col else (False, 0, len(dma7_data))
+        if use_l7d:
             # Use L7D weights - filter to only records with L7D weights
-            dma7_data_with_weights = dma7_data[dma7_data[l7d_col].notna()].copy()
+            dma7_data_with_weights = dma7_data.notna(l7d_col)
             dma7_weight_column = l7d_col
         else:
             # Fall back to regular weights when L7D weights are sparse (<50%) or not available
-            dma7_data_with_weights = dma7_data.copy()
+            dma7_data_with_weights = dma7_data
             dma7_weight_column = regular_col if regular_col else None
         
         # Use 7DMA-specific weights for 7DMA calculations
         # For sample size, calculate_vote_share will count all valid votes from dma7_data_with_weights
         # But if we're using L7D weights, we need to count all valid votes from the original dma7_data
         # to match the final PPT which counts all valid votes, not just those with L7D weights
-        dma7_vote_shares = self.calculator.calculate_vote_share(
-            dma7_data_with_weights,
-            weight_column=dma7_weight_column,
-            use_weights=True
-        )
+        with self.calculator.calculation_context(metric='Vote Share 7DMA'):
+            dma7_vote_shares = self.calculator.calculate_vote_share(
+                dma7_data_with_weights,
+                weight_column=dma7_weight_column,
+                use_weights=True
+            )
         
         # For sample size: if using L7D weights, count all records with L7D weights (regardless of vote)
         # This matches the final PPT which shows 15,206 for 7DMA sample
-        if l7d_available > 0 and (l7d_available / total_records) >= 0.5:
+        if use_l7d:
             # Count all records with L7D weights (regardless of whether they have valid votes)
-            dma7_vote_shares['sample'] = len(dma7_data[dma7_data[l7d_col].notna()].copy())
+            dma7_vote_shares['sample'] = int(l7d_available)
         
         # Normalized vote share uses same data filtered up to reference date
-        normalized_vote_shares = self.calculator.calculate_vote_share(
-            overall_data,  # Already filtered to reference_date
-            weight_column=self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level',
-            use_weights=True
-        )
+        with self.calculator.calculation_context(metric='Vote Share Normalized'):
+            normalized_vote_shares = self.calculator.calculate_vote_share(
+                overall_data,  # Already filtered to reference_date
+                weight_column=self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level',
+                use_weights=True
+            )
         
         # Party mapping
         party_map = {
@@ -404,6 +709,18 @@ class CompleteReportGenerator:
         """Update slide 2 (Introduction) table with all calculated stats"""
         metrics = self.get_overall_metrics()
         
+        # Sample counts shown on the slide (recorded as shares of the overall sample for the audit)
+        sample_size = metrics['sample_size']
+        sample_counts = {'Male': metrics['male_sample'], 'Female': metrics['female_sample'],
+                         'F2F': metrics['f2f_sample'], 'CATI': metrics['cati_sample']}
+        overall_data = self.get_named_window('Overall')
+        with self.calculator.calculation_context(metric='Sample'):
+            self.calculator.record_item_shares(
+                'counts', None, sample_counts, sample_size,
+                {item: count / sample_size * 100 if sample_size > 0 else 0 for item, count in sample_counts.items()},
+                sample_size, len(overall_data), data_filtered=overall_data
+            )
+        
         # Use reference date (when report is generated)
         # Format date with proper ordinal suffix
         day = self.reference_date.day
@@ -463,34 +780,20 @@ class CompleteReportGenerator:
             for paragraph in details_cell.text_frame.paragraphs:
                 paragraph.alignment = PP_ALIGN.RIGHT
     
-    def update_demographic_table(self, table, slide):
+    def update_demographic_table(self, table, slide, slide_num=None):
         """
         Update demographic breakdown tables (Gender, Location, Religion, Social Category, Age)
         
         Args:
             table: Table object to update
             slide: Slide object to identify which demographic
+            slide_num: Slide number (demographic read from the template map when given)
         """
         # Determine demographic type from slide content
-        demographic_type = None
-        for shape in slide.shapes:
-            if hasattr(shape, 'text') and shape.text:
-                text = shape.text.lower()
-                if 'gender' in text:
-                    demographic_type = 'Gender'
-                    break
-                elif 'location' in text:
-                    demographic_type = 'Location'
-                    break
-                elif 'religion' in text:
-                    demographic_type = 'Religion'
-                    break
-                elif 'social category' in text:
-                    demographic_type = 'Social Category'
-                    break
-                elif 'age' in text:
-                    demographic_type = 'Age'
-                    break
+        if self.template_map is not None and slide_num in self.template_map.slides:
+            demographic_type = self.template_map.get_demographic(slide_num)
+        else:
+            demographic_type = get_slide_demographic(slide)
         
         if not demographic_type:
             # Try to infer from table headers
@@ -518,17 +821,9 @@ class CompleteReportGenerator:
             return
         
         # Get demographic column name
-        demographic_column_map = {
-            'Gender': 'Gender',
-            'Location': 'Residential locality type',
-            'Religion': '20. Could you please tell me the religion that you belong to?',
-            'Social Category': '21. Which social category do you belong to?',
-            'Age': 'Could you please tell me your age in complete years?'
-        }
-        
-        demographic_column = demographic_column_map.get(demographic_type)
-        if not demographic_column or demographic_column not in self.df.columns:
-            print(f"Warning: {demographic_column} not found in data")
+        demographic_column = self.segments.get_column(demographic_type)
+        if demographic_column is None:
+            print(f"Warning: {DEMOGRAPHIC_COLUMNS.get(demographic_type)} not found in data")
             return
         
         # Determine which metrics to calculate from table headers
@@ -552,24 +847,12 @@ class CompleteReportGenerator:
                     has_overall = True
         
         # Calculate demographic breakdowns
-        # Overall data - filter up to reference_date
-        overall_data = self.calculator.df[
-            self.calculator.df['Survey Date'] <= self.reference_date
-        ].copy()
-        
-        # 7 DMA data - last 7 days ending one day before reference_date
-        dma7_data = self.calculator.filter_by_date_range(
-            days=7,
-            exclude_latest=True,  # Exclude reference_date itself
-            reference_date=self.reference_date
-        )
-        
-        # 15 DMA data - last 15 days ending one day before reference_date
-        dma15_data = self.calculator.filter_by_date_range(
-            days=15,
-            exclude_latest=True,  # Exclude reference_date itself
-            reference_date=self.reference_date
-        )
+        # Overall data - up to reference_date
+        # 7 DMA / 15 DMA data - last 7 / 15 days ending one day before reference_date (reference_date excluded)
+        # Each category's rows in these windows come from the segment registry (memoized)
+        dma_end_date = self.reference_date - timedelta(days=1)
+        dma7_start_date = dma_end_date - timedelta(days=6)
+        dma15_start_date = dma_end_date - timedelta(days=14)
         
         # Get categories from table or data
         categories = []
@@ -590,68 +873,22 @@ class CompleteReportGenerator:
         for category_idx, category in enumerate(categories[:len(table.rows)-2]):
             row_idx = category_idx + 2
             
-            # Filter data by category using numeric codes
-            category_filter = None
-            if demographic_type == 'Gender':
-                # Gender: 1=Male, 2=Female
-                if category.lower() in ['male', 'm']:
-                    category_filter = self.df[demographic_column] == 1
-                elif category.lower() in ['female', 'f']:
-                    category_filter = self.df[demographic_column] == 2
-            elif demographic_type == 'Location':
-                # Location: 1=Urban, 2=Rural
-                if category.lower() in ['urban', 'u']:
-                    category_filter = self.df[demographic_column] == 1
-                elif category.lower() in ['rural', 'r']:
-                    category_filter = self.df[demographic_column] == 2
-            elif demographic_type == 'Religion':
-                # Religion: 1=Hindu, 2=Muslim
-                if category.lower() in ['hindu', 'h']:
-                    category_filter = self.df[demographic_column] == 1
-                elif category.lower() in ['muslim', 'm', 'islam']:
-                    category_filter = self.df[demographic_column] == 2
-                elif category.lower() in ['other', 'others']:
-                    # Other religions (codes 3, 4, 5, 6, 7, etc.)
-                    category_filter = ~self.df[demographic_column].isin([1, 2])
-            elif demographic_type == 'Social Category':
-                # Social Category: 1=General, 2=OBC, 3=SC, 4=ST
-                if 'general' in category.lower() and 'obc' in category.lower():
-                    # General+OBC combined
-                    category_filter = self.df[demographic_column].isin([1, 2])
-                elif 'general' in category.lower():
-                    category_filter = self.df[demographic_column] == 1
-                elif 'obc' in category.lower():
-                    category_filter = self.df[demographic_column] == 2
-                elif category.lower() in ['sc', 'scheduled caste']:
-                    category_filter = self.df[demographic_column] == 3
-                elif category.lower() in ['st', 'scheduled tribe']:
-                    category_filter = self.df[demographic_column] == 4
-            elif demographic_type == 'Age':
-                # Age groups based on numeric age
-                age_col = self.df[demographic_column]
-                age_numeric = pd.to_numeric(age_col, errors='coerce')
-                
-                if '18-25' in category or '18 - 25' in category:
-                    category_filter = (age_numeric >= 18) & (age_numeric <= 25)
-                elif '26-35' in category or '26 - 35' in category or '26-34' in category or '26 - 34' in category:
-                    # Handle both 26-35 and 26-34
-                    if '26-34' in category or '26 - 34' in category:
-                        category_filter = (age_numeric >= 26) & (age_numeric <= 34)
-                    else:
-                        category_filter = (age_numeric >= 26) & (age_numeric <= 35)
-                elif '36-50' in category or '36 - 50' in category:
-                    category_filter = (age_numeric >= 36) & (age_numeric <= 50)
-                elif '50+' in category or 'above 50' in category or '50 +' in category:
-                    category_filter = age_numeric > 50
-            
-            if category_filter is None:
+            # Match the row label to a demographic segment
+            category_value = match_segment_label(demographic_type, category)
+            if category_value is None:
                 print(f"Warning: Could not match category '{category}' for {demographic_type}")
                 continue
             
-            # Filter dataframes by category
-            category_dma7_data = dma7_data[category_filter[dma7_data.index]].copy() if has_7dma else pd.DataFrame()
-            category_dma15_data = dma15_data[category_filter[dma15_data.index]].copy() if has_15dma else pd.DataFrame()
-            category_overall_data = overall_data[category_filter[overall_data.index]].copy() if has_overall else pd.DataFrame()
+            # Segment records in each window
+            category_dma7_data = self.segments.get_window_data(
+                demographic_type, category_value, start=dma7_start_date, end=dma_end_date
+            ) if has_7dma else None
+            category_dma15_data = self.segments.get_window_data(
+                demographic_type, category_value, start=dma15_start_date, end=dma_end_date
+            ) if has_15dma else None
+            category_overall_data = self.segments.get_window_data(
+                demographic_type, category_value, end=self.reference_date
+            ) if has_overall else None
             
             # Weight columns
             l7d_col = self.get_weight_column('Region', 'L7D') or 'Weight Voteshare L7D Region Level'
@@ -660,74 +897,79 @@ class CompleteReportGenerator:
             
             # Calculate 7DMA vote shares (using L7D weights)
             dma7_vote_shares = {}
-            if has_7dma and len(category_dma7_data) > 0:
-                # Check if L7D weights are available for this category
-                l7d_available = category_dma7_data[l7d_col].notna().sum() if l7d_col in category_dma7_data.columns else 0
-                total_records = len(category_dma7_data)
-                
+            if has_7dma and category_dma7_data is not None and len(category_dma7_data) > 0:
                 # For 7DMA: Use L7D weights if >=50% of records have L7D weights, otherwise use regular weights
-                if l7d_available > 0 and (l7d_available / total_records) >= 0.5:
+                use_l7d = self.use_period_weights(
+                    'L7D', start=dma7_start_date, end=dma_end_date, segment=(demographic_type, category_value),
+                    mask=self.segments.get_mask(demographic_type, category_value),
+                    label=f"{demographic_type}={category_value} 7DMA"
+                )[0]
+                if use_l7d:
                     # Use L7D weights - filter to only records with L7D weights
-                    category_dma7_data_with_weights = category_dma7_data[category_dma7_data[l7d_col].notna()].copy()
+                    category_dma7_data_with_weights = category_dma7_data.notna(l7d_col)
                     dma7_weight_column = l7d_col
                 else:
                     # Fall back to regular weights when L7D weights are sparse (<50%)
-                    category_dma7_data_with_weights = category_dma7_data.copy()
+                    category_dma7_data_with_weights = category_dma7_data
                     dma7_weight_column = regular_col
                 
-                dma7_vote_shares = self.calculator.calculate_vote_share(
-                    category_dma7_data_with_weights,
-                    weight_column=dma7_weight_column,
-                    use_weights=True
-                )
+                with self.calculator.calculation_context(metric='Vote Share 7DMA', segment=f"{demographic_type}={category_value}"):
+                    dma7_vote_shares = self.calculator.calculate_vote_share(
+                        category_dma7_data_with_weights,
+                        weight_column=dma7_weight_column,
+                        use_weights=True
+                    )
                 
                 # For sample size: when using L7D weights, count all records with valid votes from ORIGINAL data
                 # (before filtering by L7D weights), not just those with L7D weights
                 # This matches the audit trail which shows all records in the 7DMA window
-                if l7d_available > 0 and (l7d_available / total_records) >= 0.5:
+                if use_l7d:
                     # Count all records with valid votes from original category_dma7_data
                     vote_question = '8. If assembly elections (MLA) were to be held tomorrow, then which party would you vote for?'
-                    dma7_vote_shares['sample'] = len(category_dma7_data[category_dma7_data[vote_question].notna()].copy())
+                    dma7_vote_shares['sample'] = self.get_sample_size(category_dma7_data, vote_question)
             
             # Calculate 15DMA vote shares (using L15D weights)
             dma15_vote_shares = {}
-            if has_15dma and len(category_dma15_data) > 0:
-                # Check if L15D weights are available for this category
-                l15d_available = category_dma15_data[l15d_col].notna().sum() if l15d_col in category_dma15_data.columns else 0
-                total_records = len(category_dma15_data)
-                
+            if has_15dma and category_dma15_data is not None and len(category_dma15_data) > 0:
                 # For 15DMA: Use L15D weights if >=50% of records have L15D weights, otherwise use regular weights
-                if l15d_available > 0 and (l15d_available / total_records) >= 0.5:
+                use_l15d = self.use_period_weights(
+                    'L15D', start=dma15_start_date, end=dma_end_date, segment=(demographic_type, category_value),
+                    mask=self.segments.get_mask(demographic_type, category_value),
+                    label=f"{demographic_type}={category_value} 15DMA"
+                )[0]
+                if use_l15d:
                     # Use L15D weights - filter to only records with L15D weights
-                    category_dma15_data_with_weights = category_dma15_data[category_dma15_data[l15d_col].notna()].copy()
+                    category_dma15_data_with_weights = category_dma15_data.notna(l15d_col)
                     dma15_weight_column = l15d_col
                 else:
                     # Fall back to regular weights when L15D weights are sparse (<50%)
-                    category_dma15_data_with_weights = category_dma15_data.copy()
+                    category_dma15_data_with_weights = category_dma15_data
                     dma15_weight_column = regular_col
                 
-                dma15_vote_shares = self.calculator.calculate_vote_share(
-                    category_dma15_data_with_weights,
-                    weight_column=dma15_weight_column,
-                    use_weights=True
-                )
+                with self.calculator.calculation_context(metric='Vote Share 15DMA', segment=f"{demographic_type}={category_value}"):
+                    dma15_vote_shares = self.calculator.calculate_vote_share(
+                        category_dma15_data_with_weights,
+                        weight_column=dma15_weight_column,
+                        use_weights=True
+                    )
                 
                 # For sample size: when using L15D weights, count all records with valid votes from ORIGINAL data
                 # (before filtering by L15D weights), not just those with L15D weights
                 # This matches the audit trail which shows all records in the 15DMA window
-                if l15d_available > 0 and (l15d_available / total_records) >= 0.5:
+                if use_l15d:
                     # Count all records with valid votes from original category_dma15_data
                     vote_question = '8. If assembly elections (MLA) were to be held tomorrow, then which party would you vote for?'
-                    dma15_vote_shares['sample'] = len(category_dma15_data[category_dma15_data[vote_question].notna()].copy())
+                    dma15_vote_shares['sample'] = self.get_sample_size(category_dma15_data, vote_question)
             
             # Calculate Overall vote shares (using regular weights)
             overall_vote_shares = {}
-            if has_overall and len(category_overall_data) > 0:
-                overall_vote_shares = self.calculator.calculate_vote_share(
-                    category_overall_data,
-                    weight_column=regular_col,
-                    use_weights=True
-                )
+            if has_overall and category_overall_data is not None and len(category_overall_data) > 0:
+                with self.calculator.calculation_context(metric='Vote Share Normalized', segment=f"{demographic_type}={category_value}"):
+                    overall_vote_shares = self.calculator.calculate_vote_share(
+                        category_overall_data,
+                        weight_column=regular_col,
+                        use_weights=True
+                    )
             
             # Helper function to format cell with proper font, alignment, and decimal alignment
             def format_table_cell(cell, value, is_percentage=False):
@@ -844,7 +1086,8 @@ class CompleteReportGenerator:
         # Get top caste codes from data to create mapping
         caste_column = '22. Could you please tell me your caste?'
         if caste_column in self.df.columns:
-            top_codes = self.df[caste_column].value_counts().head(12).index.tolist()
+            # Counted in export row order (index), so ties rank as in the export - not by Survey Date
+            top_codes = self.df[caste_column].sort_index().value_counts().head(12).index.tolist()
             # Map top codes to caste names based on frequency and common patterns
             # This is a heuristic - should be verified with questionnaire
             code_mapping = {}
@@ -884,7 +1127,8 @@ class CompleteReportGenerator:
         # Create caste code mapping based on top codes in data
         # Map caste names to codes by matching top codes to template order
         # Note: Code 88 is likely NWR/Refused, so exclude it from caste mapping
-        top_codes_all = self.df[caste_column].value_counts().head(15).index.tolist()  # Get more codes
+        # Counted in export row order (index), so ties rank as in the export - not by Survey Date
+        top_codes_all = self.df[caste_column].sort_index().value_counts().head(15).index.tolist()  # Get more codes
         # Exclude code 88 (likely NWR/Refused) from valid caste codes
         valid_codes = [code for code in top_codes_all if code != 88][:12]  # Take top 12 excluding 88
         
@@ -941,43 +1185,39 @@ class CompleteReportGenerator:
                 # Single code
                 caste_filter = self.df[caste_column] == caste_codes
             
-            caste_data = self.df[caste_filter].copy()
+            caste_data = self.calculator.data_window.where(caste_filter)
             
             if is_30dma:
                 # 30 DMA: use last 30 days ending one day before reference date
                 end_date = self.reference_date - timedelta(days=1)
                 cutoff_date = end_date - timedelta(days=29)  # 30 days total
-                filtered_data = caste_data[
-                    (caste_data['Survey Date'] >= cutoff_date) & 
-                    (caste_data['Survey Date'] <= end_date) &
-                    (caste_data['Survey Date'] <= self.reference_date - timedelta(days=1))
-                ].copy()
+                filtered_data = caste_data.between(cutoff_date, end_date)
                 
                 # Check for L15D weights (30 DMA might use 15D weights)
                 l15d_col = self.get_weight_column('Region', 'L15D') or 'Weight Voteshare L15D Region Level'
                 regular_col = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
                 
-                l15d_available = filtered_data[l15d_col].notna().sum() if l15d_col in filtered_data.columns else 0
-                total_records = len(filtered_data)
-                
-                if l15d_available > 0 and (l15d_available / total_records) >= 0.5:
-                    filtered_data = filtered_data[filtered_data[l15d_col].notna()].copy()
+                # Segment key of the per-day weight counts: the caste codes the filter selects
+                caste_segment = (caste_column, tuple(caste_codes) if isinstance(caste_codes, list) else caste_codes)
+                if self.use_period_weights('L15D', start=cutoff_date, end=end_date, segment=caste_segment,
+                                           mask=caste_filter, label=f"Caste {caste_name} 30DMA")[0]:
+                    filtered_data = filtered_data.notna(l15d_col)
                     weight_column = l15d_col
                 else:
                     weight_column = regular_col
             else:
                 # Overall: use all data up to reference date
-                filtered_data = caste_data[
-                    caste_data['Survey Date'] <= self.reference_date
-                ].copy()
+                filtered_data = caste_data.between(end=self.reference_date)
                 weight_column = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
             
             # Calculate vote shares
-            vote_shares = self.calculator.calculate_vote_share(
-                filtered_data,
-                weight_column=weight_column,
-                use_weights=True
-            )
+            with self.calculator.calculation_context(metric='Vote Share 30DMA' if is_30dma else 'Vote Share Normalized',
+                                                     segment=f"Caste={caste_name}"):
+                vote_shares = self.calculator.calculate_vote_share(
+                    filtered_data,
+                    weight_column=weight_column,
+                    use_weights=True
+                )
             
             # Update table cells
             # Column structure: 0=S.No, 1=Caste, 2=Sample, 3=AITC, 4=BJP, 5=LEFT, 6=INC, 7=Others, 8=NWR, 9=Margin
@@ -1033,58 +1273,119 @@ class CompleteReportGenerator:
         
         daily_vote_shares = []
         
+        # Daily totals for the whole sample - each cumulative window is a prefix sum lookup
+        weight_column = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
+        series = self.daily_aggregates.get_series([weight_column])
+        max_survey_date = self.df['Survey Date'].max()
+        
         for date in target_dates:
             # For each date, calculate OVERALL normalized vote share using ALL data up to this date (cumulative)
             # Data should be filtered up to this date AND not exceed reference_date
-            actual_end_date = min(date, self.reference_date, self.df['Survey Date'].max())
-            date_data = self.df[
-                (self.df['Survey Date'] <= actual_end_date) & 
-                (self.df['Survey Date'] <= self.reference_date)
-            ].copy()
+            actual_end_date = min(date, self.reference_date, max_survey_date)
+            window = series.window_totals(end=actual_end_date)
             
-            if len(date_data) > 0:
+            if window['records'].sum() > 0:
                 # Calculate overall normalized vote share (cumulative) for this date
-                vote_shares = self.calculator.calculate_vote_share(
-                    date_data,
-                    weight_column=self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level',
-                    use_weights=True
-                )
-                
-                # Convert date to Excel serial number for chart (matching final PPT format)
-                excel_epoch = datetime(1899, 12, 30)
-                excel_serial = (date - excel_epoch).days
-                
-                daily_vote_shares.append({
-                    'date': date,
-                    'date_label': date.strftime('%m/%d/%Y'),
-                    'excel_serial': excel_serial,  # Excel serial number for chart
-                    'AITC': vote_shares.get('AITC', 0),
-                    'BJP': vote_shares.get('BJP', 0),
-                    'LEFT': vote_shares.get('LEFT', 0),
-                    'INC': vote_shares.get('INC', 0),
-                    'Others': vote_shares.get('Others', 0),
-                    'NWR': vote_shares.get('NWR', 0)
-                })
+                with self.calculator.calculation_context(metric='Normalized Trend', group=f"Point={date:%Y-%m-%d}"):
+                    vote_shares = self.calculator.get_vote_shares_from_window(window, weight_column=weight_column)
+                daily_vote_shares.append(self._build_daily_vote_share_entry(date, vote_shares))
             else:
                 # If no data for this date, still add entry with zero values
-                # Convert date to Excel serial number for chart
-                excel_epoch = datetime(1899, 12, 30)
-                excel_serial = (date - excel_epoch).days
-                
-                daily_vote_shares.append({
-                    'date': date,
-                    'date_label': date.strftime('%m/%d/%Y'),
-                    'excel_serial': excel_serial,  # Excel serial number for chart
-                    'AITC': 0,
-                    'BJP': 0,
-                    'LEFT': 0,
-                    'INC': 0,
-                    'Others': 0,
-                    'NWR': 0
-                })
+                daily_vote_shares.append(self._build_daily_vote_share_entry(date))
         
         return daily_vote_shares
     
+    def _build_daily_vote_share_entry(self, date, vote_shares=None):
+        """
+        Build one time series point for the trend charts
+        
+        Args:
+            date: Date of the point
+            vote_shares: Vote share dictionary (None for a zero entry when there is no data)
+        
+        Returns:
+            Dictionary with date, label, Excel serial and vote shares for each party (plus the
+            vote share's 'uncertainty' when share uncertainty is enabled)
+        """
+        vote_shares = vote_shares or {}
+        
+        # Convert date to Excel serial number for chart (matching final PPT format)
+        excel_epoch = datetime(1899, 12, 30)
+        excel_serial = (date - excel_epoch).days
+        
+        entry = {
+            'date': date,
+            'date_label': date.strftime('%m/%d/%Y'),
+            'excel_serial': excel_serial,  # Excel serial number for chart
+            'AITC': vote_shares.get('AITC', 0),
+            'BJP': vote_shares.get('BJP', 0),
+            'LEFT': vote_shares.get('LEFT', 0),
+            'INC': vote_shares.get('INC', 0),
+            'Others': vote_shares.get('Others', 0),
+            'NWR': vote_shares.get('NWR', 0)
+        }
+        if vote_shares.get('uncertainty') is not None:
+            entry['uncertainty'] = vote_shares['uncertainty']
+        return entry
+    
+    def _add_confidence_error_bars(self, chart, daily_data):
+        """
+        Draw the confidence interval of every trend chart point as error bars (only with error_bars)
+        
+        Args:
+            chart: Trend chart (series in PARTY_CATEGORIES order, data already written)
+            daily_data: Points from _build_daily_vote_share_entry (points without an interval get none)
+        """
+        if not self.error_bars:
+            return
+        
+        series_errors = []
+        for party in PARTY_CATEGORIES:
+            plus = []
+            minus = []
+            for d in daily_data:
+                uncertainty = d.get('uncertainty')
+                if uncertainty is None or np.isnan(uncertainty['ci_low'][party]):
+                    plus.append(0.0)
+                    minus.append(0.0)
+                    continue
+                # Error bars are lengths from the plotted (rounded) value to the interval bounds
+                value = round(d[party], 1)
+                plus.append(round(max(uncertainty['ci_high'][party] - value, 0.0), 2))
+                minus.append(round(max(value - uncertainty['ci_low'][party], 0.0), 2))
+            series_errors.append((plus, minus))
+        write_error_bars(chart, series_errors)
+    
+    def _get_7dma_vote_shares(self, window, l7d_col, regular_col, label=None, date=None):
+        """
+        Vote shares for a 7DMA window using L7D weights when >=50% of records have them
+        
+        Args:
+            window: Window totals from DailyPartySeries.window_totals
+            l7d_col: L7D weight column
+            regular_col: Overall weight column (fallback)
+            label: Chart name for the sparse-weight summary (e.g. 'Gender=Male 7DMA chart')
+            date: Chart point the window belongs to (labels the recorded calculation)
+        
+        Returns:
+            Vote share dictionary
+        """
+        # Check if L7D weights are available
+        l7d_records = window['weighted_records'].get(l7d_col)
+        l7d_available = int(l7d_records.sum()) if l7d_records is not None else 0
+        total_records = int(window['records'].sum())
+        
+        # For 7DMA: Use L7D weights if >=50% of records have L7D weights, otherwise use regular weights
+        # This ensures we don't use sparse L7D weights which give incorrect results
+        with self.calculator.calculation_context(metric='7DMA Trend',
+                                                 group=f"Point={date:%Y-%m-%d}" if date is not None else None):
+            if self.weights.use_period_weights('L7D', l7d_available, total_records, label=label):
+                # Use L7D weights - only records with L7D weights
+                return self.calculator.get_vote_shares_from_window(window, weight_column=l7d_col, weighted_records_only=True)
+            
+            # Fall back to regular weights when L7D weights are sparse (<50%)
+            return self.calculator.get_vote_shares_from_window(window, weight_column=regular_col)
+    
     def calculate_overall_normalized_for_demographic(self, demographic_type, demographic_value, num_days=16):
         """
         Calculate Overall Normalized Vote Share (cumulative) for a specific demographic
@@ -1098,70 +1399,9 @@ class CompleteReportGenerator:
         Returns:
             List of dictionaries with date and vote shares for each party
         """
-        # Get demographic column name
-        demographic_column_map = {
-            'Gender': 'Gender',
-            'Location': 'Residential locality type',
-            'Religion': '20. Could you please tell me the religion that you belong to?',
-            'Social Category': '21. Which social category do you belong to?',
-            'Age': 'Could you please tell me your age in complete years?'
-        }
-        
-        demographic_column = demographic_column_map.get(demographic_type)
-        if not demographic_column or demographic_column not in self.df.columns:
-            return []
-        
-        # Create filter for demographic
-        if demographic_type == 'Gender':
-            # Gender: 1=Male, 2=Female
-            if demographic_value == 'Male':
-                demographic_filter = self.df[demographic_column] == 1
-            elif demographic_value == 'Female':
-                demographic_filter = self.df[demographic_column] == 2
-            else:
-                return []
-        elif demographic_type == 'Location':
-            # Location: 1=Urban, 2=Rural
-            if demographic_value == 'Urban':
-                demographic_filter = self.df[demographic_column] == 1
-            elif demographic_value == 'Rural':
-                demographic_filter = self.df[demographic_column] == 2
-            else:
-                return []
-        elif demographic_type == 'Religion':
-            # Religion: 1=Hindu, 2=Muslim
-            if demographic_value == 'Hindu':
-                demographic_filter = self.df[demographic_column] == 1
-            elif demographic_value == 'Muslim':
-                demographic_filter = self.df[demographic_column] == 2
-            else:
-                return []
-        elif demographic_type == 'Social Category':
-            # Social Category: 1=General, 2=OBC, 3=SC, 4=ST
-            if demographic_value == 'General+OBC':
-                demographic_filter = self.df[demographic_column].isin([1, 2])
-            elif demographic_value == 'SC':
-                demographic_filter = self.df[demographic_column] == 3
-            elif demographic_value == 'ST':
-                demographic_filter = self.df[demographic_column] == 4
-            else:
-                return []
-        elif demographic_type == 'Age':
-            # Age groups based on numeric age
-            age_col = self.df[demographic_column]
-            age_numeric = pd.to_numeric(age_col, errors='coerce')
-            
-            if demographic_value == '18-25':
-                demographic_filter = (age_numeric >= 18) & (age_numeric <= 25)
-            elif demographic_value == '26-34':
-                demographic_filter = (age_numeric >= 26) & (age_numeric <= 34)
-            elif demographic_value == '36-50':
-                demographic_filter = (age_numeric >= 36) & (age_numeric <= 50)
-            elif demographic_value == '50+':
-                demographic_filter = age_numeric > 50
-            else:
-                return []
-        else:
+        # Demographic segment mask (built once per dataset, shared by all demographic charts)
+        demographic_filter = self.segments.get_mask(demographic_type, demographic_value)
+        if demographic_filter is None:
             return []
         
         # Calculate dates: last N days ending at reference_date
@@ -1186,59 +1426,54 @@ class CompleteReportGenerator:
         
         daily_vote_shares = []
         
+        # Daily totals for this demographic (built once per segment, reused by later calls)
+        weight_column = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
+        series = self.daily_aggregates.get_series(
+            [weight_column], segment=(demographic_type, demographic_value), mask=demographic_filter
+        )
+        max_survey_date = self.df['Survey Date'].max()
+        
         for date in target_dates:
             # Filter data by demographic AND date
-            actual_end_date = min(date, self.reference_date, self.df['Survey Date'].max())
-            date_data = self.df[
-                (self.df['Survey Date'] <= actual_end_date) & 
-                (self.df['Survey Date'] <= self.reference_date) &
-                demographic_filter
-            ].copy()
+            actual_end_date = min(date, self.reference_date, max_survey_date)
+            window = series.window_totals(end=actual_end_date)
             
-            if len(date_data) > 0:
+            if window['records'].sum() > 0:
                 # Calculate overall normalized vote share (cumulative) for this demographic and date
-                vote_shares = self.calculator.calculate_vote_share(
-                    date_data,
-                    weight_column=self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level',
-                    use_weights=True
-                )
-                
-                # Convert date to Excel serial number for chart (matching final PPT format)
-                excel_epoch = datetime(1899, 12, 30)
-                excel_serial = (date - excel_epoch).days
-                
-                daily_vote_shares.append({
-                    'date': date,
-                    'date_label': date.strftime('%m/%d/%Y'),
-                    'excel_serial': excel_serial,  # Excel serial number for chart
-                    'AITC': vote_shares.get('AITC', 0),
-                    'BJP': vote_shares.get('BJP', 0),
-                    'LEFT': vote_shares.get('LEFT', 0),
-                    'INC': vote_shares.get('INC', 0),
-                    'Others': vote_shares.get('Others', 0),
-                    'NWR': vote_shares.get('NWR', 0)
-                })
+                with self.calculator.calculation_context(metric='Normalized Trend', group=f"Point={date:%Y-%m-%d}"):
+                    vote_shares = self.calculator.get_vote_shares_from_window(window, weight_column=weight_column)
+                daily_vote_shares.append(self._build_daily_vote_share_entry(date, vote_shares))
             else:
                 # If no data for this date, still add entry with zero values
-                # Convert date to Excel serial number for chart
-                excel_epoch = datetime(1899, 12, 30)
-                excel_serial = (date - excel_epoch).days
-                
-                daily_vote_shares.append({
-                    'date': date,
-                    'date_label': date.strftime('%m/%d/%Y'),
-                    'excel_serial': excel_serial,  # Excel serial number for chart
-                    'AITC': 0,
-                    'BJP': 0,
-                    'LEFT': 0,
-                    'INC': 0,
-                    'Others': 0,
-                    'NWR': 0
-                })
+                daily_vote_shares.append(self._build_daily_vote_share_entry(date))
         
         return daily_vote_shares
     
-    def update_demographic_chart(self, chart, demographic_type, demographic_value):
+    def compute_demographic_chart(self, demographic_type, demographic_value, is_7dma=False):
+        """
+        Compute the data behind a demographic chart (no slide changes, so it can run in a worker process)
+        
+        Args:
+            demographic_type: 'Gender', 'Location', 'Religion', 'Social Category', 'Age'
+            demographic_value: Value to filter by
+            is_7dma: If True, 7 DMA for last 13 days; if False, Overall Normalized (cumulative) for last 16 days
+        
+        Returns:
+            Dictionary with 'daily_data' and 'sample_size'
+        """
+        if is_7dma:
+            daily_data = self.calculate_7dma_for_demographic(demographic_type, demographic_value, num_days=13)
+        else:
+            daily_data = self.calculate_overall_normalized_for_demographic(demographic_type, demographic_value, num_days=16)
+        
+        # Sample size only matters when the chart is drawn
+        sample_size = 0
+        if len(daily_data) > 0:
+            sample_size = self._get_demographic_sample_size(demographic_type, demographic_value, is_7dma=is_7dma)
+        
+        return {'daily_data': daily_data, 'sample_size': sample_size}
+    
+    def update_demographic_chart(self, chart, demographic_type, demographic_value, precomputed=None):
         """
         Update demographic chart with Overall Normalized Vote Share (cumulative) for last 16 days
         Filtered by demographic category
@@ -1247,6 +1482,7 @@ class CompleteReportGenerator:
             chart: Chart object from slide
             demographic_type: 'Gender', 'Location', 'Religion', 'Social Category', 'Age'
             demographic_value: Value to filter by
+            precomputed: Result of compute_demographic_chart (computed here if not given)
         
         Returns:
             Sample size used for calculations (for updating Base text)
@@ -1254,9 +1490,9 @@ class CompleteReportGenerator:
         from pptx.chart.data import CategoryChartData
         
         # Calculate Overall Normalized Vote Share (cumulative) for this demographic
-        daily_data = self.calculate_overall_normalized_for_demographic(
-            demographic_type, demographic_value, num_days=16
-        )
+        if precomputed is None:
+            precomputed = self.compute_demographic_chart(demographic_type, demographic_value, is_7dma=False)
+        daily_data = precomputed['daily_data']
         
         if len(daily_data) == 0:
             print(f"Warning: No data found for {demographic_type}={demographic_value}")
@@ -1282,13 +1518,14 @@ class CompleteReportGenerator:
         chart_data.add_series('Others', others_values)
         chart_data.add_series('N+W+R', nwr_values)
         
-        chart.replace_data(chart_data)
+        self.chart_writer.replace_data(chart, chart_data)
+        self._add_confidence_error_bars(chart, daily_data)
         
         # Set axis labels to vertical rotation (like format final file)
         self._set_axis_labels_vertical(chart)
         
-        # Calculate sample size: all records up to reference_date, filtered by demographic
-        sample_size = self._get_demographic_sample_size(demographic_type, demographic_value, is_7dma=False)
+        # Sample size: all records up to reference_date, filtered by demographic
+        sample_size = precomputed['sample_size']
         
         print(f"Updated chart for {demographic_type}={demographic_value} with {len(daily_data)} days of data")
         return sample_size
@@ -1306,65 +1543,9 @@ class CompleteReportGenerator:
         Returns:
             List of dictionaries with date and vote shares for each party
         """
-        # Get demographic column name
-        demographic_column_map = {
-            'Gender': 'Gender',
-            'Location': 'Residential locality type',
-            'Religion': '20. Could you please tell me the religion that you belong to?',
-            'Social Category': '21. Which social category do you belong to?',
-            'Age': 'Could you please tell me your age in complete years?'
-        }
-        
-        demographic_column = demographic_column_map.get(demographic_type)
-        if not demographic_column or demographic_column not in self.df.columns:
-            return []
-        
-        # Create filter for demographic (same logic as calculate_overall_normalized_for_demographic)
-        if demographic_type == 'Gender':
-            if demographic_value == 'Male':
-                demographic_filter = self.df[demographic_column] == 1
-            elif demographic_value == 'Female':
-                demographic_filter = self.df[demographic_column] == 2
-            else:
-                return []
-        elif demographic_type == 'Location':
-            if demographic_value == 'Urban':
-                demographic_filter = self.df[demographic_column] == 1
-            elif demographic_value == 'Rural':
-                demographic_filter = self.df[demographic_column] == 2
-            else:
-                return []
-        elif demographic_type == 'Religion':
-            if demographic_value == 'Hindu':
-                demographic_filter = self.df[demographic_column] == 1
-            elif demographic_value == 'Muslim':
-                demographic_filter = self.df[demographic_column] == 2
-            else:
-                return []
-        elif demographic_type == 'Social Category':
-            if demographic_value == 'General+OBC':
-                demographic_filter = self.df[demographic_column].isin([1, 2])
-            elif demographic_value == 'SC':
-                demographic_filter = self.df[demographic_column] == 3
-            elif demographic_value == 'ST':
-                demographic_filter = self.df[demographic_column] == 4
-            else:
-                return []
-        elif demographic_type == 'Age':
-            age_col = self.df[demographic_column]
-            age_numeric = pd.to_numeric(age_col, errors='coerce')
-            
-            if demographic_value == '18-25':
-                demographic_filter = (age_numeric >= 18) & (age_numeric <= 25)
-            elif demographic_value == '26-34':
-                demographic_filter = (age_numeric >= 26) & (age_numeric <= 34)
-            elif demographic_value == '36-50':
-                demographic_filter = (age_numeric >= 36) & (age_numeric <= 50)
-            elif demographic_value == '50+':
-                demographic_filter = age_numeric > 50
-            else:
-                return []
-        else:
+        # Demographic segment mask (built once per dataset, shared by all demographic charts)
+        demographic_filter = self.segments.get_mask(demographic_type, demographic_value)
+        if demographic_filter is None:
             return []
         
         # Calculate dates: last N days ending at reference_date (matching Slide 7)
@@ -1384,6 +1565,15 @@ class CompleteReportGenerator:
         
         daily_vote_shares = []
         
+        # For 7DMA, use L7D weights when >=50% available, otherwise use regular weights
+        # This matches the final PPT behavior where L7D weights are only used when sufficient
+        l7d_col = self.get_weight_column('Region', 'L7D') or 'Weight Voteshare L7D Region Level'
+        regular_col = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
+        series = self.daily_aggregates.get_series(
+            [l7d_col, regular_col], segment=(demographic_type, demographic_value), mask=demographic_filter
+        )
+        max_survey_date = self.df['Survey Date'].max()
+        
         for date in target_dates:
             # For each date, calculate 7 DMA: end_date is one day before the date point
             # So if date is Oct 31, use Oct 24-30 (7 days ending on Oct 30, excluding Oct 31)
@@ -1391,78 +1581,20 @@ class CompleteReportGenerator:
             actual_end_date = date - timedelta(days=1)  # One day before the date point
             cutoff = actual_end_date - timedelta(days=6)  # 6 days before end_date = 7 days total
             
-            # Filter data: by demographic AND 7 DMA date range
-            max_end_date = min(actual_end_date, self.reference_date - timedelta(days=1), self.df['Survey Date'].max())
-            date_data = self.df[
-                (self.df['Survey Date'] >= cutoff) & 
-                (self.df['Survey Date'] <= max_end_date) &
-                (self.df['Survey Date'] <= self.reference_date - timedelta(days=1)) &
-                demographic_filter
-            ].copy()
+            # Window: by demographic AND 7 DMA date range (not exceeding reference_date - 1)
+            max_end_date = min(actual_end_date, self.reference_date - timedelta(days=1), max_survey_date)
+            window = series.window_totals(start=cutoff, end=max_end_date)
             
-            if len(date_data) > 0:
-                # For 7DMA, use L7D weights when >=50% available, otherwise use regular weights
-                # This matches the final PPT behavior where L7D weights are only used when sufficient
-                l7d_col = self.get_weight_column('Region', 'L7D') or 'Weight Voteshare L7D Region Level'
-                regular_col = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
-                
-                # Check if L7D weights are available
-                l7d_available = date_data[l7d_col].notna().sum()
-                total_records = len(date_data)
-                
-                # For 7DMA: Use L7D weights if >=50% of records have L7D weights, otherwise use regular weights
-                # This ensures we don't use sparse L7D weights which give incorrect results
-                if l7d_available > 0 and (l7d_available / total_records) >= 0.5:
-                    # Use L7D weights - filter to only records with L7D weights
-                    date_data_with_weights = date_data[date_data[l7d_col].notna()].copy()
-                    weight_column = l7d_col
-                else:
-                    # Fall back to regular weights when L7D weights are sparse (<50%)
-                    date_data_with_weights = date_data.copy()
-                    weight_column = regular_col
-                
-                vote_shares = self.calculator.calculate_vote_share(
-                    date_data_with_weights,
-                    weight_column=weight_column,
-                    use_weights=True
-                )
-                
-                # Convert date to Excel serial number for chart (matching final PPT format)
-                excel_epoch = datetime(1899, 12, 30)
-                excel_serial = (date - excel_epoch).days
-                
-                daily_vote_shares.append({
-                    'date': date,
-                    'date_label': date.strftime('%m/%d/%Y'),
-                    'excel_serial': excel_serial,  # Excel serial number for chart
-                    'AITC': vote_shares.get('AITC', 0),
-                    'BJP': vote_shares.get('BJP', 0),
-                    'LEFT': vote_shares.get('LEFT', 0),
-                    'INC': vote_shares.get('INC', 0),
-                    'Others': vote_shares.get('Others', 0),
-                    'NWR': vote_shares.get('NWR', 0)
-                })
+            if window['records'].sum() > 0:
+                vote_shares = self._get_7dma_vote_shares(window, l7d_col, regular_col, label=f"{demographic_type}={demographic_value} 7DMA chart", date=date)
+                daily_vote_shares.append(self._build_daily_vote_share_entry(date, vote_shares))
             else:
                 # If no data for this date, still add entry with zero values
-                # Convert date to Excel serial number for chart
-                excel_epoch = datetime(1899, 12, 30)
-                excel_serial = (date - excel_epoch).days
-                
-                daily_vote_shares.append({
-                    'date': date,
-                    'date_label': date.strftime('%m/%d/%Y'),
-                    'excel_serial': excel_serial,  # Excel serial number for chart
-                    'AITC': 0,
-                    'BJP': 0,
-                    'LEFT': 0,
-                    'INC': 0,
-                    'Others': 0,
-                    'NWR': 0
-                })
+                daily_vote_shares.append(self._build_daily_vote_share_entry(date))
         
         return daily_vote_shares
     
-    def update_7dma_demographic_chart(self, chart, demographic_type, demographic_value):
+    def update_7dma_demographic_chart(self, chart, demographic_type, demographic_value, precomputed=None):
         """
         Update demographic 7 DMA chart with 7 DMA Normalized Vote Share for last 13 days
         Filtered by demographic category
@@ -1471,6 +1603,7 @@ class CompleteReportGenerator:
             chart: Chart object from slide
             demographic_type: 'Gender', 'Location', 'Religion', 'Social Category', 'Age'
             demographic_value: Value to filter by
+            precomputed: Result of compute_demographic_chart (computed here if not given)
         
         Returns:
             Sample size used for calculations (for updating Base text)
@@ -1478,9 +1611,9 @@ class CompleteReportGenerator:
         from pptx.chart.data import CategoryChartData
         
         # Calculate 7 DMA Normalized Vote Share for this demographic
-        daily_data = self.calculate_7dma_for_demographic(
-            demographic_type, demographic_value, num_days=13
-        )
+        if precomputed is None:
+            precomputed = self.compute_demographic_chart(demographic_type, demographic_value, is_7dma=True)
+        daily_data = precomputed['daily_data']
         
         if len(daily_data) == 0:
             print(f"Warning: No data found for 7 DMA {demographic_type}={demographic_value}")
@@ -1508,13 +1641,14 @@ class CompleteReportGenerator:
         chart_data.add_series('Others', others_values)
         chart_data.add_series('N+W+R', nwr_values)
         
-        chart.replace_data(chart_data)
+        self.chart_writer.replace_data(chart, chart_data)
+        self._add_confidence_error_bars(chart, daily_data)
         
         # Set axis labels to vertical rotation (like format final file)
         self._set_axis_labels_vertical(chart)
         
-        # Calculate sample size: 7DMA window, filtered by demographic
-        sample_size = self._get_demographic_sample_size(demographic_type, demographic_value, is_7dma=True)
+        # Sample size: 7DMA window, filtered by demographic
+        sample_size = precomputed['sample_size']
         
         print(f"Updated 7 DMA chart for {demographic_type}={demographic_value} with {len(daily_data)} days of data")
         return sample_size
@@ -1531,84 +1665,15 @@ class CompleteReportGenerator:
         Returns:
             Sample size (number of records)
         """
-        # Get demographic column name
-        demographic_column_map = {
-            'Gender': 'Gender',
-            'Location': 'Residential locality type',
-            'Religion': '20. Could you please tell me the religion that you belong to?',
-            'Social Category': '21. Which social category do you belong to?',
-            'Age': 'Could you please tell me your age in complete years?'
-        }
-        
-        demographic_column = demographic_column_map.get(demographic_type)
-        if not demographic_column or demographic_column not in self.df.columns:
-            return 0
-        
-        # Create filter for demographic
-        if demographic_type == 'Gender':
-            if demographic_value == 'Male':
-                demographic_filter = self.df[demographic_column] == 1
-            elif demographic_value == 'Female':
-                demographic_filter = self.df[demographic_column] == 2
-            else:
-                return 0
-        elif demographic_type == 'Location':
-            if demographic_value == 'Urban':
-                demographic_filter = self.df[demographic_column] == 1
-            elif demographic_value == 'Rural':
-                demographic_filter = self.df[demographic_column] == 2
-            else:
-                return 0
-        elif demographic_type == 'Religion':
-            if demographic_value == 'Hindu':
-                demographic_filter = self.df[demographic_column] == 1
-            elif demographic_value == 'Muslim':
-                demographic_filter = self.df[demographic_column] == 2
-            else:
-                return 0
-        elif demographic_type == 'Social Category':
-            if demographic_value == 'General+OBC':
-                demographic_filter = self.df[demographic_column].isin([1, 2])
-            elif demographic_value == 'SC':
-                demographic_filter = self.df[demographic_column] == 3
-            elif demographic_value == 'ST':
-                demographic_filter = self.df[demographic_column] == 4
-            else:
-                return 0
-        elif demographic_type == 'Age':
-            age_col = self.df[demographic_column]
-            age_numeric = pd.to_numeric(age_col, errors='coerce')
-            if demographic_value == '18-25':
-                demographic_filter = (age_numeric >= 18) & (age_numeric <= 25)
-            elif demographic_value == '26-34':
-                demographic_filter = (age_numeric >= 26) & (age_numeric <= 34)
-            elif demographic_value == '36-50':
-                demographic_filter = (age_numeric >= 36) & (age_numeric <= 50)
-            elif demographic_value == '50+':
-                demographic_filter = age_numeric > 50
-            else:
-                return 0
-        else:
-            return 0
-        
         if is_7dma:
             # For 7DMA: use last 7 days ending one day before reference_date
             end_date_7dma = self.reference_date - timedelta(days=1)
             cutoff_7dma = end_date_7dma - timedelta(days=6)
-            date_filter = (self.df['Survey Date'] >= cutoff_7dma) & (self.df['Survey Date'] <= end_date_7dma)
-            
-            filtered_data = self.df[date_filter & demographic_filter].copy()
-            
-            # Sample size: only count records with non-empty responses to main question
-            sample_size = self.get_sample_size(filtered_data)
-        else:
-            # For Overall: use all data up to reference_date
-            date_filter = self.df['Survey Date'] <= self.reference_date
-            filtered_data = self.df[date_filter & demographic_filter].copy()
-            # Sample size: only count records with non-empty responses to main question
-            sample_size = self.get_sample_size(filtered_data)
+            return self.segments.get_sample_size(demographic_type, demographic_value, start=cutoff_7dma, end=end_date_7dma)
         
-        return sample_size
+        # For Overall: use all data up to reference_date
+        # Sample size: only count records with non-empty responses to main question
+        return self.segments.get_sample_size(demographic_type, demographic_value, end=self.reference_date)
     
     def update_base_text_on_slide(self, slide, sample_size, slide_num=None):
         """
@@ -1630,220 +1695,18 @@ class CompleteReportGenerator:
         if slide_num is not None and slide_num in [47, 48]:
             return False
         
-        found_and_updated = False
-        
         # Specific handling for Gains and Losses demographic slides 49-61
         is_gains_losses_demographic_slide = (slide_num is not None and 49 <= slide_num <= 61)
         
-        def update_text_in_shape(shape):
-            """Recursive function to update Base text in any shape"""
-            nonlocal found_and_updated
-            
-            # Check text frame
-            if hasattr(shape, 'text_frame') and shape.text_frame:
-                text_frame = shape.text_frame
-                # Try to disable word wrap to keep text on one line
-                try:
-                    text_frame.word_wrap = False
-                except:
-                    pass
-                
-                for paragraph in shape.text_frame.paragraphs:
-                    # Get full paragraph text (may span multiple runs)
-                    full_paragraph_text = ''.join([run.text for run in paragraph.runs])
-                    
-                    if is_gains_losses_demographic_slide:
-                        # For slides 49-61, specifically look for "Base of all eligible voters of 2021 : {number}"
-                        # and replace only the number, keeping the text "Base of all eligible voters of 2021 :"
-                        # First, try to match the full text with a number
-                        pattern_gains_losses_base = r'(Base of all eligible voters of 2021\s*:?\s*)(\d{1,3}(?:,\d{3})*)'
-                        match = re.search(pattern_gains_losses_base, full_paragraph_text, re.IGNORECASE)
-                        if match:
-                            # Replace only the number part (group 2), keep the text (group 1)
-                            # Use lambda to avoid issues with comma-formatted numbers in replacement string
-                            # Remove any newlines and ensure single line
-                            # Replace only the number, keeping text on same line
-                            new_text = re.sub(pattern_gains_losses_base, lambda m: f'{m.group(1).strip()} {sample_size:,}', full_paragraph_text, flags=re.IGNORECASE)
-                            # Remove all newlines and extra whitespace, ensure single line
-                            new_text = re.sub(r'\s+', ' ', new_text.replace('\n', ' ').replace('\r', ' ')).strip()
-                            # Clear all runs and set new text in first run
-                            paragraph.clear()
-                            run = paragraph.add_run()
-                            run.text = new_text
-                            found_and_updated = True
-                            return True
-                        # Also check if text contains "Base of all eligible voters of 2021" but no number yet
-                        if 'Base of all eligible voters of 2021' in full_paragraph_text or 'base of all eligible voters of 2021' in full_paragraph_text.lower():
-                            # Replace any existing number pattern after the text, or append if no number
-                            pattern_gains_losses_base_no_num = r'(Base of all eligible voters of 2021\s*:?\s*)(\d{1,3}(?:,\d{3})*)?'
-                            new_text = re.sub(pattern_gains_losses_base_no_num, f'Base of all eligible voters of 2021 : {sample_size:,}', full_paragraph_text, flags=re.IGNORECASE)
-                            # Remove all newlines and extra whitespace, ensure single line
-                            new_text = re.sub(r'\s+', ' ', new_text.replace('\n', ' ').replace('\r', ' ')).strip()
-                            # Clear all runs and set new text in first run
-                            paragraph.clear()
-                            run = paragraph.add_run()
-                            run.text = new_text
-                            found_and_updated = True
-                            return True
-                        # Also handle case where it might be "Base: {number}" and we need to replace with full text
-                        pattern_base_colon = r'(Base\s*:\s*)(\d{1,3}(?:,\d{3})*)'
-                        match = re.search(pattern_base_colon, full_paragraph_text, re.IGNORECASE)
-                        if match:
-                            # Replace "Base: {number}" with "Base of all eligible voters of 2021 : {sample_size}"
-                            new_text = f"Base of all eligible voters of 2021 : {sample_size:,}"
-                            # Remove all newlines and extra whitespace, ensure single line
-                            new_text = re.sub(r'\s+', ' ', new_text.replace('\n', ' ').replace('\r', ' ')).strip()
-                            # Clear all runs and set new text in first run
-                            paragraph.clear()
-                            run = paragraph.add_run()
-                            run.text = new_text
-                            # Disable word wrap if possible (to keep on one line)
-                            if hasattr(paragraph, 'text_frame'):
-                                try:
-                                    paragraph.text_frame.word_wrap = False
-                                except:
-                                    pass
-                            found_and_updated = True
-                            return True
-                    else:
-                        # For other slides (6, 7, 14-36, 44, 45, 63, 64), use existing patterns
-                        # Get full paragraph text (may span multiple runs) to avoid duplicates
-                        full_paragraph_text = ''.join([run.text for run in paragraph.runs])
-                        
-                        patterns = [
-                            # Pattern 1: "Base: 12,345" or "Base 12,345"
-                            (r'(Base\s*:?\s*)(\d{1,3}(?:,\d{3})*)', lambda m: f'{m.group(1)}{sample_size:,}'),
-                            # Pattern 2: "Base: 12345" or "Base 12345" (no commas)
-                            (r'(Base\s*:?\s*)(\d+)', lambda m: f'{m.group(1)}{sample_size:,}'),
-                            # Pattern 3: "Base: 12 345" (space-separated)
-                            (r'(Base\s*:?\s*)(\d{1,3}(?:\s+\d{3})*)', lambda m: f'{m.group(1)}{sample_size:,}'),
-                        ]
-                        
-                        for pattern, replacement in patterns:
-                            match = re.search(pattern, full_paragraph_text, re.IGNORECASE)
-                            if match:
-                                new_text = re.sub(pattern, replacement, full_paragraph_text, flags=re.IGNORECASE)
-                                # Remove all newlines and extra whitespace, ensure single line
-                                new_text = re.sub(r'\s+', ' ', new_text.replace('\n', ' ').replace('\r', ' ')).strip()
-                                # Clear all runs and set new text in first run
-                                paragraph.clear()
-                                run = paragraph.add_run()
-                                run.text = new_text
-                                found_and_updated = True
-                                return True
-                        
-                        # Also check if text contains "Base" but no number yet (append number)
-                        if 'Base' in full_paragraph_text and not re.search(r'\d', full_paragraph_text):
-                            # Append sample size after "Base"
-                            if full_paragraph_text.strip().endswith('Base') or full_paragraph_text.strip().endswith('Base:'):
-                                new_text = f"{full_paragraph_text.strip()} {sample_size:,}"
-                            else:
-                                # Replace "Base" with "Base: sample_size"
-                                new_text = re.sub(r'Base\s*:?', f'Base: {sample_size:,}', full_paragraph_text, flags=re.IGNORECASE)
-                            # Remove all newlines and extra whitespace, ensure single line
-                            new_text = re.sub(r'\s+', ' ', new_text.replace('\n', ' ').replace('\r', ' ')).strip()
-                            # Clear all runs and set new text in first run
-                            paragraph.clear()
-                            run = paragraph.add_run()
-                            run.text = new_text
-                            found_and_updated = True
-                            return True
-            
-            # Check table cells
-            if hasattr(shape, 'has_table') and shape.has_table:
-                table = shape.table
-                for row in table.rows:
-                    for cell in row.cells:
-                        if hasattr(cell, 'text_frame') and cell.text_frame:
-                            for paragraph in cell.text_frame.paragraphs:
-                                for run in paragraph.runs:
-                                    text = run.text
-                                    
-                                    if is_gains_losses_demographic_slide:
-                                        # For slides 49-61, get full paragraph text (may span multiple runs)
-                                        full_cell_text = ''.join([r.text for r in paragraph.runs])
-                                        
-                                        # First, try to match the full text with a number
-                                        pattern_gains_losses_base = r'(Base of all eligible voters of 2021\s*:?\s*)(\d{1,3}(?:,\d{3})*)'
-                                        match = re.search(pattern_gains_losses_base, full_cell_text, re.IGNORECASE)
-                                        if match:
-                                            # Replace only the number part (group 2), keep the text (group 1)
-                                            # Use lambda to avoid issues with comma-formatted numbers in replacement string
-                                            # Replace only the number, keeping text on same line
-                                            new_text = re.sub(pattern_gains_losses_base, lambda m: f'{m.group(1).strip()} {sample_size:,}', full_cell_text, flags=re.IGNORECASE)
-                                            # Remove all newlines and extra whitespace, ensure single line
-                                            new_text = re.sub(r'\s+', ' ', new_text.replace('\n', ' ').replace('\r', ' ')).strip()
-                                            # Clear all runs and set new text in first run
-                                            paragraph.clear()
-                                            run = paragraph.add_run()
-                                            run.text = new_text
-                                            found_and_updated = True
-                                            return True
-                                        # Also check if text contains "Base of all eligible voters of 2021" but no number yet
-                                        if 'Base of all eligible voters of 2021' in full_cell_text or 'base of all eligible voters of 2021' in full_cell_text.lower():
-                                            # Replace any existing number pattern after the text, or append if no number
-                                            pattern_gains_losses_base_no_num = r'(Base of all eligible voters of 2021\s*:?\s*)(\d{1,3}(?:,\d{3})*)?'
-                                            new_text = re.sub(pattern_gains_losses_base_no_num, f'Base of all eligible voters of 2021 : {sample_size:,}', full_cell_text, flags=re.IGNORECASE)
-                                            # Remove all newlines and extra whitespace, ensure single line
-                                            new_text = re.sub(r'\s+', ' ', new_text.replace('\n', ' ').replace('\r', ' ')).strip()
-                                            # Clear all runs and set new text in first run
-                                            paragraph.clear()
-                                            run = paragraph.add_run()
-                                            run.text = new_text
-                                            found_and_updated = True
-                                            return True
-                                        # Also handle case where it might be "Base: {number}" and we need to replace with full text
-                                        pattern_base_colon = r'(Base\s*:\s*)(\d{1,3}(?:,\d{3})*)'
-                                        match = re.search(pattern_base_colon, full_cell_text, re.IGNORECASE)
-                                        if match:
-                                            # Replace "Base: {number}" with "Base of all eligible voters of 2021 : {sample_size}"
-                                            new_text = f"Base of all eligible voters of 2021 : {sample_size:,}"
-                                            # Remove all newlines and extra whitespace, ensure single line
-                                            new_text = re.sub(r'\s+', ' ', new_text.replace('\n', ' ').replace('\r', ' ')).strip()
-                                            # Clear all runs and set new text in first run
-                                            paragraph.clear()
-                                            run = paragraph.add_run()
-                                            run.text = new_text
-                                            found_and_updated = True
-                                            return True
-                                    else:
-                                        # Check for Base pattern in table cells
-                                        # Get full paragraph text (may span multiple runs) to avoid duplicates
-                                        full_cell_text = ''.join([r.text for r in paragraph.runs])
-                                        
-                                        patterns = [
-                                            # Pattern 1: "Base: 12,345" or "Base 12,345"
-                                            (r'(Base\s*:?\s*)(\d{1,3}(?:,\d{3})*)', lambda m: f'{m.group(1)}{sample_size:,}'),
-                                            # Pattern 2: "Base: 12345" or "Base 12345" (no commas)
-                                            (r'(Base\s*:?\s*)(\d+)', lambda m: f'{m.group(1)}{sample_size:,}'),
-                                        ]
-                                        for pattern, replacement in patterns:
-                                            match = re.search(pattern, full_cell_text, re.IGNORECASE)
-                                            if match:
-                                                new_text = re.sub(pattern, replacement, full_cell_text, flags=re.IGNORECASE)
-                                                # Remove all newlines and extra whitespace, ensure single line
-                                                new_text = re.sub(r'\s+', ' ', new_text.replace('\n', ' ').replace('\r', ' ')).strip()
-                                                # Clear all runs and set new text in first run
-                                                paragraph.clear()
-                                                run = paragraph.add_run()
-                                                run.text = new_text
-                                                found_and_updated = True
-                                                return True
-            
-            # Check group shapes (recursive)
-            if hasattr(shape, 'shapes'):
-                for sub_shape in shape.shapes:
-                    if update_text_in_shape(sub_shape):
-                        return True
-            
-            return False
-        
-        # Search all shapes on the slide
-        for shape in slide.shapes:
-            if update_text_in_shape(shape):
-                break
+        # Bound Base text paragraph from the template map
+        if self.template_map is not None and slide_num is not None:
+            updated = self.template_map.update_base_text(slide, slide_num, sample_size,
+                                                         gains_losses=is_gains_losses_demographic_slide)
+            if updated is not None:
+                return updated
         
-        return found_and_updated
+        # Search all shapes on the slide (text frames, tables, and group shapes)
+        return update_base_text(slide, sample_size, gains_losses=is_gains_losses_demographic_slide)
     
     def update_slide_6_chart(self, chart):
         """
@@ -1904,7 +1767,8 @@ class CompleteReportGenerator:
         chart_data.add_series('N+W+R', nwr_values)
         
         # Single clean replace_data call (avoid multiple updates)
-        chart.replace_data(chart_data)
+        self.chart_writer.replace_data(chart, chart_data)
+        self._add_confidence_error_bars(chart, daily_data)
         
         # Set axis labels to vertical rotation (like format final file)
         self._set_axis_labels_vertical(chart)
@@ -1956,6 +1820,13 @@ class CompleteReportGenerator:
         
         daily_vote_shares = []
         
+        # For 7DMA, use L7D weights when >=50% available, otherwise use regular weights
+        # This matches the final PPT behavior where L7D weights are only used when sufficient
+        l7d_col = self.get_weight_column('Region', 'L7D') or 'Weight Voteshare L7D Region Level'
+        regular_col = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
+        series = self.daily_aggregates.get_series([l7d_col, regular_col])
+        max_survey_date = self.df['Survey Date'].max()
+        
         for date in target_dates:
             # For each date, calculate 7 DMA: end_date is one day before the date point
             # So if date is Oct 31, use Oct 24-30 (7 days ending on Oct 30, excluding Oct 31)
@@ -1963,73 +1834,16 @@ class CompleteReportGenerator:
             actual_end_date = date - timedelta(days=1)  # One day before the date point
             cutoff = actual_end_date - timedelta(days=6)  # 6 days before end_date = 7 days total
             
-            # Filter data: from cutoff to actual_end_date, and not exceed reference_date - 1
-            max_end_date = min(actual_end_date, self.reference_date - timedelta(days=1), self.df['Survey Date'].max())
-            date_data = self.df[
-                (self.df['Survey Date'] >= cutoff) & 
-                (self.df['Survey Date'] <= max_end_date) &
-                (self.df['Survey Date'] <= self.reference_date - timedelta(days=1))
-            ].copy()
+            # Window: from cutoff to actual_end_date, and not exceed reference_date - 1
+            max_end_date = min(actual_end_date, self.reference_date - timedelta(days=1), max_survey_date)
+            window = series.window_totals(start=cutoff, end=max_end_date)
             
-            if len(date_data) > 0:
-                # For 7DMA, use L7D weights when >=50% available, otherwise use regular weights
-                # This matches the final PPT behavior where L7D weights are only used when sufficient
-                l7d_col = self.get_weight_column('Region', 'L7D') or 'Weight Voteshare L7D Region Level'
-                regular_col = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
-                
-                # Check if L7D weights are available
-                l7d_available = date_data[l7d_col].notna().sum()
-                total_records = len(date_data)
-                
-                # For 7DMA: Use L7D weights if >=50% of records have L7D weights, otherwise use regular weights
-                # This ensures we don't use sparse L7D weights which give incorrect results
-                if l7d_available > 0 and (l7d_available / total_records) >= 0.5:
-                    # Use L7D weights - filter to only records with L7D weights
-                    date_data_with_weights = date_data[date_data[l7d_col].notna()].copy()
-                    weight_column = l7d_col
-                else:
-                    # Fall back to regular weights when L7D weights are sparse (<50%)
-                    date_data_with_weights = date_data.copy()
-                    weight_column = regular_col
-                
-                vote_shares = self.calculator.calculate_vote_share(
-                    date_data_with_weights,
-                    weight_column=weight_column,
-                    use_weights=True
-                )
-                
-                # Convert date to Excel serial number for chart (matching final PPT format)
-                excel_epoch = datetime(1899, 12, 30)
-                excel_serial = (date - excel_epoch).days
-                
-                daily_vote_shares.append({
-                    'date': date,
-                    'date_label': date.strftime('%m/%d/%Y'),
-                    'excel_serial': excel_serial,  # Excel serial number for chart
-                    'AITC': vote_shares.get('AITC', 0),
-                    'BJP': vote_shares.get('BJP', 0),
-                    'LEFT': vote_shares.get('LEFT', 0),
-                    'INC': vote_shares.get('INC', 0),
-                    'Others': vote_shares.get('Others', 0),
-                    'NWR': vote_shares.get('NWR', 0)
-                })
+            if window['records'].sum() > 0:
+                vote_shares = self._get_7dma_vote_shares(window, l7d_col, regular_col, label='State 7DMA chart', date=date)
+                daily_vote_shares.append(self._build_daily_vote_share_entry(date, vote_shares))
             else:
                 # If no data for this date, still add entry with zero values
-                # Convert date to Excel serial number for chart
-                excel_epoch = datetime(1899, 12, 30)
-                excel_serial = (date - excel_epoch).days
-                
-                daily_vote_shares.append({
-                    'date': date,
-                    'date_label': date.strftime('%m/%d/%Y'),
-                    'excel_serial': excel_serial,  # Excel serial number for chart
-                    'AITC': 0,
-                    'BJP': 0,
-                    'LEFT': 0,
-                    'INC': 0,
-                    'Others': 0,
-                    'NWR': 0
-                })
+                daily_vote_shares.append(self._build_daily_vote_share_entry(date))
         
         return daily_vote_shares
     
@@ -2079,23 +1893,14 @@ class CompleteReportGenerator:
         chart_data.add_series('N+W+R', nwr_values)
         
         # Single clean replace_data call
-        chart.replace_data(chart_data)
+        self.chart_writer.replace_data(chart, chart_data)
+        self._add_confidence_error_bars(chart, daily_data)
         
         # Set axis labels to vertical rotation (like format final file)
         self._set_axis_labels_vertical(chart)
         
         # Calculate sample size: 7DMA window (last 7 days ending one day before reference_date)
-        end_date_7dma = self.reference_date - timedelta(days=1)
-        cutoff_7dma = end_date_7dma - timedelta(days=6)
-        dma7_data = self.df[
-            (self.df['Survey Date'] >= cutoff_7dma) & 
-            (self.df['Survey Date'] <= end_date_7dma)
-        ].copy()
-        
-        # Check if L7D weights are available
-        l7d_col = self.get_weight_column('Region', 'L7D') or 'Weight Voteshare L7D Region Level'
-        l7d_available = dma7_data[l7d_col].notna().sum()
-        total_records = len(dma7_data)
+        dma7_data = self.get_named_window('L7D')
         
         # Sample size: only count records with non-empty responses to main question
         sample_size = self.get_sample_size(dma7_data)
@@ -2146,16 +1951,10 @@ class CompleteReportGenerator:
         # Filter data based on 7 DMA or overall
         if is_7dma:
             # For 7 DMA: use last 7 days ending one day before reference_date
-            end_date = self.reference_date - timedelta(days=1)
-            cutoff = end_date - timedelta(days=6)
-            filtered_df = self.df[
-                (self.df['Survey Date'] >= cutoff) &
-                (self.df['Survey Date'] <= end_date) &
-                (self.df['Survey Date'] <= self.reference_date - timedelta(days=1))
-            ].copy()
+            filtered_df = self.get_named_window('L7D')
         else:
             # For overall: use all data up to reference_date
-            filtered_df = self.df[self.df['Survey Date'] <= self.reference_date].copy()
+            filtered_df = self.get_named_window('Overall')
         
         # For 7DMA, ALWAYS use L7D weights (as per user requirement)
         # Filter to only include records with L7D weights when available
@@ -2163,15 +1962,12 @@ class CompleteReportGenerator:
         regular_col = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
         
         if is_7dma:
-            # Check if L7D weights are available
-            l7d_available = filtered_df[l7d_col].notna().sum()
-            total_records = len(filtered_df)
-            
             # For 7DMA: Use L7D weights if >=50% of records have L7D weights, otherwise use regular weights
             # This ensures we don't use sparse L7D weights which give incorrect results
-            if l7d_available > 0 and (l7d_available / total_records) >= 0.5:
+            if self.use_period_weights('L7D', *self.calculator.get_window_bounds(7, self.reference_date),
+                                       label=f"Top reasons ({party}) 7DMA")[0]:
                 # Use L7D weights - filter to only records with L7D weights
-                filtered_df = filtered_df[filtered_df[l7d_col].notna()].copy()
+                filtered_df = filtered_df.notna(l7d_col)
                 weight_col = l7d_col
             else:
                 # Fall back to regular weights when L7D weights are sparse (<50%)
@@ -2181,13 +1977,13 @@ class CompleteReportGenerator:
         
         weights = pd.to_numeric(filtered_df[weight_col], errors='coerce').fillna(0)
         
-        # Get reason columns based on party
+        # Get reason options based on party
         if party == 'AITC':
             # Question 11: "In your opinion what are the top 3 reasons for voting for AITC?"
-            reason_prefix = '11. In your opinion what are the top 3 reasons for voting for AITC?'
+            reasons = self.multi_select.get('Q11')
         elif party == 'BJP':
             # Question 12: "In your opinion what are the top 3 reasons for voting for BJP?"
-            reason_prefix = '12. In your opinion what are the top 3 reasons for voting for BJP?'
+            reasons = self.multi_select.get('Q12')
         else:
             return {'reasons': [], 'categories': []}
         
@@ -2217,25 +2013,21 @@ class CompleteReportGenerator:
                     return True
             return False
         
-        reason_cols = [col for col in self.df.columns 
-                       if str(col).startswith(reason_prefix) 
-                       and not should_exclude_column(str(col))]
+        reason_options = [option for option, col in enumerate(reasons.columns)
+                          if not should_exclude_column(str(col))]
+        
+        # Weighted counts of all reasons in one matrix-vector product
+        weighted_sums = reasons.weighted_totals(filtered_df, weights.to_numpy(), reason_options)
+        
+        # Total weighted responses = sum of all weights for records that selected at least one reason
+        total_weighted = weights.sum()
         
-        # Calculate weighted counts for each reason
         reason_counts = {}
-        for col in reason_cols:
-            # Extract reason text (everything after " - ")
-            reason_text = str(col).split(' - ')[-1] if ' - ' in str(col) else str(col)
-            
-            # Convert column to numeric (0 or 1)
-            reason_values = pd.to_numeric(filtered_df[col], errors='coerce').fillna(0)
-            
-            # Calculate weighted sum
-            weighted_sum = (reason_values * weights).sum()
+        for option, weighted_sum in zip(reason_options, weighted_sums):
+            # Reason text (everything after " - ")
+            reason_text = reasons.labels[option]
             
             # Calculate percentage (weighted sum / total weighted responses)
-            # Total weighted responses = sum of all weights for records that selected at least one reason
-            total_weighted = weights.sum()
             percentage = (weighted_sum / total_weighted * 100) if total_weighted > 0 else 0
             
             reason_counts[reason_text] = {
@@ -2260,6 +2052,14 @@ class CompleteReportGenerator:
         # Calculate sample size (number of records used in calculation)
         sample_size = len(filtered_df)
         
+        with self.calculator.calculation_context(metric=f"Top Reasons ({party})"):
+            self.calculator.record_item_shares(
+                'multi_select', weight_col,
+                {reason_text: data['weighted_count'] for reason_text, data in reason_counts.items()}, total_weighted,
+                {reason_text: data['percentage'] for reason_text, data in reason_counts.items()},
+                sample_size, sample_size, data_filtered=filtered_df
+            )
+        
         return {
             'reasons': mapped_reasons,  # List of (display_label, original_reason_text, {weighted_count, percentage})
             'categories': categories,  # Display labels (rephrased)
@@ -2303,7 +2103,7 @@ class CompleteReportGenerator:
         chart_data.add_series('AITC', aitc_values)
         
         # Replace chart data
-        chart.replace_data(chart_data)
+        self.chart_writer.replace_data(chart, chart_data)
         
         print(f"Updated chart with top 3 AITC reasons: {categories}")
         return sample_size
@@ -2319,29 +2119,9 @@ class CompleteReportGenerator:
         Returns:
             Party category string
         """
-        if pd.isna(party_code):
-            return 'NWR'
-        
-        try:
-            party_code = int(party_code)
-        except (ValueError, TypeError):
-            return 'NWR'
-        
-        # Main parties (same mapping as Q8)
-        if party_code == 1:
-            return 'AITC'
-        elif party_code == 2:
-            return 'BJP'
-        elif party_code == 3:
-            return 'INC'
-        elif party_code == 4:
-            return 'LEFT'
-        elif party_code in [12, 44]:
-            return 'Others'
-        elif party_code in [55, 66, 67, 77, 78, 88]:
-            return 'NWR'
-        else:
-            return 'Others'
+        # Same code frame as Q8 - bulk categorization uses the precomputed column
+        # (see calculator.get_party_categories)
+        return self.calculator.categorize_party(party_code)
     
     def calculate_ae2021_vote_shares_from_survey(self, data_filtered, weight_column=None, use_weights=True):
         """
@@ -2365,17 +2145,12 @@ class CompleteReportGenerator:
         if question_2021 not in data_filtered.columns:
             return {'AITC': 0, 'BJP': 0, 'LEFT': 0, 'INC': 0, 'Others': 0, 'NWR': 0}
         
-        vote_data = data_filtered[[question_2021]].copy()
-        
-        # Categorize parties
-        vote_data['party_category'] = vote_data[question_2021].apply(self.categorize_party_2021)
+        vote_data = pd.DataFrame({'party_category': self.calculator.get_party_categories(data_filtered, question_2021)})
         
         # Add weights
         if use_weights and weight_column and weight_column in data_filtered.columns:
-            vote_data = vote_data.reset_index(drop=True)
-            weights = data_filtered[weight_column].reset_index(drop=True)
-            vote_data['weight'] = pd.to_numeric(weights, errors='coerce')
-            vote_data = vote_data[vote_data['weight'].notna()].copy()
+            vote_data['weight'] = pd.to_numeric(data_filtered[weight_column], errors='coerce')
+            vote_data = vote_data[vote_data['weight'].notna()]
         else:
             vote_data['weight'] = 1.0
         
@@ -2386,11 +2161,19 @@ class CompleteReportGenerator:
         
         # Calculate weighted vote share for each party
         vote_shares = {}
+        party_weights = {}
         for party in ['AITC', 'BJP', 'LEFT', 'INC', 'Others', 'NWR']:
             party_mask = vote_data['party_category'] == party
             party_weight = vote_data.loc[party_mask, 'weight'].sum()
+            party_weights[party] = party_weight
             vote_shares[party] = (party_weight / total_weight) * 100
         
+        with self.calculator.calculation_context(metric='AE2021 Vote Share (Q5)'):
+            self.calculator.record_item_shares(
+                'options', weight_column if use_weights else None, party_weights, total_weight, vote_shares,
+                len(vote_data), len(vote_data), data_filtered=data_filtered
+            )
+        
         return vote_shares
     
     def calculate_gains_losses(self, data_filtered, is_7dma=False, demographic_type=None, demographic_value=None):
@@ -2412,218 +2195,174 @@ class CompleteReportGenerator:
         weight_column = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
         
         # Filter to only records that voted in 2021 (have valid Q5 response)
-        eligible_data = data_filtered[data_filtered[question_2021].notna()].copy()
+        eligible_data = data_filtered[data_filtered[question_2021].notna()]
         
         if len(eligible_data) == 0:
             return {'base_sample': 0, 'matrix': {}}
         
-        # Get weights
-        if weight_column in eligible_data.columns:
-            weights = pd.to_numeric(eligible_data[weight_column], errors='coerce')
-            eligible_data = eligible_data[weights.notna()].copy()
-            weights = pd.to_numeric(eligible_data[weight_column], errors='coerce')
-        else:
-            weights = pd.Series([1.0] * len(eligible_data), index=eligible_data.index)
+        # 2021 × 2025 weighted contingency table (records without a valid weight are excluded)
+        crosstab = self.calculator.calculate_party_crosstab(eligible_data, question_2021, question_2025, weight_column)
+        return self._get_gains_losses_from_crosstab(crosstab['weights'][0], crosstab['records'][0])
+    
+    def calculate_gains_losses_by_segment(self, data_filtered, demographic_type):
+        """
+        Gains and Losses table data of every segment of a demographic type in one pass
+        (each segment's result is the same as calculate_gains_losses on the segment's records)
+        
+        Args:
+            data_filtered: Filtered DataWindow (overall or 7DMA) over the loaded data
+            demographic_type: Demographic type (e.g. 'Age')
+        
+        Returns:
+            Dictionary segment value → calculate_gains_losses result (empty if the demographic is not available)
+        """
+        question_2021 = '5. Which party did you vote for in the last assembly elections (MLA) in 2021?'
+        question_2025 = '8. If assembly elections (MLA) were to be held tomorrow, then which party would you vote for?'
+        weight_column = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
+        demographic_column = self.segments.get_column(demographic_type)
+        if demographic_column is None:
+            return {}
+        
+        eligible_data = data_filtered[data_filtered[question_2021].notna()]
+        
+        # Extra grouping key: the demographic answer (blank answers are a group too). Every
+        # segment rule depends on the answer only, so a segment is a union of these groups
+        group_codes, group_values = pd.factorize(eligible_data[demographic_column], use_na_sentinel=False)
+        group_codes = group_codes.astype(np.int64)
+        crosstab = self.calculator.calculate_party_crosstab(
+            eligible_data, question_2021, question_2025, weight_column,
+            group_codes=group_codes, num_groups=len(group_values)
+        )
+        first_rows = np.unique(group_codes, return_index=True)[1]
+        eligible_records = np.bincount(group_codes, minlength=len(group_values))
+        
+        results = {}
+        for (segment_type, segment_value) in DEMOGRAPHIC_SEGMENTS:
+            if segment_type != demographic_type:
+                continue
+            mask = self.segments.get_mask(segment_type, segment_value)
+            if mask is None:
+                continue
+            # Segment groups: the groups whose first record is in the segment
+            in_segment = mask.to_numpy(dtype=bool)[eligible_data.rows[first_rows]]
+            if eligible_records[in_segment].sum() == 0:
+                results[segment_value] = {'base_sample': 0, 'matrix': {}}
+            else:
+                results[segment_value] = self._get_gains_losses_from_crosstab(
+                    crosstab['weights'][in_segment].sum(axis=0), crosstab['records'][in_segment].sum(axis=0)
+                )
+        return results
+    
+    def get_segment_gains_losses(self, demographic_type, is_7dma=False):
+        """
+        Get the Gains and Losses data of every segment of a demographic type (a metric graph node,
+        so the segments' slides share one pass)
         
-        # Categorize 2021 votes
-        eligible_data['party_2021'] = eligible_data[question_2021].apply(self.categorize_party_2021)
+        Args:
+            demographic_type: Demographic type (e.g. 'Age')
+            is_7dma: If True, use 7DMA data; if False, use Overall data
         
-        # Categorize 2025 votes
-        eligible_data['party_2025'] = eligible_data[question_2025].apply(self.calculator.categorize_party)
+        Returns:
+            Dictionary segment value → calculate_gains_losses result
+        """
+        key = ('gains_losses_by_segment', demographic_type, is_7dma)
+        if self.metrics is not None and key in self.metrics:
+            return self.metrics.get(key)
+        return self.calculate_gains_losses_by_segment(self.get_named_window('L7D' if is_7dma else 'Overall'),
+                                                      demographic_type)
+    
+    @staticmethod
+    def _get_gains_losses_from_crosstab(weights, records):
+        """
+        Gains and Losses table data from a 2021 × 2025 weighted contingency table
+        
+        Args:
+            weights: Sum of weights per (2021 party, 2025 party), PARTY_CATEGORIES order
+            records: Records per (2021 party, 2025 party)
         
-        # Calculate gains/losses matrix
+        Returns:
+            Dictionary with 'base_sample', 'matrix' (2021 party → 2025 party → percentage of the
+            2021 party's weight), 'total_2025_vote_shares' (the "Total" row) and the table's
+            'weights' / 'records' (for the audit records)
+        """
+        # Calculate gains/losses matrix: each 2021 row as percentages of its row total
         parties = ['AITC', 'BJP', 'LEFT', 'INC', 'Others', 'NWR']
         matrix = {}
         
-        for party_2021 in parties:
-            matrix[party_2021] = {}
-            party_2021_data = eligible_data[eligible_data['party_2021'] == party_2021].copy()
-            
-            if len(party_2021_data) == 0:
-                for party_2025 in parties:
-                    matrix[party_2021][party_2025] = 0.0
+        for row, party_2021 in enumerate(parties):
+            total_weight_2021 = weights[row].sum()
+            if records[row].sum() == 0 or total_weight_2021 == 0:
+                matrix[party_2021] = {party_2025: 0.0 for party_2025 in parties}
                 continue
-            
-            # Get weights for this 2021 party
-            party_2021_weights = weights[party_2021_data.index]
-            total_weight_2021 = party_2021_weights.sum()
-            
-            if total_weight_2021 == 0:
-                for party_2025 in parties:
-                    matrix[party_2021][party_2025] = 0.0
-                continue
-            
-            # Calculate percentage going to each 2025 party
-            for party_2025 in parties:
-                party_2025_mask = party_2021_data['party_2025'] == party_2025
-                party_2025_weights = party_2021_weights[party_2025_mask]
-                weight_sum = party_2025_weights.sum()
-                percentage = (weight_sum / total_weight_2021) * 100
-                matrix[party_2021][party_2025] = percentage
+            matrix[party_2021] = {
+                party_2025: (weights[row, column] / total_weight_2021) * 100
+                for column, party_2025 in enumerate(parties)
+            }
         
         # Calculate overall 2025 vote shares (for "Total" row)
         # This is the weighted average across all 2021 parties
-        total_2025_vote_shares = {}
         total_weight_all = weights.sum()
-        
+        column_weights = weights.sum(axis=0)
         if total_weight_all > 0:
-            for party_2025 in parties:
-                party_2025_mask = eligible_data['party_2025'] == party_2025
-                party_2025_weights = weights[party_2025_mask]
-                weight_sum = party_2025_weights.sum()
-                total_2025_vote_shares[party_2025] = (weight_sum / total_weight_all) * 100
+            total_2025_vote_shares = {party_2025: (column_weights[column] / total_weight_all) * 100
+                                      for column, party_2025 in enumerate(parties)}
         else:
-            for party_2025 in parties:
-                total_2025_vote_shares[party_2025] = 0.0
+            total_2025_vote_shares = {party_2025: 0.0 for party_2025 in parties}
         
         # Base sample size: count all eligible voters (those who voted in 2021)
-        base_sample = len(eligible_data)
+        base_sample = int(records.sum())
         
-        return {'base_sample': base_sample, 'matrix': matrix, 'total_2025_vote_shares': total_2025_vote_shares}
+        return {'base_sample': base_sample, 'matrix': matrix, 'total_2025_vote_shares': total_2025_vote_shares,
+                'weights': weights, 'records': records}
     
-    def update_gains_losses_table(self, table, is_7dma=False, is_demographic=False, demographic_type=None, demographic_value=None):
+    def compute_gains_losses_table(self, is_7dma=False, is_demographic=False, demographic_type=None, demographic_value=None):
         """
-        Update Gains and Losses table (Slides 47-61)
+        Compute the data behind a Gains and Losses table (no slide changes, so it can run in a worker process)
         
         Args:
-            table: Table object to update
             is_7dma: If True, use 7DMA data; if False, use Overall data
             is_demographic: If True, this is a demographic table; if False, overall table
             demographic_type: Demographic type if demographic table
             demographic_value: Demographic value if demographic table
         
         Returns:
-            Sample size used for calculations (for updating Base text)
+            Dictionary with 'gains_losses' and 'ae2021_vs' (None if the demographic is not available)
         """
         # Determine which data to use
         if is_demographic:
-            # For demographic tables, filter data by demographic
-            demographic_column_map = {
-                'Gender': 'Gender',
-                'Location': 'Residential locality type',
-                'Religion': '20. Could you please tell me the religion that you belong to?',
-                'Social Category': '21. Which social category do you belong to?',
-                'Age': 'Could you please tell me your age in complete years?'
-            }
-            
-            demographic_column = demographic_column_map.get(demographic_type)
-            if not demographic_column or demographic_column not in self.df.columns:
-                print(f"Warning: {demographic_column} not found for {demographic_type}")
-                return
-            
-            # Create demographic filter
-            if demographic_type == 'Gender':
-                if demographic_value == 'Male':
-                    demo_filter = self.df[demographic_column] == 1
-                elif demographic_value == 'Female':
-                    demo_filter = self.df[demographic_column] == 2
-                else:
-                    return
-            elif demographic_type == 'Location':
-                if demographic_value == 'Urban':
-                    demo_filter = self.df[demographic_column] == 1
-                elif demographic_value == 'Rural':
-                    demo_filter = self.df[demographic_column] == 2
-                else:
-                    return
-            elif demographic_type == 'Religion':
-                if demographic_value == 'Hindu':
-                    demo_filter = self.df[demographic_column] == 1
-                elif demographic_value == 'Muslim':
-                    demo_filter = self.df[demographic_column] == 2
-                else:
-                    return
-            elif demographic_type == 'Social Category':
-                if demographic_value == 'General+OBC':
-                    demo_filter = self.df[demographic_column].isin([1, 2])
-                elif demographic_value == 'SC':
-                    demo_filter = self.df[demographic_column] == 3
-                elif demographic_value == 'ST':
-                    demo_filter = self.df[demographic_column] == 4
-                else:
-                    return
-            elif demographic_type == 'Age':
-                age_col = self.df[demographic_column]
-                age_numeric = pd.to_numeric(age_col, errors='coerce')
-                if demographic_value == '18-25':
-                    demo_filter = (age_numeric >= 18) & (age_numeric <= 25)
-                elif demographic_value == '26-34':
-                    demo_filter = (age_numeric >= 26) & (age_numeric <= 34)
-                elif demographic_value == '36-50':
-                    demo_filter = (age_numeric >= 36) & (age_numeric <= 50)
-                elif demographic_value == '50+':
-                    demo_filter = age_numeric > 50
-                else:
-                    return
-            
-            # Filter data by demographic
-            demo_data = self.df[demo_filter].copy()
-        else:
-            # Overall table - use all data
-            demo_data = self.df.copy()
+            # For demographic tables, filter data by demographic (segment registry - memoized)
+            if self.segments.get_column(demographic_type) is None:
+                print(f"Warning: {DEMOGRAPHIC_COLUMNS.get(demographic_type)} not found for {demographic_type}")
+                return None
+            if self.segments.get_mask(demographic_type, demographic_value) is None:
+                return None
         
         # Apply date filter
         if is_7dma:
             # 7DMA: last 7 days ending one day before reference_date
-            dma7_data = self.calculator.filter_by_date_range(
-                days=7,
-                exclude_latest=True,
-                reference_date=self.reference_date
-            )
-            # Filter to demographic if needed
+            end_date = self.reference_date - timedelta(days=1)
+            cutoff_date = end_date - timedelta(days=6)
             if is_demographic:
-                # Apply demographic filter to 7DMA data
-                filtered_data = dma7_data[demo_filter.loc[dma7_data.index] if hasattr(demo_filter, 'loc') else demo_filter].copy()
-                # Alternative: reapply demographic filter directly on dma7_data
-                if demographic_type == 'Gender':
-                    if demographic_value == 'Male':
-                        filtered_data = dma7_data[dma7_data['Gender'] == 1].copy()
-                    elif demographic_value == 'Female':
-                        filtered_data = dma7_data[dma7_data['Gender'] == 2].copy()
-                elif demographic_type == 'Location':
-                    loc_col = 'Residential locality type'
-                    if demographic_value == 'Urban':
-                        filtered_data = dma7_data[dma7_data[loc_col] == 1].copy()
-                    elif demographic_value == 'Rural':
-                        filtered_data = dma7_data[dma7_data[loc_col] == 2].copy()
-                elif demographic_type == 'Religion':
-                    rel_col = '20. Could you please tell me the religion that you belong to?'
-                    if demographic_value == 'Hindu':
-                        filtered_data = dma7_data[dma7_data[rel_col] == 1].copy()
-                    elif demographic_value == 'Muslim':
-                        filtered_data = dma7_data[dma7_data[rel_col] == 2].copy()
-                elif demographic_type == 'Social Category':
-                    sc_col = '21. Which social category do you belong to?'
-                    if demographic_value == 'General+OBC':
-                        filtered_data = dma7_data[dma7_data[sc_col].isin([1, 2])].copy()
-                    elif demographic_value == 'SC':
-                        filtered_data = dma7_data[dma7_data[sc_col] == 3].copy()
-                    elif demographic_value == 'ST':
-                        filtered_data = dma7_data[dma7_data[sc_col] == 4].copy()
-                elif demographic_type == 'Age':
-                    age_col = 'Could you please tell me your age in complete years?'
-                    age_numeric = pd.to_numeric(dma7_data[age_col], errors='coerce')
-                    if demographic_value == '18-25':
-                        filtered_data = dma7_data[(age_numeric >= 18) & (age_numeric <= 25)].copy()
-                    elif demographic_value == '26-34':
-                        filtered_data = dma7_data[(age_numeric >= 26) & (age_numeric <= 34)].copy()
-                    elif demographic_value == '36-50':
-                        filtered_data = dma7_data[(age_numeric >= 36) & (age_numeric <= 50)].copy()
-                    elif demographic_value == '50+':
-                        filtered_data = dma7_data[age_numeric > 50].copy()
+                filtered_data = self.segments.get_window_data(demographic_type, demographic_value,
+                                                              start=cutoff_date, end=end_date)
             else:
-                filtered_data = dma7_data.copy()
+                filtered_data = self.get_named_window('L7D')
         else:
             # Overall: all data up to reference_date
-            filtered_data = demo_data[demo_data['Survey Date'] <= self.reference_date].copy()
-        
-        # Calculate gains/losses
-        gains_losses = self.calculate_gains_losses(
-            filtered_data,
-            is_7dma=is_7dma,
-            demographic_type=demographic_type if is_demographic else None,
-            demographic_value=demographic_value if is_demographic else None
-        )
+            if is_demographic:
+                filtered_data = self.segments.get_window_data(demographic_type, demographic_value,
+                                                              end=self.reference_date)
+            else:
+                filtered_data = self.get_named_window('Overall')
+        
+        # Calculate gains/losses (every segment of a demographic type comes from one grouped pass)
+        if is_demographic:
+            gains_losses = self.get_segment_gains_losses(demographic_type, is_7dma)[demographic_value]
+        else:
+            gains_losses = self.calculate_gains_losses(filtered_data, is_7dma=is_7dma)
+        self._record_party_table('Gains/Losses', '2021', gains_losses, filtered_data,
+                                 self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level',
+                                 total_row=gains_losses.get('total_2025_vote_shares'))
         
         # Get 2021 AE vote shares
         if is_demographic:
@@ -2645,6 +2384,67 @@ class CompleteReportGenerator:
                 'NWR': 1.08  # NOTA
             }
         
+        return {'gains_losses': gains_losses, 'ae2021_vs': ae2021_vs}
+    
+    def _record_party_table(self, metric, row_label, table_data, data_filtered, weight_column, total_row=None):
+        """
+        Record every row of a party × party table (gains / losses, vote transferability) for the
+        audit trail: one calculation per row party, with the cells shown in the table
+        
+        Args:
+            metric: Metric label (e.g. 'Gains/Losses')
+            row_label: What the row party is (e.g. '2021' → groups '2021=AITC', ...)
+            table_data: Result with 'matrix' and the table's 'weights' / 'records' (PARTY_CATEGORIES order)
+            data_filtered: Rows the table was computed from (for the date window)
+            weight_column: Weight column used
+            total_row: Column party → share of the "Total" row (optional)
+        """
+        if not self.calculator.record_calculations or 'weights' not in table_data:
+            return
+        weights = table_data['weights']
+        records = table_data['records']
+        
+        with self.calculator.calculation_context(metric=metric):
+            for row, row_party in enumerate(PARTY_CATEGORIES):
+                # Cells shown as "-" (e.g. the transferability diagonal) are not numbers of the table
+                shares = {party: value for party, value in table_data['matrix'].get(row_party, {}).items() if value != '-'}
+                self.calculator.record_item_shares(
+                    'crosstab', weight_column,
+                    {party: weights[row, column] for column, party in enumerate(PARTY_CATEGORIES) if party in shares},
+                    weights[row].sum(), shares, records[row].sum(), records[row].sum(),
+                    data_filtered=data_filtered, group=f"{row_label}={row_party}"
+                )
+            if total_row is not None:
+                self.calculator.record_item_shares(
+                    'crosstab', weight_column, dict(zip(PARTY_CATEGORIES, weights.sum(axis=0))), weights.sum(),
+                    total_row, records.sum(), records.sum(), data_filtered=data_filtered, group=f"{row_label}=Total"
+                )
+    
+    def update_gains_losses_table(self, table, is_7dma=False, is_demographic=False, demographic_type=None, demographic_value=None,
+                                  precomputed=None):
+        """
+        Update Gains and Losses table (Slides 47-61)
+        
+        Args:
+            table: Table object to update
+            is_7dma: If True, use 7DMA data; if False, use Overall data
+            is_demographic: If True, this is a demographic table; if False, overall table
+            demographic_type: Demographic type if demographic table
+            demographic_value: Demographic value if demographic table
+            precomputed: Result of compute_gains_losses_table (computed here if not given)
+        
+        Returns:
+            Sample size used for calculations (for updating Base text)
+        """
+        if precomputed is None:
+            precomputed = self.compute_gains_losses_table(is_7dma=is_7dma, is_demographic=is_demographic,
+                                                          demographic_type=demographic_type,
+                                                          demographic_value=demographic_value)
+            if precomputed is None:
+                return
+        gains_losses = precomputed['gains_losses']
+        ae2021_vs = precomputed['ae2021_vs']
+        
         # Helper function to format cell
         def format_table_cell(cell, value, is_percentage=False):
             from pptx.util import Pt
@@ -2831,7 +2631,8 @@ class CompleteReportGenerator:
             is_7dma: If True, use 7DMA data; if False, use Overall data
         
         Returns:
-            Dictionary with transferability matrix and base sample size
+            Dictionary with transferability matrix, base sample size and the first × second choice
+            table's 'weights' / 'records'
         """
         question_first_choice = '8. If assembly elections (MLA) were to be held tomorrow, then which party would you vote for?'
         # Question 9: Second choice party
@@ -2846,99 +2647,63 @@ class CompleteReportGenerator:
                 if '9.' in str(col) and 'party' in str(col).lower():
                     question_second_choice = col
                     break
-        question_second_choice_reason = '10. Could you tell us the reason for choosing the above party as your second choice?'
         weight_column = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
         
         # Filter to records with first choice
-        eligible_data = data_filtered[data_filtered[question_first_choice].notna()].copy()
+        eligible_data = data_filtered[data_filtered[question_first_choice].notna()]
         
-        # Find all Question 10 columns (reasons for second choice)
-        q10_columns = [c for c in eligible_data.columns if question_second_choice_reason in str(c)]
+        # Question 10 options (reasons for second choice)
+        second_choice_reasons = self.multi_select.get('Q10')
         
         # Filter to records that have a second choice (indicated by having at least one Q10 response)
-        # A record has a second choice if any Q10 column has value 1 (or non-null)
-        if q10_columns:
-            has_second_choice = False
-            for q10_col in q10_columns:
-                # Check if column has value 1 (indicating this reason was selected)
-                has_second_choice = has_second_choice | (pd.to_numeric(eligible_data[q10_col], errors='coerce') == 1)
-            eligible_data = eligible_data[has_second_choice].copy()
+        # A record has a second choice if any Q10 column has value 1 (indicating this reason was selected)
+        if len(second_choice_reasons):
+            eligible_data = eligible_data[second_choice_reasons.get_selected(eligible_data)]
         
         # Now filter to records that also have Question 9 (second choice party) response
         if question_second_choice is None or question_second_choice not in eligible_data.columns:
             # If Question 9 column not found, return empty
             return {'base_sample': 0, 'matrix': {}}
         
-        eligible_data = eligible_data[eligible_data[question_second_choice].notna()].copy()
+        eligible_data = eligible_data[eligible_data[question_second_choice].notna()]
         
         if len(eligible_data) == 0:
             return {'base_sample': 0, 'matrix': {}}
         
-        # Get weights
-        if weight_column in eligible_data.columns:
-            weights = pd.to_numeric(eligible_data[weight_column], errors='coerce')
-            eligible_data = eligible_data[weights.notna()].copy()
-            weights = pd.to_numeric(eligible_data[weight_column], errors='coerce')
-        else:
-            weights = pd.Series([1.0] * len(eligible_data), index=eligible_data.index)
-        
-        # Categorize first choice votes
-        eligible_data['party_first'] = eligible_data[question_first_choice].apply(self.calculator.categorize_party)
-        
-        # Categorize second choice votes
-        eligible_data['party_second'] = eligible_data[question_second_choice].apply(self.calculator.categorize_party)
+        # First × second choice weighted contingency table (records without a valid weight are excluded)
+        crosstab = self.calculator.calculate_party_crosstab(
+            eligible_data, question_first_choice, question_second_choice, weight_column
+        )
+        weights = crosstab['weights'][0]
+        records = crosstab['records'][0]
         
         # Base sample size: all eligible records (with both first and second choice)
-        base_sample_size = len(eligible_data)
+        base_sample_size = int(records.sum())
         
         # Calculate transferability matrix
         # IMPORTANT: Include ALL first choice voters in denominator (including same-party)
         # But diagonal (same party) should always show "-"
         parties = ['AITC', 'BJP', 'LEFT', 'INC', 'Others', 'NWR']
-        matrix = {}
-        
-        for party_first in parties:
-            matrix[party_first] = {}
-            # Get ALL records with this first choice (including same-party second choice)
-            party_first_all = eligible_data[eligible_data['party_first'] == party_first].copy()
-            
-            if len(party_first_all) == 0:
-                for party_second in parties:
-                    if party_first == party_second:
-                        matrix[party_first][party_second] = "-"
-                    else:
-                        matrix[party_first][party_second] = 0
-                continue
-            
-            # Get weights for ALL first choice voters (including same-party)
-            party_weights_all = weights.loc[party_first_all.index]
-            total_weight_first = party_weights_all.sum()
-            
-            if total_weight_first == 0:
-                for party_second in parties:
-                    if party_first == party_second:
-                        matrix[party_first][party_second] = "-"
-                    else:
-                        matrix[party_first][party_second] = 0
-                continue
+        matrix = {}
+        
+        for row, party_first in enumerate(parties):
+            # Weight of ALL first choice voters (including same-party second choice)
+            total_weight_first = weights[row].sum()
+            matrix[party_first] = {}
             
-            # Calculate percentage for each second choice
-            for party_second in parties:
+            for column, party_second in enumerate(parties):
                 # If same party (diagonal), always show "-" (not applicable)
                 if party_first == party_second:
                     matrix[party_first][party_second] = "-"
+                elif records[row].sum() == 0 or total_weight_first == 0 or records[row, column] == 0:
+                    matrix[party_first][party_second] = 0
                 else:
-                    # Get records with this first choice AND this second choice (different party)
-                    party_second_data = party_first_all[party_first_all['party_second'] == party_second].copy()
-                    if len(party_second_data) == 0:
-                        matrix[party_first][party_second] = 0
-                    else:
-                        # Calculate percentage: (weighted count of first=X and second=Y) / (weighted count of first=X) * 100
-                        weight_sum = party_weights_all.loc[party_second_data.index].sum()
-                        percentage = (weight_sum / total_weight_first) * 100
-                        matrix[party_first][party_second] = percentage
+                    # Calculate percentage: (weighted count of first=X and second=Y) / (weighted count of first=X) * 100
+                    matrix[party_first][party_second] = (weights[row, column] / total_weight_first) * 100
         
-        return {'base_sample': base_sample_size, 'matrix': matrix}
+        transferability = {'base_sample': base_sample_size, 'matrix': matrix, 'weights': weights, 'records': records}
+        self._record_party_table('Vote Transferability', 'First choice', transferability, eligible_data, weight_column)
+        return transferability
     
     def update_vote_transferability_table(self, table, is_7dma=False):
         """
@@ -2954,15 +2719,10 @@ class CompleteReportGenerator:
         # Filter data
         if is_7dma:
             # 7DMA: last 7 days ending one day before reference_date
-            dma7_data = self.calculator.filter_by_date_range(
-                days=7,
-                exclude_latest=True,
-                reference_date=self.reference_date
-            )
-            filtered_data = dma7_data.copy()
+            filtered_data = self.get_named_window('L7D')
         else:
             # Overall: all data up to reference_date
-            filtered_data = self.df[self.df['Survey Date'] <= self.reference_date].copy()
+            filtered_data = self.get_named_window('Overall')
         
         # Calculate vote transferability
         transferability = self.calculate_vote_transferability(filtered_data, is_7dma=is_7dma)
@@ -3063,7 +2823,7 @@ class CompleteReportGenerator:
         weight_column = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
         
         # Filter to records with valid response
-        eligible_data = data_filtered[data_filtered[question].notna()].copy()
+        eligible_data = data_filtered[data_filtered[question].notna()]
         
         if len(eligible_data) == 0:
             return {'base_sample': 0, 'percentages': {}}
@@ -3071,7 +2831,7 @@ class CompleteReportGenerator:
         # Get weights
         if weight_column in eligible_data.columns:
             weights = pd.to_numeric(eligible_data[weight_column], errors='coerce')
-            eligible_data = eligible_data[weights.notna()].copy()
+            eligible_data = eligible_data[weights.notna()]
             weights = pd.to_numeric(eligible_data[weight_column], errors='coerce')
         else:
             weights = pd.Series([1.0] * len(eligible_data), index=eligible_data.index)
@@ -3082,16 +2842,38 @@ class CompleteReportGenerator:
         
         # Calculate percentages for each CM candidate code
         percentages = {}
+        code_weights = {}
         for code in eligible_data[question].dropna().unique():
             if pd.isna(code) or code == 'q17':
                 continue
             code_data = eligible_data[eligible_data[question] == code]
             weight_sum = weights.loc[code_data.index].sum()
             percentage = (weight_sum / total_weight) * 100
+            code_weights[int(code)] = weight_sum
             percentages[int(code)] = percentage
         
+        self._record_option_shares('Preferred CM', code_weights, total_weight, percentages, eligible_data, weight_column)
         return {'base_sample': len(eligible_data), 'percentages': percentages}
     
+    def _record_option_shares(self, metric, option_weights, total_weight, percentages, eligible_data, weight_column):
+        """
+        Record the answer shares of a single-choice opinion question for the audit trail
+        
+        Args:
+            metric: Metric label (e.g. 'Preferred CM')
+            option_weights: Answer → weight total
+            total_weight: Weight of all eligible records
+            percentages: Answer → percentage
+            eligible_data: Eligible records (answered, with a valid weight)
+            weight_column: Weight column (ignored if not in the data - every record then weighs 1)
+        """
+        with self.calculator.calculation_context(metric=metric):
+            self.calculator.record_item_shares(
+                'options', weight_column if weight_column in eligible_data.columns else None,
+                option_weights, total_weight, percentages, len(eligible_data), len(eligible_data),
+                data_filtered=eligible_data
+            )
+    
     def update_preferred_cm_table(self, table):
         """
         Update Preferred CM Candidate table (Slide 66)
@@ -3103,14 +2885,10 @@ class CompleteReportGenerator:
             base_sample size
         """
         # Filter data for Overall
-        filtered_data_overall = self.df[self.df['Survey Date'] <= self.reference_date].copy()
+        filtered_data_overall = self.get_named_window('Overall')
         
         # Filter data for 7DMA
-        dma7_data = self.calculator.filter_by_date_range(
-            days=7,
-            exclude_latest=True,
-            reference_date=self.reference_date
-        )
+        dma7_data = self.get_named_window('L7D')
         
         # Calculate preferred CM for Overall
         cm_data_overall = self.calculate_preferred_cm(filtered_data_overall)
@@ -3224,10 +3002,10 @@ class CompleteReportGenerator:
         weight_column = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
         
         # Filter to records with valid response
-        eligible_data = data_filtered[data_filtered[question].notna()].copy()
+        eligible_data = data_filtered[data_filtered[question].notna()]
         
         # Remove invalid responses
-        eligible_data = eligible_data[eligible_data[question] != 'q14'].copy()
+        eligible_data = eligible_data[eligible_data[question] != 'q14']
         
         if len(eligible_data) == 0:
             return {'base_sample': 0, 'percentages': {}}
@@ -3235,7 +3013,7 @@ class CompleteReportGenerator:
         # Get weights
         if weight_column in eligible_data.columns:
             weights = pd.to_numeric(eligible_data[weight_column], errors='coerce')
-            eligible_data = eligible_data[weights.notna()].copy()
+            eligible_data = eligible_data[weights.notna()]
             weights = pd.to_numeric(eligible_data[weight_column], errors='coerce')
         else:
             weights = pd.Series([1.0] * len(eligible_data), index=eligible_data.index)
@@ -3256,6 +3034,7 @@ class CompleteReportGenerator:
         
         # Calculate percentages for each rating
         percentages = {}
+        rating_weights = {}
         for code in [1, 2, 3, 4, 5]:
             code_data = eligible_data[pd.to_numeric(eligible_data[question], errors='coerce') == code]
             if len(code_data) > 0:
@@ -3263,8 +3042,14 @@ class CompleteReportGenerator:
                 percentage = (weight_sum / total_weight) * 100
                 percentages[code] = percentage
             else:
+                weight_sum = 0
                 percentages[code] = 0
+            rating_weights[code] = weight_sum
         
+        self._record_option_shares('State Government Rating',
+                                   {rating_map[code]: weight for code, weight in rating_weights.items()}, total_weight,
+                                   {rating_map[code]: value for code, value in percentages.items()},
+                                   eligible_data, weight_column)
         return {'base_sample': len(eligible_data), 'percentages': percentages}
     
     def update_state_government_rating_table(self, table):
@@ -3278,14 +3063,10 @@ class CompleteReportGenerator:
             base_sample size
         """
         # Filter data for Overall
-        filtered_data_overall = self.df[self.df['Survey Date'] <= self.reference_date].copy()
+        filtered_data_overall = self.get_named_window('Overall')
         
         # Filter data for 7DMA
-        dma7_data = self.calculator.filter_by_date_range(
-            days=7,
-            exclude_latest=True,
-            reference_date=self.reference_date
-        )
+        dma7_data = self.get_named_window('L7D')
         
         # Calculate state government rating for Overall
         rating_data_overall = self.calculate_state_government_rating(filtered_data_overall)
@@ -3346,7 +3127,7 @@ class CompleteReportGenerator:
         weight_column = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
         
         # Filter to records with valid response
-        eligible_data = data_filtered[data_filtered[question].notna()].copy()
+        eligible_data = data_filtered[data_filtered[question].notna()]
         
         if len(eligible_data) == 0:
             return {'base_sample': 0, 'percentages': {}}
@@ -3354,7 +3135,7 @@ class CompleteReportGenerator:
         # Get weights
         if weight_column in eligible_data.columns:
             weights = pd.to_numeric(eligible_data[weight_column], errors='coerce')
-            eligible_data = eligible_data[weights.notna()].copy()
+            eligible_data = eligible_data[weights.notna()]
             weights = pd.to_numeric(eligible_data[weight_column], errors='coerce')
         else:
             weights = pd.Series([1.0] * len(eligible_data), index=eligible_data.index)
@@ -3364,21 +3145,25 @@ class CompleteReportGenerator:
             return {'base_sample': len(eligible_data), 'percentages': {}}
         
         # Categorize party responses
-        eligible_data['party'] = eligible_data[question].apply(self.calculator.categorize_party)
+        party_categories = self.calculator.get_party_categories(eligible_data, question)
         
         # Calculate percentages for each party
         parties = ['AITC', 'BJP', 'LEFT', 'INC', 'Others', 'NWR']
         percentages = {}
+        party_weights = {}
         
         for party in parties:
-            party_data = eligible_data[eligible_data['party'] == party].copy()
-            if len(party_data) > 0:
-                weight_sum = weights.loc[party_data.index].sum()
+            party_mask = party_categories == party
+            if party_mask.any():
+                weight_sum = weights[party_mask].sum()
                 percentage = (weight_sum / total_weight) * 100
                 percentages[party] = percentage
             else:
+                weight_sum = 0
                 percentages[party] = 0
+            party_weights[party] = weight_sum
         
+        self._record_option_shares('Wisdom of Crowds', party_weights, total_weight, percentages, eligible_data, weight_column)
         return {'base_sample': len(eligible_data), 'percentages': percentages}
     
     def update_wisdom_of_crowds_table(self, table):
@@ -3392,14 +3177,10 @@ class CompleteReportGenerator:
             base_sample size
         """
         # Filter data for Overall
-        filtered_data_overall = self.df[self.df['Survey Date'] <= self.reference_date].copy()
+        filtered_data_overall = self.get_named_window('Overall')
         
         # Filter data for 7DMA
-        dma7_data = self.calculator.filter_by_date_range(
-            days=7,
-            exclude_latest=True,
-            reference_date=self.reference_date
-        )
+        dma7_data = self.get_named_window('L7D')
         
         # Calculate wisdom of crowds for Overall
         woc_data_overall = self.calculate_wisdom_of_crowds(filtered_data_overall)
@@ -3455,19 +3236,16 @@ class CompleteReportGenerator:
         Returns:
             Dictionary with top issues, percentages, and base sample size
         """
-        question_prefix = '13. According to you, what are the three most pressing issues of your assembly constituency?'
         weight_column = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
         
-        # Find all Q13 columns
-        issue_cols = [col for col in data_filtered.columns 
-                     if str(col).startswith(question_prefix)]
+        # All Q13 options
+        issues = self.multi_select.get('Q13')
         
-        if len(issue_cols) == 0:
+        if len(issues) == 0:
             return {'base_sample': 0, 'issues': []}
         
-        # Filter to records with at least one issue selected
-        has_issue = data_filtered[issue_cols].notna().any(axis=1)
-        eligible_data = data_filtered[has_issue].copy()
+        # Filter to records with at least one issue answered
+        eligible_data = data_filtered[issues.get_answered(data_filtered)]
         
         if len(eligible_data) == 0:
             return {'base_sample': 0, 'issues': []}
@@ -3475,7 +3253,7 @@ class CompleteReportGenerator:
         # Get weights
         if weight_column in eligible_data.columns:
             weights = pd.to_numeric(eligible_data[weight_column], errors='coerce')
-            eligible_data = eligible_data[weights.notna()].copy()
+            eligible_data = eligible_data[weights.notna()]
             weights = pd.to_numeric(eligible_data[weight_column], errors='coerce')
         else:
             weights = pd.Series([1.0] * len(eligible_data), index=eligible_data.index)
@@ -3484,23 +3262,15 @@ class CompleteReportGenerator:
         if total_weight == 0:
             return {'base_sample': len(eligible_data), 'issues': []}
         
-        # Calculate weighted counts for each issue
+        # Weighted and actual (not weighted) record counts of all issues, one matrix-vector product each
+        weighted_sums = issues.weighted_totals(eligible_data, weights.to_numpy())
+        record_counts = issues.weighted_totals(eligible_data)
+        
         issue_counts = {}
-        for col in issue_cols:
-            # Extract issue text (everything after " - ")
-            issue_text = str(col).split(' - ')[-1] if ' - ' in str(col) else str(col)
-            
-            # Convert column to numeric (0 or 1)
-            issue_values = pd.to_numeric(eligible_data[col], errors='coerce').fillna(0)
-            
-            # Calculate weighted sum
-            weighted_sum = (issue_values * weights).sum()
-            
+        for issue_text, weighted_sum, record_count in zip(issues.labels, weighted_sums, record_counts):
             # Calculate percentage
             percentage = (weighted_sum / total_weight * 100) if total_weight > 0 else 0
-            
-            # Count actual records (not weighted)
-            record_count = int(issue_values.sum())
+            record_count = int(record_count)
             
             issue_counts[issue_text] = {
                 'weighted_count': weighted_sum,
@@ -3511,6 +3281,14 @@ class CompleteReportGenerator:
         # Sort by weighted count and get top issues
         top_issues = sorted(issue_counts.items(), key=lambda x: x[1]['weighted_count'], reverse=True)
         
+        with self.calculator.calculation_context(metric='Top Issues'):
+            self.calculator.record_item_shares(
+                'multi_select', weight_column if weight_column in eligible_data.columns else None,
+                {issue_text: data['weighted_count'] for issue_text, data in top_issues}, total_weight,
+                {issue_text: data['percentage'] for issue_text, data in top_issues},
+                len(eligible_data), len(eligible_data), data_filtered=eligible_data
+            )
+        
         return {
             'base_sample': len(eligible_data),
             'issues': top_issues  # List of (issue_text, {weighted_count, percentage})
@@ -3527,7 +3305,7 @@ class CompleteReportGenerator:
             base_sample size
         """
         # Filter data for Overall
-        filtered_data_overall = self.df[self.df['Survey Date'] <= self.reference_date].copy()
+        filtered_data_overall = self.get_named_window('Overall')
         
         # Calculate top issues for Overall
         issues_data = self.calculate_top_issues(filtered_data_overall)
@@ -3600,7 +3378,7 @@ class CompleteReportGenerator:
         region_column = 'Region Name'
         
         # Filter to records with valid response
-        eligible_data = data_filtered[data_filtered[question].notna()].copy()
+        eligible_data = data_filtered[data_filtered[question].notna()]
         
         if len(eligible_data) == 0:
             return {'base_sample': 0, 'regions': {}}
@@ -3608,17 +3386,18 @@ class CompleteReportGenerator:
         # Get weights
         if weight_column in eligible_data.columns:
             weights = pd.to_numeric(eligible_data[weight_column], errors='coerce')
-            eligible_data = eligible_data[weights.notna()].copy()
-            weights = pd.to_numeric(eligible_data[weight_column], errors='coerce')
+            eligible_data = eligible_data[weights.notna()]
         else:
-            weights = pd.Series([1.0] * len(eligible_data), index=eligible_data.index)
-        
-        # Categorize party responses
-        eligible_data['party'] = eligible_data[question].apply(self.calculator.categorize_party)
+            weight_column = None
         
         # Get unique regions
         regions = eligible_data[region_column].dropna().unique()
         
+        # Weighted party totals for all regions in one pass
+        party_totals = self.calculator.calculate_party_totals(
+            eligible_data, [region_column], [weight_column] if weight_column else None
+        )
+        
         parties = ['AITC', 'BJP', 'LEFT', 'INC', 'Others', 'NWR']
         region_data = {}
         
@@ -3628,31 +3407,31 @@ class CompleteReportGenerator:
                 'vote_shares': {}
             }
             
-            region_records = eligible_data[eligible_data[region_column] == region].copy()
-            if len(region_records) == 0:
-                for party in parties:
-                    region_data[region]['vote_shares'][party] = 0
-                continue
-            
-            region_weights = weights.loc[region_records.index]
-            total_weight_region = region_weights.sum()
+            region_totals = party_totals[party_totals[region_column] == region].set_index('party')
+            total_weight_region = region_totals['weight'].sum()
             
             if total_weight_region == 0:
                 for party in parties:
                     region_data[region]['vote_shares'][party] = 0
                 continue
             
-            region_data[region]['base_sample'] = len(region_records)
+            region_data[region]['base_sample'] = int(region_totals['records'].sum())
             
             # Calculate vote shares for each party in this region
             for party in parties:
-                party_data = region_records[region_records['party'] == party].copy()
-                if len(party_data) > 0:
-                    weight_sum = region_weights.loc[party_data.index].sum()
+                if region_totals.loc[party, 'records'] > 0:
+                    weight_sum = region_totals.loc[party, 'weight']
                     percentage = (weight_sum / total_weight_region) * 100
                     region_data[region]['vote_shares'][party] = percentage
                 else:
                     region_data[region]['vote_shares'][party] = 0
+            
+            with self.calculator.calculation_context(metric='Regional Vote Share'):
+                self.calculator.record_item_shares(
+                    'totals', weight_column, region_totals['weight'].reindex(parties).to_dict(), total_weight_region,
+                    region_data[region]['vote_shares'], region_data[region]['base_sample'],
+                    region_data[region]['base_sample'], data_filtered=eligible_data, group=f"Region={region}"
+                )
         
         return {'base_sample': len(eligible_data), 'regions': region_data}
     
@@ -3689,14 +3468,10 @@ class CompleteReportGenerator:
             }
         
         # Filter data for Overall
-        filtered_data_overall = self.df[self.df['Survey Date'] <= self.reference_date].copy()
+        filtered_data_overall = self.get_named_window('Overall')
         
         # Filter data for 7DMA
-        dma7_data = self.calculator.filter_by_date_range(
-            days=7,
-            exclude_latest=True,
-            reference_date=self.reference_date
-        )
+        dma7_data = self.get_named_window('L7D')
         
         # Calculate vote share by regions for Overall
         regions_data_overall = self.calculate_vote_share_by_regions(filtered_data_overall)
@@ -3829,20 +3604,17 @@ class CompleteReportGenerator:
         
         return regions_data_overall['base_sample']
     
-    def update_regional_chart(self, chart, region_name, is_7dma=False):
+    def compute_regional_chart(self, region_name, is_7dma=False):
         """
-        Update regional chart with vote share data for a specific region
+        Compute the data behind a regional chart (no slide changes, so it can run in a worker process)
         
         Args:
-            chart: Chart object from slide
             region_name: Name of the region (e.g., 'Jalpaiguri', 'Malda')
-            is_7dma: If True, show 7DMA data; if False, show Overall cumulative data
+            is_7dma: If True, 7DMA data; if False, Overall cumulative data
         
         Returns:
-            Sample size used for calculations
+            Dictionary with 'daily_data' and 'sample_size'
         """
-        from pptx.chart.data import CategoryChartData
-        
         if is_7dma:
             # Calculate 7DMA for this region
             daily_data = self.calculate_7dma_for_region(region_name, num_days=13)
@@ -3852,6 +3624,28 @@ class CompleteReportGenerator:
             daily_data = self.calculate_overall_for_region(region_name, num_days=17)
             sample_size = self._get_region_sample_size(region_name, is_7dma=False)
         
+        return {'daily_data': daily_data, 'sample_size': sample_size}
+    
+    def update_regional_chart(self, chart, region_name, is_7dma=False, precomputed=None):
+        """
+        Update regional chart with vote share data for a specific region
+        
+        Args:
+            chart: Chart object from slide
+            region_name: Name of the region (e.g., 'Jalpaiguri', 'Malda')
+            is_7dma: If True, show 7DMA data; if False, show Overall cumulative data
+            precomputed: Result of compute_regional_chart (computed here if not given)
+        
+        Returns:
+            Sample size used for calculations
+        """
+        from pptx.chart.data import CategoryChartData
+        
+        if precomputed is None:
+            precomputed = self.compute_regional_chart(region_name, is_7dma=is_7dma)
+        daily_data = precomputed['daily_data']
+        sample_size = precomputed['sample_size']
+        
         if len(daily_data) == 0:
             print(f"Warning: No data found for region {region_name}")
             return 0
@@ -3878,7 +3672,8 @@ class CompleteReportGenerator:
         chart_data.add_series('Others', others_values)
         chart_data.add_series('N+W+R', nwr_values)
         
-        chart.replace_data(chart_data)
+        self.chart_writer.replace_data(chart, chart_data)
+        self._add_confidence_error_bars(chart, daily_data)
         
         # Set axis labels to vertical rotation (like format final file)
         self._set_axis_labels_vertical(chart)
@@ -3888,20 +3683,21 @@ class CompleteReportGenerator:
     
     def calculate_7dma_for_region(self, region_name, num_days=13):
         """Calculate 7DMA vote shares for a region over num_days"""
-        region_data = self.df[self.df['Region Name'] == region_name].copy()
-        if len(region_data) == 0:
-            return []
+        # Use L7D weights if available (with >=50% threshold)
+        l7d_col = self.get_weight_column('Region', 'L7D') or 'Weight Voteshare L7D Region Level'
+        regular_col = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
         
-        # Get unique dates up to reference_date
-        region_data = region_data[region_data['Survey Date'] <= self.reference_date].copy()
-        question = '8. If assembly elections (MLA) were to be held tomorrow, then which party would you vote for?'
+        # Daily totals for this region (all regions are aggregated in one pass on first use)
+        series = self.daily_aggregates.get_group_series('Region Name', region_name, [l7d_col, regular_col])
+        if series is None:
+            return []
         
-        # Find the first date with actual data for this region
-        region_data_with_votes = region_data[region_data[question].notna()].copy()
-        if len(region_data_with_votes) == 0:
+        # Find the first date with actual data for this region (up to reference_date)
+        dates_with_votes = series.get_dates(end=self.reference_date, with_valid_votes=True)
+        if len(dates_with_votes) == 0:
             return []
         
-        first_date_with_data = region_data_with_votes['Survey Date'].min()
+        first_date_with_data = dates_with_votes[0]
         
         # Calculate 7DMA for each date starting from first_date_with_data
         # But only include dates where there's actual data in the 7-day window
@@ -3925,70 +3721,33 @@ class CompleteReportGenerator:
             end_date = date - timedelta(days=1)  # Exclude reference date
             cutoff_date = end_date - timedelta(days=6)  # Last 7 days
             
-            # Only calculate if we have data in the window
-            date_data = region_data[
-                (region_data['Survey Date'] >= cutoff_date) & 
-                (region_data['Survey Date'] <= end_date)
-            ].copy()
+            window = series.window_totals(start=cutoff_date, end=min(end_date, self.reference_date))
             
             # Only include if there's actual data with valid votes
-            date_data_with_votes = date_data[date_data[question].notna()].copy()
-            if len(date_data_with_votes) == 0:
+            if window['valid_votes'].sum() == 0:
                 # Skip dates with no data in the 7-day window
                 continue
             
-            # Use L7D weights if available (with >=50% threshold)
-            l7d_col = self.get_weight_column('Region', 'L7D') or 'Weight Voteshare L7D Region Level'
-            regular_col = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
-            
-            l7d_available = date_data[l7d_col].notna().sum() if l7d_col in date_data.columns else 0
-            total_records = len(date_data)
-            
-            if l7d_available > 0 and (l7d_available / total_records) >= 0.5:
-                # Use L7D weights - filter to only records with L7D weights
-                date_data_with_weights = date_data[date_data[l7d_col].notna()].copy()
-                weight_column = l7d_col
-            else:
-                # Fall back to regular weights
-                date_data_with_weights = date_data.copy()
-                weight_column = regular_col
-            
-            vote_shares = self.calculator.calculate_vote_share(date_data_with_weights, weight_column=weight_column, use_weights=True)
-            
-            # Convert date to Excel serial number and date label
-            excel_serial = (date - datetime(1899, 12, 30)).days
-            date_label = date.strftime('%m/%d/%Y')
-            
-            daily_results.append({
-                'date': date,
-                'date_label': date_label,
-                'excel_serial': excel_serial,
-                'AITC': vote_shares.get('AITC', 0),
-                'BJP': vote_shares.get('BJP', 0),
-                'LEFT': vote_shares.get('LEFT', 0),
-                'INC': vote_shares.get('INC', 0),
-                'Others': vote_shares.get('Others', 0),
-                'NWR': vote_shares.get('NWR', 0)
-            })
+            vote_shares = self._get_7dma_vote_shares(window, l7d_col, regular_col, label=f"Region={region_name} 7DMA chart", date=date)
+            daily_results.append(self._build_daily_vote_share_entry(date, vote_shares))
         
         return daily_results
     
     def calculate_overall_for_region(self, region_name, num_days=17):
         """Calculate Overall cumulative vote shares for a region over num_days"""
-        region_data = self.df[self.df['Region Name'] == region_name].copy()
-        if len(region_data) == 0:
-            return []
+        weight_column = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
         
-        # Get unique dates up to reference_date
-        region_data = region_data[region_data['Survey Date'] <= self.reference_date].copy()
-        question = '8. If assembly elections (MLA) were to be held tomorrow, then which party would you vote for?'
+        # Daily totals for this region (all regions are aggregated in one pass on first use)
+        series = self.daily_aggregates.get_group_series('Region Name', region_name, [weight_column])
+        if series is None:
+            return []
         
-        # Find the first date with actual data for this region
-        region_data_with_votes = region_data[region_data[question].notna()].copy()
-        if len(region_data_with_votes) == 0:
+        # Find the first date with actual data for this region (up to reference_date)
+        dates_with_votes = series.get_dates(end=self.reference_date, with_valid_votes=True)
+        if len(dates_with_votes) == 0:
             return []
         
-        first_date_with_data = region_data_with_votes['Survey Date'].min()
+        first_date_with_data = dates_with_votes[0]
         
         # Calculate Overall for each date starting from first_date_with_data
         # Include ALL dates from first_date_with_data to reference_date (even if no new data on that date)
@@ -4006,14 +3765,13 @@ class CompleteReportGenerator:
         last_vote_shares = None
         for date in all_dates:
             # Calculate cumulative up to this date
-            date_data = region_data[region_data['Survey Date'] <= date].copy()
+            window = series.window_totals(end=min(date, self.reference_date))
             
             # Check if there's actual data with valid votes
-            date_data_with_votes = date_data[date_data[question].notna()].copy()
-            if len(date_data_with_votes) > 0:
+            if window['valid_votes'].sum() > 0:
                 # Calculate vote shares
-                weight_column = self.get_weight_column('Region', 'Overall') or 'Weight Voteshare Overall Region Level'
-                vote_shares = self.calculator.calculate_vote_share(date_data, weight_column=weight_column, use_weights=True)
+                with self.calculator.calculation_context(metric='Normalized Trend', group=f"Point={date:%Y-%m-%d}"):
+                    vote_shares = self.calculator.get_vote_shares_from_window(window, weight_column=weight_column)
                 last_vote_shares = vote_shares
             elif last_vote_shares is not None:
                 # If no new data on this date, use the cumulative value from previous date
@@ -4022,39 +3780,19 @@ class CompleteReportGenerator:
                 # Skip if no data at all yet
                 continue
             
-            # Convert date to Excel serial number and date label
-            excel_serial = (date - datetime(1899, 12, 30)).days
-            date_label = date.strftime('%m/%d/%Y')
-            
-            daily_results.append({
-                'date': date,
-                'date_label': date_label,
-                'excel_serial': excel_serial,
-                'AITC': vote_shares.get('AITC', 0),
-                'BJP': vote_shares.get('BJP', 0),
-                'LEFT': vote_shares.get('LEFT', 0),
-                'INC': vote_shares.get('INC', 0),
-                'Others': vote_shares.get('Others', 0),
-                'NWR': vote_shares.get('NWR', 0)
-            })
+            daily_results.append(self._build_daily_vote_share_entry(date, vote_shares))
         
         return daily_results
     
     def _get_region_sample_size(self, region_name, is_7dma=False):
         """Get sample size for a region - only count records with non-empty responses"""
-        region_data = self.df[self.df['Region Name'] == region_name].copy()
-        
         if is_7dma:
             # Filter for 7DMA window
-            end_date = self.reference_date - timedelta(days=1)
-            cutoff_date = end_date - timedelta(days=6)
-            region_data = region_data[
-                (region_data['Survey Date'] >= cutoff_date) & 
-                (region_data['Survey Date'] <= end_date)
-            ].copy()
+            region_data = self.get_named_window('L7D')
         else:
             # Filter for overall
-            region_data = region_data[region_data['Survey Date'] <= self.reference_date].copy()
+            region_data = self.get_named_window('Overall')
+        region_data = region_data[region_data['Region Name'] == region_name]
         
         # Count only records with valid (non-empty) responses to main question
         return self.get_sample_size(region_data)
@@ -4243,7 +3981,49 @@ class CompleteReportGenerator:
             print(f"Warning: Could not adjust plot area for legend spacing: {e}")
             pass
     
-    def update_district_table(self, table, is_15dma=False, is_7dma=False, slide_num=88):
+    def compute_district_table(self, is_15dma=False, is_7dma=False):
+        """
+        Compute the weighted party totals of every district behind a district table
+        (shared by both slides of the table, no slide changes, so it can run in a worker process)
+        
+        Args:
+            is_15dma: If True, use 15DMA data
+            is_7dma: If True, use 7DMA data
+        
+        Returns:
+            Dictionary with 'party_totals' and the 'weight_column', 'regular_col' and 'period_col' totalled
+        """
+        # Filter data
+        if is_15dma:
+            filtered_data = self.get_named_window('L15D')
+            weight_column = 'Weight - with Vote Share - AE 2021 - District L15D'
+            if weight_column not in filtered_data.columns:
+                weight_column = self.get_weight_column('District', 'Overall') or 'Weight Voteshare Overall District Level'
+        elif is_7dma:
+            filtered_data = self.get_named_window('L7D')
+            weight_column = self.get_weight_column('District', 'L7D') or 'Weight Voteshare L7D District Level'
+            if weight_column not in filtered_data.columns:
+                weight_column = self.get_weight_column('District', 'Overall') or 'Weight Voteshare Overall District Level'
+        else:
+            filtered_data = self.get_named_window('Overall')
+            weight_column = self.get_weight_column('District', 'Overall') or 'Weight Voteshare Overall District Level'
+        
+        # Weighted party totals for every district in one pass (period and overall weights)
+        regular_col = self.get_weight_column('District', 'Overall') or 'Weight Voteshare Overall District Level'
+        if is_15dma:
+            period_col = 'Weight - with Vote Share - AE 2021 - District L15D'
+        elif is_7dma:
+            period_col = self.get_weight_column('District', 'L7D') or 'Weight Voteshare L7D District Level'
+        else:
+            period_col = None
+        party_totals = self.calculator.calculate_party_totals(
+            filtered_data, ['District Name'], [col for col in [weight_column, regular_col, period_col] if col]
+        )
+        
+        return {'party_totals': party_totals, 'weight_column': weight_column,
+                'regular_col': regular_col, 'period_col': period_col}
+    
+    def update_district_table(self, table, is_15dma=False, is_7dma=False, slide_num=88, precomputed=None):
         """
         Update district table with vote share data
         
@@ -4252,13 +4032,13 @@ class CompleteReportGenerator:
             is_15dma: If True, use 15DMA data
             is_7dma: If True, use 7DMA data
             slide_num: Slide number (to determine which districts to show)
+            precomputed: Result of compute_district_table (computed here if not given)
         
         Returns:
             Sample size
         """
         # Get unique districts
-        unique_districts = self.df['District Name'].dropna().unique()
-        unique_districts = sorted([d for d in unique_districts if d != 'district_name'])
+        unique_districts = self.get_report_districts()
         
         # Determine which districts to show based on slide number
         # Slides 88, 90, 92: First half of districts
@@ -4269,30 +4049,12 @@ class CompleteReportGenerator:
         else:
             districts_to_show = unique_districts[districts_per_slide:]
         
-        # Filter data
-        if is_15dma:
-            end_date = self.reference_date - timedelta(days=1)
-            cutoff_date = end_date - timedelta(days=14)
-            filtered_data = self.df[
-                (self.df['Survey Date'] >= cutoff_date) & 
-                (self.df['Survey Date'] <= end_date)
-            ].copy()
-            weight_column = 'Weight - with Vote Share - AE 2021 - District L15D'
-            if weight_column not in filtered_data.columns:
-                weight_column = self.get_weight_column('District', 'Overall') or 'Weight Voteshare Overall District Level'
-        elif is_7dma:
-            end_date = self.reference_date - timedelta(days=1)
-            cutoff_date = end_date - timedelta(days=6)
-            filtered_data = self.df[
-                (self.df['Survey Date'] >= cutoff_date) & 
-                (self.df['Survey Date'] <= end_date)
-            ].copy()
-            weight_column = self.get_weight_column('District', 'L7D') or 'Weight Voteshare L7D District Level'
-            if weight_column not in filtered_data.columns:
-                weight_column = self.get_weight_column('District', 'Overall') or 'Weight Voteshare Overall District Level'
-        else:
-            filtered_data = self.df[self.df['Survey Date'] <= self.reference_date].copy()
-            weight_column = self.get_weight_column('District', 'Overall') or 'Weight Voteshare Overall District Level'
+        if precomputed is None:
+            precomputed = self.compute_district_table(is_15dma=is_15dma, is_7dma=is_7dma)
+        party_totals = precomputed['party_totals']
+        weight_column = precomputed['weight_column']
+        regular_col = precomputed['regular_col']
+        period_col = precomputed['period_col']
         
         # Update table rows (starting from row 2, row 0 is header, row 1 is sub-header)
         total_sample = 0
@@ -4300,50 +4062,37 @@ class CompleteReportGenerator:
             if row_idx >= len(table.rows):
                 break
             
-            district_data = filtered_data[filtered_data['District Name'] == district].copy()
-            if len(district_data) == 0:
+            district_totals = party_totals[party_totals['District Name'] == district]
+            district_counts = district_totals[district_totals['weight_column'] == district_totals['weight_column'].iloc[0]] \
+                if len(district_totals) else district_totals
+            total_records = int(district_counts['records'].sum())
+            if total_records == 0:
                 continue
             
             # Calculate actual sample size: only count records with non-empty responses
-            sample_size = self.get_sample_size(district_data)
+            sample_size = int(district_counts['valid_votes'].sum())
             total_sample += sample_size
             
             # For 15DMA and 7DMA, check if L15D/L7D weights are available (with >=50% threshold)
-            if is_15dma:
-                l15d_col = 'Weight - with Vote Share - AE 2021 - District L15D'
-                regular_col = self.get_weight_column('District', 'Overall') or 'Weight Voteshare Overall District Level'
-                l15d_available = district_data[l15d_col].notna().sum() if l15d_col in district_data.columns else 0
-                total_records = len(district_data)
-                
-                if l15d_available > 0 and (l15d_available / total_records) >= 0.5:
-                    # Use L15D weights - filter to only records with L15D weights
-                    district_data_with_weights = district_data[district_data[l15d_col].notna()].copy()
-                    weight_column_used = l15d_col
-                else:
-                    # Fall back to regular weights
-                    district_data_with_weights = district_data.copy()
-                    weight_column_used = regular_col
-            elif is_7dma:
-                l7d_col = self.get_weight_column('District', 'L7D') or 'Weight Voteshare L7D District Level'
-                regular_col = self.get_weight_column('District', 'Overall') or 'Weight Voteshare Overall District Level'
-                l7d_available = district_data[l7d_col].notna().sum() if l7d_col in district_data.columns else 0
-                total_records = len(district_data)
+            if is_15dma or is_7dma:
+                period_totals = district_totals[district_totals['weight_column'] == period_col]
+                period_available = int(period_totals['weighted_records'].sum())
                 
-                if l7d_available > 0 and (l7d_available / total_records) >= 0.5:
-                    # Use L7D weights - filter to only records with L7D weights
-                    district_data_with_weights = district_data[district_data[l7d_col].notna()].copy()
-                    weight_column_used = l7d_col
+                if self.weights.use_period_weights('L15D' if is_15dma else 'L7D', period_available, total_records,
+                                                   label=f"District {district} {'15DMA' if is_15dma else '7DMA'}"):
+                    # Use L15D/L7D weights - only records with those weights contribute
+                    weight_column_used = period_col
                 else:
                     # Fall back to regular weights
-                    district_data_with_weights = district_data.copy()
                     weight_column_used = regular_col
             else:
                 # Overall - use regular weights
-                district_data_with_weights = district_data.copy()
                 weight_column_used = weight_column
             
             # Calculate vote shares (for percentages only, not sample size)
-            vote_shares = self.calculator.calculate_vote_share(district_data_with_weights, weight_column=weight_column_used, use_weights=True)
+            with self.calculator.calculation_context(metric='Vote Share 15DMA' if is_15dma else ('Vote Share 7DMA' if is_7dma else 'Vote Share Normalized'),
+                                                     segment=f"District={district}"):
+                vote_shares = self.calculator.get_vote_shares_from_totals(district_totals, weight_column=weight_column_used)
             
             # Update sample size (column 2)
             if len(table.columns) > 2:
@@ -4452,20 +4201,17 @@ class CompleteReportGenerator:
         
         return total_sample
     
-    def update_district_chart(self, chart, district_name, is_15dma=False):
+    def compute_district_chart(self, district_name, is_15dma=False):
         """
-        Update district chart with vote share data
+        Compute the data behind a district chart (no slide changes, so it can run in a worker process)
         
         Args:
-            chart: Chart object from slide
             district_name: Name of the district
-            is_15dma: If True, show 15DMA data; if False, show Overall cumulative data
+            is_15dma: If True, 15DMA data; if False, Overall cumulative data
         
         Returns:
-            Sample size used for calculations
+            Dictionary with 'daily_data' and 'sample_size'
         """
-        from pptx.chart.data import CategoryChartData
-        
         if is_15dma:
             # Calculate 15DMA for this district
             daily_data = self.calculate_15dma_for_district(district_name, num_days=13)
@@ -4475,6 +4221,28 @@ class CompleteReportGenerator:
             daily_data = self.calculate_overall_for_district(district_name, num_days=17)
             sample_size = self._get_district_sample_size(district_name, is_15dma=False)
         
+        return {'daily_data': daily_data, 'sample_size': sample_size}
+    
+    def update_district_chart(self, chart, district_name, is_15dma=False, precomputed=None):
+        """
+        Update district chart with vote share data
+        
+        Args:
+            chart: Chart object from slide
+            district_name: Name of the district
+            is_15dma: If True, show 15DMA data; if False, show Overall cumulative data
+            precomputed: Result of compute_district_chart (computed here if not given)
+        
+        Returns:
+            Sample size used for calculations
+        """
+        from pptx.chart.data import CategoryChartData
+        
+        if precomputed is None:
+            precomputed = self.compute_district_chart(district_name, is_15dma=is_15dma)
+        daily_data = precomputed['daily_data']
+        sample_size = precomputed['sample_size']
+        
         if len(daily_data) == 0:
             print(f"Warning: No data found for district {district_name}")
             return 0
@@ -4506,7 +4274,8 @@ class CompleteReportGenerator:
         chart_data.add_series('Others', others_values)
         chart_data.add_series('N+W+R', nwr_values)
         
-        chart.replace_data(chart_data)
+        self.chart_writer.replace_data(chart, chart_data)
+        self._add_confidence_error_bars(chart, daily_data)
         
         # For slides 95-136, keep dates horizontal (set rotation to 0)
         self._set_axis_labels_horizontal(chart)
@@ -4519,13 +4288,18 @@ class CompleteReportGenerator:
     
     def calculate_15dma_for_district(self, district_name, num_days=13):
         """Calculate 15DMA vote shares for a district over num_days"""
-        district_data = self.df[self.df['District Name'] == district_name].copy()
-        if len(district_data) == 0:
+        # Use L15D weights if available
+        weight_column = 'Weight - with Vote Share - AE 2021 - District L15D'
+        if weight_column not in self.df.columns:
+            weight_column = self.get_weight_column('District', 'Overall') or 'Weight Voteshare Overall District Level'
+        
+        # Daily totals for this district (all districts are aggregated in one pass on first use)
+        series = self.daily_aggregates.get_group_series('District Name', district_name, [weight_column])
+        if series is None:
             return []
         
         # Get unique dates up to reference_date
-        district_data = district_data[district_data['Survey Date'] <= self.reference_date].copy()
-        unique_dates = sorted(district_data['Survey Date'].dropna().unique())
+        unique_dates = series.get_dates(end=self.reference_date)
         
         if len(unique_dates) == 0:
             return []
@@ -4539,48 +4313,28 @@ class CompleteReportGenerator:
             end_date = date - timedelta(days=1)  # Exclude reference date
             cutoff_date = end_date - timedelta(days=14)  # Last 15 days
             
-            date_data = district_data[
-                (district_data['Survey Date'] >= cutoff_date) & 
-                (district_data['Survey Date'] <= end_date)
-            ].copy()
+            window = series.window_totals(start=cutoff_date, end=min(end_date, self.reference_date))
             
-            if len(date_data) == 0:
+            if window['records'].sum() == 0:
                 continue
             
-            # Use L15D weights if available
-            weight_column = 'Weight - with Vote Share - AE 2021 - District L15D'
-            if weight_column not in date_data.columns:
-                weight_column = self.get_weight_column('District', 'Overall') or 'Weight Voteshare Overall District Level'
-            
-            vote_shares = self.calculator.calculate_vote_share(date_data, weight_column=weight_column, use_weights=True)
-            
-            # Convert date to Excel serial number and date label
-            excel_serial = (date - datetime(1899, 12, 30)).days
-            date_label = date.strftime('%m/%d/%Y')
-            
-            daily_results.append({
-                'date': date,
-                'date_label': date_label,
-                'excel_serial': excel_serial,
-                'AITC': vote_shares.get('AITC', 0),
-                'BJP': vote_shares.get('BJP', 0),
-                'LEFT': vote_shares.get('LEFT', 0),
-                'INC': vote_shares.get('INC', 0),
-                'Others': vote_shares.get('Others', 0),
-                'NWR': vote_shares.get('NWR', 0)
-            })
+            with self.calculator.calculation_context(metric='15DMA Trend', group=f"Point={date:%Y-%m-%d}"):
+                vote_shares = self.calculator.get_vote_shares_from_window(window, weight_column=weight_column)
+            daily_results.append(self._build_daily_vote_share_entry(date, vote_shares))
         
         return daily_results
     
     def calculate_overall_for_district(self, district_name, num_days=17):
         """Calculate Overall cumulative vote shares for a district over num_days"""
-        district_data = self.df[self.df['District Name'] == district_name].copy()
-        if len(district_data) == 0:
+        weight_column = self.get_weight_column('District', 'Overall') or 'Weight Voteshare Overall District Level'
+        
+        # Daily totals for this district (all districts are aggregated in one pass on first use)
+        series = self.daily_aggregates.get_group_series('District Name', district_name, [weight_column])
+        if series is None:
             return []
         
         # Get unique dates up to reference_date
-        district_data = district_data[district_data['Survey Date'] <= self.reference_date].copy()
-        unique_dates = sorted(district_data['Survey Date'].dropna().unique())
+        unique_dates = series.get_dates(end=self.reference_date)
         
         if len(unique_dates) == 0:
             return []
@@ -4591,51 +4345,298 @@ class CompleteReportGenerator:
         daily_results = []
         for date in dates_to_calculate:
             # Calculate cumulative up to this date
-            date_data = district_data[district_data['Survey Date'] <= date].copy()
+            window = series.window_totals(end=min(date, self.reference_date))
             
-            if len(date_data) == 0:
+            if window['records'].sum() == 0:
                 continue
             
-            weight_column = self.get_weight_column('District', 'Overall') or 'Weight Voteshare Overall District Level'
-            vote_shares = self.calculator.calculate_vote_share(date_data, weight_column=weight_column, use_weights=True)
-            
-            # Convert date to Excel serial number and date label
-            excel_serial = (date - datetime(1899, 12, 30)).days
-            date_label = date.strftime('%m/%d/%Y')
-            
-            daily_results.append({
-                'date': date,
-                'date_label': date_label,
-                'excel_serial': excel_serial,
-                'AITC': vote_shares.get('AITC', 0),
-                'BJP': vote_shares.get('BJP', 0),
-                'LEFT': vote_shares.get('LEFT', 0),
-                'INC': vote_shares.get('INC', 0),
-                'Others': vote_shares.get('Others', 0),
-                'NWR': vote_shares.get('NWR', 0)
-            })
+            with self.calculator.calculation_context(metric='Normalized Trend', group=f"Point={date:%Y-%m-%d}"):
+                vote_shares = self.calculator.get_vote_shares_from_window(window, weight_column=weight_column)
+            daily_results.append(self._build_daily_vote_share_entry(date, vote_shares))
         
         return daily_results
     
     def _get_district_sample_size(self, district_name, is_15dma=False):
         """Get sample size for a district - only count records with non-empty responses"""
-        district_data = self.df[self.df['District Name'] == district_name].copy()
-        
         if is_15dma:
             # Filter for 15DMA window
-            end_date = self.reference_date - timedelta(days=1)
-            cutoff_date = end_date - timedelta(days=14)
-            district_data = district_data[
-                (district_data['Survey Date'] >= cutoff_date) & 
-                (district_data['Survey Date'] <= end_date)
-            ].copy()
+            district_data = self.get_named_window('L15D')
         else:
             # Filter for overall
-            district_data = district_data[district_data['Survey Date'] <= self.reference_date].copy()
+            district_data = self.get_named_window('Overall')
+        district_data = district_data[district_data['District Name'] == district_name]
         
         # Count only records with valid (non-empty) responses to main question
         return self.get_sample_size(district_data)
     
+    def get_report_districts(self):
+        """Get districts for the district charts (Slides 95-136), in slide order"""
+        unique_districts = self.df['District Name'].dropna().unique()
+        return sorted([d for d in unique_districts if d != 'district_name'])
+    
+    def get_slide_compute_tasks(self):
+        """
+        List the slide computations that are independent of each other and of the slide XML
+        (demographic charts 14-39, gains/losses 47-61, regional charts 75-84, district tables 88-93,
+        district charts 95-136)
+        
+        Returns:
+            List of (slide_num, segment label, compute method name, args)
+        """
+        tasks = []
+        for slide_num, demographic_type, demographic_value in OVERALL_DMA_DEMOGRAPHIC_SLIDES:
+            tasks.append((slide_num, f"{demographic_type}={demographic_value}", 'compute_demographic_chart',
+                          (demographic_type, demographic_value, False)))
+        for slide_num, demographic_type, demographic_value in DMA7_DEMOGRAPHIC_SLIDES:
+            tasks.append((slide_num, f"{demographic_type}={demographic_value}", 'compute_demographic_chart',
+                          (demographic_type, demographic_value, True)))
+        
+        tasks.append((47, None, 'compute_gains_losses_table', (True, False, None, None)))
+        tasks.append((48, None, 'compute_gains_losses_table', (False, False, None, None)))
+        for slide_num, demographic_type, demographic_value in DEMOGRAPHIC_GAINS_LOSSES_SLIDES:
+            tasks.append((slide_num, f"{demographic_type}={demographic_value}", 'compute_gains_losses_table',
+                          (False, True, demographic_type, demographic_value)))
+        
+        for region_idx, region in enumerate(REGION_ORDER):
+            tasks.append((75 + (region_idx * 2), f"Region={region}", 'compute_regional_chart', (region, False)))
+            tasks.append((76 + (region_idx * 2), f"Region={region}", 'compute_regional_chart', (region, True)))
+        
+        # Both slides of a district table (first and second half of the districts) share its totals
+        for slide_num, is_15dma, is_7dma in [(88, True, False), (89, True, False), (90, False, False),
+                                             (91, False, False), (92, False, True), (93, False, True)]:
+            tasks.append((slide_num, None, 'compute_district_table', (is_15dma, is_7dma)))
+        
+        for district_idx, district in enumerate(self.get_report_districts()):
+            tasks.append((95 + (district_idx * 2), f"District={district}", 'compute_district_chart', (district, True)))
+            tasks.append((96 + (district_idx * 2), f"District={district}", 'compute_district_chart', (district, False)))
+        
+        return tasks
+    
+    @staticmethod
+    def get_metric_key(task):
+        """
+        Get the metric graph node of a slide computation (slides drawing the same metric share it)
+        
+        Args:
+            task: (slide_num, segment label, compute method name, args) from get_slide_compute_tasks
+        
+        Returns:
+            Node key (compute method name, *args)
+        """
+        return (task[2],) + tuple(task[3])
+    
+    def build_metric_graph(self):
+        """
+        Declare the slide metrics (see get_slide_compute_tasks) and the report windows and
+        demographic segments they depend on. Nothing is computed here: a metric is evaluated the
+        first time a slide bound in the template draws it (see get_slide_metric)
+        
+        Returns:
+            MetricGraph
+        """
+        graph = MetricGraph()
+        self.slide_metric_tasks = {}
+        
+        for task in self.get_slide_compute_tasks():
+            slide_num, segment, method_name, args = task
+            self.slide_metric_tasks[slide_num] = task
+            key = self.get_metric_key(task)
+            if key in graph:
+                continue
+            
+            # Report window the metric reads (N-DMA metrics end one day before the reference date)
+            if method_name == 'compute_demographic_chart':
+                window = 'L7D' if args[2] else 'Overall'
+            elif method_name == 'compute_gains_losses_table':
+                window = 'L7D' if args[0] else 'Overall'
+            elif method_name == 'compute_regional_chart':
+                window = 'L7D' if args[1] else 'Overall'
+            elif method_name == 'compute_district_table':
+                window = 'L15D' if args[0] else ('L7D' if args[1] else 'Overall')
+            else:
+                window = 'L15D' if args[1] else 'Overall'
+            depends_on = [('window', window)]
+            if ('window', window) not in graph:
+                graph.add(('window', window), lambda window=window: self.get_named_window(window))
+            
+            # Demographic segment (rows of e.g. Religion=Muslim, memoized by the segment registry)
+            if method_name == 'compute_demographic_chart' or (method_name == 'compute_gains_losses_table' and args[1]):
+                demographic = args[-3:-1] if method_name == 'compute_demographic_chart' else args[2:4]
+                segment_key = ('segment',) + tuple(demographic)
+                if segment_key not in graph:
+                    graph.add(segment_key, lambda demographic=demographic: self.segments.get_mask(*demographic))
+                depends_on.append(segment_key)
+            
+            # Gains/losses of all segments of the demographic type (one grouped contingency table)
+            if method_name == 'compute_gains_losses_table' and args[1]:
+                crosstab_key = ('gains_losses_by_segment', args[2], args[0])
+                if crosstab_key not in graph:
+                    graph.add(crosstab_key, lambda window=window, demographic_type=args[2]:
+                              self.calculate_gains_losses_by_segment(self.get_named_window(window), demographic_type),
+                              depends_on=[('window', window)])
+                depends_on.append(crosstab_key)
+            
+            graph.add(key, lambda method_name=method_name, args=args: self._capture_calculation_records(
+                lambda: getattr(self, method_name)(*args)), depends_on=depends_on)
+        
+        return graph
+    
+    def _capture_calculation_records(self, compute):
+        """
+        Run a computation, keeping its calculation records apart from the records made so far
+        
+        Args:
+            compute: Function without arguments
+        
+        Returns:
+            (result, calculation records made by this computation)
+        """
+        previous_records = self.calculator.calculation_records
+        self.calculator.calculation_records = []
+        try:
+            result = compute()
+            return result, self.calculator.calculation_records
+        finally:
+            self.calculator.calculation_records = previous_records
+    
+    def compute_slide(self, task):
+        """
+        Evaluate one slide computation's metric (records labelled with the task's slide and segment)
+        
+        Args:
+            task: (slide_num, segment label, compute method name, args) from get_slide_compute_tasks
+        
+        Returns:
+            (result, calculation records made by this computation)
+        """
+        slide_num, segment, method_name, args = task
+        self.calculator.set_calculation_context(slide=slide_num, segment=segment)
+        return self.metrics.get(self.get_metric_key(task))
+    
+    def is_slide_bound(self, slide_num, kind):
+        """
+        Check whether the output deck has a slide whose template binds shapes of a kind
+        
+        Args:
+            slide_num: Slide number
+            kind: 'charts' or 'tables'
+        
+        Returns:
+            True if the slide exists and has such shapes (or is not in the template map - it is
+            then searched when it is updated)
+        """
+        if len(self.output_prs.slides) < slide_num:
+            return False
+        if self.template_map is None or slide_num not in self.template_map.slides:
+            return True
+        return len(self.template_map.slides[slide_num][kind]) > 0
+    
+    def get_bound_slide_tasks(self):
+        """
+        Get the slide computations whose slide is bound in the template (see is_slide_bound)
+        
+        Returns:
+            List of tasks from get_slide_compute_tasks, in slide order
+        """
+        return [task for slide_num, task in sorted(self.slide_metric_tasks.items())
+                if self.is_slide_bound(slide_num, SLIDE_METRIC_SHAPES[task[2]])]
+    
+    def precompute_slides(self, workers):
+        """
+        Compute the metrics of the independent slides bound in the template (see
+        get_slide_compute_tasks) on a pool of worker processes, one task per metric.
+        Workers are forked, so they share the loaded survey data read-only; only the small
+        per-slide results come back into the metric graph. Rendering (XML changes) and saving
+        stay in this process
+        
+        Args:
+            workers: Number of worker processes (<= 1 computes nothing up front)
+        
+        Returns:
+            Number of metrics computed in worker processes
+        """
+        global _slide_worker_generator
+        
+        if workers is None or workers <= 1:
+            return 0
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            print("Warning: Worker processes need fork (not available on this platform) - computing slides sequentially")
+            return 0
+        
+        # One task per metric not computed yet (the first slide drawing it)
+        tasks = {}
+        for task in self.get_bound_slide_tasks():
+            key = self.get_metric_key(task)
+            if not self.metrics.is_evaluated(key):
+                tasks.setdefault(key, task)
+        tasks = list(tasks.values())
+        computed = 0
+        
+        # The first regional / district chart of each kind builds the per-day table shared by all
+        # regions / districts - compute those here so every worker inherits the built tables
+        shared_table_tasks = {}
+        for task in tasks:
+            if task[2] in ('compute_regional_chart', 'compute_district_chart'):
+                shared_table_tasks.setdefault((task[2], task[3][1]), task)
+        for task in shared_table_tasks.values():
+            self.compute_slide(task)
+        
+        tasks = [task for task in tasks if not self.metrics.is_evaluated(self.get_metric_key(task))]
+        if not tasks:
+            return computed
+        
+        workers = min(workers, len(tasks))
+        print(f"Computing {len(tasks)} slides on {workers} worker processes...")
+        _slide_worker_generator = self
+        try:
+            with multiprocessing.get_context('fork').Pool(processes=workers) as pool:
+                for slide_num, result, records, store_counts, weight_decisions in pool.imap_unordered(
+                        _compute_slide_in_worker, tasks):
+                    self.metrics.set(self.get_metric_key(self.slide_metric_tasks[slide_num]), (result, records))
+                    self.weights.add_decisions(weight_decisions)
+                    computed += 1
+                    if self.aggregate_store is not None:
+                        self.aggregate_store.days_reused += store_counts[0]
+                        self.aggregate_store.days_aggregated += store_counts[1]
+        except Exception as e:
+            # Remaining slides are computed as they are rendered
+            print(f"Warning: Parallel slide computation failed, computing slides sequentially: {e}")
+        finally:
+            _slide_worker_generator = None
+        
+        return computed
+    
+    def get_slide_metric(self, slide_num):
+        """
+        Get the metric drawn on a slide (computed on first use, shared with every slide drawing
+        the same metric) and add its calculation records to the slide, in slide order
+        
+        Args:
+            slide_num: Slide number
+        
+        Returns:
+            Result of the slide's compute method, or None if the slide has no metric node
+        """
+        task = self.slide_metric_tasks.get(slide_num)
+        if task is None:
+            return None
+        result, records = self.metrics.get(self.get_metric_key(task))
+        self.calculator.add_calculation_records(records, relabel=True)
+        return result
+    
+    def _begin_slide(self, slide, segment=None):
+        """
+        Start updating a slide: label the calculations recorded from now on and report progress
+        
+        Args:
+            slide: Slide number
+            segment: Segment label (e.g. 'Gender=Male', 'Region=Malda') for recorded calculations
+        """
+        self.calculator.set_calculation_context(slide=slide, segment=segment)
+        self.profiler.begin_slide(slide, family=get_slide_family(slide))
+        if self.progress_callback is not None:
+            self.progress_callback(slide, len(self.output_prs.slides))
+    
     def generate_complete_report(self, output_path):
         """
         Generate complete report by copying template and updating values
@@ -4649,9 +4650,28 @@ class CompleteReportGenerator:
         # Copy entire template by loading it
         print("Copying template structure...")
         # Load template PPT and save it as output (we'll modify values)
-        self.output_prs = Presentation(self.template_ppt_path)
+        # The template parsed at load time is used directly the first time (no second parse)
+        if self.template_unmodified:
+            self.output_prs = self.template_prs
+            self.template_prs = None  # Now the output deck - not kept once the next deck replaces it
+            self.template_unmodified = False
+        else:
+            with self.profiler.stage('open_template'):
+                self.output_prs = open_presentation(self.template_ppt_path, lazy_parts=self.lazy_template_parts)
+        self.chart_writer.reset()
+        self.calculator.result_cache.reset_counters()
+        self.weights.reset_decisions()
+        self.profiler.info['reference_date'] = self.reference_date.strftime('%Y-%m-%d')
+        self.profiler.info['template_path'] = self.template_ppt_path
+        
+        # Compute the metrics of the independent demographic / gains-losses / regional / district
+        # slides bound in the template in parallel (each is rendered from the metric graph below,
+        # in slide order - without workers each metric is computed when its first slide is updated)
+        with self.profiler.stage('precompute_slides'):
+            precomputed = self.precompute_slides(self.workers)
         
         # Update slide 1 (Title) - Reporting Date (use current date when report is generated)
+        self._begin_slide(slide=1)
         if len(self.output_prs.slides) > 0:
             slide1 = self.output_prs.slides[0]
             # Use reference date (when report is generated)
@@ -4695,26 +4715,29 @@ class CompleteReportGenerator:
         print("Updated Slide 1: Title slide")
         
         # Update slide 2 (Introduction) - Sample size
+        self._begin_slide(slide=2)
         if len(self.output_prs.slides) > 1:
             slide2 = self.output_prs.slides[1]
-            for shape in slide2.shapes:
+            for shape in self.get_slide_shapes(slide2, 2, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
                     self.update_slide_2_table(shape.table)
             print("Updated Slide 2: Introduction")
         
         # Update slide 5 (State Level Vote Share)
+        self._begin_slide(slide=5)
         if len(self.output_prs.slides) > 4:
             slide5 = self.output_prs.slides[4]
-            for shape in slide5.shapes:
+            for shape in self.get_slide_shapes(slide5, 5, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
                     self.update_slide_5_table(shape.table)
             print("Updated Slide 5: State Level Vote Share")
         
         # Update slide 6 (Overall Normalized Vote Share Chart)
+        self._begin_slide(slide=6)
         if len(self.output_prs.slides) > 5:
             slide6 = self.output_prs.slides[5]
             sample_size_6 = 0
-            for shape in slide6.shapes:
+            for shape in self.get_slide_shapes(slide6, 6, 'charts'):
                 try:
                     if hasattr(shape, 'chart') and shape.chart:
                         sample_size_6 = self.update_slide_6_chart(shape.chart)
@@ -4732,10 +4755,11 @@ class CompleteReportGenerator:
             print("Updated Slide 6: Overall Normalized Vote Share Chart")
         
         # Update slide 7 (7 DMA Chart)
+        self._begin_slide(slide=7)
         if len(self.output_prs.slides) > 6:
             slide7 = self.output_prs.slides[6]
             sample_size_7 = 0
-            for shape in slide7.shapes:
+            for shape in self.get_slide_shapes(slide7, 7, 'charts'):
                 try:
                     if hasattr(shape, 'chart') and shape.chart:
                         sample_size_7 = self.update_slide_7_chart(shape.chart)
@@ -4754,13 +4778,14 @@ class CompleteReportGenerator:
         
         # Update slide 9 (Demographics - Part 1) - Multiple tables
         # Only replace values, do not change table positions or design
+        self._begin_slide(slide=9)
         if len(self.output_prs.slides) > 8:
             slide9 = self.output_prs.slides[8]
             table_count = 0
             
-            for shape in slide9.shapes:
+            for shape in self.get_slide_shapes(slide9, 9, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
-                    self.update_demographic_table(shape.table, slide9)
+                    self.update_demographic_table(shape.table, slide9, slide_num=9)
                     table_count += 1
             
             if table_count > 0:
@@ -4768,13 +4793,14 @@ class CompleteReportGenerator:
         
         # Update slide 10 (Demographics - Part 2) - Multiple tables
         # Only replace values, do not change table positions or design
+        self._begin_slide(slide=10)
         if len(self.output_prs.slides) > 9:
             slide10 = self.output_prs.slides[9]
             table_count = 0
             
-            for shape in slide10.shapes:
+            for shape in self.get_slide_shapes(slide10, 10, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
-                    self.update_demographic_table(shape.table, slide10)
+                    self.update_demographic_table(shape.table, slide10, slide_num=10)
                     table_count += 1
             
             if table_count > 0:
@@ -4783,13 +4809,14 @@ class CompleteReportGenerator:
         # Update slides 11-12 (Demographic tables - Part 3 and 4)
         # Slide 11: Social Category and Age (Part 3)
         # Only replace values, do not change table positions or design
+        self._begin_slide(slide=11)
         if len(self.output_prs.slides) > 10:
             slide11 = self.output_prs.slides[10]
             table_count = 0
             
-            for shape in slide11.shapes:
+            for shape in self.get_slide_shapes(slide11, 11, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
-                    self.update_demographic_table(shape.table, slide11)
+                    self.update_demographic_table(shape.table, slide11, slide_num=11)
                     table_count += 1
             
             if table_count > 0:
@@ -4797,13 +4824,14 @@ class CompleteReportGenerator:
         
         # Slide 12: Age (Part 4)
         # Only replace values, do not change table positions or design
+        self._begin_slide(slide=12)
         if len(self.output_prs.slides) > 11:
             slide12 = self.output_prs.slides[11]
             table_count = 0
             
-            for shape in slide12.shapes:
+            for shape in self.get_slide_shapes(slide12, 12, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
-                    self.update_demographic_table(shape.table, slide12)
+                    self.update_demographic_table(shape.table, slide12, slide_num=12)
                     table_count += 1
             
             if table_count > 0:
@@ -4811,29 +4839,20 @@ class CompleteReportGenerator:
         
         # Update Overall DMA demographic charts (Slides 14-23)
         # These are "DMA – [Demographic] (Overall)" charts
-        overall_dma_demographic_slides = [
-            (14, 'Gender', 'Male'),
-            (15, 'Gender', 'Female'),
-            (16, 'Location', 'Urban'),
-            (17, 'Location', 'Rural'),
-            (18, 'Religion', 'Hindu'),
-            (19, 'Religion', 'Muslim'),
-            (20, 'Social Category', 'General+OBC'),
-            (21, 'Social Category', 'SC'),
-            (22, 'Social Category', 'ST'),
-            (23, 'Age', '18-25'),
-        ]
-        
-        for slide_num, demographic_type, demographic_value in overall_dma_demographic_slides:
+        for slide_num, demographic_type, demographic_value in OVERALL_DMA_DEMOGRAPHIC_SLIDES:
+            self._begin_slide(slide=slide_num, segment=f"{demographic_type}={demographic_value}")
             if len(self.output_prs.slides) > slide_num - 1:
                 slide = self.output_prs.slides[slide_num - 1]
                 sample_size = 0
                 
                 # Find chart in slide
-                for shape in slide.shapes:
+                for shape in self.get_slide_shapes(slide, slide_num, 'charts'):
                     try:
                         if hasattr(shape, 'chart') and shape.chart:
-                            sample_size = self.update_demographic_chart(shape.chart, demographic_type, demographic_value)
+                            sample_size = self.update_demographic_chart(
+                                shape.chart, demographic_type, demographic_value,
+                                precomputed=self.get_slide_metric(slide_num)
+                            )
                             break
                     except (ValueError, AttributeError):
                         pass
@@ -4849,35 +4868,20 @@ class CompleteReportGenerator:
         
         # Update 7 DMA demographic charts (Slides 24-39)
         # These are "7DMA – [Demographic]" charts
-        dma7_demographic_slides = [
-            (24, 'Age', '26-34'),  # Note: Slide 24 is 26-34, not 18-25
-            (25, 'Age', '36-50'),
-            (26, 'Age', '50+'),
-            (27, 'Gender', 'Male'),
-            (28, 'Gender', 'Female'),
-            (29, 'Location', 'Urban'),
-            (30, 'Location', 'Rural'),
-            (31, 'Religion', 'Hindu'),
-            (32, 'Religion', 'Muslim'),
-            (33, 'Social Category', 'General+OBC'),
-            (34, 'Social Category', 'SC'),
-            (35, 'Social Category', 'ST'),
-            (36, 'Age', '18-25'),
-            (37, 'Age', '26-34'),
-            (38, 'Age', '36-50'),
-            (39, 'Age', '50+'),
-        ]
-        
-        for slide_num, demographic_type, demographic_value in dma7_demographic_slides:
+        for slide_num, demographic_type, demographic_value in DMA7_DEMOGRAPHIC_SLIDES:
+            self._begin_slide(slide=slide_num, segment=f"{demographic_type}={demographic_value}")
             if len(self.output_prs.slides) > slide_num - 1:
                 slide = self.output_prs.slides[slide_num - 1]
                 sample_size = 0
                 
                 # Find chart in slide
-                for shape in slide.shapes:
+                for shape in self.get_slide_shapes(slide, slide_num, 'charts'):
                     try:
                         if hasattr(shape, 'chart') and shape.chart:
-                            sample_size = self.update_7dma_demographic_chart(shape.chart, demographic_type, demographic_value)
+                            sample_size = self.update_7dma_demographic_chart(
+                                shape.chart, demographic_type, demographic_value,
+                                precomputed=self.get_slide_metric(slide_num)
+                            )
                             break
                     except (ValueError, AttributeError):
                         pass
@@ -4893,28 +4897,31 @@ class CompleteReportGenerator:
         
         # Update slides 41-42 (Caste Wise Vote Shares)
         # Slide 41: Caste Wise Vote Shares (30 DMA)
+        self._begin_slide(slide=41)
         if len(self.output_prs.slides) > 40:
             slide41 = self.output_prs.slides[40]
-            for shape in slide41.shapes:
+            for shape in self.get_slide_shapes(slide41, 41, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
                     self.update_caste_table(shape.table, is_30dma=True)
                     print("Updated Slide 41: Caste Wise Vote Shares (30 DMA)")
                     break
         
         # Slide 42: Caste Wise Vote Shares (Overall)
+        self._begin_slide(slide=42)
         if len(self.output_prs.slides) > 41:
             slide42 = self.output_prs.slides[41]
-            for shape in slide42.shapes:
+            for shape in self.get_slide_shapes(slide42, 42, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
                     self.update_caste_table(shape.table, is_30dma=False)
                     print("Updated Slide 42: Caste Wise Vote Shares (Overall)")
                     break
         
         # Update slide 44 (Top Reasons for Party Choices - 7 DMA)
+        self._begin_slide(slide=44)
         if len(self.output_prs.slides) > 43:
             slide44 = self.output_prs.slides[43]
             sample_size_44 = 0
-            for shape in slide44.shapes:
+            for shape in self.get_slide_shapes(slide44, 44, 'charts'):
                 try:
                     if hasattr(shape, 'chart') and shape.chart:
                         sample_size_44 = self.update_top_reasons_chart(shape.chart, is_7dma=True)
@@ -4929,10 +4936,11 @@ class CompleteReportGenerator:
                     print(f"Updated Slide 44 Base sample size: {sample_size_44:,}")
         
         # Update slide 45 (Top Reasons for Party Choices - Overall)
+        self._begin_slide(slide=45)
         if len(self.output_prs.slides) > 44:
             slide45 = self.output_prs.slides[44]
             sample_size_45 = 0
-            for shape in slide45.shapes:
+            for shape in self.get_slide_shapes(slide45, 45, 'charts'):
                 try:
                     if hasattr(shape, 'chart') and shape.chart:
                         sample_size_45 = self.update_top_reasons_chart(shape.chart, is_7dma=False)
@@ -4948,12 +4956,14 @@ class CompleteReportGenerator:
         
         # Update Gains and Losses tables (Slides 47-61)
         # Slide 47: Gains and Losses - 7 DMA (Overall)
+        self._begin_slide(slide=47)
         if len(self.output_prs.slides) > 46:
             slide47 = self.output_prs.slides[46]
             sample_size_47 = 0
-            for shape in slide47.shapes:
+            for shape in self.get_slide_shapes(slide47, 47, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
-                    sample_size_47 = self.update_gains_losses_table(shape.table, is_7dma=True, is_demographic=False)
+                    sample_size_47 = self.update_gains_losses_table(shape.table, is_7dma=True, is_demographic=False,
+                                                                    precomputed=self.get_slide_metric(47))
                     print("Updated Slide 47: Gains and Losses - 7 DMA (Overall)")
                     break
             
@@ -4963,12 +4973,14 @@ class CompleteReportGenerator:
             #         print(f"Updated Slide 47 Base sample size: {sample_size_47:,}")
         
         # Slide 48: Gains and Losses - Overall
+        self._begin_slide(slide=48)
         if len(self.output_prs.slides) > 47:
             slide48 = self.output_prs.slides[47]
             sample_size_48 = 0
-            for shape in slide48.shapes:
+            for shape in self.get_slide_shapes(slide48, 48, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
-                    sample_size_48 = self.update_gains_losses_table(shape.table, is_7dma=False, is_demographic=False)
+                    sample_size_48 = self.update_gains_losses_table(shape.table, is_7dma=False, is_demographic=False,
+                                                                    precomputed=self.get_slide_metric(48))
                     print("Updated Slide 48: Gains and Losses - Overall")
                     break
             
@@ -4978,30 +4990,16 @@ class CompleteReportGenerator:
             #         print(f"Updated Slide 48 Base sample size: {sample_size_48:,}")
         
         # Slides 49-61: Gains and Losses - Demographics (Overall)
-        demographic_gains_losses = [
-            (49, 'Location', 'Urban'),
-            (50, 'Location', 'Rural'),
-            (51, 'Gender', 'Male'),
-            (52, 'Gender', 'Female'),
-            (53, 'Age', '18-25'),
-            (54, 'Age', '26-34'),
-            (55, 'Age', '36-50'),
-            (56, 'Age', '50+'),
-            (57, 'Religion', 'Hindu'),
-            (58, 'Religion', 'Muslim'),
-            (59, 'Social Category', 'General+OBC'),
-            (60, 'Social Category', 'SC'),
-            (61, 'Social Category', 'ST'),
-        ]
-        
-        for slide_num, demographic_type, demographic_value in demographic_gains_losses:
+        for slide_num, demographic_type, demographic_value in DEMOGRAPHIC_GAINS_LOSSES_SLIDES:
+            self._begin_slide(slide=slide_num, segment=f"{demographic_type}={demographic_value}")
             if len(self.output_prs.slides) > slide_num - 1:
                 slide = self.output_prs.slides[slide_num - 1]
                 sample_size = 0
-                for shape in slide.shapes:
+                for shape in self.get_slide_shapes(slide, slide_num, 'tables'):
                     if hasattr(shape, 'has_table') and shape.has_table:
                         sample_size = self.update_gains_losses_table(shape.table, is_7dma=False, is_demographic=True, 
-                                                      demographic_type=demographic_type, demographic_value=demographic_value)
+                                                      demographic_type=demographic_type, demographic_value=demographic_value,
+                                                      precomputed=self.get_slide_metric(slide_num))
                         print(f"Updated Slide {slide_num}: Gains and Losses - {demographic_type}={demographic_value} (Overall)")
                         break
                 
@@ -5012,10 +5010,11 @@ class CompleteReportGenerator:
         
         # Update Vote Transferability tables (Slides 63-64)
         # Slide 63: Vote Transferability - 7 DMA
+        self._begin_slide(slide=63)
         if len(self.output_prs.slides) > 62:
             slide63 = self.output_prs.slides[62]
             sample_size_63 = 0
-            for shape in slide63.shapes:
+            for shape in self.get_slide_shapes(slide63, 63, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
                     sample_size_63 = self.update_vote_transferability_table(shape.table, is_7dma=True)
                     print("Updated Slide 63: Vote Transferability - 7 DMA")
@@ -5027,10 +5026,11 @@ class CompleteReportGenerator:
                     print(f"Updated Slide 63 Base sample size: {sample_size_63:,}")
         
         # Slide 64: Vote Transferability - Overall
+        self._begin_slide(slide=64)
         if len(self.output_prs.slides) > 63:
             slide64 = self.output_prs.slides[63]
             sample_size_64 = 0
-            for shape in slide64.shapes:
+            for shape in self.get_slide_shapes(slide64, 64, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
                     sample_size_64 = self.update_vote_transferability_table(shape.table, is_7dma=False)
                     print("Updated Slide 64: Vote Transferability - Overall")
@@ -5042,10 +5042,11 @@ class CompleteReportGenerator:
                     print(f"Updated Slide 64 Base sample size: {sample_size_64:,}")
         
         # Slide 66: Preferred CM Candidate
+        self._begin_slide(slide=66)
         if len(self.output_prs.slides) > 65:
             slide66 = self.output_prs.slides[65]
             sample_size_66 = 0
-            for shape in slide66.shapes:
+            for shape in self.get_slide_shapes(slide66, 66, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
                     sample_size_66 = self.update_preferred_cm_table(shape.table)
                     print("Updated Slide 66: Preferred CM Candidate")
@@ -5057,10 +5058,11 @@ class CompleteReportGenerator:
                     print(f"Updated Slide 66 Base sample size: {sample_size_66:,}")
         
         # Slide 68: State Government Rating
+        self._begin_slide(slide=68)
         if len(self.output_prs.slides) > 67:
             slide68 = self.output_prs.slides[67]
             sample_size_68 = 0
-            for shape in slide68.shapes:
+            for shape in self.get_slide_shapes(slide68, 68, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
                     sample_size_68 = self.update_state_government_rating_table(shape.table)
                     print("Updated Slide 68: State Government Rating - State Level")
@@ -5072,10 +5074,11 @@ class CompleteReportGenerator:
                     print(f"Updated Slide 68 Base sample size: {sample_size_68:,}")
         
         # Slide 70: Key Issues
+        self._begin_slide(slide=70)
         if len(self.output_prs.slides) > 69:
             slide70 = self.output_prs.slides[69]
             sample_size_70 = 0
-            for shape in slide70.shapes:
+            for shape in self.get_slide_shapes(slide70, 70, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
                     sample_size_70 = self.update_key_issues_table(shape.table)
                     print("Updated Slide 70: Key Issues")
@@ -5087,10 +5090,11 @@ class CompleteReportGenerator:
                     print(f"Updated Slide 70 Base sample size: {sample_size_70:,}")
         
         # Slide 72: Wisdom of Crowds
+        self._begin_slide(slide=72)
         if len(self.output_prs.slides) > 71:
             slide72 = self.output_prs.slides[71]
             sample_size_72 = 0
-            for shape in slide72.shapes:
+            for shape in self.get_slide_shapes(slide72, 72, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
                     sample_size_72 = self.update_wisdom_of_crowds_table(shape.table)
                     print("Updated Slide 72: Wisdom of Crowds - Which Party is Likely to Win")
@@ -5102,10 +5106,11 @@ class CompleteReportGenerator:
                     print(f"Updated Slide 72 Base sample size: {sample_size_72:,}")
         
         # Slide 74: Vote Share by Regions
+        self._begin_slide(slide=74)
         if len(self.output_prs.slides) > 73:
             slide74 = self.output_prs.slides[73]
             sample_size_74 = 0
-            for shape in slide74.shapes:
+            for shape in self.get_slide_shapes(slide74, 74, 'tables'):
                 if hasattr(shape, 'has_table') and shape.has_table:
                     sample_size_74 = self.update_vote_share_by_regions_table(shape.table)
                     print("Updated Slide 74: Vote Share by Regions")
@@ -5122,17 +5127,18 @@ class CompleteReportGenerator:
         # Slide 79: Burdwan (Overall), Slide 80: Burdwan (7DMA)
         # Slide 81: Medinipur (Overall), Slide 82: Medinipur (7DMA)
         # Slide 83: Presidency (Overall), Slide 84: Presidency (7DMA)
-        region_order = ['Jalpaiguri', 'Malda', 'Burdwan', 'Medinipur', 'Presidency']
-        for region_idx, region in enumerate(region_order):
+        for region_idx, region in enumerate(REGION_ORDER):
             # Overall slide (75, 77, 79, 81, 83)
             slide_num_overall = 75 + (region_idx * 2)
+            self._begin_slide(slide=slide_num_overall, segment=f"Region={region}")
             if len(self.output_prs.slides) > slide_num_overall - 1:
                 slide = self.output_prs.slides[slide_num_overall - 1]
                 sample_size = 0
-                for shape in slide.shapes:
+                for shape in self.get_slide_shapes(slide, slide_num_overall, 'charts'):
                     try:
                         if hasattr(shape, 'chart') and shape.chart:
-                            sample_size = self.update_regional_chart(shape.chart, region, is_7dma=False)
+                            sample_size = self.update_regional_chart(shape.chart, region, is_7dma=False,
+                                                                     precomputed=self.get_slide_metric(slide_num_overall))
                             print(f"Updated Slide {slide_num_overall}: {region} (Overall)")
                             break
                     except (ValueError, AttributeError):
@@ -5144,13 +5150,15 @@ class CompleteReportGenerator:
             
             # 7DMA slide (76, 78, 80, 82, 84)
             slide_num_7dma = 76 + (region_idx * 2)
+            self._begin_slide(slide=slide_num_7dma, segment=f"Region={region}")
             if len(self.output_prs.slides) > slide_num_7dma - 1:
                 slide = self.output_prs.slides[slide_num_7dma - 1]
                 sample_size = 0
-                for shape in slide.shapes:
+                for shape in self.get_slide_shapes(slide, slide_num_7dma, 'charts'):
                     try:
                         if hasattr(shape, 'chart') and shape.chart:
-                            sample_size = self.update_regional_chart(shape.chart, region, is_7dma=True)
+                            sample_size = self.update_regional_chart(shape.chart, region, is_7dma=True,
+                                                                     precomputed=self.get_slide_metric(slide_num_7dma))
                             print(f"Updated Slide {slide_num_7dma}: {region} (7DMA)")
                             break
                     except (ValueError, AttributeError):
@@ -5169,12 +5177,14 @@ class CompleteReportGenerator:
         # Slide 90: Districts Overall (1 of 2), Slide 91: Districts Overall (2 of 2)
         # Slide 92: Districts 7DMA (1 of 2), Slide 93: Districts 7DMA (2 of 2)
         for slide_num in [88, 89]:
+            self._begin_slide(slide=slide_num)
             if len(self.output_prs.slides) > slide_num - 1:
                 slide = self.output_prs.slides[slide_num - 1]
                 sample_size = 0
-                for shape in slide.shapes:
+                for shape in self.get_slide_shapes(slide, slide_num, 'tables'):
                     if hasattr(shape, 'has_table') and shape.has_table:
-                        sample_size = self.update_district_table(shape.table, is_15dma=True, slide_num=slide_num)
+                        sample_size = self.update_district_table(shape.table, is_15dma=True, slide_num=slide_num,
+                                                                 precomputed=self.get_slide_metric(slide_num))
                         print(f"Updated Slide {slide_num}: Districts (15DMA)")
                         break
                 
@@ -5184,12 +5194,14 @@ class CompleteReportGenerator:
         
         # Slides 90-91: Overall districts
         for slide_num in [90, 91]:
+            self._begin_slide(slide=slide_num)
             if len(self.output_prs.slides) > slide_num - 1:
                 slide = self.output_prs.slides[slide_num - 1]
                 sample_size = 0
-                for shape in slide.shapes:
+                for shape in self.get_slide_shapes(slide, slide_num, 'tables'):
                     if hasattr(shape, 'has_table') and shape.has_table:
-                        sample_size = self.update_district_table(shape.table, is_15dma=False, is_7dma=False, slide_num=slide_num)
+                        sample_size = self.update_district_table(shape.table, is_15dma=False, is_7dma=False, slide_num=slide_num,
+                                                                 precomputed=self.get_slide_metric(slide_num))
                         print(f"Updated Slide {slide_num}: Districts (Overall)")
                         break
                 
@@ -5199,12 +5211,14 @@ class CompleteReportGenerator:
         
         # Slides 92-93: 7DMA districts
         for slide_num in [92, 93]:
+            self._begin_slide(slide=slide_num)
             if len(self.output_prs.slides) > slide_num - 1:
                 slide = self.output_prs.slides[slide_num - 1]
                 sample_size = 0
-                for shape in slide.shapes:
+                for shape in self.get_slide_shapes(slide, slide_num, 'tables'):
                     if hasattr(shape, 'has_table') and shape.has_table:
-                        sample_size = self.update_district_table(shape.table, is_15dma=False, is_7dma=True, slide_num=slide_num)
+                        sample_size = self.update_district_table(shape.table, is_15dma=False, is_7dma=True, slide_num=slide_num,
+                                                                 precomputed=self.get_slide_metric(slide_num))
                         print(f"Updated Slide {slide_num}: Districts (7DMA)")
                         break
                 
@@ -5216,20 +5230,21 @@ class CompleteReportGenerator:
         # These slides show district vote share graphs
         # Each district has 2 slides: 15DMA and Overall
         # Getting unique districts from data
-        unique_districts = self.df['District Name'].dropna().unique()
-        unique_districts = sorted([d for d in unique_districts if d != 'district_name'])
+        unique_districts = self.get_report_districts()
         
         # Starting from slide 95, each district has 2 slides (15DMA and Overall)
         for district_idx, district in enumerate(unique_districts):
             # 15DMA slide
             slide_num_15dma = 95 + (district_idx * 2)
+            self._begin_slide(slide=slide_num_15dma, segment=f"District={district}")
             if len(self.output_prs.slides) > slide_num_15dma - 1:
                 slide = self.output_prs.slides[slide_num_15dma - 1]
                 sample_size = 0
-                for shape in slide.shapes:
+                for shape in self.get_slide_shapes(slide, slide_num_15dma, 'charts'):
                     try:
                         if hasattr(shape, 'chart') and shape.chart:
-                            sample_size = self.update_district_chart(shape.chart, district, is_15dma=True)
+                            sample_size = self.update_district_chart(shape.chart, district, is_15dma=True,
+                                                                     precomputed=self.get_slide_metric(slide_num_15dma))
                             print(f"Updated Slide {slide_num_15dma}: {district} (15DMA)")
                             break
                     except (ValueError, AttributeError):
@@ -5241,13 +5256,15 @@ class CompleteReportGenerator:
             
             # Overall slide
             slide_num_overall = 96 + (district_idx * 2)
+            self._begin_slide(slide=slide_num_overall, segment=f"District={district}")
             if len(self.output_prs.slides) > slide_num_overall - 1:
                 slide = self.output_prs.slides[slide_num_overall - 1]
                 sample_size = 0
-                for shape in slide.shapes:
+                for shape in self.get_slide_shapes(slide, slide_num_overall, 'charts'):
                     try:
                         if hasattr(shape, 'chart') and shape.chart:
-                            sample_size = self.update_district_chart(shape.chart, district, is_15dma=False)
+                            sample_size = self.update_district_chart(shape.chart, district, is_15dma=False,
+                                                                     precomputed=self.get_slide_metric(slide_num_overall))
                             print(f"Updated Slide {slide_num_overall}: {district} (Overall)")
                             break
                     except (ValueError, AttributeError):
@@ -5257,12 +5274,85 @@ class CompleteReportGenerator:
                     if self.update_base_text_on_slide(slide, sample_size, slide_num=slide_num_overall):
                         print(f"Updated Slide {slide_num_overall} Base sample size: {sample_size:,}")
         
-        # Save
-        self.output_prs.save(output_path)
+        if self.aggregate_store is not None:
+            print(f"Aggregate store: reused {self.aggregate_store.days_reused} day totals, "
+                  f"aggregated {self.aggregate_store.days_aggregated} new/changed")
+        
+        # Slide metrics not bound in the template were never computed
+        bound_tasks = self.get_bound_slide_tasks()
+        shared = len(bound_tasks) - len({self.get_metric_key(task) for task in bound_tasks})
+        print(f"Metric graph: {len(bound_tasks)} of {len(self.slide_metric_tasks)} slide metrics bound in the template "
+              f"({shared} shared with another slide), {self.metrics.computed} metrics / windows / segments computed"
+              + (f" here and {precomputed} in worker processes" if precomputed else ""))
+        self.profiler.info['metric_graph'] = {'bound_slides': len(bound_tasks), 'shared': shared,
+                                              'computed': self.metrics.computed, 'worker_computed': precomputed}
+        
+        # Calculations answered from an earlier identical calculation (this deck or earlier decks of the run)
+        print(self.calculator.result_cache.summary())
+        self.profiler.info['result_cache'] = self.calculator.result_cache.get_counters()
+        
+        # L7D / L15D windows whose period weights were too sparse (Overall weights used instead)
+        print(self.weights.summary())
+        self.profiler.info['weights'] = self.weights.to_dict()
+        
+        self.profiler.end_slide()
+        
+        # Embedded chart workbooks are written in one pass (removed in cache-only mode, so
+        # "Edit Data" in PowerPoint can't bring back the template's numbers)
+        with self.profiler.stage('chart_workbooks'):
+            if self.chart_writer.editable_data:
+                print(f"Writing embedded data of {self.chart_writer.flush()} charts")
+            else:
+                print(f"Removed embedded data of {self.chart_writer.flush()} charts (chart cache only)")
+        
+        # Save (with lazy template parts only the parsed parts are re-serialized)
+        with self.profiler.stage('save'):
+            if self.lazy_template_parts:
+                parsed_parts, lazy_parts = count_parsed_parts(self.output_prs)
+                print(f"Writing deck: {parsed_parts} of {lazy_parts} slide/chart/layout parts updated, "
+                      f"{lazy_parts - parsed_parts} copied from the template unchanged")
+            self.output_prs.save(output_path)
         print(f"\nReport saved: {output_path}")
+        
+        if self.profiler.enabled:
+            dump_path = self.profiler.stop_dump(output_path)
+            print(f"Run profile saved: {self.profiler.write(output_path)}" + (f" (dump: {dump_path})" if dump_path else ""))
         print("="*80)
         
         return output_path
+    
+    def generate_audit_trail(self, output_path):
+        """
+        Generate the calculation audit trail from the calculations recorded during
+        generate_complete_report (the deck's own numbers - nothing is recomputed)
+        
+        Args:
+            output_path: Path to save audit trail - .jsonl / .parquet writes structured records
+                         (one per calculation and party), any other extension the text audit
+        
+        Returns:
+            Path to audit trail file
+        """
+        from calculation_audit_trail import CalculationAuditTrail
+        from audit_records import get_audit_format, write_audit_records
+        
+        if not self.record_calculations:
+            print("Warning: Calculations were not recorded - audit trail will be empty")
+        
+        with self.profiler.stage('audit_trail'):
+            if get_audit_format(output_path):
+                # Structured records only - text can be rendered later with calculation_audit_trail.py --render
+                output_path = write_audit_records(self.calculator.calculation_records, output_path)
+                print(f"\n✅ Audit records saved to: {output_path} ({len(self.calculator.calculation_records):,} calculations)")
+            else:
+                audit = CalculationAuditTrail(self.calculator.calculation_records, excel_path=self.excel_path,
+                                              reference_date=self.reference_date)
+                output_path = audit.generate_complete_audit(output_path)
+        
+        # Deck and audit stages together, next to the audit output
+        if self.profiler.enabled:
+            print(f"Run profile saved: {self.profiler.write(output_path)}")
+        return output_path
 
 
 def main():
@@ -5294,6 +5384,33 @@ def main():
                         help='Path to output PPT file (default: %(default)s)')
     parser.add_argument('--date', type=str, default=None,
                         help='Reference date for report generation (format: YYYY-MM-DD). Default: current date')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always parse the Excel file (do not read or write the columnar data cache)')
+    parser.add_argument('--no-aggregate-store', action='store_true',
+                        help='Aggregate every Survey Date from scratch (do not read or write the per-day aggregate store)')
+    parser.add_argument('--audit-output', type=str, default=None,
+                        help='Also write the calculation audit trail to this path (rendered from the calculations '
+                             'recorded while the deck is generated); .jsonl / .parquet writes them as structured records')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for the demographic, gains/losses, regional and district slides '
+                             '(default: number of CPUs; 1 computes every slide in this process)')
+    parser.add_argument('--chart-cache-only', action='store_true',
+                        help='Write only the chart values PowerPoint draws, not the embedded Excel data of '
+                             'each chart (faster). The embedded data is removed, so the charts show the '
+                             'report\'s numbers but "Edit Data" in PowerPoint is no longer available')
+    parser.add_argument('--parse-all-parts', action='store_true',
+                        help='Parse and re-serialize every template part (default: only the slides and charts '
+                             'the report updates; the rest is copied from the template unchanged)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Write a JSON profile (wall / CPU time, peak RSS, rows per stage, calculation and slide) '
+                             'next to the output deck and audit trail (<name>_profile.json)')
+    parser.add_argument('--profile-dump', choices=['cprofile', 'pyinstrument'], default=None,
+                        help='Also profile the whole run (<name>_profile.prof / .html next to the deck - implies --profile)')
+    parser.add_argument('--uncertainty', action='store_true',
+                        help='Compute the design effect, margin of error and bootstrap confidence interval of every '
+                             'vote share (written with the audit trail)')
+    parser.add_argument('--error-bars', action='store_true',
+                        help='Draw the confidence intervals as error bars on the trend charts (implies --uncertainty)')
     
     args = parser.parse_args()
     
@@ -5320,9 +5437,26 @@ def main():
     print("="*80)
     
     try:
-        generator = CompleteReportGenerator(excel_path, template_ppt_path, reference_date=reference_date)
+        generator = CompleteReportGenerator(excel_path, template_ppt_path, reference_date=reference_date,
+                                            use_data_cache=not args.no_cache,
+                                            use_aggregate_store=not args.no_aggregate_store,
+                                            record_calculations=bool(args.audit_output),
+                                            workers=args.workers,
+                                            editable_chart_data=not args.chart_cache_only,
+                                            lazy_template_parts=not args.parse_all_parts,
+                                            profile=args.profile or bool(args.profile_dump),
+                                            profile_dump=args.profile_dump,
+                                            uncertainty=args.uncertainty,
+                                            error_bars=args.error_bars)
         generator.generate_complete_report(output_path)
         
+        if args.audit_output:
+            # The deck is already saved - an audit failure should not fail the report
+            try:
+                generator.generate_audit_trail(args.audit_output)
+            except Exception as e:
+                print(f"Warning: Could not generate audit trail: {e}")
+        
         print("\n" + "="*80)
         print("REPORT GENERATION COMPLETE")
         print("="*80)
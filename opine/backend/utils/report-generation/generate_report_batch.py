@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Batch Report Generator
+Generates one report per reference date (and per template / survey) in one process: each
+survey is loaded once, and its date index, per-day aggregate table and segment rows are shared
+by every deck, so backfilling a month of daily decks costs little more than one deck
+
+Usage:
+    python3 generate_report_batch.py survey.xlsx --template template.pptx --start 2025-10-07 --end 2025-11-06 --output-dir decks/
+    python3 generate_report_batch.py survey.xlsx --template template.pptx --dates 2025-11-01 2025-11-06 --output-dir decks/
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from generate_complete_report import CompleteReportGenerator
+
+
+def get_reference_dates(dates=None, start=None, end=None):
+    """
+    Build the list of reference dates to generate
+
+    Args:
+        dates: List of dates ('YYYY-MM-DD')
+        start: First date of a daily range (inclusive)
+        end: Last date of a daily range (inclusive, default: start)
+
+    Returns:
+        Sorted list of unique Timestamps
+    """
+    reference_dates = [pd.to_datetime(date) for date in (dates or [])]
+    if start is not None:
+        reference_dates.extend(pd.date_range(pd.to_datetime(start), pd.to_datetime(end or start), freq='D'))
+    return sorted(set(pd.Timestamp(date).normalize() for date in reference_dates))
+
+
+def get_output_path(output_dir, excel_path, reference_date, template_path=None):
+    """
+    Output deck path for one survey / template / reference date
+
+    Args:
+        output_dir: Output directory
+        excel_path: Survey Excel path (file name used as the prefix)
+        reference_date: Reference date
+        template_path: Template path (its name is added when several templates are generated)
+
+    Returns:
+        Path to output PPT
+    """
+    name = os.path.splitext(os.path.basename(excel_path))[0]
+    if template_path:
+        name += '_' + os.path.splitext(os.path.basename(template_path))[0]
+    return os.path.join(output_dir, f"{name}_{reference_date.strftime('%Y-%m-%d')}.pptx")
+
+
+def generate_report_batch(excel_paths, template_paths, reference_dates, output_dir, use_data_cache=True,
+                          use_aggregate_store=True, audit_extension=None, workers=1, editable_chart_data=True,
+                          profile=False, uncertainty=False, error_bars=False):
+    """
+    Generate a deck for every survey × template × reference date, loading each survey once
+
+    Args:
+        excel_paths: Survey Excel paths
+        template_paths: Template PPT paths
+        reference_dates: Reference dates (see get_reference_dates)
+        output_dir: Directory for the decks (created if missing)
+        use_data_cache: If True, reuse/create the columnar cache of the Excel data
+        use_aggregate_store: If True, reuse per-day totals from previous runs
+        audit_extension: Also write an audit trail per deck with this extension ('.jsonl', '.parquet', '.txt')
+        workers: Slide computation worker processes per deck (see CompleteReportGenerator)
+        editable_chart_data: If True, also rewrite the embedded Excel data of every chart (if False
+                             only the chart values are written and the embedded data is removed)
+        profile: If True, write a JSON run profile next to each deck (<deck>_profile.json)
+        uncertainty: If True, compute margins of error / confidence intervals of every vote share
+        error_bars: If True, draw the confidence intervals as error bars on the trend charts
+
+    Returns:
+        List of result dictionaries (excel_path, template_path, reference_date, output_path,
+        audit_output, seconds, error)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    results = []
+
+    for excel_path in excel_paths:
+        generator = None
+        for template_path in template_paths:
+            for reference_date in reference_dates:
+                output_path = get_output_path(output_dir, excel_path, reference_date,
+                                              template_path if len(template_paths) > 1 else None)
+                result = {
+                    'excel_path': excel_path,
+                    'template_path': template_path,
+                    'reference_date': reference_date.strftime('%Y-%m-%d'),
+                    'output_path': output_path,
+                    'audit_output': None,
+                    'seconds': None,
+                    'error': None,
+                }
+                results.append(result)
+                started = time.time()
+                try:
+                    if generator is None:
+                        # Data loaded once per survey - later decks only switch date / template
+                        generator = CompleteReportGenerator(
+                            excel_path, template_path, reference_date=reference_date,
+                            use_data_cache=use_data_cache, use_aggregate_store=use_aggregate_store,
+                            record_calculations=bool(audit_extension), workers=workers,
+                            editable_chart_data=editable_chart_data, profile=profile,
+                            uncertainty=uncertainty, error_bars=error_bars
+                        )
+                    else:
+                        generator.set_template(template_path)
+                        generator.set_reference_date(reference_date)
+
+                    generator.generate_complete_report(output_path)
+                except Exception as e:
+                    # Keep going - one bad date or template should not stop a backfill
+                    print(f"\n❌ ERROR generating {output_path}: {e}")
+                    result['error'] = str(e)
+                    continue
+                finally:
+                    result['seconds'] = time.time() - started
+
+                if audit_extension:
+                    # The deck is already saved - an audit failure should not fail the deck
+                    try:
+                        result['audit_output'] = generator.generate_audit_trail(
+                            os.path.splitext(output_path)[0] + '_audit' + audit_extension
+                        )
+                    except Exception as e:
+                        print(f"Warning: Could not generate audit trail for {output_path}: {e}")
+
+    return results
+
+
+def main():
+    """Generate reports for a list / range of reference dates"""
+    parser = argparse.ArgumentParser(description='Generate survey reports for several reference dates in one process')
+    parser.add_argument('excel_files', nargs='+',
+                        help='Path(s) to Excel file(s) with survey data')
+    parser.add_argument('--template', action='append', required=True,
+                        help='Path to template PPT file (repeat for several templates)')
+    parser.add_argument('--output-dir', required=True,
+                        help='Directory for the generated decks (<survey>[_<template>]_<YYYY-MM-DD>.pptx)')
+    parser.add_argument('--dates', nargs='+', default=None,
+                        help='Reference dates (format: YYYY-MM-DD)')
+    parser.add_argument('--start', type=str, default=None,
+                        help='First reference date of a daily range (format: YYYY-MM-DD)')
+    parser.add_argument('--end', type=str, default=None,
+                        help='Last reference date of a daily range (format: YYYY-MM-DD, default: --start)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always parse the Excel files (do not read or write the columnar data cache)')
+    parser.add_argument('--no-aggregate-store', action='store_true',
+                        help='Aggregate every Survey Date from scratch (do not read or write the per-day aggregate store)')
+    parser.add_argument('--audit', choices=['jsonl', 'parquet', 'txt'], default=None,
+                        help='Also write an audit trail next to each deck in this format')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for the slide computations of each deck (default: number of CPUs)')
+    parser.add_argument('--chart-cache-only', action='store_true',
+                        help='Write only the chart values, not the embedded Excel data (faster - the embedded '
+                             'data is removed, so "Edit Data" in PowerPoint is no longer available)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Write a JSON run profile next to each deck (<deck>_profile.json)')
+    parser.add_argument('--uncertainty', action='store_true',
+                        help='Compute margins of error and bootstrap confidence intervals of every vote share '
+                             '(in the audit records)')
+    parser.add_argument('--error-bars', action='store_true',
+                        help='Draw the confidence intervals as error bars on the trend charts (implies --uncertainty)')
+    args = parser.parse_args()
+
+    try:
+        reference_dates = get_reference_dates(args.dates, args.start, args.end)
+    except (ValueError, TypeError) as e:
+        print(f"ERROR: Invalid reference date: {e}")
+        return 1
+    if not reference_dates:
+        print("ERROR: No reference dates given (use --dates and/or --start/--end)")
+        return 1
+
+    print("="*80)
+    print("BATCH REPORT GENERATOR")
+    print("="*80)
+    print(f"Surveys: {len(args.excel_files)}, templates: {len(args.template)}, "
+          f"reference dates: {len(reference_dates)} "
+          f"({reference_dates[0].strftime('%Y-%m-%d')} to {reference_dates[-1].strftime('%Y-%m-%d')})")
+    print(f"Output directory: {args.output_dir}")
+    print("="*80)
+
+    started = time.time()
+    results = generate_report_batch(
+        args.excel_files, args.template, reference_dates, args.output_dir,
+        use_data_cache=not args.no_cache,
+        use_aggregate_store=not args.no_aggregate_store,
+        audit_extension=f'.{args.audit}' if args.audit else None,
+        workers=args.workers,
+        editable_chart_data=not args.chart_cache_only,
+        profile=args.profile,
+        uncertainty=args.uncertainty,
+        error_bars=args.error_bars
+    )
+
+    failed = [result for result in results if result['error']]
+    print("\n" + "="*80)
+    print("BATCH REPORT GENERATION COMPLETE")
+    print("="*80)
+    for result in results:
+        status = f"ERROR: {result['error']}" if result['error'] else f"{result['seconds']:.1f}s"
+        print(f"  {result['reference_date']}  {result['output_path']}  ({status})")
+    print(f"\n✅ {len(results) - len(failed)} of {len(results)} decks generated in {time.time() - started:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Metric Graph Module
+Report metrics declared as nodes of a dependency graph (e.g. the 7 DMA chart for
+Religion=Muslim depends on the Religion=Muslim segment and the L7D window). Nothing is computed
+when the graph is built: a node is evaluated the first time a slide bound in the template asks
+for it, after the nodes it depends on, and its value is kept for the rest of the run - slides
+drawing the same metric share one computation, and metrics no template shape is bound to are
+never computed
+"""
+
+
+class MetricGraph:
+    """Metric nodes (key → compute function and dependencies), each evaluated at most once per run"""
+
+    def __init__(self):
+        self._nodes = {}  # key → (compute, depends_on)
+        self._values = {}  # key → value of every node evaluated (or set) this run
+        self._evaluating = set()  # Nodes being evaluated (cycle detection)
+        self.computed = 0  # Nodes evaluated this run
+        self.reused = 0  # Requests answered from a node already evaluated
+
+    def __contains__(self, key):
+        return key in self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def add(self, key, compute, depends_on=()):
+        """
+        Declare a metric node (replaces an existing node with the same key)
+
+        Args:
+            key: Hashable node key (e.g. ('window', 'L7D'), ('segment', 'Religion', 'Muslim'))
+            compute: Function without arguments returning the node's value
+            depends_on: Keys of the nodes evaluated before this one
+        """
+        self._nodes[key] = (compute, tuple(depends_on))
+        self._values.pop(key, None)
+
+    def get(self, key):
+        """
+        Get a node's value, evaluating it (and the nodes it depends on) on first use
+
+        Args:
+            key: Node key
+
+        Returns:
+            Node value
+        """
+        if key in self._values:
+            self.reused += 1
+            return self._values[key]
+        if key not in self._nodes:
+            raise KeyError(f"Unknown metric: {key}")
+        if key in self._evaluating:
+            raise ValueError(f"Metric depends on itself: {key}")
+
+        compute, depends_on = self._nodes[key]
+        self._evaluating.add(key)
+        try:
+            for dependency in depends_on:
+                if dependency not in self._values:
+                    self.get(dependency)
+            value = compute()
+        finally:
+            self._evaluating.discard(key)
+        self._values[key] = value
+        self.computed += 1
+        return value
+
+    def set(self, key, value):
+        """
+        Store a node's value computed elsewhere (e.g. in a worker process)
+
+        Args:
+            key: Node key (must be declared)
+            value: Node value
+        """
+        if key not in self._nodes:
+            raise KeyError(f"Unknown metric: {key}")
+        self._values[key] = value
+
+    def is_evaluated(self, key):
+        """True if the node's value is available without computing it"""
+        return key in self._values
+
+    def plan(self, keys):
+        """
+        List the nodes that evaluating keys would compute, dependencies first
+
+        Args:
+            keys: Node keys requested (unknown keys are ignored)
+
+        Returns:
+            List of node keys not evaluated yet, in evaluation order (each once)
+        """
+        order = []
+        visited = set()
+
+        def visit(key):
+            if key in visited or key in self._values or key not in self._nodes:
+                return
+            visited.add(key)
+            for dependency in self._nodes[key][1]:
+                visit(dependency)
+            order.append(key)
+
+        for key in keys:
+            visit(key)
+        return order
+
+    def reset(self):
+        """Forget every value (e.g. for another reference date) - the declared nodes stay"""
+        self._values = {}
+        self._evaluating = set()
+        self.computed = 0
+        self.reused = 0
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Multi-Select Module
+Multi-select question blocks (Q10 second-choice reasons, Q11 / Q12 AITC / BJP reasons, Q13
+pressing issues - one 0/1 column per option) loaded once per dataset into a respondents ×
+options matrix with an option-label index. Weighted option totals for any window or segment
+are then one matrix-vector product instead of a to_numeric / multiply / sum per option column.
+The matrix is scipy-sparse when scipy is installed, a dense boolean array otherwise
+"""
+
+import numpy as np
+import pandas as pd
+
+from data_window import DataWindow
+
+try:
+    from scipy import sparse
+except ImportError:  # Dense boolean matrix instead (same results)
+    sparse = None
+
+
+# Question prefixes of the multi-select blocks used in the report
+MULTI_SELECT_QUESTIONS = {
+    'Q10': '10. Could you tell us the reason for choosing the above party as your second choice?',
+    'Q11': '11. In your opinion what are the top 3 reasons for voting for AITC?',
+    'Q12': '12. In your opinion what are the top 3 reasons for voting for BJP?',
+    'Q13': '13. According to you, what are the three most pressing issues of your assembly constituency?',
+}
+
+
+def get_option_label(column):
+    """Option text of a multi-select column (everything after ' - ', or the whole name)"""
+    column = str(column)
+    return column.split(' - ')[-1] if ' - ' in column else column
+
+
+class MultiSelectMatrix:
+    """One multi-select question block as a respondents × options matrix over the survey data"""
+
+    def __init__(self, df, prefix):
+        """
+        Args:
+            df: Survey DataFrame (windows passed to the methods must be over this frame)
+            prefix: Question prefix shared by the block's option columns
+        """
+        self.df = df
+        self.prefix = prefix
+        self.columns = [col for col in df.columns if str(col).startswith(prefix)]
+        self.labels = [get_option_label(col) for col in self.columns]
+
+        # Option label → option indices (labels can repeat, e.g. an 'Others' text column)
+        self.label_index = {}
+        for option, label in enumerate(self.labels):
+            self.label_index.setdefault(label, []).append(option)
+
+        # Option values as numbers (non-numeric / empty → 0) - stored as booleans when every
+        # value is 0 or 1, which is what the survey export holds
+        columns = []
+        self.answered = np.zeros(len(df), dtype=bool)  # Rows with any non-empty column in the block
+        self.selected = np.zeros(len(df), dtype=bool)  # Rows with at least one option selected (value 1)
+        for col in self.columns:
+            self.answered |= df[col].notna().to_numpy()
+            column_values = pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+            self.selected |= column_values == 1
+            columns.append(column_values)
+        binary = all(np.isin(column_values, (0.0, 1.0)).all() for column_values in columns)
+        values = np.column_stack([
+            column_values.astype(bool) if binary else column_values for column_values in columns
+        ]) if columns else np.zeros((len(df), 0), dtype=bool)
+        self.values = sparse.csr_matrix(values) if sparse is not None else values
+
+    def __len__(self):
+        return len(self.columns)
+
+    def get_options(self, columns=None, labels=None):
+        """
+        Get option indices by column name or option label
+
+        Args:
+            columns: Option column names (None: not filtered by column)
+            labels: Option labels (None: not filtered by label)
+
+        Returns:
+            List of option indices in block order
+        """
+        options = range(len(self.columns))
+        if columns is not None:
+            columns = set(columns)
+            options = [option for option in options if self.columns[option] in columns]
+        if labels is not None:
+            wanted = {option for label in labels for option in self.label_index.get(label, [])}
+            options = [option for option in options if option in wanted]
+        return list(options)
+
+    def get_rows(self, data):
+        """
+        Row positions of a window (or DataFrame) in the block's frame
+
+        Args:
+            data: DataWindow over the block's frame, or a DataFrame with the frame's index labels
+
+        Returns:
+            Slice or int64 array of row positions
+        """
+        if isinstance(data, DataWindow) and data.base is self.df:
+            return data.row_selector
+        return self.df.index.get_indexer(data.index)
+
+    def get_answered(self, data):
+        """Boolean array aligned with data: rows with any non-empty column in the block"""
+        return self.answered[self.get_rows(data)]
+
+    def get_selected(self, data):
+        """Boolean array aligned with data: rows with at least one option selected"""
+        return self.selected[self.get_rows(data)]
+
+    def weighted_totals(self, data, weights=None, options=None):
+        """
+        Weighted option totals of a window: sum over its rows of weight × option value
+
+        Args:
+            data: DataWindow (or DataFrame) selecting the rows
+            weights: Weights aligned with data (None for unweighted counts)
+            options: Option indices (None for all options)
+
+        Returns:
+            Array of totals, one per option
+        """
+        values = self.values[self.get_rows(data)]
+        if options is not None:
+            values = values[:, list(options)]
+        if weights is None:
+            weights = np.ones(values.shape[0], dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        if sparse is not None:
+            return np.asarray(values.T @ weights, dtype=np.float64).ravel()
+        return weights @ values
+
+
+class MultiSelectRegistry:
+    """Multi-select matrices of one dataset, each built on first use"""
+
+    def __init__(self, df):
+        """
+        Args:
+            df: Survey DataFrame (read only - the registry must be rebuilt if it changes)
+        """
+        self.df = df
+        self._matrices = {}
+
+    def get(self, question):
+        """
+        Get a multi-select block
+
+        Args:
+            question: Key of MULTI_SELECT_QUESTIONS (e.g. 'Q13') or a question prefix
+
+        Returns:
+            MultiSelectMatrix
+        """
+        prefix = MULTI_SELECT_QUESTIONS.get(question, question)
+        if prefix not in self._matrices:
+            self._matrices[prefix] = MultiSelectMatrix(self.df, prefix)
+        return self._matrices[prefix]
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+PPTX Package Module
+Opens a template PPT with its slide, chart, layout and master parts kept as the raw XML bytes
+from the zip until a part is actually used. Parts the report never touches (slides without
+bound metrics, layouts, masters, their charts) are never parsed, and on save their original
+bytes are written straight back to the output zip instead of being re-serialized, so opening
+and writing a deck scales with the slides that are updated, not with the template size
+"""
+
+from pptx import Presentation
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.package import PartFactory, _PackageLoader
+from pptx.opc.packuri import PACKAGE_URI
+from pptx.oxml import parse_xml
+from pptx.package import Package
+from pptx.parts.chart import ChartPart
+from pptx.parts.slide import SlideLayoutPart, SlideMasterPart, SlidePart
+from pptx.util import lazyproperty
+
+
+class _LazyXmlPart:
+    """XmlPart mixin: the part's XML is parsed on first use of its element, not when the package is opened"""
+
+    @classmethod
+    def load(cls, partname, content_type, package, blob):
+        part = cls(partname, content_type, package, element=None)
+        part._xml_blob = blob
+        return part
+
+    @property
+    def _element(self):
+        element = self.__dict__.get('_parsed_element')
+        if element is None:
+            element = parse_xml(self._xml_blob)
+            self.__dict__['_parsed_element'] = element
+            self._xml_blob = None
+        return element
+
+    @_element.setter
+    def _element(self, element):
+        self.__dict__['_parsed_element'] = element
+
+    @property
+    def is_parsed(self):
+        """True once the part's XML has been parsed (it may have been modified)"""
+        return self.__dict__.get('_parsed_element') is not None
+
+    @property
+    def blob(self):
+        # Never parsed → never modified: write the template's bytes unchanged
+        if not self.is_parsed:
+            return self._xml_blob
+        return super().blob
+
+
+class LazySlidePart(_LazyXmlPart, SlidePart):
+    pass
+
+
+class LazyChartPart(_LazyXmlPart, ChartPart):
+    pass
+
+
+class LazySlideLayoutPart(_LazyXmlPart, SlideLayoutPart):
+    pass
+
+
+class LazySlideMasterPart(_LazyXmlPart, SlideMasterPart):
+    pass
+
+
+# Content types loaded lazily (the bulk of a deck's XML - see open_presentation)
+LAZY_PART_TYPES = {
+    CT.PML_SLIDE: LazySlidePart,
+    CT.DML_CHART: LazyChartPart,
+    CT.PML_SLIDE_LAYOUT: LazySlideLayoutPart,
+    CT.PML_SLIDE_MASTER: LazySlideMasterPart,
+}
+
+
+class _LazyPartFactory(PartFactory):
+    """PartFactory with the lazy classes for LAZY_PART_TYPES (python-pptx's registry for every other type)"""
+
+    @classmethod
+    def _part_cls_for(cls, content_type):
+        return LAZY_PART_TYPES.get(content_type) or super()._part_cls_for(content_type)
+
+
+class _LazyPackageLoader(_PackageLoader):
+    """Package loader building parts with _LazyPartFactory"""
+
+    @lazyproperty
+    def _parts(self):
+        # Same as _PackageLoader._parts, with the factory of this loader instead of the global one
+        content_types = self._content_types
+        package_reader = self._package_reader
+        return {
+            partname: _LazyPartFactory(partname, content_types[partname], self._package,
+                                       blob=package_reader[partname])
+            for partname in (p for p in self._xml_rels if p != '/')
+            if partname in package_reader
+        }
+
+
+class _LazyPackage(Package):
+    """Package whose slide / chart / layout / master parts are loaded lazily"""
+
+    def _load(self):
+        pkg_xml_rels, parts = _LazyPackageLoader.load(self._pkg_file, self)
+        self._rels.load_from_xml(PACKAGE_URI, pkg_xml_rels, parts)
+        return self
+
+
+def open_presentation(path, lazy_parts=True):
+    """
+    Open a PPT file for modification
+
+    Args:
+        path: PPT file path (or file-like object)
+        lazy_parts: If True, slide / chart / layout / master XML is parsed only when used and
+                    unused parts are saved byte for byte; if False every part is parsed up front
+                    (python-pptx default)
+
+    Returns:
+        python-pptx Presentation
+    """
+    if not lazy_parts:
+        return Presentation(path)
+
+    # The lazy part classes come from this package's own loader - python-pptx's global part
+    # registry is never modified, so concurrent opens and other Presentation() calls in the
+    # process (e.g. the template map compiler, other threads of the worker) are not affected
+    presentation_part = _LazyPackage.open(path).main_document_part
+    if presentation_part.content_type not in (CT.PML_PRESENTATION_MAIN, CT.PML_PRES_MACRO_MAIN):
+        raise ValueError(f"file '{path}' is not a PowerPoint file, content type is '{presentation_part.content_type}'")
+    return presentation_part.presentation
+
+
+def count_parsed_parts(prs):
+    """
+    Count the lazily loaded parts of a presentation that were parsed (i.e. will be re-serialized on save)
+
+    Args:
+        prs: Presentation opened with open_presentation
+
+    Returns:
+        Tuple (parsed parts, lazily loaded parts)
+    """
+    lazy_parts = [part for part in prs.part.package.iter_parts() if isinstance(part, _LazyXmlPart)]
+    return sum(1 for part in lazy_parts if part.is_parsed), len(lazy_parts)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Report Columns Module
+Manifest of the survey export columns the report's metrics read (party questions, reason /
+issue option columns, demographics, weights, Region / District Name, Survey Date), so the
+export can be loaded without the open-text, GPS, audio and other columns no slide uses
+"""
+
+from vote_share_calculator import PARTY_QUESTION_PREFIXES
+from segment_registry import DEMOGRAPHIC_COLUMNS
+
+
+# Columns read by name
+REPORT_COLUMNS = {
+    'Survey Date',
+    'Region Name',
+    'District Name',
+    'Data Type',  # F2F / CATI sample split
+    *DEMOGRAPHIC_COLUMNS.values(),
+}
+
+# Column name prefixes (question numbers, including every option column of multi-select questions)
+REPORT_COLUMN_PREFIXES = (
+    *PARTY_QUESTION_PREFIXES,  # Q5 2021 vote, Q8 vote intention, Q9 second choice, Q19 wisdom of crowds
+    '10. ',  # Reasons for second choice (multi-select)
+    '11. ',  # Reasons for voting AITC (multi-select)
+    '12. ',  # Reasons for voting BJP (multi-select)
+    '13. ',  # Most pressing issues (multi-select)
+    '14. ',  # State government satisfaction
+    '17. ',  # Best CM choice
+    '22. ',  # Caste
+    'Weight',  # All weight columns (resolved per level / period when used)
+)
+
+# Low-cardinality text columns loaded as categoricals
+REPORT_CATEGORY_COLUMNS = ('Region Name', 'District Name')
+
+
+def is_report_column(column):
+    """
+    Check whether a survey export column is used by the report
+
+    Args:
+        column: Column name
+
+    Returns:
+        True if the column is in the report column manifest
+    """
+    column = str(column)
+    return column in REPORT_COLUMNS or column.startswith(REPORT_COLUMN_PREFIXES)
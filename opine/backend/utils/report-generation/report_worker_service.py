@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+Report Worker Service
+Resident report generation worker: pandas / python-pptx are imported and the template PPT
+is parsed once, and report jobs are accepted over a local HTTP socket. Each job runs in a
+child process forked from a single-threaded launcher process that holds the warm template (so
+it starts with its own copy of the parsed template), reports progress per slide over its own
+event pipe, and at most --concurrency jobs run at once. The launcher is forked before the HTTP
+server starts its threads or opens its socket, so no job is forked from a multithreaded process
+or inherits the listening socket
+
+Job state lives in this process only: every backend instance talking to a local worker must
+get the polls of the jobs it submitted (sticky routing of /api/reports/jobs/ at the load
+balancer), or all instances must share one worker through REPORT_WORKER_URL
+
+Endpoints (JSON, localhost only):
+    GET  /health               Service status (running / queued job counts)
+    POST /jobs                 Submit a job: {excel_path, output_path, reference_date, audit_output, uncertainty,
+                               error_bars, metadata}
+    GET  /jobs/<job_id>        Job status and progress
+    POST /jobs/<job_id>/result Attach caller data to a finished job (e.g. the uploaded report URL)
+    POST /jobs/<job_id>/claim  Claim a one-time step of a finished job: {name, owner} → {claimed}
+                               (e.g. the upload - only the first poller that claims it publishes)
+
+Usage:
+    python3 report_worker_service.py --port 8765 --concurrency 2
+"""
+
+import argparse
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from pptx import Presentation
+from generate_complete_report import CompleteReportGenerator
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'template.pptx')
+
+# Finished jobs are kept for polling this long (seconds)
+FINISHED_JOB_RETENTION = 24 * 3600
+
+# A claim not released by then (e.g. its backend crashed mid-upload) can be taken over (seconds)
+CLAIM_TIMEOUT = 600
+
+# How long the launcher gets to stop its jobs when the service shuts down (seconds)
+LAUNCHER_STOP_TIMEOUT = 10
+
+
+def _run_job(job_id, params, template_prs, template_path, events, inherited=()):
+    """
+    Child process entry point: generate one report with the service's warm template
+
+    Args:
+        job_id: Job identifier
+        params: Job parameters (see ReportWorkerService.submit)
+        template_prs: Parsed template (this process's copy - modified in place)
+        template_path: Template file path
+        events: Write end of the job's pipe for (event, data) messages back to the launcher
+        inherited: Launcher connections this fork inherited (closed - only the launcher uses them)
+    """
+    for conn in inherited:
+        conn.close()
+
+    def on_progress(slide_num, total_slides):
+        events.send(('progress', {'slide': slide_num, 'total_slides': total_slides}))
+
+    try:
+        events.send(('progress', {'stage': 'loading data'}))
+        generator = CompleteReportGenerator(
+            params['excel_path'], template_path,
+            reference_date=params.get('reference_date'),
+            record_calculations=bool(params.get('audit_output')),
+            workers=params.get('workers') or 1,
+            template_prs=template_prs,
+            uncertainty=bool(params.get('uncertainty')),
+            error_bars=bool(params.get('error_bars')),
+            progress_callback=on_progress
+        )
+        events.send(('progress', {'stage': 'updating slides'}))
+        generator.generate_complete_report(params['output_path'])
+
+        audit_output = None
+        if params.get('audit_output'):
+            # The deck is already saved - an audit failure should not fail the job
+            try:
+                events.send(('progress', {'stage': 'writing audit trail'}))
+                audit_output = generator.generate_audit_trail(params['audit_output'])
+            except Exception as e:
+                print(f"Warning: Could not generate audit trail: {e}")
+
+        events.send(('completed', {'output_path': params['output_path'], 'audit_output': audit_output}))
+    except Exception as e:
+        traceback.print_exc()
+        events.send(('failed', {'error': str(e)}))
+    finally:
+        events.close()
+
+
+class JobLauncher:
+    """
+    Single-threaded process holding the parsed template: forks one process per job and relays
+    the jobs' events to the service. Forking from the multithreaded service could copy a lock
+    held by another thread (stdout, the job state lock) into the child, which would then
+    deadlock on it - the launcher has no other threads, so every fork is safe
+    """
+
+    def __init__(self, conn, template_path):
+        """
+        Args:
+            conn: Connection to the service: ('start', job_id, params) / ('stop', None, None) in,
+                  (job_id, event, data) out
+            template_path: Template PPT path
+        """
+        self.conn = conn
+        self.template_path = template_path
+        self.template_prs = None
+        self.template_mtime = None
+        self.context = multiprocessing.get_context('fork')
+        self.jobs = {}  # job_id → {'process': Process, 'events': read end of its pipe (None after EOF)}
+
+    def load_template(self):
+        """Parse the template (again, if it changed on disk)"""
+        print(f"Loading template from: {self.template_path}")
+        self.template_mtime = os.path.getmtime(self.template_path)
+        self.template_prs = Presentation(self.template_path)
+
+    def run(self):
+        """Start jobs and relay their events until the service stops or dies"""
+        self.load_template()
+        while True:
+            waiting = {self.conn: None}
+            for job_id, job in self.jobs.items():
+                waiting[job['process'].sentinel] = job_id
+                if job['events'] is not None:
+                    waiting[job['events']] = job_id
+            ready = multiprocessing.connection.wait(list(waiting))
+
+            try:
+                if self.conn in ready:
+                    command, job_id, params = self.conn.recv()
+                    if command == 'stop':
+                        break
+                    self.start_job(job_id, params)
+
+                for job_id, job in list(self.jobs.items()):
+                    if job['events'] is not None and job['events'] in ready:
+                        self.relay_events(job_id, job)
+                    if job['process'].sentinel in ready:
+                        self.finish_job(job_id, job)
+            except (EOFError, OSError):
+                break  # Service died (closed or reset its connection)
+
+        # Nobody is left to collect the results
+        for job in self.jobs.values():
+            job['process'].terminate()
+        for job in self.jobs.values():
+            job['process'].join()
+
+    def start_job(self, job_id, params):
+        """Fork the process of a job"""
+        # Template changed on disk - parse the new one before forking further jobs
+        try:
+            if not self.jobs and os.path.getmtime(self.template_path) != self.template_mtime:
+                print("Template changed, reloading")
+                self.load_template()
+        except Exception as e:
+            print(f"Warning: Could not reload template, keeping the loaded one: {e}")
+
+        events, child_events = self.context.Pipe(duplex=False)
+        inherited = [self.conn, events] + [job['events'] for job in self.jobs.values() if job['events'] is not None]
+        process = self.context.Process(
+            target=_run_job,
+            args=(job_id, params, self.template_prs, self.template_path, child_events, inherited)
+        )
+        try:
+            process.start()
+        except OSError as e:
+            events.close()
+            self.conn.send((job_id, 'exited', {'error': f"Could not start report process: {e}"}))
+            return
+        finally:
+            child_events.close()  # Only the child writes
+        self.jobs[job_id] = {'process': process, 'events': events}
+        print(f"Started job {job_id} (pid {process.pid}): {params['excel_path']}")
+
+    def relay_events(self, job_id, job):
+        """Forward a job's pending events to the service"""
+        try:
+            while job['events'].poll():
+                event, data = job['events'].recv()
+                self.conn.send((job_id, event, data))
+        except EOFError:
+            job['events'].close()
+            job['events'] = None
+
+    def finish_job(self, job_id, job):
+        """Relay the events an exited job left in its pipe, then report its exit to the service"""
+        # Everything the process sent is in the pipe by now - an empty pipe is drained (not
+        # waiting for EOF: its slide workers may still hold the write end)
+        if job['events'] is not None:
+            self.relay_events(job_id, job)
+            if job['events'] is not None:
+                job['events'].close()
+        job['process'].join()
+        self.conn.send((job_id, 'exited', {'exitcode': job['process'].exitcode}))
+        del self.jobs[job_id]
+
+
+def _run_launcher(conn, service_conn, template_path):
+    """
+    Launcher process entry point
+
+    Args:
+        conn: Launcher end of the service connection
+        service_conn: Service end (inherited by the fork - closed, so the launcher sees EOF when the service exits)
+        template_path: Template PPT path
+    """
+    service_conn.close()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C stops the service, which then stops the launcher
+    JobLauncher(conn, template_path).run()
+
+
+class ReportWorkerService:
+    """Job queue, concurrency limit and progress tracking for report generation"""
+
+    def __init__(self, template_path=DEFAULT_TEMPLATE, concurrency=2, slide_workers=1):
+        """
+        Initialize service and start the job launcher (which parses the template once).
+        Create the service before starting any thread or opening the HTTP server's socket - the
+        launcher is forked here and every job process is forked from it
+
+        Args:
+            template_path: Template PPT path
+            concurrency: Maximum number of reports generated at the same time
+            slide_workers: Slide computation worker processes per report (see CompleteReportGenerator)
+        """
+        self.template_path = template_path
+        self.concurrency = max(1, concurrency)
+        self.slide_workers = max(1, slide_workers)
+
+        self.jobs = {}
+        self.pending = deque()
+        self.running = set()  # job_ids started on the launcher and not yet exited
+        self.lock = threading.Lock()  # Job state - never held while sending to the launcher
+        self.send_lock = threading.Lock()  # One sender at a time on the launcher connection
+        self.closing = False
+
+        context = multiprocessing.get_context('fork')
+        self.launcher_conn, launcher_end = context.Pipe()
+        self.launcher = context.Process(
+            target=_run_launcher, args=(launcher_end, self.launcher_conn, template_path), name='report-launcher'
+        )
+        self.launcher.start()
+        launcher_end.close()
+
+        threading.Thread(target=self._collect_events, daemon=True).start()
+
+    def submit(self, params):
+        """
+        Queue a report job
+
+        Args:
+            params: Dictionary with excel_path, output_path, and optional reference_date,
+                    audit_output, uncertainty / error_bars (see CompleteReportGenerator), metadata
+                    (returned unchanged with the job status)
+
+        Returns:
+            Job status dictionary
+        """
+        for key in ('excel_path', 'output_path'):
+            if not params.get(key):
+                raise ValueError(f"{key} is required")
+        if not os.path.exists(params['excel_path']):
+            raise ValueError(f"Excel file not found: {params['excel_path']}")
+
+        job_id = params.get('job_id') or uuid.uuid4().hex
+        job = {
+            'job_id': job_id,
+            'state': 'queued',
+            'stage': None,
+            'slide': None,
+            'total_slides': None,
+            'params': {key: params.get(key) for key in ('excel_path', 'output_path', 'reference_date', 'audit_output',
+                                                         'uncertainty', 'error_bars')},
+            'metadata': params.get('metadata') or {},
+            'result': None,
+            'error': None,
+            'claims': {},  # Step name → (owner, expiry time) - see claim_job
+            'created_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+        }
+        with self.lock:
+            if job_id in self.jobs:
+                raise ValueError(f"Job already exists: {job_id}")
+            self.jobs[job_id] = job
+            self.pending.append(job_id)
+            status = self._job_status(job)
+        self._start_pending()
+        return status
+
+    def get_job(self, job_id):
+        """Get job status dictionary (None if unknown)"""
+        with self.lock:
+            self._prune_finished()
+            job = self.jobs.get(job_id)
+            return self._job_status(job) if job else None
+
+    def set_job_result(self, job_id, data):
+        """Attach caller data to a finished job (shared by every process polling this service)"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            job['metadata'].update(data or {})
+            return self._job_status(job)
+
+    def claim_job(self, job_id, name, owner):
+        """
+        Claim a one-time step of a job (e.g. publishing the report), so concurrent polls from
+        several backend instances do it once
+
+        Args:
+            job_id: Job identifier
+            name: Step name (e.g. 'publish')
+            owner: Caller identifier (claiming again with the same owner succeeds)
+
+        Returns:
+            True if the caller holds the claim, False if another owner does, None if the job is unknown
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            now = time.time()
+            claim = job['claims'].get(name)
+            if claim is not None and claim[0] != owner and claim[1] > now:
+                return False
+            job['claims'][name] = (owner, now + CLAIM_TIMEOUT)
+            return True
+
+    def release_job(self, job_id, name, owner):
+        """
+        Release a claim (the step failed - the next caller may retry it)
+
+        Returns:
+            True if the caller held the claim, False if it did not, None if the job is unknown
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            claim = job['claims'].get(name)
+            if claim is None or claim[0] != owner:
+                return False
+            del job['claims'][name]
+            return True
+
+    def get_health(self):
+        """Service status"""
+        with self.lock:
+            return {
+                'status': 'ok',
+                'running': len(self.running),
+                'queued': len(self.pending),
+                'concurrency': self.concurrency,
+                'template': self.template_path,
+            }
+
+    def _job_status(self, job):
+        """Public job dictionary (queue position for queued jobs)"""
+        status = {key: value for key, value in job.items() if key not in ('params', 'claims')}
+        status.update(job['params'])
+        if job['state'] == 'queued' and job['job_id'] in self.pending:
+            status['queue_position'] = list(self.pending).index(job['job_id']) + 1
+        return status
+
+    def close(self):
+        """Stop the launcher (its running jobs are terminated)"""
+        self.closing = True
+        try:
+            with self.send_lock:
+                self.launcher_conn.send(('stop', None, None))
+        except OSError:
+            pass  # Launcher already gone
+        self.launcher.join(LAUNCHER_STOP_TIMEOUT)
+        if self.launcher.is_alive():
+            self.launcher.terminate()
+            self.launcher.join()
+
+    def _start_pending(self):
+        """Start queued jobs up to the concurrency limit (caller must not hold the lock)"""
+        with self.lock:
+            starting = []
+            while self.pending and len(self.running) < self.concurrency:
+                job_id = self.pending.popleft()
+                job = self.jobs[job_id]
+                job['state'] = 'running'
+                job['started_at'] = time.time()
+                self.running.add(job_id)
+                starting.append((job_id, dict(job['params'], workers=self.slide_workers)))
+
+        # Sent without holding the job state lock - the launcher may be blocked relaying events
+        # that _collect_events needs the lock to apply
+        for job_id, params in starting:
+            try:
+                with self.send_lock:
+                    self.launcher_conn.send(('start', job_id, params))
+            except OSError as e:
+                self._finish_job(job_id, {'error': f"Could not start report process: {e}"})
+
+    def _collect_events(self):
+        """Apply the job events relayed by the launcher (thread)"""
+        while True:
+            try:
+                job_id, event, data = self.launcher_conn.recv()
+            except (EOFError, OSError):
+                break
+            if event == 'exited':
+                self._finish_job(job_id, data)
+            else:
+                self._apply_event(job_id, event, data)
+
+        if not self.closing:
+            # Jobs can't be started any more - exit so the process manager restarts the service
+            print("ERROR: Report launcher exited, stopping the report worker service")
+            os._exit(1)
+
+    def _finish_job(self, job_id, data):
+        """
+        Mark a job failed unless it already finished (its process exited without reporting a
+        result, or could not be started), then start queued jobs
+
+        Args:
+            job_id: Job identifier
+            data: {'exitcode': process exit code} or {'error': message}
+        """
+        with self.lock:
+            job = self.jobs[job_id]
+            if job['state'] == 'running':
+                job['state'] = 'failed'
+                job['error'] = data.get('error') or f"Report process exited with code {data.get('exitcode')}"
+                job['finished_at'] = time.time()
+                print(f"Failed job {job_id}: {job['error']}")
+            self.running.discard(job_id)
+        self._start_pending()
+
+    def _apply_event(self, job_id, event, data):
+        """Apply a progress / completion event sent by a job process"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+            if event == 'progress':
+                job.update(data)
+            elif event == 'completed':
+                job.update({'state': 'completed', 'stage': None, 'result': data, 'finished_at': time.time()})
+                print(f"Completed job {job_id} in {job['finished_at'] - job['started_at']:.1f}s")
+            elif event == 'failed':
+                job.update({'state': 'failed', 'stage': None, 'error': data['error'], 'finished_at': time.time()})
+                print(f"Failed job {job_id}: {data['error']}")
+
+    def _prune_finished(self):
+        """Forget finished jobs older than the retention period (caller holds the lock)"""
+        cutoff = time.time() - FINISHED_JOB_RETENTION
+        for job_id in [job_id for job_id, job in self.jobs.items()
+                       if job['finished_at'] is not None and job['finished_at'] < cutoff]:
+            del self.jobs[job_id]
+
+
+class ReportWorkerRequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints for ReportWorkerService"""
+
+    service = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_GET(self):
+        parts = [part for part in self.path.split('/') if part]
+        if parts == ['health']:
+            return self._send_json(200, self.service.get_health())
+        if len(parts) == 2 and parts[0] == 'jobs':
+            job = self.service.get_job(parts[1])
+            if job is None:
+                return self._send_json(404, {'error': 'Job not found'})
+            return self._send_json(200, job)
+        return self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        parts = [part for part in self.path.split('/') if part]
+        try:
+            payload = self._read_json()
+        except ValueError:
+            return self._send_json(400, {'error': 'Invalid JSON'})
+
+        if parts == ['jobs']:
+            try:
+                return self._send_json(202, self.service.submit(payload))
+            except ValueError as e:
+                return self._send_json(400, {'error': str(e)})
+        if len(parts) == 3 and parts[0] == 'jobs' and parts[2] in ('claim', 'release'):
+            if not payload.get('name') or not payload.get('owner'):
+                return self._send_json(400, {'error': 'name and owner are required'})
+            if parts[2] == 'claim':
+                claimed = self.service.claim_job(parts[1], payload['name'], payload['owner'])
+                key = 'claimed'
+            else:
+                claimed = self.service.release_job(parts[1], payload['name'], payload['owner'])
+                key = 'released'
+            if claimed is None:
+                return self._send_json(404, {'error': 'Job not found'})
+            return self._send_json(200, {key: claimed})
+        if len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'result':
+            job = self.service.set_job_result(parts[1], payload)
+            if job is None:
+                return self._send_json(404, {'error': 'Job not found'})
+            return self._send_json(200, job)
+        return self._send_json(404, {'error': 'Not found'})
+
+    def log_message(self, format, *args):
+        # Polling is frequent - only log submissions
+        if self.command == 'POST':
+            super().log_message(format, *args)
+
+
+def main():
+    """Run the report worker service"""
+    parser = argparse.ArgumentParser(description='Resident report generation worker service')
+    parser.add_argument('--host', default=os.environ.get('REPORT_WORKER_HOST', DEFAULT_HOST),
+                        help='Address to listen on (default: %(default)s - keep it local)')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('REPORT_WORKER_PORT', DEFAULT_PORT)),
+                        help='Port to listen on (default: %(default)s)')
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE,
+                        help='Template PPT file (default: %(default)s)')
+    parser.add_argument('--concurrency', type=int, default=int(os.environ.get('REPORT_WORKER_CONCURRENCY', 2)),
+                        help='Maximum reports generated at the same time (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Slide computation processes per report (default: CPUs / concurrency)')
+    args = parser.parse_args()
+
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        print("ERROR: The report worker service needs fork (Linux / macOS)")
+        return 1
+
+    slide_workers = args.workers or max(1, (os.cpu_count() or 1) // max(1, args.concurrency))
+    service = ReportWorkerService(args.template, concurrency=args.concurrency, slide_workers=slide_workers)
+    ReportWorkerRequestHandler.service = service
+
+    server = ThreadingHTTPServer((args.host, args.port), ReportWorkerRequestHandler)
+    print(f"Report worker service listening on http://{args.host}:{args.port} "
+          f"(concurrency {service.concurrency}, {slide_workers} slide workers per report)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Result Cache Module
+Run-scoped cache of calculation results keyed by (metric, window rows, weight column, extra
+arguments). A window's key is the dataset token of the calculator's base frame (the survey file's
+content hash) and the rows it reads (date window ∩ segment), so the same quantity requested by two
+slides - or by two decks of a batch whose windows cover the same rows - is computed once. Hit / miss
+counters per metric are reported at the end of each deck
+"""
+
+from data_window import DataWindow
+
+
+class ResultCache:
+    """Calculation results of one loaded dataset, keyed by metric and the rows they were computed from"""
+
+    def __init__(self, enabled=True):
+        """
+        Args:
+            enabled: If False, make_key returns None (every calculation runs, nothing is counted)
+        """
+        self.enabled = enabled
+        self._results = {}
+        self.hits = {}  # metric → cache hits since reset_counters
+        self.misses = {}  # metric → cache misses since reset_counters
+
+    def make_key(self, metric, data, weight_column=None, extra=()):
+        """
+        Build the cache key of a calculation
+
+        Args:
+            metric: Metric name (e.g. 'vote_share', 'party_totals')
+            data: DataWindow the calculation reads (date window and segment rows - see DataWindow.rows_key)
+            weight_column: Weight column used (None for raw counts)
+            extra: Other arguments the result depends on (hashable tuple)
+
+        Returns:
+            Key, or None if the calculation can't be cached (cache disabled or data is not a DataWindow)
+        """
+        # DataFrames may be modified copies - only read-only windows are cached
+        if not self.enabled or not isinstance(data, DataWindow):
+            return None
+        return (metric, data.rows_key, weight_column, tuple(extra))
+
+    def get(self, key):
+        """
+        Look up a result (counted as a hit or miss of its metric)
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        value = self._results.get(key)
+        counters = self.hits if value is not None else self.misses
+        counters[key[0]] = counters.get(key[0], 0) + 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store a result
+
+        Args:
+            key: Key from make_key
+            value: Result (not None)
+        """
+        self._results[key] = value
+
+    def clear(self):
+        """Drop every result (the data the results were computed from changed)"""
+        self._results = {}
+
+    def reset_counters(self):
+        """Start counting hits and misses for the next deck"""
+        self.hits = {}
+        self.misses = {}
+
+    def get_counters(self):
+        """
+        Hit / miss counts per metric
+
+        Returns:
+            Dictionary metric → {'hits': n, 'misses': n}
+        """
+        return {
+            metric: {'hits': self.hits.get(metric, 0), 'misses': self.misses.get(metric, 0)}
+            for metric in sorted(set(self.hits) | set(self.misses))
+        }
+
+    def summary(self):
+        """One-line hit / miss summary ('Result cache: 12 hits, 80 misses (vote_share 10/60, ...)')"""
+        counters = self.get_counters()
+        hits = sum(counts['hits'] for counts in counters.values())
+        misses = sum(counts['misses'] for counts in counters.values())
+        details = ', '.join(f"{metric} {counts['hits']}/{counts['hits'] + counts['misses']}"
+                            for metric, counts in counters.items())
+        return f"Result cache: {hits} hits, {misses} misses" + (f" ({details})" if details else "")
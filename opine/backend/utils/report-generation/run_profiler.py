@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Run Profiler Module
+Per-stage instrumentation of a report / audit run: wall time, CPU time, peak RSS growth and
+rows scanned for data loading, every calculate_* call and every slide update, written as a
+machine-readable JSON profile (optionally with a cProfile / pyinstrument dump of the whole run)
+"""
+
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Not available on Windows - RSS is then not reported
+    resource = None
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+
+PROFILE_VERSION = 1
+PROFILE_DUMP_FORMATS = ('cprofile', 'pyinstrument')
+
+
+def get_peak_rss_mb():
+    """
+    Peak resident set size of this process so far
+
+    Returns:
+        Peak RSS in MB (None where the resource module is unavailable)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def get_profile_path(output_path, extension='.json'):
+    """
+    Profile path next to a deck / audit output ('report.pptx' → 'report_profile.json')
+
+    Args:
+        output_path: Deck or audit output path
+        extension: Profile file extension ('.json', '.prof', '.html')
+
+    Returns:
+        Profile path
+    """
+    return os.path.splitext(output_path)[0] + '_profile' + extension
+
+
+def _count_rows(args):
+    """Rows of the first DataFrame / DataWindow argument of a call (None if there is none)"""
+    for arg in args:
+        if hasattr(arg, 'columns') and hasattr(arg, '__len__'):
+            return len(arg)
+    return None
+
+
+class RunProfiler:
+    """Collects per-stage timings of one run (a disabled profiler records nothing and costs nothing)"""
+
+    def __init__(self, enabled=True, dump_format=None):
+        """
+        Args:
+            enabled: If False, stage() / instrument() / begin_slide() are no-ops
+            dump_format: Also profile the whole run with 'cprofile' or 'pyinstrument' (see start_dump)
+        """
+        if dump_format is not None and dump_format not in PROFILE_DUMP_FORMATS:
+            raise ValueError(f"Unknown profile dump format: {dump_format} (expected one of {PROFILE_DUMP_FORMATS})")
+        self.enabled = enabled
+        self.dump_format = dump_format
+        self.info = {}  # Run description (input, reference date, ...) written in the profile header
+        self.stages = []  # Finished stage / slide records, in completion order
+        self.calculations = {}  # (name, slide) → aggregated calculate_* calls
+        self._open = []  # Stack of running stage records
+        self._slide = None  # Running slide stage (see begin_slide)
+        self._dump_profiler = None
+        self._started = (time.perf_counter(), time.process_time(), get_peak_rss_mb())
+
+    def _start_record(self, name, kind, slide=None, rows=None):
+        record = {
+            'name': name,
+            'kind': kind,
+            'slide': slide,
+            'depth': len(self._open),
+            'rows': rows,
+            '_start': (time.perf_counter(), time.process_time(), get_peak_rss_mb()),
+        }
+        self._open.append(record)
+        return record
+
+    def _finish_record(self, record):
+        wall_start, cpu_start, rss_start = record.pop('_start')
+        record['wall_s'] = time.perf_counter() - wall_start
+        record['cpu_s'] = time.process_time() - cpu_start
+        rss_end = get_peak_rss_mb()
+        record['rss_peak_delta_mb'] = None if rss_end is None else rss_end - rss_start
+        self._open.remove(record)
+
+        # Rows scanned by the outermost calculations count towards the enclosing stage / slide
+        parent = self._open[-1] if self._open else None
+        if record['kind'] == 'calculation' and record['rows'] and parent is not None and parent['kind'] != 'calculation':
+            parent['rows'] = (parent['rows'] or 0) + record['rows']
+        return record
+
+    @contextmanager
+    def _stage(self, name, kind, rows):
+        record = self._start_record(name, kind, slide=self._slide['slide'] if self._slide else None, rows=rows)
+        try:
+            yield record
+        finally:
+            self.stages.append(self._finish_record(record))
+
+    def stage(self, name, rows=None):
+        """
+        Context manager timing one stage of the run
+
+        Args:
+            name: Stage name (e.g. 'load_data', 'save')
+            rows: Rows scanned by the stage, if known up front (see also add_rows)
+
+        Returns:
+            Context manager yielding the stage record (None when disabled)
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(name, 'stage', rows)
+
+    def add_rows(self, rows):
+        """
+        Add rows scanned to the innermost running stage (no-op when disabled or outside a stage)
+
+        Args:
+            rows: Number of rows
+        """
+        if self.enabled and self._open:
+            self._open[-1]['rows'] = (self._open[-1]['rows'] or 0) + rows
+
+    def reset(self):
+        """Start a new profile (e.g. for the next deck of a batch) - instrumented methods stay instrumented"""
+        self.end_slide()
+        self.stages = []
+        self.calculations = {}
+        self._open = []
+        self._started = (time.perf_counter(), time.process_time(), get_peak_rss_mb())
+
+    def begin_slide(self, slide_num, family=None):
+        """
+        Start timing a slide update (the previous slide, if any, ends here)
+
+        Args:
+            slide_num: Slide number
+            family: Slide family label (e.g. 'District graphs') for the summary
+        """
+        if not self.enabled:
+            return
+        self.end_slide()
+        self._slide = self._start_record(f"slide {slide_num}", 'slide', slide=slide_num)
+        self._slide['family'] = family
+
+    def end_slide(self):
+        """Finish timing the running slide update (no-op if none)"""
+        if self._slide is None:
+            return
+        # Stages left open inside the slide (e.g. by an exception) end with it
+        while self._open and self._open[-1] is not self._slide:
+            self.stages.append(self._finish_record(self._open[-1]))
+        self.stages.append(self._finish_record(self._slide))
+        self._slide = None
+
+    def _record_calculation(self, name, args, call):
+        record = self._start_record(name, 'calculation', slide=self._slide['slide'] if self._slide else None,
+                                    rows=_count_rows(args))
+        try:
+            return call()
+        finally:
+            record = self._finish_record(record)
+            key = (record['name'], record['slide'])
+            calculation = self.calculations.get(key)
+            if calculation is None:
+                calculation = self.calculations[key] = {
+                    'name': record['name'], 'slide': record['slide'], 'calls': 0,
+                    'wall_s': 0.0, 'cpu_s': 0.0, 'rows': 0, 'rss_peak_delta_mb': None,
+                }
+            calculation['calls'] += 1
+            calculation['wall_s'] += record['wall_s']
+            calculation['cpu_s'] += record['cpu_s']
+            calculation['rows'] += record['rows'] or 0
+            if record['rss_peak_delta_mb'] is not None:
+                calculation['rss_peak_delta_mb'] = (calculation['rss_peak_delta_mb'] or 0) + record['rss_peak_delta_mb']
+
+    def instrument(self, obj, prefix='calculate_', label=None):
+        """
+        Time every call of the methods of obj whose name starts with prefix
+
+        The bound methods are replaced on the instance only (the class is not modified). Calls
+        made in forked slide worker processes are not recorded - they are part of the
+        'precompute_slides' stage
+
+        Args:
+            obj: Instance to instrument (e.g. the generator or its VoteShareCalculator)
+            prefix: Method name prefix
+            label: Name prefix in the profile (default: class name)
+        """
+        if not self.enabled:
+            return
+        label = label or type(obj).__name__
+        for name in dir(type(obj)):
+            if not name.startswith(prefix) or not callable(getattr(type(obj), name, None)):
+                continue
+            method = getattr(obj, name)
+
+            def timed(*args, _method=method, _name=f"{label}.{name}", **kwargs):
+                return self._record_calculation(_name, args, lambda: _method(*args, **kwargs))
+
+            setattr(obj, name, functools.wraps(method)(timed))
+
+    def start_dump(self):
+        """Start the whole-run cProfile / pyinstrument profiler (if a dump format was requested)"""
+        if not self.enabled or self.dump_format is None or self._dump_profiler is not None:
+            return
+        if self.dump_format == 'pyinstrument' and pyinstrument is None:
+            print("Warning: pyinstrument is not installed - using cProfile for the profile dump")
+            self.dump_format = 'cprofile'
+        if self.dump_format == 'pyinstrument':
+            self._dump_profiler = pyinstrument.Profiler()
+            self._dump_profiler.start()
+        else:
+            import cProfile
+            self._dump_profiler = cProfile.Profile()
+            self._dump_profiler.enable()
+
+    def stop_dump(self, output_path):
+        """
+        Stop the whole-run profiler and write its dump next to output_path
+
+        Args:
+            output_path: Deck / audit output path (dump: <name>_profile.prof or .html)
+
+        Returns:
+            Dump path (None if no dump was running)
+        """
+        if self._dump_profiler is None:
+            return None
+        if self.dump_format == 'pyinstrument':
+            self._dump_profiler.stop()
+            dump_path = get_profile_path(output_path, '.html')
+            with open(dump_path, 'w') as f:
+                f.write(self._dump_profiler.output_html())
+        else:
+            self._dump_profiler.disable()
+            dump_path = get_profile_path(output_path, '.prof')
+            self._dump_profiler.dump_stats(dump_path)
+        self._dump_profiler = None
+        return dump_path
+
+    def to_dict(self):
+        """
+        Profile as a JSON-serializable dictionary
+
+        Returns:
+            Dictionary with the run info, totals, stages, slides, per-family and per-calculation summaries
+        """
+        wall_start, cpu_start, rss_start = self._started
+        rss_end = get_peak_rss_mb()
+
+        families = {}
+        for record in self.stages:
+            if record['kind'] != 'slide':
+                continue
+            family = families.setdefault(record.get('family') or 'Other', {
+                'family': record.get('family') or 'Other', 'slides': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'rows': 0,
+            })
+            family['slides'] += 1
+            family['wall_s'] += record['wall_s']
+            family['cpu_s'] += record['cpu_s']
+            family['rows'] += record['rows'] or 0
+
+        by_calculation = {}
+        for calculation in self.calculations.values():
+            total = by_calculation.setdefault(calculation['name'], {
+                'name': calculation['name'], 'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'rows': 0,
+            })
+            for field in ('calls', 'wall_s', 'cpu_s', 'rows'):
+                total[field] += calculation[field]
+
+        return {
+            'version': PROFILE_VERSION,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'run': self.info,
+            'total': {
+                'wall_s': time.perf_counter() - wall_start,
+                'cpu_s': time.process_time() - cpu_start,
+                'peak_rss_mb': rss_end,
+                'rss_peak_delta_mb': None if rss_end is None else rss_end - rss_start,
+            },
+            'stages': [record for record in self.stages if record['kind'] == 'stage'],
+            'slides': [record for record in self.stages if record['kind'] == 'slide'],
+            'slide_families': sorted(families.values(), key=lambda family: -family['wall_s']),
+            'calculations': sorted(by_calculation.values(), key=lambda total: -total['wall_s']),
+            'calculations_by_slide': list(self.calculations.values()),
+        }
+
+    def write(self, output_path):
+        """
+        Write the JSON profile next to a deck / audit output
+
+        Args:
+            output_path: Deck or audit output path (profile: <name>_profile.json)
+
+        Returns:
+            Profile path (None when disabled)
+        """
+        if not self.enabled:
+            return None
+        self.end_slide()
+        profile_path = get_profile_path(output_path)
+        with open(profile_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        return profile_path
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Segment Registry Module
+Demographic segment definitions (Gender, Location, Religion, Social Category, Age) with
+masks, row indices, date-window intersections and sample sizes computed once per dataset
+and memoized, so every demographic chart and table reuses the same segment rows
+"""
+
+import pandas as pd
+import numpy as np
+
+from data_window import DataWindow
+
+
+# Survey column per demographic type
+DEMOGRAPHIC_COLUMNS = {
+    'Gender': 'Gender',
+    'Location': 'Residential locality type',
+    'Religion': '20. Could you please tell me the religion that you belong to?',
+    'Social Category': '21. Which social category do you belong to?',
+    'Age': 'Could you please tell me your age in complete years?'
+}
+
+# Segment definitions: (demographic type, value) → rule
+#   ('codes', codes)       - column value is one of the codes
+#   ('other_codes', codes) - column value is not one of the codes (includes blanks)
+#   ('age', low, high)     - numeric age between low and high (inclusive)
+#   ('age_above', age)     - numeric age greater than age
+DEMOGRAPHIC_SEGMENTS = {
+    ('Gender', 'Male'): ('codes', (1,)),              # Gender: 1=Male, 2=Female
+    ('Gender', 'Female'): ('codes', (2,)),
+    ('Location', 'Urban'): ('codes', (1,)),           # Location: 1=Urban, 2=Rural
+    ('Location', 'Rural'): ('codes', (2,)),
+    ('Religion', 'Hindu'): ('codes', (1,)),           # Religion: 1=Hindu, 2=Muslim
+    ('Religion', 'Muslim'): ('codes', (2,)),
+    ('Religion', 'Other'): ('other_codes', (1, 2)),   # Other religions (codes 3, 4, 5, 6, 7, etc.)
+    ('Social Category', 'General+OBC'): ('codes', (1, 2)),  # Social Category: 1=General, 2=OBC, 3=SC, 4=ST
+    ('Social Category', 'General'): ('codes', (1,)),
+    ('Social Category', 'OBC'): ('codes', (2,)),
+    ('Social Category', 'SC'): ('codes', (3,)),
+    ('Social Category', 'ST'): ('codes', (4,)),
+    ('Age', '18-25'): ('age', 18, 25),
+    ('Age', '26-34'): ('age', 26, 34),
+    ('Age', '26-35'): ('age', 26, 35),
+    ('Age', '36-50'): ('age', 36, 50),
+    ('Age', '50+'): ('age_above', 50),
+}
+
+
+def match_segment_label(demographic_type, label):
+    """
+    Match a demographic table row label (e.g. 'Male', 'General + OBC', '26 - 35') to a segment value
+
+    Args:
+        demographic_type: 'Gender', 'Location', 'Religion', 'Social Category', 'Age'
+        label: Row label text from the table
+
+    Returns:
+        Segment value (key of DEMOGRAPHIC_SEGMENTS) or None if the label is not recognised
+    """
+    label_lower = label.lower()
+    if demographic_type == 'Gender':
+        if label_lower in ['male', 'm']:
+            return 'Male'
+        if label_lower in ['female', 'f']:
+            return 'Female'
+    elif demographic_type == 'Location':
+        if label_lower in ['urban', 'u']:
+            return 'Urban'
+        if label_lower in ['rural', 'r']:
+            return 'Rural'
+    elif demographic_type == 'Religion':
+        if label_lower in ['hindu', 'h']:
+            return 'Hindu'
+        if label_lower in ['muslim', 'm', 'islam']:
+            return 'Muslim'
+        if label_lower in ['other', 'others']:
+            return 'Other'
+    elif demographic_type == 'Social Category':
+        if 'general' in label_lower and 'obc' in label_lower:
+            return 'General+OBC'
+        if 'general' in label_lower:
+            return 'General'
+        if 'obc' in label_lower:
+            return 'OBC'
+        if label_lower in ['sc', 'scheduled caste']:
+            return 'SC'
+        if label_lower in ['st', 'scheduled tribe']:
+            return 'ST'
+    elif demographic_type == 'Age':
+        if '18-25' in label or '18 - 25' in label:
+            return '18-25'
+        if '26-34' in label or '26 - 34' in label:
+            return '26-34'
+        if '26-35' in label or '26 - 35' in label:
+            return '26-35'
+        if '36-50' in label or '36 - 50' in label:
+            return '36-50'
+        if '50+' in label or 'above 50' in label or '50 +' in label:
+            return '50+'
+    return None
+
+
+class SegmentRegistry:
+    """Memoized demographic segment masks, row indices, date windows and sample sizes for one dataset"""
+
+    def __init__(self, df, question_column=None, date_column='Survey Date', data_window=None):
+        """
+        Initialize registry (nothing is computed until a segment is first used)
+
+        Args:
+            df: Survey DataFrame (read only - the registry must be rebuilt if it changes)
+            question_column: Column whose non-empty responses count towards sample sizes
+            date_column: Survey date column
+            data_window: DataWindow over all of df (e.g. calculator.data_window) - segment windows
+                         share its dataset token, so their cached results match the calculator's
+        """
+        self.df = df
+        self.question_column = question_column
+        self.date_column = date_column
+        self.data_window = data_window if data_window is not None else DataWindow(df, date_column=date_column)
+
+        self._masks = {}
+        self._rows = {}
+        self._window_rows = {}
+        self._sample_sizes = {}
+        self._age_numeric = None
+        self._dates = None
+        self._has_response = None
+
+    def get_column(self, demographic_type):
+        """
+        Get the survey column for a demographic type
+
+        Args:
+            demographic_type: 'Gender', 'Location', 'Religion', 'Social Category', 'Age'
+
+        Returns:
+            Column name, or None if unknown or not in the data
+        """
+        demographic_column = DEMOGRAPHIC_COLUMNS.get(demographic_type)
+        if not demographic_column or demographic_column not in self.df.columns:
+            return None
+        return demographic_column
+
+    def get_mask(self, demographic_type, demographic_value):
+        """
+        Get the boolean mask of a segment (computed on first use)
+
+        Args:
+            demographic_type: 'Gender', 'Location', 'Religion', 'Social Category', 'Age'
+            demographic_value: Segment value (e.g. 'Male', 'General+OBC', '50+')
+
+        Returns:
+            Boolean Series aligned with df, or None if the segment is unknown / its column is missing
+        """
+        key = (demographic_type, demographic_value)
+        if key in self._masks:
+            return self._masks[key]
+
+        rule = DEMOGRAPHIC_SEGMENTS.get(key)
+        demographic_column = self.get_column(demographic_type)
+        if rule is None or demographic_column is None:
+            return None
+
+        if rule[0] == 'codes':
+            mask = self.df[demographic_column].isin(rule[1])
+        elif rule[0] == 'other_codes':
+            mask = ~self.df[demographic_column].isin(rule[1])
+        else:
+            # Numeric age (parsed once, shared by all age segments)
+            if self._age_numeric is None:
+                self._age_numeric = pd.to_numeric(self.df[demographic_column], errors='coerce')
+            if rule[0] == 'age':
+                mask = (self._age_numeric >= rule[1]) & (self._age_numeric <= rule[2])
+            else:
+                mask = self._age_numeric > rule[1]
+
+        self._masks[key] = mask
+        return mask
+
+    def get_rows(self, demographic_type, demographic_value):
+        """
+        Get the row positions of a segment
+
+        Args:
+            demographic_type: Demographic type
+            demographic_value: Segment value
+
+        Returns:
+            Sorted int64 array of row positions in df, or None if the segment is unavailable
+        """
+        key = (demographic_type, demographic_value)
+        if key not in self._rows:
+            mask = self.get_mask(demographic_type, demographic_value)
+            self._rows[key] = None if mask is None else np.flatnonzero(mask.to_numpy(dtype=bool))
+        return self._rows[key]
+
+    def get_window_rows(self, demographic_type, demographic_value, start=None, end=None):
+        """
+        Get the row positions of a segment within a survey date window
+
+        Args:
+            demographic_type: Demographic type
+            demographic_value: Segment value
+            start: First survey date included (None for no lower bound)
+            end: Last survey date included (None for no upper bound)
+
+        Returns:
+            Sorted int64 array of row positions in df, or None if the segment is unavailable
+        """
+        key = (demographic_type, demographic_value, start, end)
+        if key in self._window_rows:
+            return self._window_rows[key]
+
+        rows = self.get_rows(demographic_type, demographic_value)
+        if rows is not None and (start is not None or end is not None):
+            if self._dates is None:
+                self._dates = self.df[self.date_column].to_numpy(dtype='datetime64[ns]')
+            segment_dates = self._dates[rows]
+            in_window = np.ones(len(rows), dtype=bool)
+            if start is not None:
+                in_window &= segment_dates >= np.datetime64(pd.Timestamp(start), 'ns')
+            if end is not None:
+                in_window &= segment_dates <= np.datetime64(pd.Timestamp(end), 'ns')
+            rows = rows[in_window]
+
+        self._window_rows[key] = rows
+        return rows
+
+    def get_window_data(self, demographic_type, demographic_value, start=None, end=None):
+        """
+        Get the segment's records within a survey date window
+
+        Args:
+            demographic_type: Demographic type
+            demographic_value: Segment value
+            start: First survey date included (None for no lower bound)
+            end: Last survey date included (None for no upper bound)
+
+        Returns:
+            Read-only DataWindow of matching records (in df order), or None if the segment is unavailable
+        """
+        rows = self.get_window_rows(demographic_type, demographic_value, start=start, end=end)
+        if rows is None:
+            return None
+        return self.data_window.take(rows)
+
+    def get_sample_size(self, demographic_type, demographic_value, start=None, end=None):
+        """
+        Get the segment's sample size within a survey date window
+        (records with a non-empty response to the question column)
+
+        Args:
+            demographic_type: Demographic type
+            demographic_value: Segment value
+            start: First survey date included (None for no lower bound)
+            end: Last survey date included (None for no upper bound)
+
+        Returns:
+            Sample size (0 if the segment or question column is unavailable)
+        """
+        key = (demographic_type, demographic_value, start, end)
+        if key in self._sample_sizes:
+            return self._sample_sizes[key]
+
+        rows = self.get_window_rows(demographic_type, demographic_value, start=start, end=end)
+        if rows is None or self.question_column not in self.df.columns:
+            sample_size = 0
+        else:
+            if self._has_response is None:
+                self._has_response = self.df[self.question_column].notna().to_numpy()
+            sample_size = int(self._has_response[rows].sum())
+
+        self._sample_sizes[key] = sample_size
+        return sample_size
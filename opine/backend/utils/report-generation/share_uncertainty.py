@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Share Uncertainty Module
+Margins of error and bootstrap confidence intervals for weighted vote shares, computed from the
+per-party aggregates (sum of weights, sum of squared weights) the vote share was built from - no
+pass over the survey rows, so they cost the same for one window or every segment of the deck.
+
+Margins of error use the Kish design effect of the weights (deff = n·Σw² / (Σw)², effective
+sample n / deff). Confidence intervals come from a Poisson bootstrap: resampling every record
+with a Poisson(1) count gives a party total with mean Σw and variance Σw², which is drawn directly
+as a scaled Poisson variate with those two moments - thousands of replicates for all parties (and
+any number of windows / groups at once) are one NumPy draw
+"""
+
+import zlib
+from statistics import NormalDist
+
+import numpy as np
+
+from vote_share_calculator import PARTY_CATEGORIES
+
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_REPLICATES = 2000
+
+
+def get_design_effect(total_weight, squared_weight, records):
+    """
+    Kish design effect of a set of weights
+
+    Args:
+        total_weight: Sum of the weights
+        squared_weight: Sum of the squared weights
+        records: Number of weighted records
+
+    Returns:
+        Tuple (design effect, effective sample size) - (1.0, 0.0) when there are no weights
+    """
+    if total_weight <= 0 or squared_weight <= 0:
+        return 1.0, 0.0
+    effective_sample = total_weight * total_weight / squared_weight
+    design_effect = records / effective_sample if records > 0 else 1.0
+    return design_effect, effective_sample
+
+
+class ShareUncertainty:
+    """Margins of error and Poisson-bootstrap confidence intervals of vote shares (in percent)"""
+
+    def __init__(self, confidence=DEFAULT_CONFIDENCE, replicates=DEFAULT_REPLICATES, seed=0):
+        """
+        Args:
+            confidence: Confidence level of the margins and intervals (e.g. 0.95)
+            replicates: Bootstrap replicates per vote share
+            seed: Base seed - each interval's generator is seeded from it and the aggregates, so the
+                  same vote share gets the same interval in any order or worker process
+        """
+        if not 0 < confidence < 1:
+            raise ValueError(f"Confidence must be between 0 and 1, got {confidence}")
+        self.confidence = confidence
+        self.replicates = int(replicates)
+        self.seed = seed
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    def _get_rng(self, *arrays):
+        """Random generator seeded from the base seed and the aggregates being resampled"""
+        checksum = 0
+        for array in arrays:
+            checksum = zlib.crc32(np.ascontiguousarray(array, dtype=np.float64).tobytes(), checksum)
+        return np.random.default_rng([self.seed, checksum])
+
+    def bootstrap_intervals(self, party_weights, squared_weights):
+        """
+        Poisson-bootstrap confidence intervals of the shares of one or many sets of party totals
+
+        Args:
+            party_weights: Array (..., parties) of weight totals per party
+            squared_weights: Array (..., parties) of squared weight totals per party (equal to
+                             party_weights for raw counts)
+
+        Returns:
+            Tuple (low, high) of arrays shaped like party_weights, in percent (NaN where the
+            total weight is 0)
+        """
+        party_weights = np.asarray(party_weights, dtype=np.float64)
+        squared_weights = np.asarray(squared_weights, dtype=np.float64)
+
+        # Scaled Poisson per party: scale × Poisson(T / scale) has mean T and variance scale × T = S
+        has_weight = (party_weights > 0) & (squared_weights > 0)
+        scale = np.divide(squared_weights, party_weights, out=np.ones_like(party_weights), where=has_weight)
+        expected = np.where(has_weight, party_weights / scale, 0.0)
+
+        rng = self._get_rng(party_weights, squared_weights)
+        draws = rng.poisson(expected, size=(self.replicates,) + expected.shape) * scale
+        totals = draws.sum(axis=-1, keepdims=True)
+        shares = np.divide(draws, totals, out=np.full_like(draws, np.nan), where=totals > 0) * 100
+
+        # Replicates without any record (only possible for tiny samples) are left out
+        alpha = (1 - self.confidence) / 2
+        with np.errstate(all='ignore'):
+            if np.isnan(shares).any():
+                low, high = np.nanquantile(shares, [alpha, 1 - alpha], axis=0)
+            else:
+                low, high = np.quantile(shares, [alpha, 1 - alpha], axis=0)
+        empty = party_weights.sum(axis=-1, keepdims=True) <= 0
+        return np.where(empty, np.nan, low), np.where(empty, np.nan, high)
+
+    def estimate(self, party_weights, squared_weights, records):
+        """
+        Design effect, margins of error and confidence intervals of one vote share
+
+        Args:
+            party_weights: Array of weight totals per party (PARTY_CATEGORIES order)
+            squared_weights: Array of squared weight totals per party
+            records: Number of records the totals were built from (weighted records)
+
+        Returns:
+            Dictionary with 'confidence', 'design_effect', 'effective_sample' and per-party
+            'moe' / 'ci_low' / 'ci_high' (percentage points), or None if the total weight is 0
+        """
+        party_weights = np.asarray(party_weights, dtype=np.float64)
+        squared_weights = np.asarray(squared_weights, dtype=np.float64)
+        total_weight = float(party_weights.sum())
+        if total_weight <= 0:
+            return None
+
+        design_effect, effective_sample = get_design_effect(total_weight, float(squared_weights.sum()), records)
+        shares = party_weights / total_weight
+        moe = self.z * np.sqrt(shares * (1 - shares) / effective_sample) * 100 if effective_sample > 0 else np.zeros_like(shares)
+        low, high = self.bootstrap_intervals(party_weights, squared_weights)
+
+        return {
+            'confidence': self.confidence,
+            'design_effect': float(design_effect),
+            'effective_sample': float(effective_sample),
+            'moe': {party: float(moe[idx]) for idx, party in enumerate(PARTY_CATEGORIES)},
+            'ci_low': {party: float(low[idx]) for idx, party in enumerate(PARTY_CATEGORIES)},
+            'ci_high': {party: float(high[idx]) for idx, party in enumerate(PARTY_CATEGORIES)},
+        }
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Survey Data Cache Module
+Converts the weighted survey export into a typed columnar (Arrow IPC) file keyed by
+the workbook's content hash, so repeated report / audit runs on the same upload
+memory-map the cache instead of parsing the Excel file again
+"""
+
+import pandas as pd
+import numpy as np
+import hashlib
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # Cache is optional - fall back to plain read_excel
+    pa = None
+    feather = None
+
+
+# Bump this whenever the typing rules below change so stale cache files are ignored
+CACHE_FORMAT_VERSION = 2
+
+# Keep only the most recent cache files per cache directory
+MAX_CACHE_ENTRIES = 10
+
+# Environment override for the cache location (defaults to <excel dir>/.survey_cache)
+CACHE_DIR_ENV = 'REPORT_DATA_CACHE_DIR'
+
+# Schema metadata key listing columns that held mixed text/number values
+MIXED_COLUMNS_KEY = b'report_mixed_columns'
+
+
+def compute_file_hash(file_path, chunk_size=1024 * 1024):
+    """
+    Compute SHA-256 of a file's content
+
+    Args:
+        file_path: Path to file
+        chunk_size: Bytes read per chunk
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_cache_dir(excel_path, cache_dir=None):
+    """
+    Resolve the cache directory for an export
+
+    Args:
+        excel_path: Path to Excel export
+        cache_dir: Explicit cache directory (optional)
+
+    Returns:
+        Cache directory path
+    """
+    if cache_dir:
+        return cache_dir
+    if os.environ.get(CACHE_DIR_ENV):
+        return os.environ[CACHE_DIR_ENV]
+    return os.path.join(os.path.dirname(os.path.abspath(excel_path)), '.survey_cache')
+
+
+def get_cache_path(excel_path, cache_dir=None, content_hash=None):
+    """
+    Get cache file path for an export (keyed by content hash, not file name)
+
+    Args:
+        excel_path: Path to Excel export
+        cache_dir: Explicit cache directory (optional)
+        content_hash: Precomputed content hash (optional)
+
+    Returns:
+        Path to Arrow IPC cache file
+    """
+    if content_hash is None:
+        content_hash = compute_file_hash(excel_path)
+    file_name = f"survey_v{CACHE_FORMAT_VERSION}_{content_hash}.arrow"
+    return os.path.join(get_cache_dir(excel_path, cache_dir), file_name)
+
+
+def _smallest_int_dtype(values):
+    """Get the smallest signed integer dtype that holds all values"""
+    min_value = values.min() if len(values) else 0
+    max_value = values.max() if len(values) else 0
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if min_value >= info.min and max_value <= info.max:
+            return dtype
+    return np.int64
+
+
+def optimize_dtypes(df):
+    """
+    Convert export columns to compact, typed columns
+
+    Rules:
+    - Weight columns → float64 (never narrowed - weight sums are reported figures)
+    - Code columns (whole numbers only) → smallest signed int (int8 for party codes)
+      Columns with empty cells keep float64 so NaN comparisons behave as before
+    - Other numeric columns → float64
+    - Columns mixing text and numbers → text (see MIXED_COLUMNS_KEY)
+
+    Args:
+        df: DataFrame (after Survey Date parsing)
+
+    Returns:
+        Tuple of (typed DataFrame, list of mixed text/number columns)
+    """
+    typed_columns = {}
+    mixed_columns = []
+
+    for col in df.columns:
+        series = df[col]
+
+        if col == 'Survey Date' or pd.api.types.is_datetime64_any_dtype(series):
+            typed_columns[col] = series
+            continue
+
+        if str(col).startswith('Weight'):
+            typed_columns[col] = pd.to_numeric(series, errors='coerce').astype(np.float64)
+            continue
+
+        if pd.api.types.is_bool_dtype(series):
+            typed_columns[col] = series
+            continue
+
+        inferred = pd.api.types.infer_dtype(series, skipna=True)
+
+        if inferred in ('integer', 'floating', 'mixed-integer-float', 'decimal'):
+            numeric = pd.to_numeric(series, errors='coerce').astype(np.float64)
+            valid = numeric.dropna()
+            is_whole = len(valid) > 0 and bool((valid == np.floor(valid)).all())
+            if is_whole and len(valid) == len(numeric):
+                typed_columns[col] = numeric.astype(_smallest_int_dtype(valid))
+            else:
+                typed_columns[col] = numeric
+            continue
+
+        if inferred == 'empty':
+            # Completely empty column - keep as float NaN (same as read_excel)
+            typed_columns[col] = pd.Series(np.nan, index=series.index, dtype=np.float64)
+            continue
+
+        if inferred == 'string':
+            typed_columns[col] = series
+            continue
+
+        # Mixed text / numbers / timestamps - store as text, restore numbers on load
+        mixed_columns.append(col)
+        typed_columns[col] = series.map(lambda v: v if pd.isna(v) else str(v)).astype(object)
+
+    typed_df = pd.DataFrame(typed_columns, index=df.index)
+    return typed_df, mixed_columns
+
+
+def _restore_mixed_value(value):
+    """Convert a text cell back to a number if it was one originally"""
+    if not isinstance(value, str):
+        return value
+    try:
+        int_value = int(value)
+        if str(int_value) == value:
+            return int_value
+    except ValueError:
+        pass
+    try:
+        float_value = float(value)
+        if repr(float_value) == value or str(float_value) == value:
+            return float_value
+    except ValueError:
+        pass
+    return value
+
+
+def prepare_survey_dataframe(df):
+    """
+    Apply the standard preprocessing used by the report and audit trail
+    (parse Survey Date, drop rows without a valid date - e.g. the variable-code row)
+
+    Args:
+        df: Raw DataFrame from read_excel
+
+    Returns:
+        Tuple of (typed DataFrame, list of mixed text/number columns)
+    """
+    df['Survey Date'] = pd.to_datetime(df['Survey Date'], errors='coerce')
+    df = df[df['Survey Date'].notna()].reset_index(drop=True)
+    return optimize_dtypes(df)
+
+
+def _write_cache(df, mixed_columns, cache_path):
+    """Write typed DataFrame to Arrow IPC (atomic rename)"""
+    storage = {}
+    for col in df.columns:
+        series = df[col]
+        # Whole-number columns with blanks are float64 in memory - store them as small nullable ints
+        # (widened back to float64 / NaN by _read_cache)
+        if series.dtype == np.float64 and not str(col).startswith('Weight'):
+            valid = series.dropna()
+            if len(valid) > 0 and bool((valid == np.floor(valid)).all()):
+                int_dtype = _smallest_int_dtype(valid)
+                storage[col] = series.astype(pd.api.types.pandas_dtype(np.dtype(int_dtype).name.capitalize()))
+                continue
+        storage[col] = series
+
+    table = pa.Table.from_pandas(pd.DataFrame(storage), preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[MIXED_COLUMNS_KEY] = '\x1f'.join(mixed_columns).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    # Uncompressed so the file can be memory-mapped without a decode pass
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, cache_path)
+
+
+def _read_cache(cache_path, columns=None, category_columns=None):
+    """
+    Read typed DataFrame from Arrow IPC cache (memory-mapped)
+
+    Only the selected columns are converted to pandas - the others are never read from the file
+    """
+    table = feather.read_table(cache_path, memory_map=True)
+    metadata = table.schema.metadata or {}
+    raw_mixed = metadata.get(MIXED_COLUMNS_KEY, b'').decode('utf-8')
+    mixed_columns = [col for col in raw_mixed.split('\x1f') if col]
+
+    if columns is not None:
+        table = table.select([col for col in table.column_names if columns(col)])
+    categories = [col for col in (category_columns or []) if col in table.column_names]
+
+    df = table.to_pandas(categories=categories or None)
+    for col in df.columns:
+        # Whole-number columns with blanks are stored as nullable ints - restore the float64 / NaN
+        # columns of a parsed export, so a cache hit has the same dtypes as a cache miss
+        dtype = df[col].dtype
+        if pd.api.types.is_extension_array_dtype(dtype) and pd.api.types.is_integer_dtype(dtype):
+            df[col] = df[col].astype(np.float64)
+    for col in categories:
+        # Arrow dictionaries are in order of appearance - sort like astype('category') on a miss
+        df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+    for col in mixed_columns:
+        if col in df.columns:
+            df[col] = df[col].astype(object).map(_restore_mixed_value)
+    return df
+
+
+def _prune_cache(cache_dir, keep=MAX_CACHE_ENTRIES):
+    """Remove old cache files beyond the retention limit"""
+    try:
+        entries = [
+            os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+            if name.startswith('survey_v') and name.endswith('.arrow')
+        ]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for stale_path in entries[keep:]:
+            os.remove(stale_path)
+    except OSError:
+        pass
+
+
+def write_survey_cache(raw_df, excel_path, cache_dir=None):
+    """
+    Store export data in the cache under the content hash of excel_path without parsing the file
+    (e.g. synthetic benchmark data too large to round-trip through Excel)
+
+    Args:
+        raw_df: Export rows as read_excel would return them (prepared like a parsed export)
+        excel_path: Existing file whose content hash keys the cache entry
+        cache_dir: Cache directory (default: <excel dir>/.survey_cache or $REPORT_DATA_CACHE_DIR)
+
+    Returns:
+        Path to Arrow IPC cache file
+    """
+    if feather is None:
+        raise ImportError("pyarrow is required for the survey data cache")
+    df, mixed_columns = prepare_survey_dataframe(raw_df)
+    cache_path = get_cache_path(excel_path, cache_dir)
+    _write_cache(df, mixed_columns, cache_path)
+    _prune_cache(os.path.dirname(cache_path))
+    return cache_path
+
+
+def load_survey_data(excel_path, cache_dir=None, use_cache=True, columns=None, category_columns=None,
+                     content_hash=None):
+    """
+    Load the survey export with Survey Date parsed and typed columns,
+    using the content-hash keyed Arrow cache when available
+
+    Args:
+        excel_path: Path to Excel export
+        cache_dir: Cache directory (default: <excel dir>/.survey_cache or $REPORT_DATA_CACHE_DIR)
+        use_cache: If False, always parse the Excel file and don't write a cache
+        columns: Predicate on column name selecting the columns to load (None for all columns).
+                 The cache always holds every column, so callers with different manifests share it
+        category_columns: Text columns to load as categoricals (e.g. Region / District Name)
+        content_hash: Precomputed content hash of the export (optional)
+
+    Returns:
+        DataFrame with valid Survey Date rows only
+    """
+    cache_enabled = use_cache and feather is not None
+    cache_path = None
+
+    if cache_enabled:
+        try:
+            cache_path = get_cache_path(excel_path, cache_dir, content_hash=content_hash)
+        except OSError as e:
+            print(f"Warning: Could not hash {excel_path} for data cache: {e}")
+            cache_enabled = False
+
+    if cache_enabled and os.path.exists(cache_path):
+        try:
+            df = _read_cache(cache_path, columns=columns, category_columns=category_columns)
+            os.utime(cache_path, None)  # Mark as recently used for pruning
+            print(f"Loaded data from cache: {cache_path}")
+            return df
+        except Exception as e:
+            print(f"Warning: Could not read data cache ({e}), re-reading Excel")
+
+    if cache_enabled or columns is None:
+        raw_df = pd.read_excel(excel_path)
+    else:
+        # No cache to fill - parse only the selected columns
+        raw_df = pd.read_excel(excel_path, usecols=lambda col: col == 'Survey Date' or columns(col))
+    df, mixed_columns = prepare_survey_dataframe(raw_df)
+
+    if cache_enabled:
+        try:
+            _write_cache(df, mixed_columns, cache_path)
+            _prune_cache(os.path.dirname(cache_path))
+            print(f"Saved data cache: {cache_path}")
+        except Exception as e:
+            print(f"Warning: Could not write data cache: {e}")
+
+    # Same columns and in-memory types as a cache hit: numbers restored in mixed columns
+    if columns is not None:
+        df = df.drop(columns=[col for col in df.columns if not columns(col)])
+    for col in mixed_columns:
+        if col in df.columns:
+            df[col] = df[col].map(_restore_mixed_value)
+    for col in category_columns or []:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
+    return df
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Synthetic Survey Data Module
+Generates survey exports with the real column schema (taken from template.xlsx: question
+columns, variable-code row, demographics, Region / District, weight columns) filled with random
+but plausible answers, so report performance can be measured at any sample size without a real
+(sensitive) export
+
+Usage:
+    python3 synthetic_survey_data.py 100000 synthetic_100k.xlsx --days 45 --end 2025-11-05
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from survey_data_cache import write_survey_cache
+
+
+# Column schema: header row, variable-code row and one example answer row of a real export
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'template.xlsx')
+
+# Exports with more rows than this are written with a preview of the rows only - the full data
+# goes straight into the columnar data cache (writing / parsing millions of rows through Excel
+# would dominate the benchmark)
+MAX_EXCEL_ROWS = 20000
+
+# Survey regions and their districts (21 districts → district slides 95-136)
+REGION_DISTRICTS = {
+    'Jalpaiguri': ['Alipurduar', 'Cooch Behar', 'Darjeeling', 'Jalpaiguri'],
+    'Malda': ['Dakshin Dinajpur', 'Maldah', 'Murshidabad', 'Uttar Dinajpur'],
+    'Burdwan': ['Bankura', 'Birbhum', 'Paschim Bardhaman', 'Purba Bardhaman', 'Purulia'],
+    'Medinipur': ['Hooghly', 'Howrah', 'Paschim Medinipur', 'Purba Medinipur'],
+    'Presidency': ['Kolkata', 'Nadia', 'North 24 Parganas', 'South 24 Parganas'],
+}
+
+# Party codes (AITC, BJP, INC, LEFT, Others, NWR codes) and their answer shares
+PARTY_CODES = [1, 2, 3, 4, 12, 44, 55, 66, 67, 77, 78, 88]
+PARTY_SHARES = [35, 30, 5, 6, 2, 2, 2, 1, 2, 1, 10, 4]
+
+# Single-choice party questions (2021 / 2024 / by-election vote, vote intention, second choice, wisdom of crowds)
+PARTY_QUESTION_PREFIXES = ('5. ', '6. ', '7. ', '8. ', '9. ', '19. ')
+
+# Multi-select option blocks (sources, second-choice reasons, AITC / BJP reasons, pressing issues)
+MULTI_SELECT_PREFIXES = ('4. ', '10. ', '11. ', '12. ', '13. ')
+
+# Single-choice answer codes (column prefix → (codes, shares or None for uniform))
+ANSWER_CODES = {
+    'Gender': ([1, 2, 3], [50, 49, 1]),
+    'Residential locality type': ([1, 2], [32, 68]),
+    '14. ': ([1, 2, 3, 4, 5], None),
+    '15. ': ([1, 2, 3, 4, 5], None),
+    '17. ': ([1, 2, 3, 4, 44, 99], [40, 30, 5, 5, 5, 15]),
+    '20. ': ([1, 2, 3], [70, 27, 3]),
+    '21. ': ([1, 2, 3, 4], [40, 25, 10, 25]),
+    '22. ': ([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 44, 48], None),
+    'Data Type': ([1, 2], [80, 20]),  # F2F / CATI
+}
+
+
+def _choice(rng, codes, shares, size):
+    """Random codes with the given relative shares (uniform if shares is None)"""
+    p = None if shares is None else np.asarray(shares, dtype=float) / np.sum(shares)
+    return rng.choice(codes, size, p=p)
+
+
+def generate_synthetic_survey(num_rows, days=45, end_date='2025-11-05', seed=0, schema_path=SCHEMA_PATH):
+    """
+    Generate a synthetic survey export
+
+    Args:
+        num_rows: Number of respondents
+        days: Number of survey days (Survey Date spread evenly over the days ending at end_date)
+        end_date: Last survey date ('YYYY-MM-DD')
+        seed: Random seed (same arguments → same data)
+        schema_path: Excel file whose header, variable-code row and example row define the columns
+
+    Returns:
+        Tuple (DataFrame of the answer rows, variable-code row as a one-row DataFrame)
+    """
+    rng = np.random.default_rng(seed)
+    schema = pd.read_excel(schema_path)
+    code_row = schema.iloc[[0]].reset_index(drop=True)
+    example = schema.iloc[1]
+
+    # Columns not generated below keep the example answer (same object repeated - no copy per row)
+    data = {}
+    for col in schema.columns:
+        value = example[col]
+        data[col] = np.full(num_rows, value, dtype=object if isinstance(value, str) else None)
+
+    survey_days = pd.date_range(end=pd.to_datetime(end_date), periods=days, freq='D')
+    day_index = rng.integers(0, days, num_rows)
+    data['Survey Date'] = survey_days.values[day_index]
+    data['Day No.'] = day_index + 1
+    data['Day'] = day_index + 1
+    data['Serial Number'] = np.arange(1, num_rows + 1)
+    data['server_id'] = np.arange(1, num_rows + 1) + 300000
+
+    # Region / District (district codes follow REGION_DISTRICTS order)
+    regions = list(REGION_DISTRICTS)
+    region_index = rng.integers(0, len(regions), num_rows)
+    district_names = np.empty(num_rows, dtype=object)
+    district_codes = np.zeros(num_rows, dtype=np.int64)
+    first_code = 1
+    for i, region in enumerate(regions):
+        rows = np.flatnonzero(region_index == i)
+        districts = REGION_DISTRICTS[region]
+        picked = rng.integers(0, len(districts), len(rows))
+        district_names[rows] = np.array(districts, dtype=object)[picked]
+        district_codes[rows] = first_code + picked
+        first_code += len(districts)
+    data['Region Name'] = np.array(regions, dtype=object)[region_index]
+    data['Region Code'] = region_index + 1
+    data['District Name'] = district_names
+    data['District Code'] = district_codes
+
+    data['Could you please tell me your age in complete years?'] = rng.integers(18, 80, num_rows)
+
+    for col in schema.columns:
+        name = str(col)
+        if name.startswith(PARTY_QUESTION_PREFIXES):
+            codes = _choice(rng, PARTY_CODES, PARTY_SHARES, num_rows).astype(np.float64)
+            codes[rng.random(num_rows) < 0.02] = np.nan  # Skipped question
+            data[col] = codes
+        elif name.startswith(MULTI_SELECT_PREFIXES):
+            # Option columns hold 0/1 - the "Others (specify)" text columns stay empty
+            if name.endswith(('.1', '(Please specify)')):
+                data[col] = np.full(num_rows, np.nan)
+            else:
+                data[col] = (rng.random(num_rows) < 0.25).astype(np.int64)
+        else:
+            for prefix, (codes, shares) in ANSWER_CODES.items():
+                if name.startswith(prefix):
+                    data[col] = _choice(rng, codes, shares, num_rows)
+                    break
+
+    # Weights - the L7D / L15D weights exist only for respondents of the last 7 / 15 days
+    last_day = survey_days[-1]
+    for col in schema.columns:
+        name = str(col)
+        if not name.startswith('Weight'):
+            continue
+        weights = rng.gamma(2.0, 0.5 if name.startswith('Weight Demographic') else 500.0, num_rows)
+        for suffix, window_days in ((' L7D', 7), (' L15D', 15)):
+            if name.endswith(suffix):
+                recent = data['Survey Date'] > (last_day - pd.Timedelta(days=window_days)).to_datetime64()
+                weights = np.where(recent, weights, np.nan)
+        data[col] = weights
+
+    return pd.DataFrame(data, columns=schema.columns), code_row
+
+
+def write_synthetic_export(output_path, num_rows, days=45, end_date='2025-11-05', seed=0,
+                           max_excel_rows=MAX_EXCEL_ROWS, cache_dir=None, cache_all=False):
+    """
+    Write a synthetic export as an Excel file the report generator can read
+
+    Exports larger than max_excel_rows are written with only the first max_excel_rows rows in
+    the Excel file, and the full data is stored in the columnar data cache under that file's
+    content hash - runs with the data cache enabled (the default) load all rows, --no-cache runs
+    would only see the preview
+
+    Args:
+        output_path: Excel path
+        num_rows: Number of respondents
+        days: Number of survey days
+        end_date: Last survey date
+        seed: Random seed
+        max_excel_rows: Largest export written to Excel in full
+        cache_dir: Data cache directory (default: see survey_data_cache.get_cache_dir)
+        cache_all: Also cache exports written to Excel in full (the first report run then reads
+                   the cache like every later run instead of parsing the Excel file)
+
+    Returns:
+        True if the Excel file holds every row, False if the full data is only in the data cache
+    """
+    df, code_row = generate_synthetic_survey(num_rows, days=days, end_date=end_date, seed=seed)
+    complete = num_rows <= max_excel_rows
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    # Variable-code row first, as in the real export (dropped on load - no valid Survey Date)
+    pd.concat([code_row, df if complete else df.head(max_excel_rows)], ignore_index=True).to_excel(
+        output_path, index=False
+    )
+
+    if not complete or cache_all:
+        cache_path = write_survey_cache(df, output_path, cache_dir=cache_dir)
+        if not complete:
+            print(f"Excel file holds the first {max_excel_rows:,} rows - all {num_rows:,} rows cached: {cache_path}")
+    return complete
+
+
+def main():
+    """Write a synthetic export"""
+    parser = argparse.ArgumentParser(description='Generate a synthetic survey export with the real column schema')
+    parser.add_argument('rows', type=int, help='Number of respondents')
+    parser.add_argument('output', help='Output Excel path')
+    parser.add_argument('--days', type=int, default=45, help='Number of survey days (default: %(default)s)')
+    parser.add_argument('--end', default='2025-11-05', help='Last survey date (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: %(default)s)')
+    parser.add_argument('--max-excel-rows', type=int, default=MAX_EXCEL_ROWS,
+                        help='Larger exports are written to the data cache, with a preview in Excel (default: %(default)s)')
+    args = parser.parse_args()
+
+    write_synthetic_export(args.output, args.rows, days=args.days, end_date=args.end, seed=args.seed,
+                           max_excel_rows=args.max_excel_rows)
+    print(f"✅ Synthetic export ({args.rows:,} rows, {args.days} days): {args.output}")
+
+
+if __name__ == "__main__":
+    main()
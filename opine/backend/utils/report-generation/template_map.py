@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Template Map Module
+Compiles the template PPT once into a per-slide map of the shapes the report binds to
+(chart and table shapes, the demographic named by the slide text, and the shapes / paragraph
+the "Base" sample size text update touches), cached as JSON keyed by the template's content
+hash. Report runs go straight to the bound shapes instead of scanning and regex-matching every
+shape and paragraph; a changed template hashes differently and is recompiled automatically
+"""
+
+import json
+import os
+import re
+
+from pptx import Presentation
+
+from survey_data_cache import compute_file_hash
+
+
+# Bump this whenever the compiled bindings change (new kinds, matching rules) so stale maps are ignored
+TEMPLATE_MAP_VERSION = 1
+
+# Keep only the most recent maps per map directory
+MAX_MAP_ENTRIES = 10
+
+# Environment override for the map location (defaults to <template dir>/.template_maps)
+MAP_DIR_ENV = 'REPORT_TEMPLATE_MAP_DIR'
+
+# Gains and Losses demographic slides label their base "Base of all eligible voters of 2021"
+GAINS_LOSSES_BASE_SLIDES = range(49, 62)
+
+# Demographic named by a slide's text (checked in this order, lowercase substrings)
+DEMOGRAPHIC_KEYWORDS = [
+    ('gender', 'Gender'),
+    ('location', 'Location'),
+    ('religion', 'Religion'),
+    ('social category', 'Social Category'),
+    ('age', 'Age'),
+]
+
+GAINS_LOSSES_BASE_PATTERN = r'(Base of all eligible voters of 2021\s*:?\s*)(\d{1,3}(?:,\d{3})*)'
+GAINS_LOSSES_BASE_NO_NUMBER_PATTERN = r'(Base of all eligible voters of 2021\s*:?\s*)(\d{1,3}(?:,\d{3})*)?'
+BASE_COLON_PATTERN = r'(Base\s*:\s*)(\d{1,3}(?:,\d{3})*)'
+BASE_PATTERNS = [
+    r'(Base\s*:?\s*)(\d{1,3}(?:,\d{3})*)',  # "Base: 12,345" or "Base 12,345"
+    r'(Base\s*:?\s*)(\d+)',  # "Base: 12345" or "Base 12345" (no commas)
+    r'(Base\s*:?\s*)(\d{1,3}(?:\s+\d{3})*)',  # "Base: 12 345" (space-separated) - text boxes only
+]
+
+
+def replace_base_text(text, sample_size, gains_losses=False, in_table=False):
+    """
+    Replace the sample size in a "Base" label paragraph
+
+    Args:
+        text: Paragraph text (all runs)
+        sample_size: Sample size to display
+        gains_losses: If True, use the Gains and Losses demographic label (slides 49-61)
+        in_table: If True, the paragraph is in a table cell (fewer patterns, no appending)
+
+    Returns:
+        New single-line paragraph text, or None if the paragraph has no Base label
+    """
+    if gains_losses:
+        if re.search(GAINS_LOSSES_BASE_PATTERN, text, re.IGNORECASE):
+            # Replace only the number, keeping the label text
+            new_text = re.sub(GAINS_LOSSES_BASE_PATTERN, lambda m: f'{m.group(1).strip()} {sample_size:,}',
+                              text, flags=re.IGNORECASE)
+        elif 'base of all eligible voters of 2021' in text.lower():
+            # Label without a number yet
+            new_text = re.sub(GAINS_LOSSES_BASE_NO_NUMBER_PATTERN,
+                              f'Base of all eligible voters of 2021 : {sample_size:,}', text, flags=re.IGNORECASE)
+        elif re.search(BASE_COLON_PATTERN, text, re.IGNORECASE):
+            # "Base: {number}" replaced with the full label
+            new_text = f"Base of all eligible voters of 2021 : {sample_size:,}"
+        else:
+            return None
+    else:
+        new_text = None
+        for pattern in BASE_PATTERNS[:2] if in_table else BASE_PATTERNS:
+            if re.search(pattern, text, re.IGNORECASE):
+                new_text = re.sub(pattern, lambda m: f'{m.group(1)}{sample_size:,}', text, flags=re.IGNORECASE)
+                break
+        if new_text is None:
+            if in_table or 'Base' not in text or re.search(r'\d', text):
+                return None
+            # "Base" without a number yet - append the sample size
+            if text.strip().endswith('Base') or text.strip().endswith('Base:'):
+                new_text = f"{text.strip()} {sample_size:,}"
+            else:
+                new_text = re.sub(r'Base\s*:?', f'Base: {sample_size:,}', text, flags=re.IGNORECASE)
+
+    # Remove all newlines and extra whitespace, ensure single line
+    return re.sub(r'\s+', ' ', new_text.replace('\n', ' ').replace('\r', ' ')).strip()
+
+
+def set_paragraph_text(paragraph, text):
+    """Replace a paragraph's runs with a single run holding text"""
+    paragraph.clear()
+    run = paragraph.add_run()
+    run.text = text
+
+
+def iter_base_text_candidates(shapes, path=()):
+    """
+    Walk shapes in the order the Base text update searches them
+
+    Args:
+        shapes: Slide or group shape collection
+        path: Shape path of the collection (tuple of (index, shape_id) from the slide)
+
+    Yields:
+        ('text_frame', path, shape) before a text frame's paragraphs are searched, then
+        ('paragraph', path, cell, paragraph_idx, paragraph, in_table) per candidate paragraph
+        (cell is (row, col) for table cells, None for text frames)
+    """
+    for index, shape in enumerate(shapes):
+        shape_path = path + ((index, shape.shape_id),)
+
+        # Text frame (accessing it adds an empty one to shapes without text)
+        if hasattr(shape, 'text_frame') and shape.text_frame:
+            yield ('text_frame', shape_path, shape)
+            for paragraph_idx, paragraph in enumerate(shape.text_frame.paragraphs):
+                yield ('paragraph', shape_path, None, paragraph_idx, paragraph, False)
+
+        # Table cells (only paragraphs with runs)
+        if hasattr(shape, 'has_table') and shape.has_table:
+            for row_idx, row in enumerate(shape.table.rows):
+                for col_idx, cell in enumerate(row.cells):
+                    for paragraph_idx, paragraph in enumerate(cell.text_frame.paragraphs):
+                        if paragraph.runs:
+                            yield ('paragraph', shape_path, (row_idx, col_idx), paragraph_idx, paragraph, True)
+
+        # Group shapes (recursive)
+        if hasattr(shape, 'shapes'):
+            yield from iter_base_text_candidates(shape.shapes, shape_path)
+
+
+def update_base_text(slide, sample_size, gains_losses=False):
+    """
+    Search a slide for its Base label and update the sample size (no template map needed)
+    Text frames passed on the way get word wrap disabled, keeping their text on one line
+
+    Args:
+        slide: Slide object
+        sample_size: Sample size to display
+        gains_losses: If True, use the Gains and Losses demographic label
+
+    Returns:
+        True if Base text was found and updated, False otherwise
+    """
+    for candidate in iter_base_text_candidates(slide.shapes):
+        if candidate[0] == 'text_frame':
+            try:
+                candidate[2].text_frame.word_wrap = False
+            except Exception:
+                pass
+            continue
+        _, _, _, _, paragraph, in_table = candidate
+        new_text = replace_base_text(''.join(run.text for run in paragraph.runs), sample_size,
+                                     gains_losses=gains_losses, in_table=in_table)
+        if new_text is not None:
+            set_paragraph_text(paragraph, new_text)
+            return True
+    return False
+
+
+def get_slide_demographic(slide):
+    """Get the demographic named by a slide's text shapes (None if none)"""
+    for shape in slide.shapes:
+        if hasattr(shape, 'text') and shape.text:
+            text = shape.text.lower()
+            for keyword, demographic_type in DEMOGRAPHIC_KEYWORDS:
+                if keyword in text:
+                    return demographic_type
+    return None
+
+
+def get_map_dir(template_path, map_dir=None):
+    """
+    Resolve the map directory for a template
+
+    Args:
+        template_path: Path to template PPT
+        map_dir: Explicit map directory (optional)
+
+    Returns:
+        Map directory path
+    """
+    if map_dir:
+        return map_dir
+    if os.environ.get(MAP_DIR_ENV):
+        return os.environ[MAP_DIR_ENV]
+    return os.path.join(os.path.dirname(os.path.abspath(template_path)), '.template_maps')
+
+
+def _prune_maps(map_dir, keep=MAX_MAP_ENTRIES):
+    """Remove old map files beyond the retention limit"""
+    try:
+        entries = [
+            os.path.join(map_dir, name) for name in os.listdir(map_dir)
+            if name.startswith('template_map_v') and name.endswith('.json')
+        ]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for stale_path in entries[keep:]:
+            os.remove(stale_path)
+    except OSError:
+        pass
+
+
+class TemplateMap:
+    """Per-slide shape bindings of one template (slide numbers are 1-based)"""
+
+    def __init__(self, template_hash, slides):
+        """
+        Args:
+            template_hash: Content hash of the template file
+            slides: Dictionary slide number → bindings (charts, tables, demographic, base_text)
+        """
+        self.template_hash = template_hash
+        self.slides = slides
+
+    @classmethod
+    def compile(cls, template_path, template_hash):
+        """
+        Compile the bindings of a template (parses its own copy - the Base text walk adds
+        empty text frames to the shapes it visits)
+
+        Args:
+            template_path: Path to template PPT
+            template_hash: Content hash of the template file
+
+        Returns:
+            TemplateMap
+        """
+        prs = Presentation(template_path)
+        slides = {}
+        for slide_idx, slide in enumerate(prs.slides):
+            slide_num = slide_idx + 1
+            charts = []
+            tables = []
+            for index, shape in enumerate(slide.shapes):
+                if getattr(shape, 'has_chart', False):
+                    charts.append([index, shape.shape_id])
+                if getattr(shape, 'has_table', False):
+                    tables.append([index, shape.shape_id])
+
+            # Text frames the Base text search passes, and the paragraph it updates
+            wrap_paths = []
+            base_text = None
+            gains_losses = slide_num in GAINS_LOSSES_BASE_SLIDES
+            for candidate in iter_base_text_candidates(slide.shapes):
+                if candidate[0] == 'text_frame':
+                    wrap_paths.append([list(step) for step in candidate[1]])
+                    continue
+                _, shape_path, cell, paragraph_idx, paragraph, in_table = candidate
+                text = ''.join(run.text for run in paragraph.runs)
+                if replace_base_text(text, 0, gains_losses=gains_losses, in_table=in_table) is not None:
+                    base_text = {
+                        'path': [list(step) for step in shape_path],
+                        'cell': list(cell) if cell else None,
+                        'paragraph': paragraph_idx,
+                        'in_table': in_table,
+                    }
+                    break
+
+            slides[slide_num] = {
+                'charts': charts,
+                'tables': tables,
+                'demographic': get_slide_demographic(slide),
+                'wrap_paths': wrap_paths,
+                'base_text': base_text,
+            }
+        return cls(template_hash, slides)
+
+    @classmethod
+    def load(cls, template_path, map_dir=None, use_cache=True):
+        """
+        Load the template's map from the cache, compiling (and caching) it when the template changed
+
+        Args:
+            template_path: Path to template PPT
+            map_dir: Map directory (default: <template dir>/.template_maps or $REPORT_TEMPLATE_MAP_DIR)
+            use_cache: If False, always compile and don't write the map
+
+        Returns:
+            TemplateMap
+        """
+        template_hash = compute_file_hash(template_path)
+        map_path = os.path.join(get_map_dir(template_path, map_dir),
+                                f"template_map_v{TEMPLATE_MAP_VERSION}_{template_hash}.json")
+
+        if use_cache and os.path.exists(map_path):
+            try:
+                with open(map_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                os.utime(map_path, None)  # Mark as recently used for pruning
+                return cls(template_hash, {int(slide_num): entry for slide_num, entry in data['slides'].items()})
+            except Exception as e:
+                print(f"Warning: Could not read template map ({e}), recompiling")
+
+        print(f"Compiling template map: {template_path}")
+        template_map = cls.compile(template_path, template_hash)
+
+        if use_cache:
+            try:
+                os.makedirs(os.path.dirname(map_path), exist_ok=True)
+                tmp_path = map_path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'template_hash': template_hash, 'slides': template_map.slides}, f)
+                os.replace(tmp_path, map_path)
+                _prune_maps(os.path.dirname(map_path))
+                print(f"Saved template map: {map_path}")
+            except Exception as e:
+                print(f"Warning: Could not write template map: {e}")
+
+        return template_map
+
+    @staticmethod
+    def _resolve_path(slide, path):
+        """Get the shape at a shape path (None if the slide no longer matches the template)"""
+        shapes = slide.shapes
+        shape = None
+        for index, shape_id in path:
+            try:
+                shape = shapes[index]
+            except IndexError:
+                return None
+            if shape.shape_id != shape_id:
+                return None
+            shapes = getattr(shape, 'shapes', None)
+        return shape
+
+    def get_shapes(self, slide, slide_num, kind):
+        """
+        Get the chart or table shapes of a slide
+
+        Args:
+            slide: Slide object (from a deck of this template)
+            slide_num: Slide number
+            kind: 'charts' or 'tables'
+
+        Returns:
+            List of shapes in slide order, or None if the slide is not in the map
+        """
+        entry = self.slides.get(slide_num)
+        if entry is None:
+            return None
+        shapes = []
+        for step in entry[kind]:
+            shape = self._resolve_path(slide, [step])
+            if shape is None:
+                return None
+            shapes.append(shape)
+        return shapes
+
+    def get_demographic(self, slide_num):
+        """Get the demographic named by a slide's text (None if none or not in the map)"""
+        entry = self.slides.get(slide_num)
+        return entry['demographic'] if entry else None
+
+    def update_base_text(self, slide, slide_num, sample_size, gains_losses=False):
+        """
+        Update the bound Base label paragraph of a slide (same shapes and paragraph as update_base_text)
+
+        Args:
+            slide: Slide object (from a deck of this template)
+            slide_num: Slide number
+            sample_size: Sample size to display
+            gains_losses: If True, use the Gains and Losses demographic label
+
+        Returns:
+            True / False like update_base_text, or None if the binding no longer applies (search instead)
+        """
+        entry = self.slides.get(slide_num)
+        if entry is None or gains_losses != (slide_num in GAINS_LOSSES_BASE_SLIDES):
+            return None
+
+        wrap_shapes = [self._resolve_path(slide, path) for path in entry['wrap_paths']]
+        if any(shape is None for shape in wrap_shapes):
+            return None
+
+        paragraph = None
+        target = entry['base_text']
+        if target is not None:
+            shape = self._resolve_path(slide, target['path'])
+            if shape is None:
+                return None
+            if target['cell'] is not None:
+                paragraphs = shape.table.cell(*target['cell']).text_frame.paragraphs
+            else:
+                paragraphs = shape.text_frame.paragraphs
+            if target['paragraph'] >= len(paragraphs):
+                return None
+            paragraph = paragraphs[target['paragraph']]
+            new_text = replace_base_text(''.join(run.text for run in paragraph.runs), sample_size,
+                                         gains_losses=gains_losses, in_table=target['in_table'])
+            if new_text is None:
+                return None
+
+        for shape in wrap_shapes:
+            try:
+                shape.text_frame.word_wrap = False
+            except Exception:
+                pass
+        if paragraph is None:
+            return False
+        set_paragraph_text(paragraph, new_text)
+        return True
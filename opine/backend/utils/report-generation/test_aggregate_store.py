@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Tests for the aggregate store: per-day hashes of successive daily exports (a new day, a changed
+day, a re-sorted export, the same export loaded from the data cache or from Excel) and per-day
+totals merged from the store matching a run without it (--no-aggregate-store), down to the deck
+
+Run: python3 -m pytest test_aggregate_store.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from pptx import Presentation
+
+from aggregate_store import AggregateStore, compute_day_hashes, compute_survey_key, STORE_DIR_ENV
+from generate_complete_report import CompleteReportGenerator
+from report_columns import is_report_column, REPORT_CATEGORY_COLUMNS
+from survey_data_cache import load_survey_data
+from synthetic_survey_data import generate_synthetic_survey
+from vote_share_calculator import VoteShareCalculator, DailyAggregateTable
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'template.pptx')
+
+VOTE_QUESTION = '8. If assembly elections (MLA) were to be held tomorrow, then which party would you vote for?'
+
+NUM_ROWS = 800
+NUM_DAYS = 10
+END_DATE = '2025-11-05'
+REFERENCE_DATE = '2025-11-06'
+
+
+def write_export(path, df, code_row):
+    """Write an export the way the survey platform does (variable-code row first)"""
+    pd.concat([code_row, df], ignore_index=True).to_excel(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(scope='module')
+def exports(tmp_path_factory):
+    """
+    Successive daily exports of one survey:
+    yesterday, today (yesterday + one more day), changed (today with an answer on an earlier day
+    corrected) and resorted (today's rows in another order)
+    """
+    export_dir = tmp_path_factory.mktemp('exports')
+    df, code_row = generate_synthetic_survey(NUM_ROWS, days=NUM_DAYS, end_date=END_DATE, seed=7)
+    df = df.sort_values('Survey Date', kind='stable').reset_index(drop=True)
+
+    last_day = df['Survey Date'].max()
+    yesterday = df[df['Survey Date'] < last_day]
+
+    changed = df.copy()
+    changed_row = int(np.flatnonzero(changed['Survey Date'] == changed['Survey Date'].min() + pd.Timedelta(days=3))[0])
+    changed.loc[changed_row, VOTE_QUESTION] = 2.0 if changed.loc[changed_row, VOTE_QUESTION] != 2.0 else 1.0
+
+    resorted = df.sample(frac=1.0, random_state=11)
+
+    return {
+        'yesterday': write_export(export_dir / 'yesterday.xlsx', yesterday, code_row),
+        'today': write_export(export_dir / 'today.xlsx', df, code_row),
+        'changed': write_export(export_dir / 'changed.xlsx', changed, code_row),
+        'resorted': write_export(export_dir / 'resorted.xlsx', resorted, code_row),
+        'changed_date': changed.loc[changed_row, 'Survey Date'],
+    }
+
+
+def load_export(excel_path, cache_dir=None):
+    """Load an export as the report generator does (report columns, names as categoricals)"""
+    return load_survey_data(excel_path, cache_dir=cache_dir, use_cache=cache_dir is not None,
+                            columns=is_report_column, category_columns=REPORT_CATEGORY_COLUMNS)
+
+
+@pytest.fixture(scope='module')
+def frames(exports):
+    """Every export parsed from Excel once (the calculator and tables never modify them)"""
+    return {name: load_export(exports[name]) for name in ('yesterday', 'today', 'changed', 'resorted')}
+
+
+def build_table(df, store=None):
+    """Daily aggregate table over the calculator's frame, as in CompleteReportGenerator.load_data"""
+    calculator = VoteShareCalculator(df)
+    return DailyAggregateTable(calculator, calculator.df, store=store)
+
+
+def day_hash_map(df):
+    """Survey Date → day hash of an export"""
+    table = build_table(df)
+    hashes = compute_day_hashes(table.df, table.day_codes, len(table.dates))
+    return dict(zip(pd.to_datetime(table.dates), hashes))
+
+
+def collect_totals(table):
+    """Per-day totals of the overall series, a demographic segment and every region / district"""
+    weight_columns = [col for col in table.df.columns if str(col).startswith('Weight')]
+    series = {'overall': table.get_series(weight_columns)}
+    gender = table.df['Gender'].to_numpy()
+    series['gender'] = table.get_series(weight_columns, segment=('Gender', 1), mask=gender == 1)
+    for group_column in ('Region Name', 'District Name'):
+        for value in table.df[group_column].dropna().unique():
+            series[(group_column, str(value))] = table.get_group_series(group_column, value, weight_columns)
+
+    totals = {}
+    for name, party_series in series.items():
+        totals[(name, 'records')] = party_series.daily_records
+        totals[(name, 'valid_votes')] = party_series.daily_valid_votes
+        for key in ('weights', 'squared_weights', 'weighted_records', 'weighted_valid_votes'):
+            for weight_column, prefix in party_series._prefix[key].items():
+                totals[(name, key, weight_column)] = np.diff(prefix, axis=0)
+    return totals
+
+
+def assert_same_totals(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key in expected:
+        # Reused days were summed in the stored run's row order - equal up to rounding
+        np.testing.assert_allclose(actual[key], expected[key], rtol=1e-12, atol=1e-9, err_msg=str(key))
+
+
+def test_day_hashes_ignore_row_order(frames):
+    assert day_hash_map(frames['resorted']) == day_hash_map(frames['today'])
+
+
+def test_day_hashes_same_for_cache_and_excel(exports, frames, tmp_path):
+    from_excel = day_hash_map(frames['today'])
+    cache_miss = day_hash_map(load_export(exports['today'], cache_dir=str(tmp_path)))
+    cache_hit = day_hash_map(load_export(exports['today'], cache_dir=str(tmp_path)))
+    assert cache_miss == from_excel
+    assert cache_hit == from_excel
+
+
+def test_day_hashes_ignore_dtypes(frames):
+    """Nullable integer codes, categorical / text names: the dtypes a cache hit and a parse can differ in"""
+    df = frames['today']
+    day_codes, dates = pd.factorize(df['Survey Date'], sort=True)
+    retyped = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_float_dtype(series.dtype) and (series.dropna() % 1 == 0).all():
+            retyped[col] = series.astype('Int64')
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            retyped[col] = series.astype(object)
+        elif pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype):
+            retyped[col] = series.astype('category')
+    assert any(str(dtype) == 'Int64' for dtype in retyped.dtypes)
+    expected = compute_day_hashes(df, day_codes, len(dates))
+    np.testing.assert_array_equal(compute_day_hashes(retyped, day_codes, len(dates)), expected)
+
+
+def test_day_hashes_new_day(frames):
+    yesterday = day_hash_map(frames['yesterday'])
+    today = day_hash_map(frames['today'])
+    assert len(today) == len(yesterday) + 1
+    assert all(today[date] == day_hash for date, day_hash in yesterday.items())
+
+
+def test_day_hashes_changed_day(exports, frames):
+    today = day_hash_map(frames['today'])
+    changed = day_hash_map(frames['changed'])
+    assert today.keys() == changed.keys()
+    assert [date for date in today if today[date] != changed[date]] == [exports['changed_date']]
+
+
+def test_store_matches_no_store(exports, frames, tmp_path):
+    """Each daily run re-aggregates only new / changed days and matches a run without the store"""
+    runs = [
+        # (export, loaded from the data cache, days re-aggregated per entry)
+        ('yesterday', False, NUM_DAYS - 1),  # Empty store: every day
+        ('today', False, 1),                 # New day
+        ('today', True, 0),                  # Same export from the data cache
+        ('resorted', False, 0),              # Same rows in another order
+        ('changed', False, 1),               # Corrected answer on an earlier day
+        ('today', False, 1),                 # Correction reverted
+    ]
+    cache_dir = str(tmp_path / 'data_cache')
+    load_export(exports['today'], cache_dir=cache_dir)
+
+    for name, from_cache, days_aggregated in runs:
+        df = load_export(exports[name], cache_dir=cache_dir) if from_cache else frames[name]
+        store = AggregateStore(compute_survey_key(df), store_dir=str(tmp_path / 'store'))
+        with_store = collect_totals(build_table(df, store=store))
+        without_store = collect_totals(build_table(df))
+
+        assert_same_totals(with_store, without_store)
+        num_days = len(np.unique(df['Survey Date']))
+        entries = (store.days_reused + store.days_aggregated) // num_days
+        assert entries > 0
+        assert store.days_aggregated == entries * days_aggregated, name
+
+
+def snapshot_deck(path):
+    """Chart values, table cells and text of every slide"""
+    shapes = []
+    for slide_num, slide in enumerate(Presentation(path).slides, 1):
+        for shape in slide.shapes:
+            if shape.has_table:
+                shapes.append((slide_num, [[cell.text for cell in row.cells] for row in shape.table.rows]))
+            elif getattr(shape, 'has_chart', False) and shape.has_chart:
+                shapes.append((slide_num, [(series.name, [None if value is None else round(value, 6)
+                                                          for value in series.values])
+                                           for plot in shape.chart.plots for series in plot.series]))
+            elif shape.has_text_frame:
+                shapes.append((slide_num, shape.text_frame.text))
+    return shapes
+
+
+def test_deck_matches_no_aggregate_store(exports, tmp_path, monkeypatch):
+    """A deck built from the store (after yesterday's run) equals a --no-aggregate-store deck"""
+    monkeypatch.setenv(STORE_DIR_ENV, str(tmp_path / 'store'))
+
+    def generate(excel_path, output_name, use_aggregate_store):
+        generator = CompleteReportGenerator(excel_path, TEMPLATE_PATH, reference_date=REFERENCE_DATE,
+                                            use_data_cache=False, use_aggregate_store=use_aggregate_store)
+        output_path = str(tmp_path / output_name)
+        generator.generate_complete_report(output_path)
+        return generator, output_path
+
+    generate(exports['yesterday'], 'yesterday.pptx', True)
+    generator, with_store = generate(exports['today'], 'with_store.pptx', True)
+    assert generator.aggregate_store.days_reused > 0
+    _, without_store = generate(exports['today'], 'without_store.pptx', False)
+
+    assert snapshot_deck(with_store) == snapshot_deck(without_store)
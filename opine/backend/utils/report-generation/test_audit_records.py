@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the structured audit records of a report run: every record carries a key that tells
+its number apart from every other number of the deck (slide, metric, segment, window, weights,
+party / item), and the calculations that are not party vote shares (gains / losses,
+transferability, top reasons / issues, opinion tables) are recorded too, and the text audit is
+rendered from those records
+
+Run: python3 -m pytest test_audit_records.py
+"""
+
+import os
+
+import pandas as pd
+import pytest
+from pptx import Presentation
+
+from audit_records import AUDIT_KEY_FIELDS, read_audit_records, write_audit_records, compare_audit_records
+from calculation_audit_trail import AUDIT_SLIDE_SECTIONS, render_audit_records
+from generate_complete_report import CompleteReportGenerator
+from synthetic_survey_data import generate_synthetic_survey
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'template.pptx')
+
+
+@pytest.fixture(scope='module')
+def audit(tmp_path_factory):
+    """Deck and audit records of a run over a synthetic export"""
+    work_dir = tmp_path_factory.mktemp('audit')
+    df, code_row = generate_synthetic_survey(1200, days=20, end_date='2025-11-05', seed=3)
+    excel_path = str(work_dir / 'export.xlsx')
+    pd.concat([code_row, df], ignore_index=True).to_excel(excel_path, index=False)
+
+    generator = CompleteReportGenerator(excel_path, TEMPLATE_PATH, reference_date='2025-11-06',
+                                        use_data_cache=False, use_aggregate_store=False, record_calculations=True)
+    deck_path = str(work_dir / 'report.pptx')
+    generator.generate_complete_report(deck_path)
+    records_path = write_audit_records(generator.calculator.calculation_records, str(work_dir / 'audit.jsonl'))
+    return {'deck': deck_path, 'records_path': records_path, 'rows': read_audit_records(records_path)}
+
+
+def test_every_record_has_a_key(audit):
+    rows = audit['rows']
+    assert len(rows) > 0
+    for field in ('slide', 'metric', 'source', 'party'):
+        assert rows[field].notna().all(), field
+
+    keys = rows[AUDIT_KEY_FIELDS].astype(object).where(rows[AUDIT_KEY_FIELDS].notna(), '')
+    duplicates = rows[keys.duplicated(keep=False)]
+    assert duplicates.empty, duplicates[AUDIT_KEY_FIELDS].head().to_string()
+
+
+def test_slide_5_metrics(audit):
+    """Raw, 7DMA and normalized vote shares of the same slide are told apart"""
+    rows = audit['rows']
+    slide_5 = rows[rows['slide'] == 5]
+    assert set(slide_5['metric']) == {'Vote Share Raw', 'Vote Share 7DMA', 'Vote Share Normalized'}
+    assert slide_5.loc[slide_5['metric'] == 'Vote Share Raw', 'weight_column'].isna().all()
+    assert slide_5.loc[slide_5['metric'] != 'Vote Share Raw', 'weight_column'].notna().all()
+
+
+def test_non_vote_share_calculations(audit):
+    rows = audit['rows']
+    metrics_by_slide = rows.groupby('slide')['metric'].agg(set)
+    expected = {
+        2: 'Sample',
+        44: 'Top Reasons (AITC)', 45: 'Top Reasons (AITC)',
+        47: 'Gains/Losses', 48: 'Gains/Losses', 49: 'Gains/Losses',
+        63: 'Vote Transferability', 64: 'Vote Transferability',
+        66: 'Preferred CM', 68: 'State Government Rating', 70: 'Top Issues', 72: 'Wisdom of Crowds',
+        74: 'Regional Vote Share',
+    }
+    for slide, metric in expected.items():
+        assert metric in metrics_by_slide.get(slide, set()), slide
+
+    gains_losses = rows[(rows['slide'] == 47)]
+    assert set(gains_losses['group']) == {f"2021={party}" for party in ('AITC', 'BJP', 'LEFT', 'INC', 'Others', 'NWR', 'Total')}
+
+    # Transferability diagonal cells are shown as "-", not recorded
+    transferability = rows[rows['slide'] == 63]
+    assert not (transferability['group'] == 'First choice=' + transferability['party']).any()
+
+
+def test_recorded_values_match_deck(audit):
+    """The top reasons chart of slide 45 draws the three largest recorded reason shares"""
+    rows = audit['rows']
+    reasons = rows[rows['slide'] == 45].sort_values('numerator', ascending=False).head(3)
+    chart = next(shape.chart for shape in Presentation(audit['deck']).slides[44].shapes
+                 if getattr(shape, 'has_chart', False) and shape.chart)
+    assert list(chart.plots[0].series[0].values) == [round(value, 1) for value in reasons['value']]
+
+
+def test_compare_same_run(audit):
+    assert compare_audit_records(audit['records_path'], audit['records_path']).empty
+
+
+def test_text_audit_lists_every_calculation(audit, tmp_path):
+    """The text audit is rendered from the records alone: each calculation once, under its slide section"""
+    with open(render_audit_records(audit['records_path'], str(tmp_path / 'audit.txt'))) as f:
+        text = f.read()
+    rows = audit['rows']
+    assert text.count('\n  #') == rows['seq'].nunique()
+    for _, _, title, _ in AUDIT_SLIDE_SECTIONS:
+        assert f"{title} - DETAILED CALCULATIONS" in text
+    assert 'OTHER SLIDES' not in text
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized party code mapping (PARTY_CODE_LOOKUP / categorize_party_codes), pinned
+to the per-value mapping the reports used before it (int() of the code, then the Q8 code frame)
+
+Run: python3 -m pytest test_vote_share_calculator.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from vote_share_calculator import VoteShareCalculator, PARTY_CATEGORIES, PARTY_CODE_LOOKUP
+
+
+BASELINE_PARTY_MAP = {1: 'AITC', 2: 'BJP', 3: 'INC', 4: 'LEFT'}
+
+
+def baseline_categorize_party(party_code):
+    """Frozen copy of the original VoteShareCalculator.categorize_party (do not edit)"""
+    if pd.isna(party_code):
+        return 'NWR'
+
+    try:
+        party_code = int(party_code)
+    except (ValueError, TypeError):
+        return 'NWR'
+
+    if party_code in BASELINE_PARTY_MAP:
+        return BASELINE_PARTY_MAP[party_code]
+    elif party_code == 12:
+        return 'Others'
+    elif party_code == 44:
+        return 'Others'
+    elif party_code in [55, 66, 67, 77, 78, 88]:
+        return 'NWR'
+    else:
+        return 'Others'
+
+
+# Every code of the questionnaire's frame, the codes around the lookup table's edges and beyond
+INT_CODES = list(range(-2, 102)) + [150, 999, 10 ** 6]
+
+# Numeric variants the export / data cache can hold for a code
+FLOAT_CODES = [float(code) for code in INT_CODES] + [1.4, 1.9, 2.5, 3.999, 44.5, 55.2, 87.9, 88.1, -0.5, 0.5]
+
+# Text variants: plain, padded and signed codes are read by int(); decimal text, blanks and words are not
+TEXT_CODES = (
+    [str(code) for code in INT_CODES]
+    + [' 1', '2 ', ' 44 ', '+3', '-1', '01', '0088', '1_2']
+    + ['1.0', '2.0', '44.0', '55.0', '88.0', '1.5', '1e0', '0x1']
+    + ['', ' ', 'nan', 'NaN', 'None', 'NA', 'AITC', 'BJP', 'Others', 'abc']
+)
+
+BLANK_CODES = [None, np.nan, pd.NA, pd.NaT, float('inf'), float('-inf')]
+
+
+@pytest.fixture(scope='module')
+def calculator():
+    df = pd.DataFrame({'Survey Date': pd.to_datetime(['2025-11-01']), 'Weight': [1.0]})
+    return VoteShareCalculator(df)
+
+
+def expected_category(code):
+    """Baseline category of a code (infinite codes, where int() raised OverflowError, are NWR)"""
+    if isinstance(code, float) and np.isinf(code):
+        return 'NWR'
+    return baseline_categorize_party(code)
+
+
+def assert_matches_baseline(calculator, codes):
+    """The vectorized mapping of a Series gives the baseline category of every value"""
+    actual = calculator.categorize_party_codes(codes)
+    assert list(actual.index) == list(codes.index)
+    expected = [expected_category(code) for code in codes.tolist()]
+    mismatches = [(code, got, want) for code, got, want in zip(codes.tolist(), actual.astype(str), expected)
+                  if got != want]
+    assert not mismatches
+
+
+def test_questionnaire_codes():
+    expected = {1: 'AITC', 2: 'BJP', 3: 'INC', 4: 'LEFT', 12: 'Others', 44: 'Others',
+                55: 'NWR', 66: 'NWR', 67: 'NWR', 77: 'NWR', 78: 'NWR', 88: 'NWR'}
+    for code, category in expected.items():
+        assert PARTY_CATEGORIES[PARTY_CODE_LOOKUP[code]] == category
+        assert baseline_categorize_party(code) == category
+
+
+def test_lookup_covers_code_space():
+    for code in range(len(PARTY_CODE_LOOKUP)):
+        assert PARTY_CATEGORIES[PARTY_CODE_LOOKUP[code]] == baseline_categorize_party(code)
+
+
+@pytest.mark.parametrize('dtype', ['int64', 'Int64', 'object'])
+def test_int_codes(calculator, dtype):
+    assert_matches_baseline(calculator, pd.Series(INT_CODES, dtype=dtype))
+
+
+@pytest.mark.parametrize('dtype', ['float64', 'object'])
+def test_float_codes(calculator, dtype):
+    assert_matches_baseline(calculator, pd.Series(FLOAT_CODES, dtype=dtype))
+
+
+@pytest.mark.parametrize('dtype', ['object', 'str'])
+def test_text_codes(calculator, dtype):
+    assert_matches_baseline(calculator, pd.Series(TEXT_CODES, dtype=dtype))
+
+
+def test_blank_codes(calculator):
+    assert_matches_baseline(calculator, pd.Series(BLANK_CODES, dtype='object'))
+    assert_matches_baseline(calculator, pd.Series([np.nan, 1.0, np.nan], dtype='float64'))
+    assert_matches_baseline(calculator, pd.Series([pd.NA, 2, pd.NA], dtype='Int8'))
+
+
+def test_mixed_export_column(calculator):
+    """A column mixing numbers, numeric text and blanks, as read from a hand-edited export"""
+    codes = pd.Series([1, 2.0, '3', '4.0', None, ' 55 ', 88, 'abc', 44.9, '', True, False],
+                      index=range(100, 112), dtype='object')
+    assert_matches_baseline(calculator, codes)
+
+
+def test_precomputed_column_matches_baseline():
+    """The party category column added at construction maps the vote question like the baseline"""
+    vote_question = '8. If assembly elections (MLA) were to be held tomorrow, then which party would you vote for?'
+    codes = INT_CODES[:60] + TEXT_CODES[:40]
+    df = pd.DataFrame({
+        'Survey Date': pd.to_datetime('2025-11-01') + pd.to_timedelta(np.arange(len(codes)) % 5, unit='D'),
+        vote_question: pd.Series(codes, dtype='object'),
+    })
+    calculator = VoteShareCalculator(df)
+    categories = calculator.get_party_categories(calculator.df)
+    expected = calculator.df[vote_question].map(baseline_categorize_party)
+    assert categories.astype(str).tolist() == expected.tolist()
+    assert 'Party Category - Q8' not in df.columns
@@ -6,20 +6,101 @@ Implements calculations for normalized vote shares using weights
 
 import pandas as pd
 import numpy as np
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
+from aggregate_store import compute_day_hashes
+from data_window import DataWindow
+from result_cache import ResultCache
+
+
+# Standard party categories (order used by all vote share tables/charts)
+PARTY_CATEGORIES = ['AITC', 'BJP', 'LEFT', 'INC', 'Others', 'NWR']
+
+
+def _build_party_code_lookup():
+    """
+    Build lookup table over the party code space (index = party code, value = category index)
+    Same mapping as categorize_party: 1-4 main parties, 12/44 Others, 55-88 non-response → NWR,
+    any other code → Others
+    """
+    lookup = np.full(100, PARTY_CATEGORIES.index('Others'), dtype=np.int8)
+    lookup[1] = PARTY_CATEGORIES.index('AITC')
+    lookup[2] = PARTY_CATEGORIES.index('BJP')
+    lookup[3] = PARTY_CATEGORIES.index('INC')
+    lookup[4] = PARTY_CATEGORIES.index('LEFT')
+    lookup[[12, 44]] = PARTY_CATEGORIES.index('Others')
+    lookup[[55, 66, 67, 77, 78, 88]] = PARTY_CATEGORIES.index('NWR')
+    return lookup
+
+
+PARTY_CODE_LOOKUP = _build_party_code_lookup()
+
+
+def _parse_party_code(code):
+    """
+    Read a text party code the way categorize_party does (int(), so '1' → 1 but '1.0' is not a
+    code); other values are left for pd.to_numeric
+
+    Returns:
+        Party code as a float, NaN if int() can't read it
+    """
+    if isinstance(code, str):
+        try:
+            return float(int(code))
+        except ValueError:
+            return np.nan
+    return code
+
+# Party questions sharing the Q8 code frame, with their precomputed category column names
+PARTY_QUESTION_PREFIXES = {
+    '5. ': 'Party Category - Q5',    # 2021 AE vote
+    '8. ': 'Party Category - Q8',    # Current vote intention
+    '9. ': 'Party Category - Q9',    # Second choice
+    '19. ': 'Party Category - Q19',  # Wisdom of crowds
+}
+
+# Named report windows → number of days ending the day before the reference date
+# (None: every record up to and including the reference date)
+NAMED_WINDOW_DAYS = {
+    'Overall': None,
+    'L7D': 7,
+    'L15D': 15,
+    'L30D': 30,
+}
+
 
 class VoteShareCalculator:
     """Calculate vote shares with normalization using weights"""
     
-    def __init__(self, df):
+    def __init__(self, df, sort_by_date=True, dataset_token=None):
         """
         Initialize calculator with dataframe
         
         Args:
-            df: DataFrame with survey data including weights
+            df: DataFrame with survey data including weights (not modified - the calculator adds the
+                party category columns to a shallow copy without copying the data; use calculator.df after)
+            sort_by_date: If True, sort the rows by Survey Date (date windows become contiguous
+                          row ranges); if False, keep the export row order
+            dataset_token: Stable identity of the data (e.g. the survey file's content hash) that
+                           cached results are keyed on - a new unique token if None
         """
-        self.df = df.copy()
+        # Survey Date parsed and rows sorted by it once, so every date window (cumulative, N-DMA,
+        # arbitrary range) is one contiguous row range found by binary search over the dates
+        df = df.copy(deep=False)
+        if 'Survey Date' in df.columns:
+            if not pd.api.types.is_datetime64_any_dtype(df['Survey Date']):
+                df['Survey Date'] = pd.to_datetime(df['Survey Date'], errors='coerce')
+            if sort_by_date and not df['Survey Date'].is_monotonic_increasing:
+                df = df.sort_values('Survey Date', kind='stable', na_position='last')
+        self.df = df
+        
+        # Read-only row-position view of df (date windows resolved by binary search, no copies)
+        self.data_window = DataWindow(self.df, token=dataset_token)
+        self._named_windows = {}  # (name, reference date) → DataWindow
+        
+        # Results of vote share / party totals calculations over windows of df (reused by later calls)
+        self.result_cache = ResultCache()
         
         # Party code mapping (from Questionnaire Q8)
         # Correct mapping per questionnaire:
@@ -37,6 +118,218 @@ class VoteShareCalculator:
         
         # Question column for vote share
         self.vote_question = '8. If assembly elections (MLA) were to be held tomorrow, then which party would you vote for?'
+        
+        # Precompute party category columns once per dataset (reused by every calculation)
+        self.party_category_columns = {}
+        self.add_party_category_columns(self.df)
+        
+        # Calculation records (intermediate results for the audit trail) - off unless requested
+        self.record_calculations = False
+        self.calculation_records = []
+        self._calculation_context = {}
+        self._nested_context = {}
+        
+        # Margins of error / confidence intervals (ShareUncertainty) attached to every vote share
+        # as vote_shares['uncertainty'] - off (None) unless requested
+        self.uncertainty = None
+    
+    def set_calculation_context(self, **labels):
+        """
+        Set the labels attached to calculations recorded from now on (replaces the previous labels)
+        
+        Args:
+            **labels: e.g. slide=6, metric='Overall Normalized', segment='Gender=Male'
+        """
+        self._calculation_context = {key: value for key, value in labels.items() if value is not None}
+    
+    @contextmanager
+    def calculation_context(self, **labels):
+        """
+        Temporarily add labels to calculations recorded inside the with block
+        
+        Args:
+            **labels: Extra labels (e.g. segment='Region=Malda')
+        """
+        previous = self._nested_context
+        self._nested_context = {**previous, **{key: value for key, value in labels.items() if value is not None}}
+        try:
+            yield
+        finally:
+            self._nested_context = previous
+    
+    def _record_calculation(self, source, weight_column, weighted_records_only, counts, party_weights,
+                            vote_shares, window=None, group=None):
+        """
+        Record the intermediate results of one vote share calculation
+        
+        Args:
+            source: 'rows' (filtered DataFrame), 'daily_window' (prefix sums) or 'totals' (party totals cube)
+            weight_column: Weight column used (None for raw counts)
+            weighted_records_only: True if only records with a valid weight were used
+            counts: Dictionary with 'rows', 'valid_votes', 'weighted_records'
+            party_weights: Array of weight totals per party (PARTY_CATEGORIES order)
+            vote_shares: Resulting vote share dictionary
+            window: Survey Date range as (first, last) (optional)
+            group: Group label for breakdowns (optional)
+        """
+        record = self._new_record(window, group)
+        record.update({
+            'source': source,
+            'weight_column': weight_column,
+            'weighted_records_only': bool(weighted_records_only),
+            'rows': int(counts['rows']),
+            'valid_votes': int(counts['valid_votes']),
+            'weighted_records': int(counts['weighted_records']),
+            'total_weight': float(np.sum(party_weights)),
+            'party_weights': {party: float(party_weights[idx]) for idx, party in enumerate(PARTY_CATEGORIES)},
+            'sample': int(vote_shares.get('sample', 0)),
+            'vote_shares': {party: float(vote_shares.get(party, 0)) for party in PARTY_CATEGORIES},
+        })
+        if vote_shares.get('uncertainty') is not None:
+            record['uncertainty'] = vote_shares['uncertainty']
+        self.calculation_records.append(record)
+    
+    def record_item_shares(self, source, weight_column, item_weights, total_weight, shares, sample, rows,
+                           data_filtered=None, group=None):
+        """
+        Record the intermediate results of a share calculation that is not a party vote share
+        (gains / losses and transferability rows, top reasons / issues, opinion questions).
+        Items take the place of parties in the record; nothing is recorded unless
+        record_calculations is on
+        
+        Args:
+            source: 'crosstab' (row of a contingency table), 'multi_select' (multi-select options),
+                    'options' (single-choice answers) or 'counts' (sample counts)
+            weight_column: Weight column used (None for raw counts)
+            item_weights: Dictionary item label → weight total (numerator)
+            total_weight: Weight total the shares are relative to (denominator)
+            shares: Dictionary item label → share (percentage)
+            sample: Sample size reported with the shares
+            rows: Records the calculation used
+            data_filtered: Filtered DataFrame / DataWindow used (for the Survey Date range, optional)
+            group: Group label (e.g. '2021=AITC' for a row of the gains / losses table)
+        """
+        if not self.record_calculations:
+            return
+        record = self._new_record(self._get_date_range(data_filtered), group)
+        record.update({
+            'source': source,
+            'weight_column': weight_column,
+            'weighted_records_only': weight_column is not None,
+            'rows': int(rows),
+            'valid_votes': int(sample),
+            'weighted_records': int(rows),
+            'total_weight': float(total_weight),
+            'party_weights': {str(item): float(weight) for item, weight in item_weights.items()},
+            'sample': int(sample),
+            'vote_shares': {str(item): float(shares.get(item, 0)) for item in item_weights},
+        })
+        self.calculation_records.append(record)
+    
+    def _new_record(self, window, group):
+        """Start a calculation record: sequence number, context labels, group and date window"""
+        record = {'seq': len(self.calculation_records) + 1}
+        record.update(self._calculation_context)
+        record.update(self._nested_context)
+        if group is not None:
+            record['group'] = group
+        if window is not None and window[0] is not None:
+            record['window_start'] = pd.Timestamp(window[0]).strftime('%Y-%m-%d')
+            record['window_end'] = pd.Timestamp(window[1]).strftime('%Y-%m-%d')
+        return record
+    
+    @staticmethod
+    def _get_date_range(data_filtered):
+        """First and last Survey Date of filtered rows (None if there are none)"""
+        if data_filtered is None or 'Survey Date' not in data_filtered.columns:
+            return None
+        survey_dates = data_filtered['Survey Date']
+        return (survey_dates.min(), survey_dates.max()) if survey_dates.notna().any() else None
+    
+    def add_calculation_records(self, records, relabel=False):
+        """
+        Append calculation records made by another calculator (e.g. in a worker process)
+        Records keep their context labels and are renumbered to follow this calculator's records
+        
+        Args:
+            records: List of calculation record dictionaries
+            relabel: If True, the records take the current calculation context labels (e.g. a
+                     result computed once for an earlier slide and drawn again on this one)
+        """
+        context = self._calculation_context if relabel else {}
+        for record in records:
+            self.calculation_records.append({**record, **context, 'seq': len(self.calculation_records) + 1})
+    
+    def add_party_category_columns(self, df):
+        """
+        Add precomputed party category columns (categorical, int8 codes) for the party questions
+        DataFrames filtered from df carry these columns, so no per-call categorization is needed
+        
+        Args:
+            df: DataFrame to add columns to (modified in place - the constructor passes its own
+                shallow copy, never the caller's frame)
+        
+        Returns:
+            Dictionary mapping question column → category column
+        """
+        for question in df.columns:
+            question_str = str(question)
+            for prefix, category_column in PARTY_QUESTION_PREFIXES.items():
+                if question_str.startswith(prefix):
+                    if category_column not in df.columns:
+                        df[category_column] = self.categorize_party_codes(df[question])
+                    self.party_category_columns[question] = category_column
+                    break
+        return self.party_category_columns
+    
+    def categorize_party_codes(self, codes):
+        """
+        Vectorized categorize_party using the party code lookup table
+        
+        Args:
+            codes: Series of party codes from survey
+        
+        Returns:
+            Categorical Series of party categories (same index as codes)
+        """
+        if not pd.api.types.is_numeric_dtype(codes.dtype):
+            codes = codes.map(_parse_party_code)
+        numeric = pd.to_numeric(codes, errors='coerce')
+        values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        # Missing / non-numeric / non-finite codes → NWR; codes outside the table → Others
+        category_codes = np.full(len(values), PARTY_CATEGORIES.index('NWR'), dtype=np.int8)
+        valid = np.isfinite(values)
+        int_codes = np.trunc(values[valid])
+        in_table = (int_codes >= 0) & (int_codes < len(PARTY_CODE_LOOKUP))
+        valid_codes = np.full(len(int_codes), PARTY_CATEGORIES.index('Others'), dtype=np.int8)
+        valid_codes[in_table] = PARTY_CODE_LOOKUP[int_codes[in_table].astype(np.int64)]
+        category_codes[valid] = valid_codes
+        
+        return pd.Series(
+            pd.Categorical.from_codes(category_codes, categories=PARTY_CATEGORIES),
+            index=codes.index
+        )
+    
+    def get_party_categories(self, data, question=None):
+        """
+        Get party categories for a question, using the precomputed column when available
+        
+        Args:
+            data: DataFrame (full or filtered)
+            question: Party question column (default: Q8 vote question)
+        
+        Returns:
+            Categorical Series of party categories aligned with data
+        """
+        if question is None:
+            question = self.vote_question
+        
+        category_column = self.party_category_columns.get(question)
+        if category_column and category_column in data.columns:
+            return data[category_column]
+        
+        return self.categorize_party_codes(data[question])
     
     def filter_by_date_range(self, days=None, exclude_latest=False, reference_date=None):
         """
@@ -48,16 +341,41 @@ class VoteShareCalculator:
             reference_date: Reference date for calculation (default: current date, or latest data date if None)
         
         Returns:
-            Filtered DataFrame
+            Filtered DataFrame (a copy - use get_date_window for a read-only view)
         """
         if 'Survey Date' not in self.df.columns:
             return self.df
         
-        self.df['Survey Date'] = pd.to_datetime(self.df['Survey Date'], errors='coerce')
+        return self.get_date_window(days=days, reference_date=reference_date).to_frame()
+    
+    def get_date_window(self, days=None, reference_date=None):
+        """
+        Date range as a read-only DataWindow over the data (same rows as filter_by_date_range, no copy)
         
+        Args:
+            days: Number of days from reference date (None for overall)
+            reference_date: Reference date for calculation (default: latest data date if None)
+        
+        Returns:
+            DataWindow
+        """
         if days is None:
-            return self.df[self.df['Survey Date'].notna()].copy()
+            return self.data_window.between()
+        
+        # Rows in this date range (binary search over the date index)
+        return self.data_window.between(*self.get_window_bounds(days, reference_date))
+    
+    def get_window_bounds(self, days, reference_date=None):
+        """
+        Get the first and last survey date of an N-day window
+        
+        Args:
+            days: Number of days in the window
+            reference_date: Reference date for calculation (default: latest data date if None)
         
+        Returns:
+            Tuple (cutoff_date, end_date), both included
+        """
         # Use reference date (current date when report is generated) or latest data date
         if reference_date is None:
             # Default to latest date in data if no reference date provided
@@ -80,11 +398,31 @@ class VoteShareCalculator:
         end_date = reference_date - timedelta(days=1)
         cutoff_date = end_date - timedelta(days=days-1)  # (days-1) days before end_date
         
-        # Filter data for this date range
-        return self.df[
-            (self.df['Survey Date'] >= cutoff_date) & 
-            (self.df['Survey Date'] <= end_date)
-        ].copy()
+        return cutoff_date, end_date
+    
+    def get_named_window(self, name, reference_date=None):
+        """
+        Get a named report window (memoized per reference date)
+        
+        Args:
+            name: 'Overall' (all records up to and including reference_date) or 'L7D' / 'L15D' / 'L30D'
+                  (N days ending one day before reference_date)
+            reference_date: Reference date for calculation (default: latest data date if None)
+        
+        Returns:
+            DataWindow
+        """
+        if name not in NAMED_WINDOW_DAYS:
+            raise ValueError(f"Unknown window: {name} (expected one of {', '.join(NAMED_WINDOW_DAYS)})")
+        
+        key = (name, None if reference_date is None else pd.Timestamp(reference_date))
+        if key not in self._named_windows:
+            days = NAMED_WINDOW_DAYS[name]
+            if days is None:
+                self._named_windows[key] = self.data_window.between(end=key[1])
+            else:
+                self._named_windows[key] = self.data_window.between(*self.get_window_bounds(days, reference_date))
+        return self._named_windows[key]
     
     def categorize_party(self, party_code):
         """
@@ -151,46 +489,348 @@ class VoteShareCalculator:
         if self.vote_question not in data_filtered.columns:
             return {'sample': 0, 'AITC': 0, 'BJP': 0, 'LEFT': 0, 'INC': 0, 'Others': 0, 'NWR': 0}
         
-        vote_data = data_filtered[[self.vote_question]].copy()
+        # Same rows and weight column as an earlier call → its result (and audit record) is reused
+        cache_key = self.result_cache.make_key('vote_share', data_filtered, weight_column,
+                                               extra=(bool(self.record_calculations), self.uncertainty is not None))
+        cached = self.result_cache.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            vote_shares, record_args = cached
+            if record_args is not None:
+                self._record_calculation(*record_args)
+            return dict(vote_shares)
         
-        # Categorize parties
-        vote_data['party_category'] = vote_data[self.vote_question].apply(self.categorize_party)
+        # Weighted party totals in a single pass (no group keys)
+        totals = self._aggregate_party_totals(data_filtered, None, 1, [weight_column] if weight_column else [])
         
-        # Add weights
-        if weight_column and weight_column in data_filtered.columns:
-            vote_data = vote_data.reset_index(drop=True)
-            weights = data_filtered[weight_column].reset_index(drop=True)
-            
-            # Convert weights to numeric, filtering out non-numeric values
-            vote_data['weight'] = pd.to_numeric(weights, errors='coerce')
-            
+        if weight_column:
             # Sample size: count all records with valid votes (from original filtered data)
             # This matches the final PPT which counts all valid votes, not just those with valid weights
-            sample_size = len(data_filtered[data_filtered[self.vote_question].notna()].copy())
-            
-            # Filter out rows with invalid weights (NaN or non-numeric) for calculation
-            vote_data = vote_data[vote_data['weight'].notna()].copy()
+            sample_size = int(totals['valid_votes'][0].sum())
+            party_weights = totals['weights'][0][0]
+            squared_weights = totals['squared_weights'][0][0]
+            weighted_records = totals['weighted_records'][0][0].sum()
         else:
-            vote_data['weight'] = 1.0
-            # Sample size: count all records with valid votes
-            sample_size = len(vote_data)
+            # Raw vote share: every record counts once (weight 1)
+            sample_size = int(totals['records'][0].sum())
+            party_weights = totals['records'][0].astype(np.float64)
+            squared_weights = party_weights
+            weighted_records = totals['records'][0].sum()
         
-        total_weight = vote_data['weight'].sum()
+        vote_shares = self._vote_shares_from_party_weights(party_weights, sample_size)
+        self._add_uncertainty(vote_shares, party_weights, squared_weights, weighted_records)
+        
+        record_args = None
+        if self.record_calculations:
+            record_args = (
+                'rows', weight_column, False,
+                {
+                    'rows': len(data_filtered),
+                    'valid_votes': totals['valid_votes'][0].sum(),
+                    'weighted_records': totals['weighted_records'][0][0].sum() if weight_column else len(data_filtered),
+                },
+                party_weights, dict(vote_shares), self._get_date_range(data_filtered)
+            )
+            self._record_calculation(*record_args)
+        
+        if cache_key is not None:
+            self.result_cache.put(cache_key, (dict(vote_shares), record_args))
+        return vote_shares
+    
+    def _vote_shares_from_party_weights(self, party_weights, sample_size):
+        """
+        Convert per-party weight totals (PARTY_CATEGORIES order) into a vote share dictionary
+        
+        Args:
+            party_weights: Array of weight totals per party
+            sample_size: Sample size to report
+        
+        Returns:
+            Dictionary with party vote shares and sample size
+        """
+        total_weight = party_weights.sum()
         
         if total_weight == 0:
             return {'sample': sample_size, 'AITC': 0, 'BJP': 0, 'LEFT': 0, 'INC': 0, 'Others': 0, 'NWR': 0}
         
         # Calculate weighted vote share for each party
         vote_shares = {}
-        for party in ['AITC', 'BJP', 'LEFT', 'INC', 'Others', 'NWR']:
-            party_mask = vote_data['party_category'] == party
-            party_weight = vote_data.loc[party_mask, 'weight'].sum()
-            vote_shares[party] = (party_weight / total_weight) * 100
+        for party_idx, party in enumerate(PARTY_CATEGORIES):
+            vote_shares[party] = (party_weights[party_idx] / total_weight) * 100
         
         vote_shares['sample'] = sample_size
         
         return vote_shares
     
+    def _add_uncertainty(self, vote_shares, party_weights, squared_weights, weighted_records):
+        """
+        Attach margins of error and confidence intervals to a vote share dictionary (if enabled)
+        
+        Args:
+            vote_shares: Vote share dictionary (modified in place)
+            party_weights: Array of weight totals per party
+            squared_weights: Array of squared weight totals per party (party_weights for raw counts)
+            weighted_records: Number of records the weight totals were built from
+        """
+        if self.uncertainty is None:
+            return
+        uncertainty = self.uncertainty.estimate(party_weights, squared_weights, int(weighted_records))
+        if uncertainty is not None:
+            vote_shares['uncertainty'] = uncertainty
+    
+    def _aggregate_party_totals(self, data_filtered, group_codes, num_groups, weight_columns):
+        """
+        Single-pass aggregation kernel: bincount over (group, party) cells
+        
+        Args:
+            data_filtered: Filtered DataFrame
+            group_codes: Array of group index per row (-1 = excluded), None for one group
+            num_groups: Number of groups
+            weight_columns: List of weight columns present in data_filtered
+        
+        Returns:
+            Dictionary of arrays shaped (num_groups, parties):
+            'records', 'valid_votes', and per weight column 'weights' / 'squared_weights' (for the
+            design effect) / 'weighted_records' / 'weighted_valid_votes' (valid votes among records
+            with a valid weight)
+        """
+        num_parties = len(PARTY_CATEGORIES)
+        num_rows = len(data_filtered)
+        
+        if self.vote_question in data_filtered.columns:
+            party_codes = self.get_party_categories(data_filtered).cat.codes.to_numpy(dtype=np.int64)
+            valid_votes = data_filtered[self.vote_question].notna().to_numpy()
+        else:
+            party_codes = np.full(num_rows, PARTY_CATEGORIES.index('NWR'), dtype=np.int64)
+            valid_votes = np.zeros(num_rows, dtype=bool)
+        
+        if group_codes is None:
+            cell_index = party_codes
+        else:
+            included = group_codes >= 0
+            cell_index = np.where(included, group_codes * num_parties + party_codes, -1)
+        
+        in_cells = cell_index >= 0
+        cell_index = cell_index[in_cells]
+        num_cells = num_groups * num_parties
+        
+        def cell_totals(values=None):
+            totals = np.bincount(cell_index, weights=values, minlength=num_cells)
+            return totals.reshape(num_groups, num_parties)
+        
+        totals = {
+            'records': cell_totals().astype(np.int64),
+            'valid_votes': cell_totals(valid_votes[in_cells].astype(np.float64)).astype(np.int64),
+            'weights': [],
+            'squared_weights': [],
+            'weighted_records': [],
+            'weighted_valid_votes': [],
+        }
+        
+        for weight_column in weight_columns:
+            weights = pd.to_numeric(data_filtered[weight_column], errors='coerce').to_numpy(dtype=np.float64)[in_cells]
+            has_weight = ~np.isnan(weights)
+            valid_weights = np.where(has_weight, weights, 0.0)
+            totals['weights'].append(cell_totals(valid_weights))
+            totals['squared_weights'].append(cell_totals(valid_weights * valid_weights))
+            totals['weighted_records'].append(cell_totals(has_weight.astype(np.float64)).astype(np.int64))
+            totals['weighted_valid_votes'].append(
+                cell_totals((has_weight & valid_votes[in_cells]).astype(np.float64)).astype(np.int64)
+            )
+        
+        return totals
+    
+    def calculate_party_crosstab(self, data_filtered, row_question, column_question, weight_column=None,
+                                 group_codes=None, num_groups=1):
+        """
+        Weighted contingency table of two party questions (e.g. 2021 vote × 2025 vote) in one
+        bincount pass over a combined (group, row party, column party) index
+        
+        Args:
+            data_filtered: Filtered DataFrame or DataWindow
+            row_question: Party question of the table rows (e.g. Q5 2021 vote)
+            column_question: Party question of the table columns (e.g. Q8 2025 vote)
+            weight_column: Weight column (records without a valid weight are excluded); None or a
+                           column missing from the data counts every record with weight 1
+            group_codes: Array of group index per row (-1 = excluded), None for one group
+            num_groups: Number of groups
+        
+        Returns:
+            Dictionary of arrays shaped (num_groups, parties, parties), rows and columns in
+            PARTY_CATEGORIES order: 'weights' (sum of weights per cell) and 'records' (records per cell)
+        """
+        num_parties = len(PARTY_CATEGORIES)
+        row_codes = self.get_party_categories(data_filtered, row_question).cat.codes.to_numpy(dtype=np.int64)
+        column_codes = self.get_party_categories(data_filtered, column_question).cat.codes.to_numpy(dtype=np.int64)
+        
+        if weight_column is not None and weight_column in data_filtered.columns:
+            weights = pd.to_numeric(data_filtered[weight_column], errors='coerce').to_numpy(dtype=np.float64)
+            included = ~np.isnan(weights)
+        else:
+            weights = np.ones(len(row_codes), dtype=np.float64)
+            included = np.ones(len(row_codes), dtype=bool)
+        
+        cell_index = row_codes * num_parties + column_codes
+        if group_codes is not None:
+            included &= group_codes >= 0
+            cell_index = group_codes * (num_parties * num_parties) + cell_index
+        cell_index = cell_index[included]
+        
+        shape = (num_groups, num_parties, num_parties)
+        num_cells = num_groups * num_parties * num_parties
+        return {
+            'weights': np.bincount(cell_index, weights=weights[included], minlength=num_cells).reshape(shape),
+            'records': np.bincount(cell_index, minlength=num_cells).reshape(shape),
+        }
+    
+    def calculate_party_totals(self, data_filtered, group_columns=None, weight_columns=None):
+        """
+        Breakdown engine: weighted party totals for any set of grouping keys in one pass
+        
+        Args:
+            data_filtered: Filtered DataFrame
+            group_columns: List of grouping columns (e.g. ['Region Name'], ['Gender', 'Survey Date'])
+                           None or [] for a single overall group
+            weight_columns: List of weight columns to total (None for raw counts only)
+        
+        Returns:
+            Tidy DataFrame (cube) with one row per (group keys..., party, weight_column):
+            - weight: Sum of valid weights (raw record count if weight_column is None)
+            - squared_weight: Sum of squared valid weights (for the design effect)
+            - weighted_records: Records with a valid weight
+            - records: All records in the cell
+            - valid_votes: Records with a non-empty vote response
+            Rows with a missing grouping value are excluded
+        """
+        group_columns = list(group_columns or [])
+        weight_columns = [col for col in dict.fromkeys(weight_columns or []) if col in data_filtered.columns]
+        
+        # Same rows, groups and weight columns as an earlier call → copy of its cube
+        cache_key = self.result_cache.make_key('party_totals', data_filtered, tuple(weight_columns),
+                                               extra=tuple(group_columns))
+        cached = self.result_cache.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            return cached.copy()
+        
+        if group_columns:
+            grouped = data_filtered[group_columns].groupby(group_columns, sort=True, dropna=True)
+            group_codes = grouped.ngroup().to_numpy(dtype=np.int64)
+            group_index = grouped.size().index
+            num_groups = len(group_index)
+            group_values = group_index.to_frame(index=False) if num_groups else pd.DataFrame(columns=group_columns)
+        else:
+            group_codes = None
+            num_groups = 1
+            group_values = pd.DataFrame(index=[0])
+        
+        totals = self._aggregate_party_totals(data_filtered, group_codes, num_groups, weight_columns)
+        
+        # Reshape to tidy format: one block per weight column, one row per (group, party)
+        num_parties = len(PARTY_CATEGORIES)
+        base = group_values.loc[group_values.index.repeat(num_parties)].reset_index(drop=True)
+        base['party'] = pd.Categorical(PARTY_CATEGORIES * num_groups, categories=PARTY_CATEGORIES)
+        base['records'] = totals['records'].ravel()
+        base['valid_votes'] = totals['valid_votes'].ravel()
+        
+        blocks = []
+        if not weight_columns:
+            block = base.copy()
+            block['weight_column'] = None
+            block['weight'] = block['records'].astype(np.float64)
+            block['squared_weight'] = block['records'].astype(np.float64)
+            block['weighted_records'] = block['records']
+            blocks.append(block)
+        for idx, weight_column in enumerate(weight_columns):
+            block = base.copy()
+            block['weight_column'] = weight_column
+            block['weight'] = totals['weights'][idx].ravel()
+            block['squared_weight'] = totals['squared_weights'][idx].ravel()
+            block['weighted_records'] = totals['weighted_records'][idx].ravel()
+            blocks.append(block)
+        
+        cube = pd.concat(blocks, ignore_index=True)
+        cube = cube[group_columns + ['party', 'weight_column', 'weight', 'squared_weight', 'weighted_records',
+                                     'records', 'valid_votes']]
+        if cache_key is not None:
+            self.result_cache.put(cache_key, cube)
+            return cube.copy()
+        return cube
+    
+    def get_vote_shares_from_totals(self, party_totals, weight_column=None):
+        """
+        Convert party totals for one group into a vote share dictionary
+        (same output as calculate_vote_share)
+        
+        Args:
+            party_totals: Rows of the party totals cube for a single group
+            weight_column: Weight column to read (None for raw counts)
+        
+        Returns:
+            Dictionary with party vote shares and sample size
+        """
+        available_columns = set(party_totals['weight_column'].dropna())
+        
+        if weight_column is not None and weight_column in available_columns:
+            rows = party_totals[party_totals['weight_column'] == weight_column]
+            # Sample size: count all records with valid votes, not just those with valid weights
+            sample_size = int(rows['valid_votes'].sum())
+            party_weights = rows.groupby('party', observed=False)['weight'].sum()
+            squared_weights = rows.groupby('party', observed=False)['squared_weight'].sum()
+        else:
+            # Raw vote share: counts are the same in every weight block
+            first_column = party_totals['weight_column'].iloc[0] if len(party_totals) else None
+            if first_column is None:
+                rows = party_totals[party_totals['weight_column'].isna()]
+            else:
+                rows = party_totals[party_totals['weight_column'] == first_column]
+            sample_size = int(rows['records'].sum())
+            party_weights = rows.groupby('party', observed=False)['records'].sum().astype(np.float64)
+            squared_weights = party_weights
+        
+        party_weights = party_weights.reindex(PARTY_CATEGORIES, fill_value=0.0).to_numpy(dtype=np.float64)
+        vote_shares = self._vote_shares_from_party_weights(party_weights, sample_size)
+        if self.uncertainty is not None:
+            squared_weights = squared_weights.reindex(PARTY_CATEGORIES, fill_value=0.0).to_numpy(dtype=np.float64)
+            self._add_uncertainty(vote_shares, party_weights, squared_weights, rows['weighted_records'].sum())
+        
+        if self.record_calculations:
+            # Group keys are the cube's leading columns (before 'party')
+            group_columns = list(party_totals.columns[:list(party_totals.columns).index('party')])
+            group = None
+            if group_columns and len(rows):
+                group = ', '.join(f"{col}={rows[col].iloc[0]}" for col in group_columns)
+            used_column = weight_column if weight_column is not None and weight_column in available_columns else None
+            self._record_calculation(
+                'totals', used_column, False,
+                {
+                    'rows': rows['records'].sum(),
+                    'valid_votes': rows['valid_votes'].sum(),
+                    'weighted_records': rows['weighted_records'].sum(),
+                },
+                party_weights, vote_shares, group=group
+            )
+        
+        return vote_shares
+    
+    def get_vote_shares_by_group(self, party_totals, group_columns, weight_column=None):
+        """
+        Vote shares for every group in a party totals cube
+        
+        Args:
+            party_totals: Cube from calculate_party_totals
+            group_columns: Grouping columns used to build the cube
+            weight_column: Weight column to read (None for raw counts)
+        
+        Returns:
+            Dictionary mapping group key (value, or tuple for several columns) → vote share dictionary
+        """
+        group_columns = list(group_columns)
+        results = {}
+        for group_key, group_rows in party_totals.groupby(group_columns, sort=False):
+            if len(group_columns) == 1 and isinstance(group_key, tuple):
+                group_key = group_key[0]
+            results[group_key] = self.get_vote_shares_from_totals(group_rows, weight_column=weight_column)
+        return results
+    
     def calculate_margin(self, vote_shares):
         """
         Calculate margin (AITC - BJP)
@@ -216,26 +856,78 @@ class VoteShareCalculator:
         if 'Survey Date' not in self.df.columns:
             return pd.DataFrame()
         
-        self.df['Survey Date'] = pd.to_datetime(self.df['Survey Date'], errors='coerce')
-        dates = sorted(self.df['Survey Date'].dropna().unique())
+        if not pd.api.types.is_datetime64_any_dtype(self.df['Survey Date']):
+            self.df['Survey Date'] = pd.to_datetime(self.df['Survey Date'], errors='coerce')
+        
+        # Window totals come from per-day prefix sums instead of re-filtering the data per date
+        weight_column = 'Weight - with Vote Share - AE 2021 - Region'
+        series = DailyAggregateTable(self, self.df).get_series([weight_column])
         
         dma_results = []
         
-        for date in dates:
+        for date in series.get_dates():
             # Get data for this date going back N days
             cutoff_date = date - timedelta(days=days)
-            date_data = self.df[
-                (self.df['Survey Date'] >= cutoff_date) & 
-                (self.df['Survey Date'] <= date)
-            ].copy()
+            window = series.window_totals(start=cutoff_date, end=date)
             
-            vote_shares = self.calculate_vote_share(date_data)
+            vote_shares = self.get_vote_shares_from_window(window, weight_column=weight_column)
             vote_shares['date'] = date
             vote_shares['margin'] = self.calculate_margin(vote_shares)
             dma_results.append(vote_shares)
         
         return pd.DataFrame(dma_results)
     
+    def get_vote_shares_from_window(self, window_totals, weight_column=None, weighted_records_only=False):
+        """
+        Convert window totals from DailyPartySeries into a vote share dictionary
+        (same output as calculate_vote_share on the rows of that window)
+        
+        Args:
+            window_totals: Dictionary from DailyPartySeries.window_totals
+            weight_column: Weight column to use (raw counts if None or not in the data)
+            weighted_records_only: If True, behave as if the window was first filtered to
+                                   records with a valid weight (e.g. L7D weights)
+        
+        Returns:
+            Dictionary with party vote shares and sample size
+        """
+        if not window_totals['vote_question_available']:
+            return {'sample': 0, 'AITC': 0, 'BJP': 0, 'LEFT': 0, 'INC': 0, 'Others': 0, 'NWR': 0}
+        
+        if weight_column is not None and weight_column in window_totals['weights']:
+            if weighted_records_only:
+                sample_size = int(window_totals['weighted_valid_votes'][weight_column].sum())
+            else:
+                # Sample size: count all records with valid votes, not just those with valid weights
+                sample_size = int(window_totals['valid_votes'].sum())
+            party_weights = window_totals['weights'][weight_column]
+            squared_weights = window_totals['squared_weights'][weight_column]
+            weighted_records = window_totals['weighted_records'][weight_column].sum()
+        else:
+            # Raw vote share: every record counts once (weight 1)
+            sample_size = int(window_totals['records'].sum())
+            party_weights = window_totals['records'].astype(np.float64)
+            squared_weights = party_weights
+            weighted_records = window_totals['records'].sum()
+            weight_column = None
+        
+        vote_shares = self._vote_shares_from_party_weights(party_weights, sample_size)
+        self._add_uncertainty(vote_shares, party_weights, squared_weights, weighted_records)
+        
+        if self.record_calculations:
+            self._record_calculation(
+                'daily_window', weight_column, weighted_records_only,
+                {
+                    'rows': weighted_records if weighted_records_only else window_totals['records'].sum(),
+                    'valid_votes': window_totals['weighted_valid_votes'][weight_column].sum() if weighted_records_only else window_totals['valid_votes'].sum(),
+                    'weighted_records': weighted_records,
+                },
+                party_weights, vote_shares,
+                window=window_totals.get('window')
+            )
+        
+        return vote_shares
+    
     def calculate_demographic_breakdown(self, data_filtered, demographic_column, weight_column='Weight - with Vote Share - AE 2021 - Region'):
         """
         Calculate vote share by demographic
@@ -253,14 +945,391 @@ class VoteShareCalculator:
         if demographic_column not in data_filtered.columns:
             return results
         
-        # Get unique demographic categories
+        # Get unique demographic categories (in order of appearance)
         categories = data_filtered[demographic_column].dropna().unique()
         
+        # All categories in one groupby pass
+        party_totals = self.calculate_party_totals(data_filtered, [demographic_column], [weight_column])
+        if weight_column not in data_filtered.columns:
+            weight_column = None
+        shares_by_category = self.get_vote_shares_by_group(party_totals, [demographic_column], weight_column)
+        
         for category in categories:
-            category_data = data_filtered[data_filtered[demographic_column] == category].copy()
-            vote_shares = self.calculate_vote_share(category_data, weight_column)
+            vote_shares = shares_by_category[category]
             vote_shares['margin'] = self.calculate_margin(vote_shares)
             results[category] = vote_shares
         
         return results
 
+
+def _to_datetime64(value):
+    """Convert a date/datetime/Timestamp to numpy datetime64 for searchsorted"""
+    return pd.Timestamp(value).to_datetime64()
+
+
+class DailyPartySeries:
+    """
+    Per-day party totals for one segment and set of weight columns, stored as prefix sums
+    so cumulative and N-DMA windows are O(1) lookups instead of re-filtering the data
+    """
+    
+    def __init__(self, dates, totals, weight_columns, vote_question_available=True):
+        """
+        Args:
+            dates: Sorted unique Survey Date values (numpy datetime64 array)
+            totals: Dictionary from VoteShareCalculator._aggregate_party_totals with one group per date
+            weight_columns: Weight columns totalled (same order as totals['weights'])
+            vote_question_available: False if the data has no vote question column
+        """
+        self.dates = dates
+        self.weight_columns = list(weight_columns)
+        self.vote_question_available = vote_question_available
+        
+        # Per-day arrays shaped (days, parties)
+        self.daily_records = totals['records']
+        self.daily_valid_votes = totals['valid_votes']
+        
+        # Prefix sums with a leading zero row: total over days [lo, hi) = prefix[hi] - prefix[lo]
+        self._prefix = {
+            'records': self._prefix_sum(totals['records']),
+            'valid_votes': self._prefix_sum(totals['valid_votes']),
+            'weights': {},
+            'squared_weights': {},
+            'weighted_records': {},
+            'weighted_valid_votes': {},
+        }
+        for idx, weight_column in enumerate(self.weight_columns):
+            for key in ('weights', 'squared_weights', 'weighted_records', 'weighted_valid_votes'):
+                self._prefix[key][weight_column] = self._prefix_sum(totals[key][idx])
+    
+    @staticmethod
+    def _prefix_sum(daily_values):
+        """Cumulative sum over days with a leading zero row"""
+        prefix = np.zeros((daily_values.shape[0] + 1, daily_values.shape[1]), dtype=daily_values.dtype)
+        np.cumsum(daily_values, axis=0, out=prefix[1:])
+        return prefix
+    
+    def get_window_bounds(self, start=None, end=None):
+        """
+        Get day index bounds [lo, hi) for Survey Date >= start and Survey Date <= end
+        
+        Args:
+            start: First date included (None for no lower bound)
+            end: Last date included (None for no upper bound)
+        
+        Returns:
+            Tuple of (lo, hi) day indices
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.dates, _to_datetime64(start), side='left'))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, _to_datetime64(end), side='right'))
+        return lo, max(lo, hi)
+    
+    def window_totals(self, start=None, end=None):
+        """
+        Party totals for all records with start <= Survey Date <= end
+        
+        Args:
+            start: First date included (None for cumulative from the first date)
+            end: Last date included (None for no upper bound)
+        
+        Returns:
+            Dictionary of per-party arrays: 'records', 'valid_votes', and per weight column
+            'weights' / 'squared_weights' / 'weighted_records' / 'weighted_valid_votes'; 'window' holds the first and
+            last Survey Date covered (None if the window is empty)
+        """
+        lo, hi = self.get_window_bounds(start, end)
+        
+        def window_sum(prefix):
+            return prefix[hi] - prefix[lo]
+        
+        # First / last Survey Date actually covered by the window (for calculation records)
+        covered = (self.dates[lo], self.dates[hi - 1]) if hi > lo else None
+        
+        return {
+            'window': covered,
+            'records': window_sum(self._prefix['records']),
+            'valid_votes': window_sum(self._prefix['valid_votes']),
+            'weights': {col: window_sum(p) for col, p in self._prefix['weights'].items()},
+            'squared_weights': {col: window_sum(p) for col, p in self._prefix['squared_weights'].items()},
+            'weighted_records': {col: window_sum(p) for col, p in self._prefix['weighted_records'].items()},
+            'weighted_valid_votes': {col: window_sum(p) for col, p in self._prefix['weighted_valid_votes'].items()},
+            'vote_question_available': self.vote_question_available,
+        }
+    
+    def get_dates(self, end=None, with_valid_votes=False):
+        """
+        Get dates that have records in this segment
+        
+        Args:
+            end: Last date included (None for all dates)
+            with_valid_votes: If True, only dates with at least one non-empty vote response
+        
+        Returns:
+            List of pandas Timestamps (sorted)
+        """
+        daily_counts = self.daily_valid_votes if with_valid_votes else self.daily_records
+        _, hi = self.get_window_bounds(None, end)
+        has_records = daily_counts[:hi].sum(axis=1) > 0
+        return [pd.Timestamp(date) for date in self.dates[:hi][has_records]]
+
+
+class DailyWeightCounts:
+    """
+    Per-day record counts of one segment, and of its records with each weight column, stored as
+    prefix sums so the share of a window's records that have a weight is an O(1) lookup
+    """
+    
+    def __init__(self, dates, records, weighted_records):
+        """
+        Args:
+            dates: Sorted unique Survey Date values (numpy datetime64 array)
+            records: Records per day (array aligned with dates)
+            weighted_records: Dictionary weight column → records with a weight per day
+        """
+        self.dates = dates
+        self._records = self._prefix_sum(records)
+        self._weighted_records = {col: self._prefix_sum(counts) for col, counts in weighted_records.items()}
+    
+    @staticmethod
+    def _prefix_sum(daily_counts):
+        """Cumulative sum over days with a leading zero"""
+        prefix = np.zeros(len(daily_counts) + 1, dtype=np.int64)
+        np.cumsum(daily_counts, out=prefix[1:])
+        return prefix
+    
+    def window_counts(self, weight_column, start=None, end=None):
+        """
+        Records with start <= Survey Date <= end, and how many of them have a weight
+        
+        Args:
+            weight_column: Weight column (0 available if it was not counted / is not in the data)
+            start: First date included (None for no lower bound)
+            end: Last date included (None for no upper bound)
+        
+        Returns:
+            Tuple (records with a weight, records)
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.dates, _to_datetime64(start), side='left'))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, _to_datetime64(end), side='right'))
+        hi = max(lo, hi)
+        total = int(self._records[hi] - self._records[lo])
+        prefix = self._weighted_records.get(weight_column)
+        available = int(prefix[hi] - prefix[lo]) if prefix is not None else 0
+        return available, total
+
+
+class DailyAggregateTable:
+    """
+    Per-day aggregate table of weighted party sums and sample counts,
+    keyed by (segment, weight columns). Each entry is a DailyPartySeries built in one
+    bincount pass over the data, so any cumulative / rolling window is read from prefix sums
+    """
+    
+    def __init__(self, calculator, df, date_column='Survey Date', store=None):
+        """
+        Args:
+            calculator: VoteShareCalculator (party categorization and aggregation kernel)
+            df: DataFrame with survey data (segment masks must be aligned with it)
+            date_column: Date column to aggregate by
+            store: AggregateStore for reusing per-day totals across runs (optional)
+        """
+        self.calculator = calculator
+        self.df = df
+        self.store = store
+        
+        # Day index per row (-1 for rows without a valid date), over the exact Survey Date values
+        survey_dates = pd.to_datetime(df[date_column], errors='coerce')
+        day_codes, unique_dates = pd.factorize(survey_dates, sort=True)
+        self.day_codes = day_codes.astype(np.int64)
+        self.dates = np.asarray(unique_dates.to_numpy(), dtype='datetime64[ns]')
+        
+        # Row hash per day - only days whose rows changed since the stored run are re-aggregated
+        self.day_hashes = None
+        if store is not None:
+            self.day_hashes = compute_day_hashes(df, self.day_codes, len(self.dates))
+        
+        self.vote_question_available = calculator.vote_question in df.columns
+        self._series = {}
+        self._group_series = {}
+        self._weight_counts = {}
+    
+    def _present_weight_columns(self, weight_columns):
+        """Deduplicated weight columns that exist in the data"""
+        return tuple(col for col in dict.fromkeys(weight_columns or []) if col and col in self.df.columns)
+    
+    def _aggregate_label_days(self, label_codes, num_labels, weight_columns, day_mask):
+        """
+        Aggregate party totals per (label, day) over rows on the selected days
+        
+        Args:
+            label_codes: Label index per row (-1 = not in any label)
+            num_labels: Number of labels
+            weight_columns: Weight columns to total
+            day_mask: Boolean array over days - only rows on these days are aggregated
+        
+        Returns:
+            Dictionary: 'records' / 'valid_votes' shaped (labels, days, parties),
+            'weights' / 'squared_weights' / 'weighted_records' / 'weighted_valid_votes' shaped
+            (labels, weight columns, days, parties)
+        """
+        num_days = len(self.dates)
+        num_parties = len(PARTY_CATEGORIES)
+        num_weights = len(weight_columns)
+        
+        row_mask = (label_codes >= 0) & (self.day_codes >= 0)
+        row_mask &= day_mask[np.where(self.day_codes >= 0, self.day_codes, 0)]
+        rows = np.flatnonzero(row_mask)
+        
+        if len(rows) == 0:
+            label_shape = (num_labels, num_days, num_parties)
+            weight_shape = (num_labels, num_weights, num_days, num_parties)
+            return {
+                'records': np.zeros(label_shape, dtype=np.int64),
+                'valid_votes': np.zeros(label_shape, dtype=np.int64),
+                'weights': np.zeros(weight_shape, dtype=np.float64),
+                'squared_weights': np.zeros(weight_shape, dtype=np.float64),
+                'weighted_records': np.zeros(weight_shape, dtype=np.int64),
+                'weighted_valid_votes': np.zeros(weight_shape, dtype=np.int64),
+            }
+        
+        # Only the selected rows are read (all rows on a first run, one day's rows on a daily update)
+        data = self.df if len(rows) == len(self.df) else self.df.iloc[rows]
+        group_codes = label_codes[rows] * num_days + self.day_codes[rows]
+        totals = self.calculator._aggregate_party_totals(data, group_codes, num_labels * num_days, list(weight_columns))
+        
+        def by_label(array):
+            return array.reshape(num_labels, num_days, num_parties)
+        
+        def by_label_weight(arrays, dtype):
+            if not arrays:
+                return np.zeros((num_labels, 0, num_days, num_parties), dtype=dtype)
+            return np.stack([by_label(array) for array in arrays], axis=1)
+        
+        return {
+            'records': by_label(totals['records']),
+            'valid_votes': by_label(totals['valid_votes']),
+            'weights': by_label_weight(totals['weights'], np.float64),
+            'squared_weights': by_label_weight(totals['squared_weights'], np.float64),
+            'weighted_records': by_label_weight(totals['weighted_records'], np.int64),
+            'weighted_valid_votes': by_label_weight(totals['weighted_valid_votes'], np.int64),
+        }
+    
+    def _build_label_series(self, entry_key, label_codes, labels, weight_columns):
+        """
+        Build one DailyPartySeries per label (from the aggregate store where days are unchanged)
+        
+        Args:
+            entry_key: Store key for this set of series
+            label_codes: Label index per row (-1 = not in any label)
+            labels: Label names (strings)
+            weight_columns: Weight columns to total
+        
+        Returns:
+            List of DailyPartySeries (same order as labels)
+        """
+        def aggregate_days(day_mask):
+            return self._aggregate_label_days(label_codes, len(labels), weight_columns, day_mask)
+        
+        if self.store is None:
+            totals = aggregate_days(np.ones(len(self.dates), dtype=bool))
+        else:
+            totals = self.store.merge_day_totals(
+                entry_key, self.dates, self.day_hashes, labels, weight_columns, aggregate_days
+            )
+        
+        label_series = []
+        for label_idx in range(len(labels)):
+            label_totals = {
+                'records': totals['records'][label_idx],
+                'valid_votes': totals['valid_votes'][label_idx],
+            }
+            for key in ('weights', 'squared_weights', 'weighted_records', 'weighted_valid_votes'):
+                label_totals[key] = [totals[key][label_idx, weight_idx] for weight_idx in range(len(weight_columns))]
+            label_series.append(DailyPartySeries(
+                self.dates, label_totals, weight_columns, self.vote_question_available
+            ))
+        return label_series
+    
+    def get_series(self, weight_columns, segment=None, mask=None):
+        """
+        Get daily party totals for a segment (built once, then reused)
+        
+        Args:
+            weight_columns: Weight columns to total (missing columns are skipped)
+            segment: Hashable segment key, e.g. ('Gender', 'Male'); None for all records
+                     (also the aggregate store key - the same key must always mean the same mask)
+            mask: Boolean Series/array aligned with df selecting the segment's records
+                  (only needed the first time a segment is requested)
+        
+        Returns:
+            DailyPartySeries
+        """
+        weight_columns = self._present_weight_columns(weight_columns)
+        key = (segment, weight_columns)
+        if key not in self._series:
+            if mask is None:
+                label_codes = np.zeros(len(self.df), dtype=np.int64)
+            else:
+                label_codes = np.where(np.asarray(mask, dtype=bool), 0, -1)
+            self._series[key] = self._build_label_series(
+                ('segment', segment, weight_columns), label_codes, [''], weight_columns
+            )[0]
+        return self._series[key]
+    
+    def get_weight_counts(self, weight_columns, segment=None, mask=None):
+        """
+        Get daily counts of a segment's records and of its records with each weight (built once, then reused)
+        
+        Args:
+            weight_columns: Weight columns to count (missing columns are skipped)
+            segment: Hashable segment key (same convention as get_series); None for all records
+            mask: Boolean Series/array aligned with df selecting the segment's records
+                  (only needed the first time a segment is requested)
+        
+        Returns:
+            DailyWeightCounts
+        """
+        weight_columns = self._present_weight_columns(weight_columns)
+        key = (segment, weight_columns)
+        if key not in self._weight_counts:
+            in_segment = self.day_codes >= 0
+            if mask is not None:
+                if isinstance(mask, pd.Series):
+                    mask = mask.fillna(False).to_numpy(dtype=bool)
+                in_segment = in_segment & np.asarray(mask, dtype=bool)
+            num_days = len(self.dates)
+            records = np.bincount(self.day_codes[in_segment], minlength=num_days)
+            weighted_records = {
+                col: np.bincount(self.day_codes[in_segment & self.df[col].notna().to_numpy()], minlength=num_days)
+                for col in weight_columns
+            }
+            self._weight_counts[key] = DailyWeightCounts(self.dates, records, weighted_records)
+        return self._weight_counts[key]
+    
+    def get_group_series(self, group_column, group_value, weight_columns):
+        """
+        Get daily party totals for records where group_column == group_value
+        All values of group_column are aggregated together in one pass on first use
+        
+        Args:
+            group_column: Column to segment by (e.g. 'Region Name', 'District Name')
+            group_value: Value of the segment
+            weight_columns: Weight columns to total (missing columns are skipped)
+        
+        Returns:
+            DailyPartySeries (None if no records have this value)
+        """
+        weight_columns = self._present_weight_columns(weight_columns)
+        key = (group_column, weight_columns)
+        
+        if key not in self._group_series:
+            value_codes, values = pd.factorize(self.df[group_column])
+            label_series = self._build_label_series(
+                ('group', group_column, weight_columns),
+                value_codes.astype(np.int64),
+                [str(value) for value in values],
+                weight_columns
+            )
+            self._group_series[key] = dict(zip(values, label_series))
+        
+        return self._group_series[key].get(group_value)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Weight Resolver Module
+Weight column names resolved once per dataset for every level × period (Region / District / AC ×
+Overall / L7D / L15D), and the sparse-weight rule of the N-DMA windows: period (L7D / L15D)
+weights are only used when at least half of the window's records have them, otherwise the
+Overall weights are used. Every decision is counted so one summary of the fallbacks is printed
+at the end of each deck instead of re-checking (or logging) availability per slide
+"""
+
+
+WEIGHT_LEVELS = ('Region', 'District', 'AC')
+WEIGHT_PERIODS = ('Overall', 'L7D', 'L15D')
+
+# Period weights are used when at least this share of the window's records have them
+MIN_PERIOD_WEIGHT_SHARE = 0.5
+
+# Fallbacks listed by name in the summary (the rest are only counted)
+SUMMARY_FALLBACK_LABELS = 5
+
+
+def find_weight_column(columns, level='Region', period='Overall', fallback_to_exact=True):
+    """
+    Find the weight column name of a level and period among the data's columns
+
+    Args:
+        columns: Column names of the data (set or Index)
+        level: 'Region', 'District', or 'AC'
+        period: 'Overall', 'L7D', or 'L15D'
+        fallback_to_exact: If True, try exact match first before pattern matching
+
+    Returns:
+        Column name if found, None otherwise
+    """
+    # Try exact match first if fallback_to_exact
+    if fallback_to_exact:
+        exact_name = f'Weight - with Vote Share - AE 2021 - {level}'
+        if period != 'Overall':
+            exact_name += f' {period}'
+        if exact_name in columns:
+            return exact_name
+
+    # Pattern match based on actual column names in Excel
+    # Pattern: "Weight Voteshare {period} {level} Level"
+    if period in WEIGHT_PERIODS:
+        pattern = f'Weight Voteshare {period} {level} Level'
+        if pattern in columns:
+            return pattern
+
+    # Try alternative patterns
+    alternatives = [
+        f'Weight Voteshare {period} {level} Level' if period != 'Overall' else f'Weight Voteshare Overall {level} Level',
+        f'Weight - with Vote Share - AE 2021 - {level}' + (f' {period}' if period != 'Overall' else ''),
+    ]
+
+    for alt in alternatives:
+        if alt in columns:
+            return alt
+
+    return None
+
+
+class WeightResolver:
+    """Weight columns of one loaded dataset and the period-weight decisions of the current deck"""
+
+    def __init__(self, columns):
+        """
+        Args:
+            columns: Column names of the loaded data
+        """
+        self.columns = frozenset(columns)
+        self._resolved = {}
+        for level in WEIGHT_LEVELS:
+            for period in WEIGHT_PERIODS:
+                for fallback_to_exact in (True, False):
+                    key = (level, period, fallback_to_exact)
+                    self._resolved[key] = find_weight_column(self.columns, *key)
+        self.checks = {}  # period → period-weight decisions since reset_decisions
+        self.fallbacks = {}  # period → labels of the windows that fell back to Overall weights
+
+    def get(self, level='Region', period='Overall', fallback_to_exact=True):
+        """
+        Get the weight column of a level and period (see find_weight_column)
+
+        Returns:
+            Column name if found, None otherwise
+        """
+        key = (level, period, fallback_to_exact)
+        if key not in self._resolved:
+            self._resolved[key] = find_weight_column(self.columns, *key)
+        return self._resolved[key]
+
+    def use_period_weights(self, period, available, total, label=None):
+        """
+        Apply the sparse-weight rule to a window (and count the decision)
+
+        Args:
+            period: 'L7D' or 'L15D'
+            available: Records of the window with a period weight
+            total: Records of the window
+            label: Window name listed in the summary if it falls back (e.g. 'Gender=Male 7DMA')
+
+        Returns:
+            True to use the period weights (only records with them), False for the Overall weights
+        """
+        use_period = available > 0 and total > 0 and (available / total) >= MIN_PERIOD_WEIGHT_SHARE
+        self.checks[period] = self.checks.get(period, 0) + 1
+        if not use_period:
+            self.fallbacks.setdefault(period, []).append(label)
+        return use_period
+
+    def add_decisions(self, decisions):
+        """
+        Add decisions counted elsewhere (e.g. in a worker process)
+
+        Args:
+            decisions: (checks, fallbacks) from get_decisions
+        """
+        checks, fallbacks = decisions
+        for period, count in checks.items():
+            self.checks[period] = self.checks.get(period, 0) + count
+        for period, labels in fallbacks.items():
+            self.fallbacks.setdefault(period, []).extend(labels)
+
+    def get_decisions(self):
+        """
+        Decisions counted since reset_decisions
+
+        Returns:
+            Tuple (period → decisions, period → labels of the windows that fell back)
+        """
+        return dict(self.checks), {period: list(labels) for period, labels in self.fallbacks.items()}
+
+    def reset_decisions(self):
+        """Start counting decisions for the next deck"""
+        self.checks = {}
+        self.fallbacks = {}
+
+    def to_dict(self):
+        """
+        Resolved columns and decision counts (JSON-serializable, for the run profile)
+
+        Returns:
+            Dictionary with 'columns' (level → period → column) and per-period 'checks' / 'fallbacks'
+        """
+        return {
+            'columns': {
+                level: {period: self.get(level, period) for period in WEIGHT_PERIODS}
+                for level in WEIGHT_LEVELS
+            },
+            'checks': dict(self.checks),
+            'fallbacks': {period: len(labels) for period, labels in self.fallbacks.items()},
+        }
+
+    def summary(self):
+        """One-line summary ('Sparse weights: 2 of 120 L7D / L15D windows used Overall weights (L7D 2/90: ...)')"""
+        checks = sum(self.checks.values())
+        fallbacks = sum(len(labels) for labels in self.fallbacks.values())
+        details = []
+        for period in sorted(self.checks):
+            labels = self.fallbacks.get(period, [])
+            if not labels:
+                continue
+            named = sorted({label for label in labels if label})
+            shown = ', '.join(named[:SUMMARY_FALLBACK_LABELS])
+            if len(named) > SUMMARY_FALLBACK_LABELS:
+                shown += f", +{len(named) - SUMMARY_FALLBACK_LABELS} more"
+            details.append(f"{period} {len(labels)}/{self.checks[period]}" + (f": {shown}" if shown else ""))
+        return (f"Sparse weights: {fallbacks} of {checks} L7D / L15D windows used Overall weights"
+                + (f" ({'; '.join(details)})" if details else ""))
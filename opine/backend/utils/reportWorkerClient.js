@@ -0,0 +1,87 @@
+const axios = require('axios');
+
+// Client for the resident Python report worker (utils/report-generation/report_worker_service.py)
+// The worker keeps pandas / python-pptx and the parsed template warm, runs a limited number of
+// reports at once and reports per-slide progress. Job state lives in that worker process only:
+// polls must reach a backend instance that talks to the same worker (sticky routing of
+// /api/reports/jobs, or one REPORT_WORKER_URL shared by all instances - see LOAD_BALANCER_SETUP.md)
+const REPORT_WORKER_URL = process.env.REPORT_WORKER_URL || 'http://127.0.0.1:8765';
+
+const workerApi = axios.create({
+  baseURL: REPORT_WORKER_URL,
+  timeout: 10000 // Requests only queue / read jobs - generation runs in the worker
+});
+
+// Submit a report job - throws if the worker is not running
+const submitReportJob = async ({ jobId, excelPath, outputPath, referenceDate, auditOutput, metadata }) => {
+  const response = await workerApi.post('/jobs', {
+    job_id: jobId || null,
+    excel_path: excelPath,
+    output_path: outputPath,
+    reference_date: referenceDate || null,
+    audit_output: auditOutput || null,
+    metadata: metadata || {}
+  });
+  return response.data;
+};
+
+// Get job status (state, stage, slide / total_slides, error, metadata) - null if the job is unknown
+const getReportJob = async (jobId) => {
+  try {
+    const response = await workerApi.get(`/jobs/${encodeURIComponent(jobId)}`);
+    return response.data;
+  } catch (error) {
+    if (error.response && error.response.status === 404) {
+      return null;
+    }
+    throw error;
+  }
+};
+
+// Store data on a finished job (e.g. uploaded report URL) so later polls from any instance reuse it
+const setReportJobResult = async (jobId, data) => {
+  const response = await workerApi.post(`/jobs/${encodeURIComponent(jobId)}/result`, data);
+  return response.data;
+};
+
+// Claim a one-time step of a job (e.g. 'publish') - true only for the first owner, so concurrent
+// polls do the step once. null if the job is unknown
+const claimReportJob = async (jobId, name, owner) => {
+  try {
+    const response = await workerApi.post(`/jobs/${encodeURIComponent(jobId)}/claim`, { name, owner });
+    return response.data.claimed;
+  } catch (error) {
+    if (error.response && error.response.status === 404) {
+      return null;
+    }
+    throw error;
+  }
+};
+
+// Release a claim after the step failed, so the next poll retries it
+// Returns true if released, false if the caller no longer held it, null if the job is unknown
+const releaseReportJob = async (jobId, name, owner) => {
+  try {
+    const response = await workerApi.post(`/jobs/${encodeURIComponent(jobId)}/release`, { name, owner });
+    return response.data.released;
+  } catch (error) {
+    if (error.response && error.response.status === 404) {
+      return null;
+    }
+    throw error;
+  }
+};
+
+// True when the worker cannot be reached (caller falls back to running the generator directly)
+const isWorkerUnavailable = (error) => {
+  return !error.response && ['ECONNREFUSED', 'ECONNRESET', 'ETIMEDOUT', 'ECONNABORTED', 'EHOSTUNREACH'].includes(error.code);
+};
+
+module.exports = {
+  submitReportJob,
+  getReportJob,
+  setReportJobResult,
+  claimReportJob,
+  releaseReportJob,
+  isWorkerUnavailable
+};
@@ -107,6 +107,26 @@ module.exports = {
       out_file: '../logs/cati-call-worker-out.log',
       log_file: '../logs/cati-call-worker-combined.log',
       time: true
+    },
+    {
+      // Resident report generator (keeps template / libraries loaded, serves jobs on localhost)
+      name: 'opine-report-worker',
+      script: 'report_worker_service.py',
+      interpreter: 'python3',
+      cwd: '/var/www/opine/backend/utils/report-generation',
+      instances: 1, // Job state lives in this process - must stay a single instance
+      autorestart: true,
+      watch: false,
+      env: {
+        PYTHONUNBUFFERED: '1',
+        REPORT_WORKER_HOST: envVars.REPORT_WORKER_HOST || '127.0.0.1',
+        REPORT_WORKER_PORT: envVars.REPORT_WORKER_PORT || 8765,
+        REPORT_WORKER_CONCURRENCY: envVars.REPORT_WORKER_CONCURRENCY || 2
+      },
+      error_file: '../logs/report-worker-error.log',
+      out_file: '../logs/report-worker-out.log',
+      log_file: '../logs/report-worker-combined.log',
+      time: true
     }
   ]
 };
@@ -24,6 +24,7 @@ const GenerateReport = () => {
   });
   const [generatingReport, setGeneratingReport] = useState(false);
   const [generatingAudit, setGeneratingAudit] = useState(false);
+  const [reportProgress, setReportProgress] = useState(null);
   const [reportFile, setReportFile] = useState(null);
   const [auditFile, setAuditFile] = useState(null);
   const [uploadedExcelPath, setUploadedExcelPath] = useState(null);
@@ -119,10 +120,11 @@ const GenerateReport = () => {
 
     try {
       setGeneratingReport(true);
+      setReportProgress(null);
       setReportFile(null);
       setAuditFile(null);
 
-      const response = await reportAPI.generateReport(excelFile, referenceDate);
+      const response = await reportAPI.generateReport(excelFile, referenceDate, setReportProgress);
 
       if (response.success) {
         setReportFile({
@@ -144,7 +146,7 @@ const GenerateReport = () => {
           handleGenerateAuditTrail(excelPathToStore);
         }, 1000);
       } else {
-        throw new Error(response.message || 'Failed to generate report');
+        throw new Error(response.error || response.message || 'Failed to generate report');
       }
     } catch (error) {
       console.error('Error generating report:', error);
@@ -155,6 +157,7 @@ const GenerateReport = () => {
       );
     } finally {
       setGeneratingReport(false);
+      setReportProgress(null);
     }
   };
 
@@ -368,7 +371,13 @@ const GenerateReport = () => {
               {generatingReport ? (
                 <>
                   <Loader className="w-5 h-5 animate-spin" />
-                  <span>Generating Report...</span>
+                  <span>
+                    {reportProgress?.status === 'queued'
+                      ? `Queued${reportProgress.queuePosition ? ` (position ${reportProgress.queuePosition})` : ''}...`
+                      : reportProgress?.progress?.slide
+                        ? `Generating Report... slide ${reportProgress.progress.slide} of ${reportProgress.progress.totalSlides}`
+                        : 'Generating Report...'}
+                  </span>
                 </>
               ) : (
                 <>
@@ -1854,7 +1854,9 @@ export const pollingStationAPI = {
 // Report Generation API
 export const reportAPI = {
   // Generate report from Excel file
-  generateReport: async (excelFile, referenceDate) => {
+  // When the backend queues the job on the report worker, polls it until the report is ready
+  // (onProgress receives {status, stage, queuePosition, progress: {slide, totalSlides}})
+  generateReport: async (excelFile, referenceDate, onProgress) => {
     try {
       const formData = new FormData();
       formData.append('excelFile', excelFile);
@@ -1870,6 +1872,34 @@ export const reportAPI = {
         maxContentLength: Infinity,
         maxBodyLength: Infinity,
       });
+
+      if (!response.data.jobId) {
+        return response.data; // Generated in the request
+      }
+
+      // Poll job status until completed / failed (2 hours max, same as the blocking request)
+      const deadline = Date.now() + 7200000;
+      while (Date.now() < deadline) {
+        await new Promise((resolve) => setTimeout(resolve, 3000));
+        const statusResponse = await api.get(`/api/reports/jobs/${response.data.jobId}`);
+        const job = statusResponse.data;
+        if (job.status === 'completed' || job.status === 'failed' || !job.success) {
+          return job;
+        }
+        if (onProgress) {
+          onProgress(job);
+        }
+      }
+      throw new Error('Report generation timed out');
+    } catch (error) {
+      throw error;
+    }
+  },
+
+  // Get report generation job status
+  getReportJobStatus: async (jobId) => {
+    try {
+      const response = await api.get(`/api/reports/jobs/${jobId}`);
       return response.data;
     } catch (error) {
       throw error;
@@ -1883,7 +1913,7 @@ export const reportAPI = {
         excelPath,
         referenceDate
       }, {
-        timeout: 7200000, // 2 hours timeout for large file processing
+        timeout: 600000, // 10 minutes - rendered from the calculations recorded with the report
       });
       return response.data;
     } catch (error) {